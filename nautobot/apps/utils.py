@@ -11,6 +11,7 @@ from nautobot.core.utils.data import (
     is_uuid,
     merge_dicts_without_collision,
     render_jinja2,
+    render_jinja2_batch,
     shallow_compare_dict,
     to_meters,
 )
@@ -128,6 +129,7 @@ __all__ = (
     "refresh_job_model_from_job_class",
     "remove_prefix_from_cf_key",
     "render_jinja2",
+    "render_jinja2_batch",
     "resolve_permission",
     "resolve_permission_ct",
     "rgb_to_hex",
@@ -1,5 +1,4 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
 from django.db.models import Q
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -8,7 +7,7 @@ from django.utils import timezone
 from .choices import CircuitTerminationSideChoices
 from .models import CircuitTermination
 from nautobot.dcim.models import CablePath
-from nautobot.dcim.signals import create_cablepath
+from nautobot.dcim.tracing import update_cable_paths
 
 
 def rebuild_paths_circuits(obj):
@@ -19,18 +18,14 @@ def rebuild_paths_circuits(obj):
 
     # TODO: Remove pylint disable after issue is resolved (see: https://github.com/PyCQA/pylint/issues/7381)
     # pylint: disable=unsupported-binary-operation
-    cable_paths = CablePath.objects.filter(
+    origins = CablePath.objects.filter(
         Q(path__contains=obj)
         | Q(destination_type=termination_type, destination_id=obj.pk)
         | Q(origin_type=termination_type, origin_id=obj.pk)
-    )
+    ).values_list("origin_type_id", "origin_id")
     # pylint: enable=unsupported-binary-operation
 
-    with transaction.atomic():
-        for cp in cable_paths:
-            cp.delete()
-            # Prevent looping back to rebuild_paths during the atomic transaction.
-            create_cablepath(cp.origin, rebuild=False)
+    update_cable_paths(origins)
 
 
 @receiver(post_save, sender=CircuitTermination)
@@ -1,5 +1,14 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
+import json
+
+from django.db.models import Q, QuerySet
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
+from nautobot.core.models.querysets import get_approximate_count
 from nautobot.core.utils.config import get_settings_or_config
 
 
@@ -8,13 +17,30 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Also supports keyset ("cursor") pagination, enabled by the `cursor` query parameter (`?cursor=` to request the first
+    page), which remains fast however deep into a large list of objects it goes. In this mode, objects are ordered by
+    the view's `cursor_ordering` fields (by default, their primary key), and the `count` is approximated for
+    unfiltered lists of many objects, or omitted (`null`) for filtered lists.
     """
 
+    cursor_query_param = "cursor"
+    cursor_query_description = (
+        "Opaque cursor for keyset pagination, as given by the `next` and `previous` links. "
+        "Specify an empty value to request the first page."
+    )
+    default_cursor_ordering = ("pk",)
+
+    cursor = None
+
     def paginate_queryset(self, queryset, request, view=None):
-        # No pagination when rendering to CSV
-        if "text/csv" in request.accepted_media_type:
+        # No pagination when rendering to CSV or newline-delimited JSON
+        if any(media_type in request.accepted_media_type for media_type in ("text/csv", "application/x-ndjson")):
             return None
 
+        if self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet):
+            return self.paginate_queryset_by_cursor(queryset, request, view=view)
+
         self.count = self.get_count(queryset)
         self.limit = self.get_limit(request)
         self.offset = self.get_offset(request)
@@ -31,6 +57,83 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         else:
             return list(queryset[self.offset :])  # noqa: E203
 
+    def paginate_queryset_by_cursor(self, queryset, request, view=None):
+        """Retrieve the page of objects following (or preceding) the position given by the request's cursor."""
+        self.request = request
+        self.limit = self.get_limit(request) or get_settings_or_config("PAGINATE_COUNT")
+        self.offset = 0
+        self.ordering = tuple(getattr(view, "cursor_ordering", self.default_cursor_ordering))
+        position, reverse = self.decode_cursor(request)
+        self.cursor = {"position": position, "reverse": reverse}
+
+        self.count = get_approximate_count(queryset)
+        if self.count is None and not queryset.query.where:
+            self.count = self.get_count(queryset)
+
+        ordering = [self._reverse_ordering(field) for field in self.ordering] if reverse else list(self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self._get_keyset_filter(ordering, position))
+        results = list(queryset.order_by(*ordering)[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if reverse:
+            results.reverse()
+
+        # Whether there are objects beyond either end of this page
+        self.cursor["has_next"] = has_more if not reverse else position is not None
+        self.cursor["has_previous"] = has_more if reverse else position is not None
+        self.cursor["first"] = self._get_position(results[0]) if results else None
+        self.cursor["last"] = self._get_position(results[-1]) if results else None
+        return results
+
+    @staticmethod
+    def _reverse_ordering(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _get_keyset_filter(ordering, position):
+        """Build a filter matching objects positioned after the given `position` values in the given `ordering`."""
+        keyset_filter = Q()
+        equal_filter = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_filter |= equal_filter & Q(**{f"{name}__{lookup}": value})
+            equal_filter &= Q(**{name: value})
+        return keyset_filter
+
+    def _get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            position.append(value.isoformat() if hasattr(value, "isoformat") else force_str(value))
+        return position
+
+    def decode_cursor(self, request):
+        """Decode the cursor of the given request into a (position, reverse) tuple."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = cursor["p"], bool(cursor.get("r", False))
+        except (binascii.Error, KeyError, TypeError, UnicodeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        return position, reverse
+
+    def encode_cursor(self, position, reverse=False):
+        """Encode the given position into a cursor link for the current request."""
+        data = {"p": position}
+        if reverse:
+            data["r"] = 1
+        encoded = urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("ascii")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
     def get_limit(self, request):
         if self.limit_query_param:
             try:
@@ -51,6 +154,11 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         return get_settings_or_config("PAGINATE_COUNT")
 
     def get_next_link(self):
+        if self.cursor is not None:
+            if not self.cursor["has_next"] or self.cursor["last"] is None:
+                return None
+            return self.encode_cursor(self.cursor["last"])
+
         # Pagination has been disabled
         if not self.limit:
             return None
@@ -58,8 +166,26 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         return super().get_next_link()
 
     def get_previous_link(self):
+        if self.cursor is not None:
+            if not self.cursor["has_previous"] or self.cursor["first"] is None:
+                return None
+            return self.encode_cursor(self.cursor["first"], reverse=True)
+
         # Pagination has been disabled
         if not self.limit:
             return None
 
         return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            }
+        )
+        return parameters
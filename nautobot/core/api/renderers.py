@@ -1,5 +1,4 @@
 import csv
-from io import StringIO
 import json
 import logging
 
@@ -36,6 +35,13 @@ class NautobotJSONRenderer(JSONRenderer):
     encoder_class = NautobotKombuJSONEncoder
 
 
+class _EchoBuffer:
+    """File-like object which returns rather than stores what is written to it, for use with `csv.writer()`."""
+
+    def write(self, value):
+        return value
+
+
 class NautobotCSVRenderer(BaseRenderer):
     """
     Render to CSV format.
@@ -58,24 +64,35 @@ class NautobotCSVRenderer(BaseRenderer):
         if isinstance(data, dict):
             data = [data]
 
-        headers = self.get_headers(data)
+        return "".join(self.render_stream([data], renderer_context=renderer_context))
 
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(headers)
-        for record in data:
-            writer.writerow(
-                self.object_to_row_elements(
-                    record,
-                    headers=headers,
-                )
-            )
+    def render_stream(self, chunks, renderer_context=None):
+        """
+        Render the provided chunks of records to CSV format, yielding the header row and then one row at a time.
 
-        return buffer.getvalue()
+        If `renderer_context` includes the list of `custom_field_keys` applicable to the records, the custom field
+        headers are derived from it; otherwise all records in the first chunk are scanned for custom field data.
+        """
+        custom_field_keys = (renderer_context or {}).get("custom_field_keys")
+        buffer = _EchoBuffer()
+        writer = csv.writer(buffer)
+        headers = None
+        for chunk in chunks:
+            if headers is None:
+                if not chunk:
+                    continue
+                headers = self.get_headers(chunk, custom_field_keys=custom_field_keys)
+                yield writer.writerow(headers)
+            for record in chunk:
+                yield writer.writerow(self.object_to_row_elements(record, headers=headers))
 
     @classmethod
-    def get_headers(cls, data):
-        """Identify the appropriate CSV headers corresponding to the given data."""
+    def get_headers(cls, data, custom_field_keys=None):
+        """
+        Identify the appropriate CSV headers corresponding to the given data.
+
+        If `custom_field_keys` is given, it is used in place of scanning the data for custom field keys.
+        """
         base_headers = list(data[0].keys())
 
         # Remove specific headers that we know are irrelevant
@@ -91,8 +108,10 @@ class NautobotCSVRenderer(BaseRenderer):
 
         # Add individual headers for each relevant custom field
         # Since we know there are cases where custom field data may be missing from a given instance,
-        # we iterate over *all* instances in the data set to be safe.
-        if "custom_fields" in data[0]:
+        # we iterate over *all* instances in the data set to be safe, unless we know the custom fields up front.
+        if "custom_fields" in data[0] and custom_field_keys is not None:
+            cf_headers = sorted(f"cf_{key}" for key in custom_field_keys)
+        elif "custom_fields" in data[0]:
             cf_headers = set()
             for record in data:
                 cf_headers |= {f"cf_{key}" for key in record["custom_fields"]}
@@ -165,3 +184,34 @@ class NautobotCSVRenderer(BaseRenderer):
             if settings.DEBUG:
                 logger.debug("key: %s, value: %s", key, value)
             yield value
+
+
+class NautobotNDJSONRenderer(BaseRenderer):
+    """
+    Render to newline-delimited JSON format, with one JSON object per line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "UTF-8"
+    encoder_class = NautobotKombuJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render the provided data to newline-delimited JSON format.
+        """
+        if data is None:
+            return ""
+
+        if isinstance(data, dict):
+            data = [data]
+
+        return "".join(self.render_stream([data], renderer_context=renderer_context))
+
+    def render_stream(self, chunks, renderer_context=None):
+        """
+        Render the provided chunks of records to newline-delimited JSON format, yielding one line at a time.
+        """
+        for chunk in chunks:
+            for record in chunk:
+                yield json.dumps(record, cls=self.encoder_class) + "\n"
@@ -665,8 +665,9 @@ class BaseModelSerializer(OptInFieldsMixin, serializers.HyperlinkedModelSerializ
         altered_data = {}
 
         if self._is_csv_request() and self.natural_keys_values is not None:
-            if natural_key_field_instance := [item for item in self.natural_keys_values if item["pk"] == instance.pk]:
-                cleaned_natural_key_field_instance = natural_key_field_instance[0]
+            if not hasattr(self, "_natural_keys_values_by_pk"):
+                self._natural_keys_values_by_pk = {item["pk"]: item for item in self.natural_keys_values}
+            if cleaned_natural_key_field_instance := self._natural_keys_values_by_pk.get(instance.pk):
                 for key, value in data.items():
                     # FK field with natural_field_lookups
                     if natural_key_field_lookups_for_field := self._get_natural_key_lookups_value_for_field(
@@ -17,6 +17,8 @@ from nautobot.core.api.views import (
     NautobotSpectacularSwaggerView,
     NautobotSpectacularRedocView,
     NewUIReadyRoutesAPIView,
+    SearchIndexRebuildView,
+    SearchView,
     StatusView,
 )
 from nautobot.extras.plugins.urls import plugin_api_patterns
@@ -53,6 +55,8 @@ urlpatterns = [
     path("users/", include("nautobot.users.api.urls")),
     path("virtualization/", include("nautobot.virtualization.api.urls")),
     path("status/", StatusView.as_view(), name="api-status"),
+    path("search/", SearchView.as_view(), name="api-search"),
+    path("search/rebuild/", SearchIndexRebuildView.as_view(), name="api-search-rebuild"),
     path("docs/", NautobotSpectacularSwaggerView.as_view(url_name="schema"), name="api_docs"),
     path("redoc/", NautobotSpectacularRedocView.as_view(url_name="schema"), name="api_redocs"),
     path("swagger/", SpectacularAPIView.as_view(), name="schema"),
@@ -7,10 +7,11 @@ import re
 from django import __version__ as DJANGO_VERSION, forms
 from django.apps import apps
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.http.response import HttpResponseBadRequest
+from django.http.response import HttpResponseBadRequest, StreamingHttpResponse
 from django.db import transaction
-from django.db.models import ProtectedError
+from django.db.models import prefetch_related_objects, ProtectedError
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import NoReverseMatch, reverse as django_reverse
 from rest_framework import status
@@ -19,14 +20,13 @@ from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet as ModelViewSet_
 from rest_framework.viewsets import ReadOnlyModelViewSet as ReadOnlyModelViewSet_
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ParseError
 from drf_spectacular.plumbing import get_relative_url, set_query_parameters
 from drf_spectacular.renderers import OpenApiJsonRenderer
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
 
-from graphql import get_default_backend
 from graphql.execution import ExecutionResult
 from graphql.type.schema import GraphQLSchema
 from graphql.execution.middleware import MiddlewareManager
@@ -35,14 +35,21 @@ from graphene_django.views import GraphQLView, instantiate_middleware, HttpError
 
 from nautobot.core.api import BulkOperationSerializer
 from nautobot.core.celery import app as celery_app
+from nautobot.core.constants import STREAMING_EXPORT_CHUNK_SIZE
 from nautobot.core.exceptions import FilterSetFieldNotFound
+from nautobot.core.graphql.backends import get_graphql_backend
+from nautobot.core.object_counts import get_object_count
+from nautobot.core.settings_funcs import is_truthy
 from nautobot.core.utils.config import get_settings_or_config
 from nautobot.core.utils.data import is_uuid
 from nautobot.core.utils.filtering import get_all_lookup_expr_for_field, get_filterset_parameter_form_field
-from nautobot.core.utils.lookup import get_form_for_model, get_route_for_model
+from nautobot.core.utils.lookup import get_form_for_model, get_route_for_model, get_searchable_models
 from nautobot.core.utils.permissions import get_permission_for_model
 from nautobot.core.utils.requests import ensure_content_type_and_field_name_in_query_params
+from nautobot.extras.metadata import get_content_type_metadata
+from nautobot.extras.models import SearchIndexEntry
 from nautobot.extras.registry import registry
+from nautobot.extras.tasks import rebuild_search_index
 from . import serializers
 
 HTTP_ACTIONS = {
@@ -226,6 +233,49 @@ class ModelViewSetMixin:
 
         return context
 
+    def list(self, request, *args, **kwargs):
+        """
+        Extend DRF's list() to stream the response when rendering to a streaming format such as CSV or ndjson.
+
+        Rather than serializing all objects in memory before rendering them, the queryset is iterated, serialized and
+        rendered one chunk at a time as the response is sent.
+        """
+        renderer = getattr(request, "accepted_renderer", None)
+        if not hasattr(renderer, "render_stream"):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer_context = self.get_renderer_context()
+        if hasattr(queryset.model, "_custom_field_data"):
+            renderer_context["custom_field_keys"] = [
+                cf.key for cf in get_content_type_metadata(queryset.model).custom_fields
+            ]
+        return StreamingHttpResponse(
+            renderer.render_stream(self.get_serialized_chunks(queryset), renderer_context=renderer_context),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+
+    def get_serialized_chunks(self, queryset, chunk_size=None):
+        """Iterate over the given queryset and yield its serialized data in chunks of (at most) `chunk_size` objects."""
+        chunk_size = chunk_size or STREAMING_EXPORT_CHUNK_SIZE
+        chunk = []
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(instance)
+            if len(chunk) >= chunk_size:
+                yield self.serialize_chunk(queryset, chunk)
+                chunk = []
+        if chunk:
+            yield self.serialize_chunk(queryset, chunk)
+
+    def serialize_chunk(self, queryset, chunk):
+        """Serialize the given list of objects, retrieved from the given queryset by `get_serialized_chunks()`."""
+        # iterator() doesn't apply prefetch_related(), so we do so for each chunk instead
+        prefetch_related_objects(chunk, *queryset._prefetch_related_lookups)
+        # The serializer is instantiated with a queryset of just this chunk, as for CSV it queries the natural keys
+        # of the related objects of all of the objects it is instantiated with
+        serializer = self.get_serializer(queryset.model.objects.filter(pk__in=[obj.pk for obj in chunk]), many=True)
+        return serializer.to_representation(chunk)
+
     def restrict_queryset(self, request, *args, **kwargs):
         """
         Restrict the view's queryset to allow only the permitted objects for the given request.
@@ -401,6 +451,107 @@ class APIRootView(NautobotAPIVersionMixin, APIView):
         )
 
 
+class SearchView(NautobotAPIVersionMixin, APIView):
+    """
+    Search all objects included in the global search, returning the best matches first.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Search terms"),
+            OpenApiParameter(
+                "obj_type",
+                str,
+                many=True,
+                description="Only search objects of the given type(s), such as `dcim.device`",
+            ),
+            OpenApiParameter("limit", int, description="Maximum number of results to return"),
+        ],
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "count": {"type": "integer"},
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "object_type": {"type": "string"},
+                                "id": {"type": "string", "format": "uuid"},
+                                "display": {"type": "string"},
+                                "url": {"type": "string", "format": "uri"},
+                            },
+                        },
+                    },
+                },
+            }
+        },
+    )
+    def get(self, request):
+        if not request.query_params.get("q", "").strip():
+            raise ParseError("The q parameter is required")
+        models = get_searchable_models()
+        obj_types = request.query_params.getlist("obj_type")
+        if obj_types:
+            models = [model for model in models if model._meta.label_lower in obj_types]
+        try:
+            limit = int(request.query_params.get("limit", get_settings_or_config("PAGINATE_COUNT")))
+        except ValueError:
+            raise ParseError("The limit parameter must be an integer")
+        max_page_size = get_settings_or_config("MAX_PAGE_SIZE")
+        if max_page_size:
+            limit = min(limit, max_page_size)
+
+        entries = SearchIndexEntry.objects.search(request.query_params["q"], user=request.user, models=models)
+        results = []
+        for entry in entries[:limit]:
+            model = ContentType.objects.get_for_id(entry.object_type_id).model_class()
+            try:
+                url = reverse(
+                    get_route_for_model(model, "detail", api=True), kwargs={"pk": entry.object_id}, request=request
+                )
+            except NoReverseMatch:
+                url = None
+            results.append(
+                {
+                    "object_type": model._meta.label_lower,
+                    "id": entry.object_id,
+                    "display": entry.name,
+                    "url": url,
+                }
+            )
+        return Response({"count": entries.count(), "results": results})
+
+
+class SearchIndexRebuildView(NautobotAPIVersionMixin, APIView):
+    """
+    Rebuild the global search index in the background, for all (or the given) searchable models.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        request={
+            "application/json": {
+                "type": "object",
+                "properties": {"obj_type": {"type": "array", "items": {"type": "string"}}},
+            }
+        },
+        responses={202: {"type": "object", "properties": {"task_id": {"type": "string"}}}},
+    )
+    def post(self, request):
+        searchable_models = [model._meta.label_lower for model in get_searchable_models()]
+        obj_types = request.data.get("obj_type") or None
+        if obj_types is not None:
+            if not isinstance(obj_types, list) or any(obj_type not in searchable_models for obj_type in obj_types):
+                raise ParseError(f"obj_type must be a list of searchable models: {', '.join(searchable_models)}")
+        result = rebuild_search_index.delay(obj_types)
+        return Response({"task_id": result.id}, status=status.HTTP_202_ACCEPTED)
+
+
 class StatusView(NautobotAPIVersionMixin, APIView):
     """
     A lightweight read-only endpoint for conveying the current operational status.
@@ -586,10 +737,12 @@ class GraphQLDRFAPIView(NautobotAPIVersionMixin, APIView):
 
     def init_graphql(self):
         if not self.schema:
-            self.schema = graphene_settings.SCHEMA
+            from nautobot.core.graphql.schema_init import get_schema  # circular import workaround
+
+            self.schema = get_schema()
 
         if self.backend is None:
-            self.backend = get_default_backend()
+            self.backend = get_graphql_backend()
 
         self.graphql_schema = self.graphql_schema or self.schema
 
@@ -805,6 +958,8 @@ class GetObjectCountsView(NautobotAPIVersionMixin, APIView):
     """
     Enumerate the models listed on the Nautobot home page and return data structure
     containing verbose_name_plural, url and count.
+
+    Counts may be cached and, for large tables, approximate; specify `?exact_counts=true` to get exact counts.
     """
 
     permission_classes = [IsAuthenticated]
@@ -839,6 +994,7 @@ class GetObjectCountsView(NautobotAPIVersionMixin, APIView):
             ],
         }
         HIDE_RESTRICTED_UI = get_settings_or_config("HIDE_RESTRICTED_UI")
+        exact = is_truthy(request.query_params.get("exact_counts", False))
 
         for entry in itertools.chain(*object_counts.values()):
             app_label, model_name = entry["model"].split(".")
@@ -853,12 +1009,8 @@ class GetObjectCountsView(NautobotAPIVersionMixin, APIView):
                 logger = logging.getLogger(__name__)
                 route = get_route_for_model(model, "list")
                 logger.warning(f"Handled expected exception when generating filter field: {route}")
-            manager = model.objects
             if request.user.has_perm(permission):
-                if hasattr(manager, "restrict"):
-                    data["count"] = model.objects.restrict(request.user).count()
-                else:
-                    data["count"] = model.objects.count()
+                data["count"], data["count_is_approximate"] = get_object_count(model, request.user, exact=exact)
             entry.update(data)
 
         return Response(object_counts)
@@ -1,5 +1,9 @@
 import logging
 from collections import defaultdict
+import threading
+import time
+import uuid
+import weakref
 
 from django.conf import settings
 from django.contrib.auth.backends import (
@@ -7,9 +11,14 @@ from django.contrib.auth.backends import (
     RemoteUserBackend as _RemoteUserBackend,
 )
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.db.models import Q
+from prometheus_client import Counter
 
+from nautobot.core.utils.config import get_settings_or_config
 from nautobot.core.utils.permissions import (
+    compile_constraints,
     permission_is_exempt,
     resolve_permission,
     resolve_permission_ct,
@@ -18,15 +27,125 @@ from nautobot.users.models import ObjectPermission
 
 logger = logging.getLogger(__name__)
 
+OBJECT_PERMISSION_CACHE_METRIC = Counter(
+    "nautobot_object_permission_cache_lookups", "Lookups of user object permissions in the cache.", ["result"]
+)
+
+OBJECT_PERMISSION_CACHE_PREFIX = "nautobot.core.authentication.object_permissions"
+OBJECT_PERMISSION_CACHE_VERSION_KEY = f"{OBJECT_PERMISSION_CACHE_PREFIX}.version"
+
+# Maximum number of users whose permissions are kept in the in-process layer of the cache
+OBJECT_PERMISSION_CACHE_MAX_USERS = 1000
+
+# In-process layer of the object permission cache, only valid for the version it was populated under
+_object_permissions_cache = {"version": None, "users": {}}
+# Weak reference to the _ObjectPermissionsChanged registered by the transaction of the current thread, if any
+_pending_changes = threading.local()
+
+
+class _ObjectPermissionsChanged:
+    """
+    Callable registered with `transaction.on_commit()` to invalidate the cache once permission changes commit.
+
+    It is only referenced by the connection's list of `on_commit()` callbacks, so it is garbage-collected when Django
+    discards it because the transaction was rolled back.
+    """
+
+    committed = False
+
+    def __call__(self):
+        self.committed = True
+        _bump_object_permissions_cache_version()
+
+
+def object_permission_changes_pending():
+    """
+    Return True if the current database transaction holds uncommitted changes to object permissions.
+
+    The shared cache is bypassed while this is the case, so that it never holds permissions which might be rolled back.
+    """
+    marker_ref = getattr(_pending_changes, "marker", None)
+    marker = marker_ref() if marker_ref is not None else None
+    return marker is not None and not marker.committed
+
+
+def get_object_permissions_cache_version():
+    """Return the current version of the object permission cache, initializing it if necessary."""
+    version = cache.get(OBJECT_PERMISSION_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(OBJECT_PERMISSION_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(OBJECT_PERMISSION_CACHE_VERSION_KEY)
+    return version
+
+
+def _bump_object_permissions_cache_version():
+    cache.set(OBJECT_PERMISSION_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+    _object_permissions_cache["version"] = None
+    _object_permissions_cache["users"] = {}
+
+
+def invalidate_object_permissions_cache():
+    """
+    Invalidate the cached object permissions of all users, in all processes.
+
+    Called when an ObjectPermission, its assignments, or group memberships change. If called inside a transaction,
+    the cache is invalidated again once the transaction commits.
+    """
+    _bump_object_permissions_cache_version()
+    if connection.in_atomic_block and not object_permission_changes_pending():
+        marker = _ObjectPermissionsChanged()
+        _pending_changes.marker = weakref.ref(marker)
+        transaction.on_commit(marker)
+
 
 class ObjectPermissionBackend(ModelBackend):
     def get_all_permissions(self, user_obj, obj=None):
         if not user_obj.is_active or user_obj.is_anonymous:
             return {}
         if not hasattr(user_obj, "_object_perm_cache"):
-            user_obj._object_perm_cache = self.get_object_permissions(user_obj)
+            user_obj._object_perm_cache, user_obj._object_perm_q_cache = self.get_cached_object_permissions(user_obj)
         return user_obj._object_perm_cache
 
+    def get_cached_object_permissions(self, user_obj):
+        """
+        Return the permissions granted to the user by an ObjectPermission, and their constraints compiled to Q objects.
+
+        If `OBJECT_PERMISSION_CACHE_TIMEOUT` is set, both are cached in process and in the Django cache backend, under
+        a version which changes whenever any ObjectPermission, its assignments or any group membership changes.
+        """
+        cache_timeout = get_settings_or_config("OBJECT_PERMISSION_CACHE_TIMEOUT")
+        if not cache_timeout or object_permission_changes_pending():
+            perms = self.get_object_permissions(user_obj)
+            return perms, {perm: compile_constraints(constraints) for perm, constraints in perms.items()}
+
+        version = get_object_permissions_cache_version()
+        if _object_permissions_cache["version"] != version:
+            _object_permissions_cache["version"] = version
+            _object_permissions_cache["users"] = {}
+        users = _object_permissions_cache["users"]
+        cached = users.get(user_obj.pk)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                OBJECT_PERMISSION_CACHE_METRIC.labels(result="hit").inc()
+                return cached[1]
+            users.pop(user_obj.pk, None)
+
+        cache_key = f"{OBJECT_PERMISSION_CACHE_PREFIX}.{version}.{user_obj.pk}"
+        perms = cache.get(cache_key)
+        if perms is None:
+            OBJECT_PERMISSION_CACHE_METRIC.labels(result="miss").inc()
+            perms = dict(self.get_object_permissions(user_obj))
+            cache.set(cache_key, perms, cache_timeout)
+        else:
+            OBJECT_PERMISSION_CACHE_METRIC.labels(result="hit").inc()
+
+        result = (perms, {perm: compile_constraints(constraints) for perm, constraints in perms.items()})
+        # Evict the users cached the longest ago, which are also the first to expire
+        while len(users) >= OBJECT_PERMISSION_CACHE_MAX_USERS:
+            users.pop(next(iter(users)), None)
+        users[user_obj.pk] = (time.monotonic() + cache_timeout, result)
+        return result
+
     def get_object_permissions(self, user_obj):
         """
         Return all permissions granted to the user by an ObjectPermission.
@@ -81,20 +200,12 @@ class ObjectPermissionBackend(ModelBackend):
         if model._meta.label_lower != ".".join((app_label, model_name)):
             raise ValueError(f"Invalid permission {perm} for model {model}")
 
-        # Compile a query filter that matches all instances of the specified model
-        obj_perm_constraints = self.get_all_permissions(user_obj)[perm]
-        constraints = Q()
-        for perm_constraints in obj_perm_constraints:
-            if perm_constraints:
-                constraints |= Q(**perm_constraints)
-            else:
-                # Found ObjectPermission with null constraints; allow model-level access
-                constraints = Q()
-                break
-
         # Permission to perform the requested action on the object depends on whether the specified object matches
         # the specified constraints. Note that this check is made against the *database* record representing the object,
-        # not the instance itself.
+        # not the instance itself. ObjectPermissions with null constraints allow model-level access.
+        constraints = user_obj._object_perm_q_cache[perm]
+        if not constraints:
+            return True
         return model.objects.filter(constraints, pk=obj.pk).exists()
 
 
@@ -1,11 +1,100 @@
 import logging
+import threading
+import time
 
-from celery import current_task
+from celery import current_task, signals
 from django.core.exceptions import ValidationError
 
+from nautobot.extras.constants import JOB_LOG_BUFFER_SIZE, JOB_LOG_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# {task_id: JobLogBuffer} of the tasks being run in this process, shared by all NautobotDatabaseHandlers
+_job_log_buffers = {}
+_job_log_buffers_lock = threading.RLock()
+
+# Background thread writing out the buffers of this process periodically, see start_job_log_flush_thread()
+_job_log_flush_thread = None
+
+
+class JobLogBuffer:
+    """The JobResult of a task, and the JobLogEntries of the task that have not yet been written to the database."""
+
+    def __init__(self, job_result):
+        self.job_result = job_result
+        self.log_entries = []
+        self.flushed_at = time.monotonic()
+        self.written = False
+
+    def add(self, log_entry, immediate=False):
+        """
+        Add the given JobLogEntry to the buffer, writing out the buffer if it is full or has been kept too long.
+
+        The buffer is also written out if `immediate` is set, or if this is the first entry of the task, so that the
+        task is seen to have started.
+        """
+        self.log_entries.append(log_entry)
+        if immediate or not self.written or len(self.log_entries) >= JOB_LOG_BUFFER_SIZE or self.is_stale():
+            self.flush()
+
+    def is_stale(self):
+        """Return whether the buffer has been kept for at least `JOB_LOG_FLUSH_INTERVAL` seconds since the last write."""
+        return time.monotonic() - self.flushed_at >= JOB_LOG_FLUSH_INTERVAL
+
+    def flush(self):
+        """Write the buffered JobLogEntries to the database."""
+        log_entries, self.log_entries = self.log_entries, []
+        self.flushed_at = time.monotonic()
+        if log_entries:
+            self.job_result.save_log_entries(log_entries)
+            self.written = True
+
+
+def flush_job_log_buffer(task_id):
+    """Write the buffered log entries of the given task to the database."""
+    with _job_log_buffers_lock:
+        job_log_buffer = _job_log_buffers.get(task_id)
+        if job_log_buffer is not None and job_log_buffer.job_result is not None:
+            job_log_buffer.flush()
+
+
+def _flush_stale_job_log_buffers():
+    """Periodically write out the buffered log entries of the tasks of this process that have been kept too long."""
+    while True:
+        time.sleep(JOB_LOG_FLUSH_INTERVAL)
+        with _job_log_buffers_lock:
+            for job_log_buffer in _job_log_buffers.values():
+                if job_log_buffer.job_result is not None and job_log_buffer.log_entries and job_log_buffer.is_stale():
+                    try:
+                        job_log_buffer.flush()
+                    except Exception:
+                        logger.exception("Error writing job log entries of %s", job_log_buffer.job_result.pk)
+
+
+def start_job_log_flush_thread():
+    """
+    Start the background thread that writes out the job log entries buffered in this process, if not already running.
+
+    The thread is started lazily, as it doesn't survive the forking of worker processes.
+    """
+    global _job_log_flush_thread
+    with _job_log_buffers_lock:
+        if _job_log_flush_thread is None or not _job_log_flush_thread.is_alive():
+            _job_log_flush_thread = threading.Thread(
+                target=_flush_stale_job_log_buffers, name="nautobot-job-log-flush", daemon=True
+            )
+            _job_log_flush_thread.start()
+
 
 class NautobotDatabaseHandler(logging.Handler):
-    """Custom logging handler to log messages to JobLogEntry database entries."""
+    """
+    Custom logging handler to log messages to JobLogEntry database entries.
+
+    The JobResult of each task is looked up only once, and the log entries of the task are buffered and written with a
+    single query once `JOB_LOG_BUFFER_SIZE` entries have accumulated or `JOB_LOG_FLUSH_INTERVAL` seconds have passed
+    since the last write (checked by a background thread in worker processes), as well as when the task ends. The first
+    log entry of each task, and any entry of level WARNING or above, is written immediately along with the buffer.
+    """
 
     def emit(self, record):
         if current_task is None:
@@ -16,23 +105,56 @@ class NautobotDatabaseHandler(logging.Handler):
         try:
             self.format(record)
 
-            try:
-                job_result = JobResult.objects.get(id=record.task_id)
-            except (ValidationError, JobResult.DoesNotExist):
-                # Both of these cases are very rare
-                # ValidationError - because the task_id might not a valid UUID
-                # JobResult.DoesNotExist - because we might not have a JobResult with that ID
-                return
-
-            # Skip recording the log entry if it has been marked as such
-            if getattr(record, "skip_db_logging", False):
-                return
-
-            job_result.log(
-                message=record.message,
-                level_choice=record.levelname.lower(),
-                obj=getattr(record, "object", None),
-                grouping=getattr(record, "grouping", record.funcName),
-            )
+            with _job_log_buffers_lock:
+                job_log_buffer = _job_log_buffers.get(record.task_id)
+                if job_log_buffer is None:
+                    try:
+                        job_result = JobResult.objects.get(id=record.task_id)
+                    except (ValidationError, JobResult.DoesNotExist):
+                        # Both of these cases are very rare
+                        # ValidationError - because the task_id might not a valid UUID
+                        # JobResult.DoesNotExist - because we might not have a JobResult with that ID
+                        job_result = None
+                    job_log_buffer = _job_log_buffers[record.task_id] = JobLogBuffer(job_result)
+                    # Tasks run eagerly (such as in tests) may log within a transaction that another thread can't see
+                    if job_result is not None and not getattr(current_task.request, "is_eager", False):
+                        start_job_log_flush_thread()
+
+                if job_log_buffer.job_result is None:
+                    return
+
+                # Skip recording the log entry if it has been marked as such
+                if getattr(record, "skip_db_logging", False):
+                    return
+
+                job_log_buffer.add(
+                    job_log_buffer.job_result.make_log_entry(
+                        message=record.message,
+                        level_choice=record.levelname.lower(),
+                        obj=getattr(record, "object", None),
+                        grouping=getattr(record, "grouping", record.funcName),
+                    ),
+                    immediate=record.levelno >= logging.WARNING,
+                )
         except Exception:
             self.handleError(record)
+
+    def flush(self):
+        """Write the buffered log entries of all tasks to the database."""
+        with _job_log_buffers_lock:
+            for job_log_buffer in _job_log_buffers.values():
+                if job_log_buffer.job_result is not None:
+                    job_log_buffer.flush()
+
+
+@signals.task_postrun.connect
+def flush_job_logs(task_id=None, **kwargs):
+    """
+    When a task ends, write its remaining buffered log entries to the database and forget its JobResult.
+
+    Jobs also write out their buffered log entries before their result is stored (see `nautobot.extras.jobs.BaseJob`).
+    """
+    with _job_log_buffers_lock:
+        job_log_buffer = _job_log_buffers.pop(task_id, None)
+    if job_log_buffer is not None and job_log_buffer.job_result is not None:
+        job_log_buffer.flush()
@@ -54,6 +54,11 @@ CSV_NULL_TYPE = "NULL"
 CSV_NO_OBJECT = "NoObject"
 # VarbinaryIPField Represents b'NoObject' as `::4e6f:4f62:6a65:6374`
 VARBINARY_IP_FIELD_REPR_OF_CSV_NO_OBJECT = "::4e6f:4f62:6a65:6374"
+# Number of objects to load and serialize at a time when streaming a CSV (or ndjson) export from the REST API
+STREAMING_EXPORT_CHUNK_SIZE = 1000
+
+# Minimum estimated table size below which an exact count is preferred over an approximate (planner statistics) count
+APPROXIMATE_COUNT_THRESHOLD = 100000
 
 
 # For our purposes, COMPOSITE_KEY_SEPARATOR needs to be:
@@ -3,10 +3,10 @@ from django.test.client import RequestFactory
 from nautobot.extras.models import GraphQLQuery
 
 from graphene.types import Scalar
-from graphene_django.settings import graphene_settings
-from graphql import get_default_backend
 from graphql.language import ast
 
+from nautobot.core.graphql.backends import get_graphql_backend
+
 
 def execute_query(query, variables=None, request=None, user=None):
     """Execute a query from the ORM.
@@ -20,13 +20,15 @@ def execute_query(query, variables=None, request=None, user=None):
     Returns:
         (GraphQLDocument): Result for query
     """
+    from nautobot.core.graphql.schema_init import get_schema  # circular import workaround
+
     if not request and not user:
         raise ValueError("Either request or username should be provided")
     if not request:
         request = RequestFactory().post("/graphql/")
         request.user = user
-    backend = get_default_backend()
-    schema = graphene_settings.SCHEMA
+    backend = get_graphql_backend()
+    schema = get_schema()
     document = backend.document_from_string(schema, query)
     if variables:
         return document.execute(context_value=request, variable_values=variables)
@@ -0,0 +1,121 @@
+"""Static analysis of GraphQL queries, used to reject overly expensive queries before executing them."""
+
+import math
+
+from graphql import GraphQLList, GraphQLNonNull
+from graphql.language import ast
+
+from nautobot.core.models.querysets import get_approximate_count
+
+
+class QueryAnalyzer:
+    """
+    Estimate the cost and the depth of a validated GraphQL query document without executing it.
+
+    The cost is the estimated number of objects that the query would resolve. Each field returning an object counts as
+    one object per parent object; each field returning a list of objects counts as many objects per parent object as
+    its model has rows (as estimated by the database), divided by the number of rows of the parent model for nested
+    lists, and capped by the `limit` argument of the field if given as a literal value.
+
+    The depth is the maximum number of nested fields returning objects, e.g. 2 for `{ devices { location { name } } }`.
+    """
+
+    def __init__(self, schema, document_ast):
+        self.schema = schema
+        self.document_ast = document_ast
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.FragmentDefinition)
+        }
+        self._row_counts = {}
+
+    def analyze(self):
+        """Return the (cost, depth) of the most expensive operation of the document."""
+        cost, depth = 0, 0
+        for definition in self.document_ast.definitions:
+            if not isinstance(definition, ast.OperationDefinition):
+                continue
+            root_type = {
+                "query": self.schema.get_query_type,
+                "mutation": self.schema.get_mutation_type,
+                "subscription": self.schema.get_subscription_type,
+            }[definition.operation]()
+            if root_type is None:
+                continue
+            operation_cost, operation_depth = self._analyze_selection_set(definition.selection_set, root_type, None, 1)
+            cost = max(cost, operation_cost)
+            depth = max(depth, operation_depth)
+        return cost, depth
+
+    def _analyze_selection_set(self, selection_set, parent_type, parent_model, count):
+        cost, depth = 0, 0
+        for selection in selection_set.selections:
+            if isinstance(selection, (ast.FragmentSpread, ast.InlineFragment)):
+                if isinstance(selection, ast.FragmentSpread):
+                    fragment = self.fragments[selection.name.value]
+                else:
+                    fragment = selection
+                fragment_type = parent_type
+                if fragment.type_condition is not None:
+                    fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                fragment_cost, fragment_depth = self._analyze_selection_set(
+                    fragment.selection_set, fragment_type, parent_model, count
+                )
+                cost += fragment_cost
+                depth = max(depth, fragment_depth)
+                continue
+
+            # Scalar fields and introspection fields don't add to the cost of the query
+            if selection.selection_set is None or selection.name.value.startswith("__"):
+                continue
+            field_definition = getattr(parent_type, "fields", {}).get(selection.name.value)
+            if field_definition is None:
+                continue
+
+            field_type = field_definition.type
+            is_list = False
+            while isinstance(field_type, (GraphQLList, GraphQLNonNull)):
+                is_list = is_list or isinstance(field_type, GraphQLList)
+                field_type = field_type.of_type
+            model = self._get_model(field_type)
+
+            field_count = count * (self._estimate_rows(selection, model, parent_model) if is_list else 1)
+            field_cost, field_depth = self._analyze_selection_set(
+                selection.selection_set, field_type, model, field_count
+            )
+            cost += field_count + field_cost
+            depth = max(depth, field_depth + 1)
+        return cost, depth
+
+    @staticmethod
+    def _get_model(graphql_type):
+        """Return the Django model of a GraphQL type generated by graphene-django, if any."""
+        meta = getattr(getattr(graphql_type, "graphene_type", None), "_meta", None)
+        return getattr(meta, "model", None)
+
+    def _estimate_rows(self, field, model, parent_model):
+        """Estimate the number of objects in the list returned by the given field, for each parent object."""
+        if model is None:
+            return 1
+        rows = self._count_rows(model)
+        if parent_model is not None:
+            rows = math.ceil(rows / max(self._count_rows(parent_model), 1))
+        for argument in field.arguments:
+            if argument.name.value == "limit" and isinstance(argument.value, ast.IntValue):
+                rows = min(rows, int(argument.value.value))
+        return max(rows, 1)
+
+    def _count_rows(self, model):
+        if model not in self._row_counts:
+            queryset = model.objects.all()
+            row_count = get_approximate_count(queryset)
+            if row_count is None:
+                row_count = queryset.count()
+            self._row_counts[model] = row_count
+        return self._row_counts[model]
+
+
+def analyze_query(schema, document_ast):
+    """Return the estimated (cost, depth) of the given validated GraphQL query document, see `QueryAnalyzer`."""
+    return QueryAnalyzer(schema, document_ast).analyze()
@@ -0,0 +1,209 @@
+"""GraphQL backend caching parsed and validated query documents, enforcing query limits and recording metrics."""
+
+from collections import OrderedDict
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from graphql import GraphQLError
+from graphql.backend.base import GraphQLBackend, GraphQLDocument
+from graphql.execution import execute, ExecutionResult
+from graphql.language import ast
+from graphql.language.base import parse, print_ast
+from graphql.pyutils.cached_property import cached_property
+from graphql.validation import validate
+from prometheus_client import Counter, Histogram
+
+from nautobot.core.graphql.analysis import analyze_query
+from nautobot.core.utils.config import get_settings_or_config
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_QUERY_DURATION_METRIC = Histogram(
+    "nautobot_graphql_query_duration_seconds", "Execution time of GraphQL queries.", ["saved_query"]
+)
+GRAPHQL_QUERY_SQL_QUERIES_METRIC = Histogram(
+    "nautobot_graphql_query_sql_queries",
+    "Number of SQL queries made to execute GraphQL queries.",
+    ["saved_query"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf")),
+)
+GRAPHQL_QUERY_ROWS_METRIC = Histogram(
+    "nautobot_graphql_query_rows",
+    "Number of database rows fetched to execute GraphQL queries.",
+    ["saved_query"],
+    buckets=(10, 100, 1000, 10000, 100000, 1000000, float("inf")),
+)
+GRAPHQL_QUERY_REJECTED_METRIC = Counter(
+    "nautobot_graphql_queries_rejected", "GraphQL queries rejected for exceeding a limit.", ["limit"]
+)
+GRAPHQL_DOCUMENT_CACHE_METRIC = Counter(
+    "nautobot_graphql_document_cache_lookups", "Lookups of parsed and validated GraphQL documents.", ["result"]
+)
+
+
+def get_query_hash(query):
+    """Return the hash identifying a GraphQL query string, e.g. in the document cache."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class QueryMetrics:
+    """
+    Context manager measuring the duration, the number of SQL queries and the number of rows fetched by its block.
+
+    Example:
+
+        >>> with QueryMetrics() as metrics:
+        ...     result = document.execute(context_value=request)
+        >>> metrics.duration, metrics.sql_queries, metrics.rows
+        (0.0123, 3, 42)
+    """
+
+    def __init__(self):
+        self.duration = 0
+        self.sql_queries = 0
+        self.rows = 0
+        self._start = None
+        self._wrapper = None
+
+    def __call__(self, execute_sql, sql, params, many, context):
+        result = execute_sql(sql, params, many, context)
+        self.sql_queries += 1
+        # Number of rows fetched (or affected) by the SQL query, or -1 if unknown
+        rowcount = context["cursor"].rowcount
+        if rowcount > 0:
+            self.rows += rowcount
+        return result
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duration = time.monotonic() - self._start
+        self._wrapper.__exit__(*exc_info)
+
+
+class NautobotGraphQLDocument(GraphQLDocument):
+    """
+    A parsed and validated GraphQL query document, which can be executed any number of times.
+
+    Validation errors are returned when executing the document, as with the default graphql-core backend. Before
+    executing it, the estimated cost and depth of the query are checked against the `GRAPHQL_MAX_QUERY_COST` and
+    `GRAPHQL_MAX_QUERY_DEPTH` settings; afterwards, the execution metrics are recorded in Prometheus, labeled with the
+    name of the saved query matching this document, if any.
+    """
+
+    def __init__(self, schema, document_string, document_ast, executor=None):
+        super().__init__(schema, document_string, document_ast, execute=self._execute)
+        self.query_hash = get_query_hash(document_string)
+        self.validation_errors = validate(schema, document_ast)
+        self.executor = executor
+
+    @cached_property
+    def analysis(self):
+        """The estimated (cost, depth) of the query, see `nautobot.core.graphql.analysis.QueryAnalyzer`."""
+        return analyze_query(self.schema, self.document_ast)
+
+    @cached_property
+    def saved_query_name(self):
+        """The name of the saved GraphQLQuery with this query, if any, used to label the metrics of this document."""
+        from nautobot.extras.models import GraphQLQuery
+
+        return GraphQLQuery.objects.filter(query=self.document_string).values_list("name", flat=True).first() or ""
+
+    @property
+    def cost(self):
+        return self.analysis[0]
+
+    @property
+    def depth(self):
+        return self.analysis[1]
+
+    def check_limits(self):
+        """Return a list of errors for the limits on query cost and depth exceeded by this document."""
+        errors = []
+        max_depth = get_settings_or_config("GRAPHQL_MAX_QUERY_DEPTH")
+        if max_depth and self.depth > max_depth:
+            GRAPHQL_QUERY_REJECTED_METRIC.labels(limit="depth").inc()
+            errors.append(
+                GraphQLError(f"Query depth of {self.depth} exceeds the maximum allowed depth of {max_depth}.")
+            )
+        max_cost = get_settings_or_config("GRAPHQL_MAX_QUERY_COST")
+        if max_cost and self.cost > max_cost:
+            GRAPHQL_QUERY_REJECTED_METRIC.labels(limit="cost").inc()
+            errors.append(GraphQLError(f"Query cost of {self.cost} exceeds the maximum allowed cost of {max_cost}."))
+        return errors
+
+    def _execute(self, *args, **kwargs):
+        if self.validation_errors:
+            return ExecutionResult(errors=self.validation_errors, invalid=True)
+
+        limit_errors = self.check_limits()
+        if limit_errors:
+            logger.warning("Rejected GraphQL query %s: %s", self.query_hash, "; ".join(map(str, limit_errors)))
+            return ExecutionResult(errors=limit_errors, invalid=True)
+
+        if self.executor is not None:
+            kwargs.setdefault("executor", self.executor)
+        with QueryMetrics() as metrics:
+            result = execute(self.schema, self.document_ast, *args, **kwargs)
+
+        GRAPHQL_QUERY_DURATION_METRIC.labels(saved_query=self.saved_query_name).observe(metrics.duration)
+        GRAPHQL_QUERY_SQL_QUERIES_METRIC.labels(saved_query=self.saved_query_name).observe(metrics.sql_queries)
+        GRAPHQL_QUERY_ROWS_METRIC.labels(saved_query=self.saved_query_name).observe(metrics.rows)
+        return result
+
+
+class NautobotGraphQLBackend(GraphQLBackend):
+    """
+    GraphQL backend keeping the most recently used parsed and validated documents in memory, keyed by query hash.
+
+    The number of cached documents is limited by the `GRAPHQL_DOCUMENT_CACHE_SIZE` setting.
+    """
+
+    def __init__(self, executor=None, cache_size=None):
+        self.executor = executor
+        self.cache_size = cache_size
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def document_from_string(self, schema, document_string):
+        if isinstance(document_string, ast.Document):
+            return NautobotGraphQLDocument(schema, print_ast(document_string), document_string, self.executor)
+
+        key = (schema, get_query_hash(document_string))
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+        if document is not None:
+            GRAPHQL_DOCUMENT_CACHE_METRIC.labels(result="hit").inc()
+            return document
+
+        GRAPHQL_DOCUMENT_CACHE_METRIC.labels(result="miss").inc()
+        # Syntax errors are raised here rather than cached, as with the default graphql-core backend
+        document = NautobotGraphQLDocument(schema, document_string, parse(document_string), self.executor)
+        cache_size = self.cache_size if self.cache_size is not None else settings.GRAPHQL_DOCUMENT_CACHE_SIZE
+        with self._lock:
+            self._documents[key] = document
+            while len(self._documents) > cache_size:
+                self._documents.popitem(last=False)
+        return document
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+_backend = NautobotGraphQLBackend()
+
+
+def get_graphql_backend():
+    """Return the GraphQL backend shared by all the GraphQL entry points of Nautobot."""
+    return _backend
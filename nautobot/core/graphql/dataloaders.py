@@ -0,0 +1,44 @@
+"""Request-scoped batch loading of data for GraphQL resolvers, following the DataLoader pattern."""
+
+from promise.dataloader import DataLoader
+
+DATALOADERS_ATTRIBUTE = "_graphql_dataloaders"
+
+
+def get_dataloader(info, key, batch_load_fn):
+    """
+    Get the DataLoader identified by `key` for the GraphQL request being resolved, creating it if needed.
+
+    The loaders are stored on the request context, so that all the resolvers of a given field collect the keys
+    (typically the parent object ids) across a resolution level and load their data with a single batch. Loaders do
+    not cache their results, as a request may be reused to execute several queries.
+
+    Args:
+        info (ResolveInfo): GraphQL resolution info; `info.context` is the request being resolved.
+        key (tuple): Hashable identifier of the loader, e.g. including the field and the model being resolved.
+        batch_load_fn (callable): Function taking a list of keys and returning a Promise of the list of values.
+
+    Returns:
+        (DataLoader): The loader to call `load()` on.
+    """
+    context = info.context
+    if context is None:
+        return DataLoader(batch_load_fn, cache=False)
+
+    loaders = getattr(context, DATALOADERS_ATTRIBUTE, None)
+    if loaders is None:
+        loaders = {}
+        setattr(context, DATALOADERS_ATTRIBUTE, loaders)
+    if key not in loaders:
+        loaders[key] = DataLoader(batch_load_fn, cache=False)
+    return loaders[key]
+
+
+def get_field_dataloader(info, name, batch_load_fn):
+    """
+    Get the DataLoader for the occurrence of the field currently being resolved in the GraphQL query.
+
+    The same field may occur several times in a query, with different selections, so each occurrence gets its own
+    loader, keyed by the `name` of the resolver and by the field node of the query.
+    """
+    return get_dataloader(info, (name, info.field_asts[0]), batch_load_fn)
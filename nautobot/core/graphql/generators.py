@@ -2,14 +2,18 @@
 
 import logging
 
+from django.db.models import Q
 import graphene
 import graphene_django_optimizer as gql_optimizer
 from graphql import GraphQLError
+from promise import Promise
 
+from nautobot.core.graphql.dataloaders import get_field_dataloader
 from nautobot.core.graphql.types import OptimizedNautobotObjectType
 from nautobot.core.graphql.utils import str_to_var_name, get_filtering_args_from_filterset
 from nautobot.core.utils.lookup import get_filterset_for_model
 from nautobot.extras.choices import RelationshipSideChoices
+from nautobot.extras.metadata import get_content_type_metadata
 from nautobot.extras.models import RelationshipAssociation
 
 logger = logging.getLogger(__name__)
@@ -116,7 +120,19 @@ def generate_computed_field_resolver(name, resolver_name):
     """
 
     def resolve_computed_field(self, info, **kwargs):
-        return self.get_computed_field(slug=name)
+        def batch_load(objs):
+            """Look up the computed field once and render it for all the objects resolved at this level of the query."""
+            computed_field = next(
+                (cf for cf in get_content_type_metadata(objs[0]).computed_fields if cf.key == name), None
+            )
+            if computed_field is None:
+                logger.warning(
+                    "Computed Field with key %s does not exist for model %s", name, objs[0]._meta.verbose_name
+                )
+                return Promise.resolve([None for _ in objs])
+            return Promise.resolve(computed_field.render_many([{"obj": obj} for obj in objs]))
+
+        return get_field_dataloader(info, resolver_name, batch_load).load(self)
 
     resolve_computed_field.__name__ = resolver_name
     return resolve_computed_field
@@ -133,73 +149,57 @@ def generate_relationship_resolver(name, resolver_name, relationship, side, peer
         peer_model (Model): Django Model of the peer of this relationship
     """
 
-    def resolve_relationship(self, info, **kwargs):
-        """Return a queryset or an object depending on the type of the relationship."""
-        peer_side = RelationshipSideChoices.OPPOSITE[side]
-        query_params = {"relationship": relationship}
-        # https://github.com/nautobot/nautobot/issues/1228
-        # If querying for **only** the ID of the related object, for example:
-        # { device(id:"...") { ... rel_my_relationship { id } } }
-        # we will get this exception:
-        # TypeError: Cannot call select_related() after .values() or .values_list()
-        # This appears to be a bug in graphene_django_optimizer but I haven't found a known issue on GitHub.
-        # For now we just work around it by catching the exception and retrying without optimization, below...
+    peer_side = RelationshipSideChoices.OPPOSITE[side]
+
+    def get_peers(info, pks):
+        """Map each of the given object ids to the list of its peers, fetching the associations and peers at once."""
+        associations = RelationshipAssociation.objects.filter(relationship=relationship)
         if not relationship.symmetric:
             # Get the objects on the other side of this relationship
-            query_params[f"{side}_id"] = self.pk
-
-            try:
-                queryset_ids = gql_optimizer.query(
-                    RelationshipAssociation.objects.filter(**query_params).values_list(f"{peer_side}_id", flat=True),
-                    info,
-                )
-            except TypeError:
-                logger.debug("Caught TypeError in graphene_django_optimizer, falling back to un-optimized query")
-                queryset_ids = RelationshipAssociation.objects.filter(**query_params).values_list(
-                    f"{peer_side}_id", flat=True
-                )
+            id_pairs = list(associations.filter(**{f"{side}_id__in": pks}).values_list(f"{side}_id", f"{peer_side}_id"))
         else:
             # Get objects that are peers for this relationship, regardless of side
-            try:
-                queryset_ids = list(
-                    gql_optimizer.query(
-                        RelationshipAssociation.objects.filter(source_id=self.pk, **query_params).values_list(
-                            "destination_id", flat=True
-                        ),
-                        info,
-                    )
-                )
-                queryset_ids += list(
-                    gql_optimizer.query(
-                        RelationshipAssociation.objects.filter(destination_id=self.pk, **query_params).values_list(
-                            "source_id", flat=True
-                        ),
-                        info,
-                    )
-                )
-            except TypeError:
-                logger.debug("Caught TypeError in graphene_django_optimizer, falling back to un-optimized query")
-                queryset_ids = list(
-                    RelationshipAssociation.objects.filter(source_id=self.pk, **query_params).values_list(
-                        "destination_id", flat=True
-                    ),
-                )
-                queryset_ids += list(
-                    RelationshipAssociation.objects.filter(destination_id=self.pk, **query_params).values_list(
-                        "source_id", flat=True
-                    ),
-                )
+            id_pairs = []
+            for source_id, destination_id in associations.filter(
+                Q(source_id__in=pks) | Q(destination_id__in=pks)
+            ).values_list("source_id", "destination_id"):
+                id_pairs += [(source_id, destination_id), (destination_id, source_id)]
+
+        peer_ids = {peer_id for _, peer_id in id_pairs}
+        peer_queryset = peer_model.objects.filter(id__in=peer_ids)
+        # https://github.com/nautobot/nautobot/issues/1228
+        # If querying for **only** the ID of the related object, for example:
+        # { device(id:"...") { ... rel_my_relationship { id } } }
+        # graphene_django_optimizer may fail with a TypeError ("Cannot call select_related() after .values()") or
+        # an AttributeError ("object has no attribute 'only'"); we work around it by retrying without optimization.
+        try:
+            peers = list(gql_optimizer.query(peer_queryset, info))
+        except (AttributeError, TypeError):
+            logger.debug("Caught exception in graphene_django_optimizer, falling back to un-optimized query")
+            peers = list(peer_queryset)
+
+        pks_by_peer_id = {}
+        for pk, peer_id in id_pairs:
+            pks_by_peer_id.setdefault(peer_id, set()).add(pk)
+        peers_by_pk = {pk: [] for pk in pks}
+        # Iterate over the peers rather than over the associations, to preserve the default ordering of the peer model
+        for peer in peers:
+            for pk in pks_by_peer_id.get(peer.pk, ()):
+                if pk in peers_by_pk:
+                    peers_by_pk[pk].append(peer)
+        return peers_by_pk
 
-        if relationship.has_many(peer_side):
-            return gql_optimizer.query(peer_model.objects.filter(id__in=queryset_ids), info)
+    def resolve_relationship(self, info, **kwargs):
+        """Return a list of objects or an object depending on the type of the relationship."""
 
-        # Also apparently a graphene_django_optimizer bug - in the same query case as described above, here we may see:
-        # AttributeError: object has no attribute "only"
-        try:
-            return gql_optimizer.query(peer_model.objects.filter(id__in=queryset_ids).first(), info)
-        except AttributeError:
-            logger.debug("Caught AttributeError in graphene_django_optimizer, falling back to un-optimized query")
-            return peer_model.objects.filter(id__in=queryset_ids).first()
+        def batch_load(pks):
+            """Load the peers of all the objects resolved at this level of the query at once."""
+            peers_by_pk = get_peers(info, pks)
+            if relationship.has_many(peer_side):
+                return Promise.resolve([peers_by_pk[pk] for pk in pks])
+            return Promise.resolve([next(iter(peers_by_pk[pk]), None) for pk in pks])
+
+        return get_field_dataloader(info, (resolver_name, relationship.pk), batch_load).load(self.pk)
 
     resolve_relationship.__name__ = resolver_name
     return resolve_relationship
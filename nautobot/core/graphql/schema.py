@@ -1,6 +1,7 @@
 """Schema module for GraphQL."""
 from collections import OrderedDict
 import logging
+import time
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -8,8 +9,10 @@ from django.db.models.fields.reverse_related import ManyToOneRel, OneToOneRel
 
 import graphene
 from graphene.types import generic
+from promise import Promise
 
 from nautobot.circuits.graphql.types import CircuitTerminationType
+from nautobot.core.graphql.dataloaders import get_field_dataloader
 from nautobot.core.graphql.utils import str_to_var_name
 from nautobot.core.graphql.generators import (
     generate_attrs_for_schema_type,
@@ -40,7 +43,7 @@ from nautobot.dcim.graphql.types import (
     RearPortType,
 )
 from nautobot.extras.registry import registry
-from nautobot.extras.models import ComputedField, CustomField, Relationship
+from nautobot.extras.metadata import get_content_type_metadata
 from nautobot.extras.choices import CustomFieldTypeChoices, RelationshipSideChoices
 from nautobot.extras.graphql.types import TagType, DynamicGroupType
 from nautobot.ipam.graphql.types import IPAddressType, PrefixType
@@ -85,6 +88,31 @@ CUSTOM_FIELD_MAPPING = {
 }
 
 
+# Fields and attribute names of each schema type before it was first extended, see reset_schema_type()
+_original_schema_types = {}
+
+
+def reset_schema_type(schema_type):
+    """Remove the fields and resolvers added to a schema type by any previous call to extend_schema_type().
+
+    This allows the schema type to be extended again when the schema is rebuilt, for example after a custom field was
+    deleted. Schemas built previously are not affected, as the resolvers of a schema are bound when it is built.
+
+    Args:
+        schema_type (DjangoObjectType): GraphQL Object type for a given model
+    """
+    if schema_type not in _original_schema_types:
+        _original_schema_types[schema_type] = (OrderedDict(schema_type._meta.fields), set(vars(schema_type)))
+        return
+
+    fields, attribute_names = _original_schema_types[schema_type]
+    schema_type._meta.fields.clear()
+    schema_type._meta.fields.update(fields)
+    for name in set(vars(schema_type)) - attribute_names:
+        if name.startswith("resolve_"):
+            delattr(schema_type, name)
+
+
 def extend_schema_type(schema_type):
     """Extend an existing schema type to add fields dynamically.
 
@@ -102,6 +130,11 @@ def extend_schema_type(schema_type):
 
     model = schema_type._meta.model
 
+    #
+    # Dynamic attributes added by a previous extension
+    #
+    reset_schema_type(schema_type)
+
     #
     # Queryset
     #
@@ -223,7 +256,7 @@ def extend_schema_type_custom_field(schema_type, model):
         (DjangoObjectType): The extended schema_type object
     """
 
-    cfs = CustomField.objects.get_for_model(model)
+    cfs = get_content_type_metadata(model).custom_fields
     prefix = ""
     if settings.GRAPHQL_CUSTOM_FIELD_PREFIX and isinstance(settings.GRAPHQL_CUSTOM_FIELD_PREFIX, str):
         prefix = f"{settings.GRAPHQL_CUSTOM_FIELD_PREFIX}_"
@@ -271,7 +304,7 @@ def extend_schema_type_computed_field(schema_type, model):
         (DjangoObjectType): The extended schema_type object
     """
 
-    cfs = ComputedField.objects.get_for_model(model)
+    cfs = get_content_type_metadata(model).computed_fields
     prefix = ""
     if settings.GRAPHQL_COMPUTED_FIELD_PREFIX and isinstance(settings.GRAPHQL_COMPUTED_FIELD_PREFIX, str):
         prefix = f"{settings.GRAPHQL_COMPUTED_FIELD_PREFIX}_"
@@ -339,8 +372,20 @@ def extend_schema_type_config_context(schema_type, model):
     if "local_config_context_data" not in fields_name:
         return schema_type
 
-    def resolve_config_context(self, args):
-        return self.get_config_context()
+    def batch_load_config_context(objs):
+        """Annotate the config context data of all the objects resolved at this level of the query at once."""
+        unannotated = {obj.pk: obj for obj in objs if not hasattr(obj, "config_context_data")}
+        if unannotated:
+            for pk, config_context_data in (
+                model.objects.filter(pk__in=unannotated.keys())
+                .annotate_config_context_data()
+                .values_list("pk", "config_context_data")
+            ):
+                unannotated[pk].config_context_data = config_context_data
+        return Promise.resolve([obj.get_config_context() for obj in objs])
+
+    def resolve_config_context(self, info):
+        return get_field_dataloader(info, "resolve_config_context", batch_load_config_context).load(self)
 
     schema_type._meta.fields["config_context"] = graphene.Field.mounted(generic.GenericScalar())
     setattr(schema_type, "resolve_config_context", resolve_config_context)
@@ -352,10 +397,10 @@ def extend_schema_type_relationships(schema_type, model):
     """Extend the schema type with attributes and resolvers corresponding
     to the relationships associated with this model."""
 
-    ct = ContentType.objects.get_for_model(model)
+    metadata = get_content_type_metadata(model)
     relationships_by_side = {
-        "source": Relationship.objects.filter(source_type=ct),
-        "destination": Relationship.objects.filter(destination_type=ct),
+        "source": metadata.source_relationships,
+        "destination": metadata.destination_relationships,
     }
 
     prefix = ""
@@ -452,13 +497,14 @@ def generate_query_mixin():
         return False
 
     logger.debug("Generating dynamic schemas for all models in the models_features graphql registry")
+    start = time.monotonic()
     #  - Ensure an attribute/schematype with the same name doesn't already exist
     registered_models = registry.get("model_features", {}).get("graphql", {})
     for app_name, models in registered_models.items():
         for model_name in models:
             try:
-                # Find the model class based on the content type
-                ct = ContentType.objects.get(app_label=app_name, model=model_name)
+                # Find the model class based on the content type, as cached by the ContentType manager
+                ct = ContentType.objects.get_by_natural_key(app_name, model_name)
                 model = ct.model_class()
             except ContentType.DoesNotExist:
                 logger.warning(
@@ -477,6 +523,7 @@ def generate_query_mixin():
 
             schema_type = generate_schema_type(app_name=app_name, model=model)
             registry["graphql_types"][type_identifier] = schema_type
+    logger.info("Generated GraphQL schema types in %.2f seconds", time.monotonic() - start)
 
     logger.debug("Adding plugins' statically defined graphql schema types")
     # After checking for conflict
@@ -484,6 +531,9 @@ def generate_query_mixin():
         model = schema_type._meta.model
         type_identifier = f"{model._meta.app_label}.{model._meta.model_name}"
 
+        if registry["graphql_types"].get(type_identifier) is schema_type:
+            # Already added when the schema was previously generated
+            continue
         if type_identifier in registry["graphql_types"]:
             logger.warning(
                 'Unable to load schema type for the model "%s" as there is already another type '
@@ -496,12 +546,17 @@ def generate_query_mixin():
             registry["graphql_types"][type_identifier] = schema_type
 
     logger.debug("Extending all registered schema types with dynamic attributes")
+    start = time.monotonic()
     for schema_type in registry["graphql_types"].values():
         if already_present(schema_type._meta.model):
             continue
 
+        # Make sure that fields referring to this model resolve to this schema type, should the schema be rebuilt
+        schema_type._meta.registry.register(schema_type)
+
         schema_type = extend_schema_type(schema_type)
         class_attrs.update(generate_attrs_for_schema_type(schema_type))
+    logger.info("Extended GraphQL schema types with dynamic attributes in %.2f seconds", time.monotonic() - start)
 
     QueryMixin = type("QueryMixin", (object,), class_attrs)
     logger.info("Generation of Nautobot GraphQL schema complete")
@@ -1,14 +1,64 @@
+"""Lazily built GraphQL schema of Nautobot, rebuilt whenever custom fields, computed fields or relationships change."""
+
+import logging
+import threading
+import time
+
 import graphene
+from graphene_django.settings import graphene_settings
 from graphene_django.types import ObjectType
 
+from nautobot.extras.metadata import content_type_metadata_changes_pending, get_content_type_metadata_version
+
+from .backends import get_graphql_backend
 from .schema import generate_query_mixin
 
+logger = logging.getLogger(__name__)
+
+# In-process schema, only valid for the content type metadata version it was built under
+_schema = {"version": None, "schema": None, "tentative": False}
+_schema_lock = threading.Lock()
+
+
+def build_schema():
+    """Build the entire GraphQL schema of Nautobot from the GraphQL types registered for each model."""
+    start = time.monotonic()
+    DynamicGraphQL = generate_query_mixin()
+
+    class Query(ObjectType, DynamicGraphQL):
+        """Contains the entire GraphQL Schema definition for Nautobot."""
+
+    schema_start = time.monotonic()
+    schema = graphene.Schema(query=Query, auto_camelcase=False)
+    logger.info("Built the GraphQL type map in %.2f seconds", time.monotonic() - schema_start)
+    logger.info("Built the GraphQL schema in %.2f seconds", time.monotonic() - start)
+    return schema
 
-DynamicGraphQL = generate_query_mixin()
 
+def get_schema():
+    """
+    Return the GraphQL schema of Nautobot, building it on first use.
 
-class Query(ObjectType, DynamicGraphQL):
-    """Contains the entire GraphQL Schema definition for Nautobot."""
+    The schema is kept until any CustomField, ComputedField or Relationship changes in any process, as tracked by the
+    content type metadata version. A schema built while the current transaction holds uncommitted changes to these is
+    only kept until the transaction ends.
+    """
+    version = get_content_type_metadata_version()
+    changes_pending = content_type_metadata_changes_pending()
+    with _schema_lock:
+        if _schema["schema"] is None or _schema["version"] != version or (_schema["tentative"] and not changes_pending):
+            _schema["schema"] = build_schema()
+            _schema["version"] = version
+            _schema["tentative"] = changes_pending
+            # Documents parsed and validated against the previous schema are no longer of use
+            get_graphql_backend().clear()
+            # Keep the GRAPHENE["SCHEMA"] setting, as used by graphene-django and by apps, up to date
+            graphene_settings.SCHEMA = _schema["schema"]
+        return _schema["schema"]
 
 
-schema = graphene.Schema(query=Query, auto_camelcase=False)
+def __getattr__(name):
+    # The schema referenced by the GRAPHENE["SCHEMA"] setting is only built when first accessed
+    if name == "schema":
+        return get_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
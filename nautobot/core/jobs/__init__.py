@@ -1,7 +1,16 @@
 from nautobot.core.celery import app, register_jobs
-from nautobot.extras.datasources import ensure_git_repository, git_repository_dry_run, refresh_datasource_content
+from nautobot.core.utils.config import get_settings_or_config
+from nautobot.dcim.models import Device
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.datasources import (
+    ensure_git_repository,
+    get_git_repository_sync_state,
+    git_repository_dry_run,
+    refresh_datasource_content,
+)
 from nautobot.extras.jobs import Job, ObjectVar
-from nautobot.extras.models import GitRepository
+from nautobot.extras.models import GitRepository, JobResult
+from nautobot.virtualization.models import VirtualMachine
 
 name = "System Jobs"
 
@@ -29,12 +38,28 @@ class GitRepositorySync(Job):
 
         try:
             ensure_git_repository(repository, logger=self.logger)
-            refresh_datasource_content("extras.gitrepository", repository, user, job_result, delete=False)
+            try:
+                refresh_datasource_content("extras.gitrepository", repository, user, job_result, delete=False)
+            except Exception:
+                # Recorded by after_return(), so that the next sync can still be incremental, retrying failed files
+                self._sync_state = get_git_repository_sync_state(repository, failed=True)
+                raise
             # Given that the above succeeded, tell all workers (including ourself) to call ensure_git_repository()
             app.control.broadcast("refresh_git_repository", repository_pk=repository.pk, head=repository.current_head)
+            # Recorded so that the next sync only needs to refresh the data provided by files changed since this one
+            return get_git_repository_sync_state(repository)
         finally:
             self.logger.info(f"Repository synchronization completed in {job_result.duration}")
 
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        # The result of a failed sync holds the exception by now, add the state of the sync to it
+        sync_state = getattr(self, "_sync_state", None)
+        if status == JobResultStatusChoices.STATUS_FAILURE and sync_state:
+            job_results = JobResult.objects.filter(pk=task_id)
+            result = job_results.values_list("result", flat=True).first()
+            job_results.update(result={**(result if isinstance(result, dict) else {}), **sync_state})
+        super().after_return(status, retval, task_id, args, kwargs, einfo)
+
 
 class GitRepositoryDryRun(Job):
     """System Job to perform a dry run on a Git repository."""
@@ -59,5 +84,28 @@ class GitRepositoryDryRun(Job):
             self.logger.info(f"Repository dry run completed in {job_result.duration}")
 
 
-jobs = [GitRepositorySync, GitRepositoryDryRun]
+class ConfigContextCacheWarmup(Job):
+    """
+    System job to render the config context of every Device and VirtualMachine, populating the rendered data cache.
+    """
+
+    class Meta:
+        name = "Config Contexts: Warm Rendered Cache"
+        description = "Render the config context of all Devices and Virtual Machines so that it is cached."
+        has_sensitive_variables = False
+
+    def run(self):
+        if not get_settings_or_config("CONFIG_CONTEXT_CACHE_TIMEOUT"):
+            self.logger.warning("CONFIG_CONTEXT_CACHE_TIMEOUT is set to 0; skipping cache warmup")
+            return
+
+        for model in (Device, VirtualMachine):
+            count = 0
+            for obj in model.objects.annotate_config_context_data().iterator():
+                obj.get_config_context()
+                count += 1
+            self.logger.info(f"Rendered the config context of {count} {model._meta.verbose_name_plural}")
+
+
+jobs = [GitRepositorySync, GitRepositoryDryRun, ConfigContextCacheWarmup]
 register_jobs(*jobs)
@@ -1,3 +1,5 @@
+import time
+
 from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
 
@@ -7,6 +9,14 @@ from nautobot.core.utils.lookup import get_filterset_for_model
 class Command(BaseCommand):
     help = "Audit all existing DynamicGroup instances in the database and output invalid filter data"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timing",
+            action="store_true",
+            default=False,
+            help="Also report the time taken to compile and to execute the member query of each DynamicGroup",
+        )
+
     def handle(self, *args, **options):
         from nautobot.extras.models import DynamicGroup
 
@@ -38,3 +48,29 @@ class Command(BaseCommand):
                 "\n>>> Please fix the broken filters stated above according to the documentation available at:\n"
                 "https://docs.nautobot.com/projects/core/en/stable/user-guide/administration/upgrading/from-v1/upgrading-from-nautobot-v1/#ui-graphql-and-rest-api-filter-changes\n"
             )
+
+        if options["timing"]:
+            self.audit_timing(dynamic_groups)
+
+    def audit_timing(self, dynamic_groups):
+        """Report the time taken to compile (without the compiled query cache) and execute each group's query."""
+        self.stdout.write("\n>>> Timing DynamicGroup member queries ...\n")
+
+        for dynamic_group in dynamic_groups:
+            if dynamic_group.model is None:
+                continue
+
+            start = time.perf_counter()
+            members = dynamic_group.get_queryset()
+            if dynamic_group.children.exists():
+                members = members.filter(dynamic_group.generate_query())
+            compile_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            count = members.count()
+            execute_time = time.perf_counter() - start
+
+            self.stdout.write(
+                f'    DynamicGroup "{dynamic_group}": compile {compile_time * 1000:.1f} ms, '
+                f"execute {execute_time * 1000:.1f} ms ({count} members)"
+            )
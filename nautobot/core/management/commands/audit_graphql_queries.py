@@ -1,12 +1,21 @@
 from django.core.management.base import BaseCommand
 
 from nautobot.core.graphql import execute_query
+from nautobot.core.graphql.backends import get_graphql_backend, QueryMetrics
 from nautobot.users.models import User
 
 
 class Command(BaseCommand):
     help = "Audit all existing GraphQLQuery instances in the database and output invalid query data"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--metrics",
+            action="store_true",
+            default=False,
+            help="Also report the estimated cost and depth, and the execution metrics, of each GraphQLQuery",
+        )
+
     def handle(self, *args, **options):
         from nautobot.extras.models import GraphQLQuery
 
@@ -16,8 +25,11 @@ class Command(BaseCommand):
         user, _ = User.objects.get_or_create(username="GraphQL Test User")
         is_valid = True
         error_dict = {}
+        metrics_dict = {}
         for graph_ql_query in graph_ql_querys:
-            result = execute_query(graph_ql_query.query, user=user).to_dict()
+            with QueryMetrics() as metrics:
+                result = execute_query(graph_ql_query.query, user=user).to_dict()
+            metrics_dict[graph_ql_query.name] = metrics
             if result.get("errors"):
                 errors = result.get("errors")
                 error_dict[graph_ql_query.name] = errors
@@ -35,3 +47,23 @@ class Command(BaseCommand):
                 "\n>>> Please fix the outdated query data stated above according to the documentation available at:\n"
                 "https://docs.nautobot.com/projects/core/en/stable/user-guide/administration/upgrading/from-v1/upgrading-from-nautobot-v1/#ui-graphql-and-rest-api-filter-changes\n"
             )
+
+        if options["metrics"]:
+            self.audit_metrics(graph_ql_querys, metrics_dict)
+
+    def audit_metrics(self, graph_ql_querys, metrics_dict):
+        """Report the estimated cost and depth of each query, and the metrics of its execution above."""
+        self.stdout.write("\n>>> GraphQLQuery metrics ...\n")
+
+        from nautobot.core.graphql.schema_init import get_schema  # circular import workaround
+
+        backend = get_graphql_backend()
+        for graph_ql_query in graph_ql_querys:
+            document = backend.document_from_string(get_schema(), graph_ql_query.query)
+            if document.validation_errors:
+                continue
+            metrics = metrics_dict[graph_ql_query.name]
+            self.stdout.write(
+                f"    GraphQLQuery `{graph_ql_query.name}`: cost {document.cost}, depth {document.depth}, "
+                f"execute {metrics.duration * 1000:.1f} ms ({metrics.sql_queries} SQL queries, {metrics.rows} rows)"
+            )
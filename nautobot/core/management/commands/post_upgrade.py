@@ -11,6 +11,8 @@ This will run the following management commands with default settings, in order:
 
 - migrate
 - trace_paths
+- recompute_utilization
+- rebuild_search_index
 - build_ui --npm-install
 - collectstatic
 - remove_stale_contenttypes
@@ -64,6 +66,20 @@ class Command(BaseCommand):
             default=True,
             help="Do not automatically remove stale content types.",
         )
+        parser.add_argument(
+            "--no-recompute-utilization",
+            action="store_false",
+            dest="recompute_utilization",
+            default=True,
+            help="Do not automatically calculate missing Prefix and Rack utilization values.",
+        )
+        parser.add_argument(
+            "--no-rebuild-search-index",
+            action="store_false",
+            dest="rebuild_search_index",
+            default=True,
+            help="Do not automatically rebuild the global search index.",
+        )
         parser.add_argument(
             "--no-trace-paths",
             action="store_false",
@@ -111,6 +127,18 @@ class Command(BaseCommand):
             call_command("trace_paths", no_input=True)
             self.stdout.write()
 
+        # Run recompute_utilization
+        if options.get("recompute_utilization"):
+            self.stdout.write("Calculating Prefix and Rack utilization...")
+            call_command("recompute_utilization")
+            self.stdout.write()
+
+        # Run rebuild_search_index
+        if options.get("rebuild_search_index"):
+            self.stdout.write("Rebuilding global search index...")
+            call_command("rebuild_search_index")
+            self.stdout.write()
+
         # Run build
         if options.get("build_ui"):
             self.stdout.write("Building user interface...")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from nautobot.dcim.models import Rack
+from nautobot.ipam.models import Prefix
+
+
+class Command(BaseCommand):
+    help = "Calculate the stored utilization of Prefixes and Racks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            default=False,
+            help="Recalculate the utilization of all Prefixes and Racks, not just those that have never been calculated",
+        )
+
+    def handle(self, *args, **options):
+        for model in (Prefix, Rack):
+            queryset = model.objects.all()
+            if not options["force"]:
+                queryset = queryset.filter(utilization_denominator=0)
+
+            self.stdout.write(f"Calculating utilization of {model._meta.verbose_name_plural}...")
+            count = queryset.update_utilization()
+            self.stdout.write(self.style.SUCCESS(f"  Updated {count} {model._meta.verbose_name_plural}"))
+
+        self.stdout.write(self.style.SUCCESS("Finished."))
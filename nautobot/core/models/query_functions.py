@@ -1,3 +1,6 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import NotSupportedError
 from django.db.models import Aggregate, Func, JSONField
 
@@ -68,3 +71,95 @@ class EmptyGroupByJSONBAgg(JSONBAgg):
     """
 
     contains_aggregate = False
+
+
+class _JSONKeyFunc(Func):
+    """
+    Base class of the functions below, which rewrite a top-level key of a JSON object column.
+
+    Supports both Postgres (JSONB operators and functions) and MySQL (JSON_* functions).
+    """
+
+    output_field = JSONField()
+
+    def __init__(self, expression, key, **extra):
+        super().__init__(expression, **extra)
+        self.key = key
+
+    @property
+    def mysql_path(self):
+        return f"$.{json.dumps(self.key)}"
+
+    def as_sql(self, compiler, connection, **extra_context):
+        vendor = connection.vendor
+        if vendor not in ("postgresql", "mysql"):
+            raise NotSupportedError(f"{self.__class__.__name__} is not supported for database {vendor}")
+
+        sql, params = compiler.compile(self.source_expressions[0])
+        return getattr(self, f"_as_{vendor}")(sql, tuple(params))
+
+
+class JSONSet(_JSONKeyFunc):
+    """
+    Set `key` to `value` in a JSON object column, using JSONB_SET on Postgres and JSON_SET on MySQL.
+    """
+
+    def __init__(self, expression, key, value, **extra):
+        super().__init__(expression, key, **extra)
+        self.value = json.dumps(value, cls=DjangoJSONEncoder)
+
+    def _as_postgresql(self, sql, params):
+        return f"JSONB_SET({sql}, %s, %s::jsonb)", (*params, [self.key], self.value)
+
+    def _as_mysql(self, sql, params):
+        return f"JSON_SET({sql}, %s, CAST(%s AS JSON))", (*params, self.mysql_path, self.value)
+
+
+class JSONRemove(_JSONKeyFunc):
+    """
+    Remove `key` from a JSON object column, using the `-` operator on Postgres and JSON_REMOVE on MySQL.
+    """
+
+    def _as_postgresql(self, sql, params):
+        return f"({sql} - %s)", (*params, self.key)
+
+    def _as_mysql(self, sql, params):
+        return f"JSON_REMOVE({sql}, %s)", (*params, self.mysql_path)
+
+
+class JSONArrayReplace(_JSONKeyFunc):
+    """
+    Replace `old_value` by `new_value` in the JSON array stored under `key` in a JSON object column.
+
+    Only apply this to rows whose array does contain `old_value`. On MySQL, which has no way of rewriting the elements of
+    an array in place, only the first occurrence of `old_value` (which must be a string) is replaced.
+    """
+
+    def __init__(self, expression, key, old_value, new_value, **extra):
+        super().__init__(expression, key, **extra)
+        self.old_value = old_value
+        self.new_value = json.dumps(new_value, cls=DjangoJSONEncoder)
+
+    def _as_postgresql(self, sql, params):
+        return (
+            f"JSONB_SET({sql}, %s, COALESCE(("
+            "SELECT JSONB_AGG(CASE WHEN e.value = %s::jsonb THEN %s::jsonb ELSE e.value END ORDER BY e.ordinality) "
+            f"FROM JSONB_ARRAY_ELEMENTS({sql} -> %s) WITH ORDINALITY AS e(value, ordinality)"
+            "), '[]'::jsonb))",
+            (
+                *params,
+                [self.key],
+                json.dumps(self.old_value, cls=DjangoJSONEncoder),
+                self.new_value,
+                *params,
+                self.key,
+            ),
+        )
+
+    def _as_mysql(self, sql, params):
+        # JSON_SEARCH() matches a LIKE pattern, in which "%" and "_" must be escaped
+        pattern = self.old_value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return (
+            f"JSON_REPLACE({sql}, JSON_UNQUOTE(JSON_SEARCH({sql}, 'one', %s, NULL, %s)), CAST(%s AS JSON))",
+            (*params, *params, pattern, f"{self.mysql_path}[*]", self.new_value),
+        )
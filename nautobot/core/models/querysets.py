@@ -1,6 +1,8 @@
-from django.db.models import Count, OuterRef, Q, QuerySet, Subquery
+from django.db import connections
+from django.db.models import Count, OuterRef, QuerySet, Subquery
 from django.db.models.functions import Coalesce
 
+from nautobot.core.constants import APPROXIMATE_COUNT_THRESHOLD
 from nautobot.core.models.utils import deconstruct_composite_key
 from nautobot.core.utils import permissions
 from nautobot.core.utils.data import merge_dicts_without_collision
@@ -21,6 +23,27 @@ def count_related(model, field):
     return Coalesce(subquery, 0)
 
 
+def get_approximate_count(queryset):
+    """
+    Return an approximate count of the objects in the given queryset, or None if no approximation is available.
+
+    On PostgreSQL, the count of an unfiltered queryset is estimated from the planner statistics in `pg_class`, which
+    is much faster than a `COUNT(*)` of a large table. Estimates below `APPROXIMATE_COUNT_THRESHOLD` are discarded,
+    as for small tables an exact count is both cheap and expected.
+    """
+    if queryset.query.where or queryset.query.distinct or queryset.query.is_sliced:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < APPROXIMATE_COUNT_THRESHOLD:
+        return None
+    return int(row[0])
+
+
 class CompositeKeyQuerySetMixin:
     """
     Mixin to extend a base queryset class with support for filtering by `composite_key=...` as a virtual parameter.
@@ -118,17 +141,12 @@ class RestrictedQuerySet(CompositeKeyQuerySetMixin, QuerySet):
 
         # Filter the queryset to include only objects with allowed attributes
         else:
-            attrs = Q()
-            for perm_attrs in user._object_perm_cache[permission_required]:
-                if isinstance(perm_attrs, list):
-                    for p in perm_attrs:
-                        attrs |= Q(**p)
-                elif perm_attrs:
-                    attrs |= Q(**perm_attrs)
-                else:
-                    # Any permission with null constraints grants access to _all_ instances
-                    attrs = Q()
-                    break
+            if not hasattr(user, "_object_perm_q_cache"):
+                user._object_perm_q_cache = {}
+            attrs = user._object_perm_q_cache.get(permission_required)
+            if attrs is None:
+                attrs = permissions.compile_constraints(user._object_perm_cache[permission_required])
+                user._object_perm_q_cache[permission_required] = attrs
             qs = self.filter(attrs)
 
         return qs
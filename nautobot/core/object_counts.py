@@ -0,0 +1,72 @@
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+
+from nautobot.core.models.querysets import get_approximate_count
+from nautobot.core.tasks import refresh_object_counts
+from nautobot.core.utils.config import get_settings_or_config
+
+logger = logging.getLogger(__name__)
+
+OBJECT_COUNTS_CACHE_PREFIX = "nautobot.core.object_counts"
+
+
+def _get_cache_key(model, signature):
+    return f"{OBJECT_COUNTS_CACHE_PREFIX}.{model._meta.label_lower}.{signature}"
+
+
+def get_object_count(model, user=None, exact=False, refresh=False):
+    """
+    Get the number of objects of the given model that the given user is permitted to view.
+
+    Counts are cached for `OBJECT_COUNT_CACHE_TIMEOUT` seconds, keyed by the model and by the permission constraints
+    applied to the user, so that all users with the same constraints share the same cache entry. For users who are
+    not restricted by any constraints (or if `user` is None), the count of a large table is approximated from the
+    database statistics rather than counted exactly, and hot cached counts are refreshed by a background task before
+    they expire.
+
+    Args:
+        model (Model): Model class whose objects are to be counted
+        user (User): User whose permissions restrict the objects to count, or None to count all objects
+        exact (bool): Whether to bypass the cache and any approximation, and refresh the cache with an exact count
+        refresh (bool): Whether to bypass the cache and refresh it with a new (possibly approximate) count
+
+    Returns:
+        (int, bool): The count, and whether it is an approximation
+    """
+    queryset = model.objects.all()
+    if user is not None and hasattr(queryset, "restrict"):
+        queryset = queryset.restrict(user, "view")
+    if queryset.query.is_empty():
+        return 0, False
+    try:
+        signature = hashlib.sha256(str(queryset.query).encode("utf-8")).hexdigest()[:16]
+    except EmptyResultSet:
+        return 0, False
+    unrestricted = not queryset.query.where
+    cache_key = _get_cache_key(model, signature)
+    timeout = get_settings_or_config("OBJECT_COUNT_CACHE_TIMEOUT")
+
+    if timeout and not (exact or refresh):
+        cached = cache.get(cache_key)
+        if cached is not None:
+            count, approximate, counted_at = cached
+            # Refresh the unrestricted count in the background before it expires, to keep it warm
+            if unrestricted and time.time() - counted_at > timeout / 2:
+                if cache.add(f"{cache_key}.refreshing", True, timeout / 2):
+                    logger.debug("Initiating background task to refresh the count of %s", model._meta.label_lower)
+                    refresh_object_counts.delay([model._meta.label_lower])
+            return count, approximate
+
+    count = None
+    if unrestricted and not exact:
+        count = get_approximate_count(queryset)
+    approximate = count is not None
+    if count is None:
+        count = queryset.count()
+    if timeout:
+        cache.set(cache_key, (count, approximate, time.time()), timeout)
+    return count, approximate
@@ -140,6 +140,11 @@ TEST_USE_FACTORIES = is_truthy(os.getenv("NAUTOBOT_TEST_USE_FACTORIES", "False")
 # Pseudo-random number generator seed, for reproducibility of test results.
 TEST_FACTORY_SEED = os.getenv("NAUTOBOT_TEST_FACTORY_SEED", None)
 
+# Webhook events which could not be delivered are retried up to this many times, after an exponentially increasing
+# delay whose base is WEBHOOK_RETRY_BACKOFF seconds
+WEBHOOK_MAX_RETRIES = int(os.getenv("NAUTOBOT_WEBHOOK_MAX_RETRIES", "3"))
+WEBHOOK_RETRY_BACKOFF = int(os.getenv("NAUTOBOT_WEBHOOK_RETRY_BACKOFF", "10"))
+
 #
 # django-slowtests
 #
@@ -198,6 +203,7 @@ REST_FRAMEWORK = {
         "nautobot.core.api.renderers.NautobotJSONRenderer",
         "nautobot.core.api.renderers.FormlessBrowsableAPIRenderer",
         "nautobot.core.api.renderers.NautobotCSVRenderer",
+        "nautobot.core.api.renderers.NautobotNDJSONRenderer",
     ),
     "DEFAULT_PARSER_CLASSES": (
         "rest_framework.parsers.JSONParser",
@@ -487,6 +493,9 @@ TEMPLATES = [
     },
 ]
 
+# Number of compiled Jinja2 templates (computed fields, custom links, webhooks, etc.) to keep in memory
+JINJA2_TEMPLATE_CACHE_SIZE = int(os.getenv("NAUTOBOT_JINJA2_TEMPLATE_CACHE_SIZE", "1000"))
+
 # Set up authentication backends
 AUTHENTICATION_BACKENDS = [
     # Always check object permissions
@@ -585,6 +594,14 @@ CONSTANCE_CONFIG = {
         help_text="Number of days to retain object changelog history.\nSet this to 0 to retain changes indefinitely.",
         field_type=int,
     ),
+    "CONFIG_CONTEXT_CACHE_TIMEOUT": ConstanceConfigItem(
+        default=0,
+        help_text="Rendered config context cache timeout in seconds. This is the amount of time that the merged config "
+        "context data of a Device or Virtual Machine will be cached in Django cache backend. Cache entries are keyed "
+        "by the config contexts that apply to the object and by its local config context data, so any change to "
+        "these results in the data being rendered afresh. Set to 0 to disable caching.",
+        field_type=int,
+    ),
     "DEVICE_NAME_AS_NATURAL_KEY": ConstanceConfigItem(
         default=False,
         help_text="Device names are not guaranteed globally-unique by Nautobot but in practice they often are. "
@@ -611,6 +628,19 @@ CONSTANCE_CONFIG = {
         help_text="Whether to show the Feedback button in the new UI sidebar.",
         field_type=bool,
     ),
+    "GRAPHQL_MAX_QUERY_COST": ConstanceConfigItem(
+        default=0,
+        help_text="Maximum estimated cost of a GraphQL query, that is the number of objects that the query is estimated "
+        "to resolve, based on the number of rows of each model and on the nesting of the query. Queries exceeding this "
+        "cost are rejected without being executed. Set to 0 to disable this limit.",
+        field_type=int,
+    ),
+    "GRAPHQL_MAX_QUERY_DEPTH": ConstanceConfigItem(
+        default=0,
+        help_text="Maximum depth of a GraphQL query, that is the number of nested levels of objects in the query. "
+        "Queries exceeding this depth are rejected without being executed. Set to 0 to disable this limit.",
+        field_type=int,
+    ),
     "HIDE_RESTRICTED_UI": ConstanceConfigItem(
         default=False,
         help_text="If set to True, users with limited permissions will not be shown menu items and home-page elements that "
@@ -631,6 +661,20 @@ CONSTANCE_CONFIG = {
         "If set to 0, a user can retrieve an unlimited number of objects.",
         field_type=int,
     ),
+    "OBJECT_COUNT_CACHE_TIMEOUT": ConstanceConfigItem(
+        default=0,
+        help_text="Object count cache timeout in seconds. This is the amount of time that the object counts displayed on "
+        "the home page will be cached in Django cache backend, per model and per set of object permission constraints. "
+        "Set to 0 to disable caching.",
+        field_type=int,
+    ),
+    "OBJECT_PERMISSION_CACHE_TIMEOUT": ConstanceConfigItem(
+        default=0,
+        help_text="Object permission cache timeout in seconds. This is the amount of time that the permissions granted "
+        "to a user by object permissions will be cached, in process and in Django cache backend. This cache is "
+        "invalidated when any object permission or group membership changes. Set to 0 to disable caching.",
+        field_type=int,
+    ),
     "PAGINATE_COUNT": ConstanceConfigItem(
         default=50,
         help_text="Default number of objects to display per page when listing objects in the UI and/or REST API.",
@@ -694,10 +738,16 @@ CONSTANCE_CONFIG_FIELDSETS = {
     "Banners": ["BANNER_LOGIN", "BANNER_TOP", "BANNER_BOTTOM"],
     "Change Logging": ["CHANGELOG_RETENTION"],
     "Device Connectivity": ["NETWORK_DRIVERS", "PREFER_IPV4"],
+    "GraphQL": ["GRAPHQL_MAX_QUERY_COST", "GRAPHQL_MAX_QUERY_DEPTH"],
     "Installation Metrics": ["DEPLOYMENT_ID"],
     "Natural Keys": ["DEVICE_NAME_AS_NATURAL_KEY", "LOCATION_NAME_AS_NATURAL_KEY"],
     "Pagination": ["PAGINATE_COUNT", "MAX_PAGE_SIZE", "PER_PAGE_DEFAULTS"],
-    "Performance": ["DYNAMIC_GROUPS_MEMBER_CACHE_TIMEOUT"],
+    "Performance": [
+        "CONFIG_CONTEXT_CACHE_TIMEOUT",
+        "DYNAMIC_GROUPS_MEMBER_CACHE_TIMEOUT",
+        "OBJECT_COUNT_CACHE_TIMEOUT",
+        "OBJECT_PERMISSION_CACHE_TIMEOUT",
+    ],
     "Rack Elevation Rendering": ["RACK_ELEVATION_DEFAULT_UNIT_HEIGHT", "RACK_ELEVATION_DEFAULT_UNIT_WIDTH"],
     "Release Checking": ["RELEASE_CHECK_URL", "RELEASE_CHECK_TIMEOUT"],
     "User Interface": ["HIDE_RESTRICTED_UI", "FEEDBACK_BUTTON_ENABLED", "SUPPORT_MESSAGE"],
@@ -731,6 +781,7 @@ GRAPHENE = {
 GRAPHQL_CUSTOM_FIELD_PREFIX = "cf"
 GRAPHQL_RELATIONSHIP_PREFIX = "rel"
 GRAPHQL_COMPUTED_FIELD_PREFIX = "cpf"
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.getenv("NAUTOBOT_GRAPHQL_DOCUMENT_CACHE_SIZE", "1000"))
 
 
 #
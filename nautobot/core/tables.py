@@ -1,6 +1,5 @@
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.fields import GenericForeignKey
-from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models.fields.related import RelatedField
 from django.urls import reverse
@@ -13,8 +12,10 @@ from django_tables2.utils import Accessor
 from tree_queries.models import TreeNode
 
 from nautobot.core.templatetags import helpers
-from nautobot.core.utils import lookup
-from nautobot.extras import choices, models
+from nautobot.core.utils import lookup, permissions
+from nautobot.extras import choices
+from nautobot.extras.metadata import get_content_type_metadata
+from nautobot.extras.models.relationships import get_relationship_associations
 
 
 class BaseTable(django_tables2.Table):
@@ -31,16 +32,16 @@ class BaseTable(django_tables2.Table):
 
     def __init__(self, *args, user=None, **kwargs):
         # Add custom field columns
-        obj_type = ContentType.objects.get_for_model(self._meta.model)
+        metadata = get_content_type_metadata(self._meta.model)
 
-        for cf in models.CustomField.objects.filter(content_types=obj_type):
+        for cf in metadata.custom_fields:
             name = cf.add_prefix_to_cf_key()
             self.base_columns[name] = CustomFieldColumn(cf)
 
-        for cpf in models.ComputedField.objects.filter(content_type=obj_type):
+        for cpf in metadata.computed_fields:
             self.base_columns[f"cpf_{cpf.key}"] = ComputedFieldColumn(cpf)
 
-        for relationship in models.Relationship.objects.filter(source_type=obj_type):
+        for relationship in metadata.source_relationships:
             if not relationship.symmetric:
                 self.base_columns[f"cr_{relationship.key}_src"] = RelationshipColumn(
                     relationship, side=choices.RelationshipSideChoices.SIDE_SOURCE
@@ -50,7 +51,7 @@ class BaseTable(django_tables2.Table):
                     relationship, side=choices.RelationshipSideChoices.SIDE_PEER
                 )
 
-        for relationship in models.Relationship.objects.filter(destination_type=obj_type):
+        for relationship in metadata.destination_relationships:
             if not relationship.symmetric:
                 self.base_columns[f"cr_{relationship.key}_dst"] = RelationshipColumn(
                     relationship, side=choices.RelationshipSideChoices.SIDE_DESTINATION
@@ -64,6 +65,7 @@ class BaseTable(django_tables2.Table):
 
         # Init table
         super().__init__(*args, **kwargs)
+        self._relationship_associations = {}
 
         # Set default empty_text if none was provided
         if self.empty_text is None:
@@ -126,6 +128,22 @@ class BaseTable(django_tables2.Table):
                         prefetch_fields.append("__".join(prefetch_path))
             self.data.data = self.data.data.prefetch_related(None).prefetch_related(*prefetch_fields)
 
+    def get_relationship_associations(self, relationship, side):
+        """
+        Get the RelationshipAssociations of the displayed records on the given side of the given relationship.
+
+        The associations and their peers are loaded for all the records of the current page at once, the first time
+        this is called for the given relationship and side.
+
+        Returns:
+            (dict): the list of RelationshipAssociations of each record, keyed by record primary key
+        """
+        key = (relationship.pk, side)
+        if key not in self._relationship_associations:
+            records = self.paginated_rows.data
+            self._relationship_associations[key] = get_relationship_associations(relationship, side, records)
+        return self._relationship_associations[key]
+
     @property
     def configurable_columns(self):
         selected_columns = [
@@ -193,12 +211,12 @@ class ButtonsColumn(django_tables2.TemplateColumn):
             <i class="mdi mdi-history"></i>
         </a>
     {{% endif %}}
-    {{% if "edit" in buttons and perms.{app_label}.change_{model_name} %}}
+    {{% if "edit" in buttons and perms.{app_label}.change_{model_name} and change_permitted %}}
         <a href="{{% url '{edit_route}' {pk_field}=record.{pk_field} %}}?return_url={{{{ request.path }}}}{{{{ return_url_extra }}}}" class="btn btn-xs btn-warning" title="Edit">
             <i class="mdi mdi-pencil"></i>
         </a>
     {{% endif %}}
-    {{% if "delete" in buttons and perms.{app_label}.delete_{model_name} %}}
+    {{% if "delete" in buttons and perms.{app_label}.delete_{model_name} and delete_permitted %}}
         <a href="{{% url '{delete_route}' {pk_field}=record.{pk_field} %}}?return_url={{{{ request.path }}}}{{{{ return_url_extra }}}}" class="btn btn-xs btn-danger" title="Delete">
             <i class="mdi mdi-trash-can-outline"></i>
         </a>
@@ -220,6 +238,7 @@ class ButtonsColumn(django_tables2.TemplateColumn):
             prepend_template = prepend_template.replace("}", "}}")
             self.template_code = prepend_template + self.template_code
 
+        self.model = model
         app_label = model._meta.app_label
         changelog_route = lookup.get_route_for_model(model, "changelog")
         edit_route = lookup.get_route_for_model(model, "edit")
@@ -247,6 +266,37 @@ class ButtonsColumn(django_tables2.TemplateColumn):
     def header(self):  # pylint: disable=invalid-overridden-method
         return ""
 
+    def get_permitted_pks(self, table, action):
+        """
+        Return the primary keys of the records on the current page of the table which the user may perform the action on.
+
+        Returns None if the requesting user is unknown, in which case only model-level permissions are checked.
+        """
+        permitted_pks = getattr(table, "_permitted_pks", None)
+        if permitted_pks is None:
+            permitted_pks = table._permitted_pks = {}
+        if action not in permitted_pks:
+            request = getattr(table, "context", {}).get("request")
+            if request is None:
+                permitted_pks[action] = None
+            else:
+                perm = permissions.get_permission_for_model(self.model, action)
+                records = [row.record for row in table.paginated_rows if isinstance(row.record, self.model)]
+                permitted = permissions.has_perms_for_objects(request.user, perm, records)
+                permitted_pks[action] = {pk for pk, is_permitted in permitted.items() if is_permitted}
+        return permitted_pks[action]
+
+    def render(self, record, table, **kwargs):  # pylint: disable=arguments-differ
+        # Check object-level permissions for all records on the page at once, rather than one query per record
+        for button, action in (("edit", "change"), ("delete", "delete")):
+            if button in self.extra_context["buttons"] and isinstance(record, self.model):
+                permitted_pks = self.get_permitted_pks(table, action)
+                permitted = permitted_pks is None or record.pk in permitted_pks
+            else:
+                permitted = True
+            self.extra_context[f"{action}_permitted"] = permitted
+        return super().render(record=record, table=table, **kwargs)
+
 
 class ChoiceFieldColumn(django_tables2.Column):
     """
@@ -414,51 +464,37 @@ class RelationshipColumn(django_tables2.Column):
     Display relationship association instances in the appropriate format.
     """
 
-    # Add [] to empty_values so when there is no relationship associations i.e. [], "—" is returned automatically.
-    empty_values = (None, "", [])
-
     def __init__(self, relationship, side, *args, **kwargs):
         self.relationship = relationship
         self.side = side
         self.peer_side = choices.RelationshipSideChoices.OPPOSITE[side]
         kwargs.setdefault("verbose_name", relationship.get_label(side))
-        kwargs.setdefault("accessor", Accessor("associations"))
+        # The associations are looked up by record primary key, see BaseTable.get_relationship_associations()
+        kwargs.setdefault("accessor", Accessor("pk"))
         super().__init__(orderable=False, *args, **kwargs)
 
-    def render(self, record, value):  # pylint: disable=arguments-differ
-        # Filter the relationship associations by the relationship instance.
-        # Since associations accessor returns all the relationship associations regardless of the relationship.
-        value = [v for v in value if v.relationship == self.relationship]
-        if not self.relationship.symmetric:
-            if self.side == choices.RelationshipSideChoices.SIDE_SOURCE:
-                value = [v for v in value if v.source_id == record.id]
-            else:
-                value = [v for v in value if v.destination_id == record.id]
+    def render(self, record, table):  # pylint: disable=arguments-differ
+        value = table.get_relationship_associations(self.relationship, self.side).get(record.pk, [])
 
-        template = ""
-        # Handle Symmetric Relationships
-        # List `value` could be empty here [] after the filtering from above
         if len(value) < 1:
             return "—"
+
+        # Handle Relationships on the many side.
+        if self.relationship.has_many(self.peer_side):
+            meta = type(value[0].get_peer(record))._meta
+            name = meta.verbose_name_plural if len(value) > 1 else meta.verbose_name
+            template = format_html(
+                '<a href="{}?relationship={}&{}_id={}">{} {}</a>',
+                reverse("extras:relationshipassociation_list"),
+                self.relationship.key,
+                self.side,
+                record.id,
+                len(value),
+                name,
+            )
+        # Handle Relationships on the one side.
         else:
-            # Handle Relationships on the many side.
-            if self.relationship.has_many(self.peer_side):
-                v = value[0]
-                meta = type(v.get_peer(record))._meta
-                name = meta.verbose_name_plural if len(value) > 1 else meta.verbose_name
-                template += format_html(
-                    '<a href="{}?relationship={}&{}_id={}">{} {}</a>',
-                    reverse("extras:relationshipassociation_list"),
-                    self.relationship.key,
-                    self.side,
-                    record.id,
-                    len(value),
-                    name,
-                )
-            # Handle Relationships on the one side.
-            else:
-                v = value[0]
-                peer = v.get_peer(record)
-                template += format_html('<a href="{}">{}</a>', peer.get_absolute_url(), peer)
+            peer = value[0].get_peer(record)
+            template = format_html('<a href="{}">{}</a>', peer.get_absolute_url(), peer)
 
         return mark_safe(template)
@@ -1,5 +1,6 @@
 import logging
 
+from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
 from packaging import version
@@ -50,3 +51,14 @@ def get_releases(pre_releases=False):
 
     # Since this is a Celery task, we can't return Version objects as they are not JSON serializable.
     return [(str(version), url) for version, url in releases]
+
+
+@celery.nautobot_task
+def refresh_object_counts(model_labels):
+    """Refresh the cached counts of all objects of the given models, e.g. `["dcim.device"]`."""
+    from nautobot.core.object_counts import get_object_count
+
+    counts = {}
+    for model_label in model_labels:
+        counts[model_label], _ = get_object_count(apps.get_model(model_label), refresh=True)
+    return counts
@@ -609,7 +609,7 @@ def utilization_graph_raw_data(numerator, denominator, warning_threshold=75, dan
     if denominator == 0:
         utilization = 0
     else:
-        utilization = int(float(numerator) / denominator * 100)
+        utilization = int(float(numerator) / float(denominator) * 100)
 
     return {
         "utilization": utilization,
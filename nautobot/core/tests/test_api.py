@@ -2,7 +2,7 @@ from copy import deepcopy
 import csv
 from io import BytesIO, StringIO
 import json
-from unittest import skip
+from unittest import mock, skip
 
 from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
@@ -21,6 +21,7 @@ from nautobot.core.api.parsers import NautobotCSVParser
 from nautobot.core.api.renderers import NautobotCSVRenderer
 from nautobot.core.api.versioning import NautobotAPIVersioning
 from nautobot.core.constants import COMPOSITE_KEY_SEPARATOR
+from nautobot.core.models.querysets import get_approximate_count
 from nautobot.dcim import models as dcim_models
 from nautobot.dcim.api import serializers as dcim_serializers
 from nautobot.extras import choices
@@ -177,6 +178,63 @@ class APIPaginationTestCase(testing.APITestCase):
         self.assertHttpStatus(response, 200)
         self.assertEqual(len(response.data["results"]), config.MAX_PAGE_SIZE)
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"], PAGINATE_COUNT=3, MAX_PAGE_SIZE=10)
+    def test_cursor_pagination(self):
+        """Walk through all objects by following the `next` links of keyset pagination, then back via `previous`."""
+        expected_pks = sorted(str(pk) for pk in Provider.objects.values_list("pk", flat=True))
+        self.assertGreater(len(expected_pks), settings.PAGINATE_COUNT)
+
+        pages = []
+        url = f"{self.url}?cursor="
+        while url:
+            response = self.client.get(url, **self.header)
+            self.assertHttpStatus(response, 200)
+            self.assertEqual(response.data["count"], len(expected_pks))
+            self.assertLessEqual(len(response.data["results"]), settings.PAGINATE_COUNT)
+            pages.append([result["id"] for result in response.data["results"]])
+            url = response.data["next"]
+        self.assertEqual([pk for page in pages for pk in page], expected_pks)
+        self.assertIsNone(response.data["next"])
+
+        # Walk back from the last page
+        for page in reversed(pages[:-1]):
+            url = response.data["previous"]
+            self.assertIn(f"limit={settings.PAGINATE_COUNT}", url)
+            response = self.client.get(url, **self.header)
+            self.assertHttpStatus(response, 200)
+            self.assertEqual([result["id"] for result in response.data["results"]], page)
+        self.assertIsNone(response.data["previous"])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"], PAGINATE_COUNT=3, MAX_PAGE_SIZE=10)
+    def test_cursor_pagination_filtered(self):
+        """Filters are preserved in the `next` links, and the count is omitted for filtered lists."""
+        providers = Provider.objects.order_by("pk")[:5]
+        query = "&".join(f"id={provider.pk}" for provider in providers)
+        response = self.client.get(f"{self.url}?{query}&limit=2&cursor=", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertIsNone(response.data["count"])
+        self.assertIn(query, response.data["next"])
+        pks = [result["id"] for result in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"], **self.header)
+            pks.extend(result["id"] for result in response.data["results"])
+        self.assertEqual(pks, [str(provider.pk) for provider in providers])
+
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor", **self.header)
+        self.assertHttpStatus(response, 404)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_cursor_pagination_approximate_count(self):
+        """The count of an unfiltered list is estimated from the table statistics when available."""
+        with mock.patch("nautobot.core.api.pagination.get_approximate_count", return_value=123456):
+            response = self.client.get(f"{self.url}?cursor=", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["count"], 123456)
+
+        # The statistics of the small test table are below the threshold, so an exact count is used instead
+        self.assertIsNone(get_approximate_count(Provider.objects.all()))
+        self.assertIsNone(get_approximate_count(Provider.objects.filter(name="x")))
+
 
 class APIVersioningTestCase(testing.APITestCase):
     """
@@ -569,6 +627,75 @@ class NautobotCSVRendererTest(TestCase):
         self.assertEqual(read_data["parent__name"], location_type.parent.name)
 
 
+class StreamingExportTestCase(testing.APITestCase):
+    """
+    Test streaming of REST API list views as CSV and newline-delimited JSON.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse("circuits-api:provider-list")
+        cls.custom_field = extras_models.CustomField.objects.create(key="streaming_cf", label="Streaming CF")
+        cls.custom_field.content_types.add(ContentType.objects.get_for_model(Provider))
+        cls.tag = extras_models.Tag.objects.create(name="Streaming Tag")
+        cls.tag.content_types.add(ContentType.objects.get_for_model(Provider))
+        for provider in Provider.objects.all()[:2]:
+            provider.tags.add(cls.tag)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_stream_csv(self):
+        """The CSV export is streamed in chunks, with custom field headers taken from the CustomField definitions."""
+        with mock.patch("nautobot.core.api.views.STREAMING_EXPORT_CHUNK_SIZE", 2):
+            response = self.client.get(f"{self.url}?format=csv", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.get("Content-Type"), "text/csv; charset=UTF-8")
+
+        rows = list(csv.DictReader(StringIO(response.getvalue().decode(response.charset))))
+        self.assertEqual(len(rows), Provider.objects.count())
+        self.assertEqual({row["id"] for row in rows}, {str(pk) for pk in Provider.objects.values_list("pk", flat=True)})
+        for row in rows:
+            self.assertIn("cf_streaming_cf", row)
+            provider = Provider.objects.get(pk=row["id"])
+            self.assertEqual(row["tags"], ",".join(sorted(provider.tags.values_list("name", flat=True))))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_stream_ndjson(self):
+        """The ndjson export has one JSON object per line, and is also available for a single object."""
+        with mock.patch("nautobot.core.api.views.STREAMING_EXPORT_CHUNK_SIZE", 2):
+            response = self.client.get(f"{self.url}?format=ndjson", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.get("Content-Type"), "application/x-ndjson; charset=UTF-8")
+
+        records = [json.loads(line) for line in response.getvalue().decode(response.charset).splitlines()]
+        self.assertEqual(len(records), Provider.objects.count())
+        for record in records:
+            self.assertIn("streaming_cf", record["custom_fields"])
+
+        provider = Provider.objects.first()
+        response = self.client.get(f"{self.url}{provider.pk}/", **self.header, HTTP_ACCEPT="application/x-ndjson")
+        self.assertHttpStatus(response, 200)
+        record = json.loads(response.content.decode(response.charset))
+        self.assertEqual(record["id"], str(provider.pk))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_stream_restricted(self):
+        """Object permissions are enforced for streamed exports as well."""
+        response = self.client.get(f"{self.url}?format=ndjson", **self.header)
+        self.assertHttpStatus(response, 403)
+
+        provider = Provider.objects.first()
+        self.add_permissions("circuits.view_provider")
+        obj_perm = self.user.object_permissions.get()
+        obj_perm.constraints = {"pk": str(provider.pk)}
+        obj_perm.save()
+        response = self.client.get(f"{self.url}?format=ndjson", **self.header)
+        self.assertHttpStatus(response, 200)
+        records = [json.loads(line) for line in response.getvalue().decode(response.charset).splitlines()]
+        self.assertEqual([record["id"] for record in records], [str(provider.pk)])
+
+
 class BaseModelSerializerTest(TestCase):
     """
     Some unit tests for BaseModelSerializer (using concrete subclasses, since BaseModelSerializer is abstract).
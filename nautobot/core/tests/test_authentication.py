@@ -1,3 +1,4 @@
+from unittest import mock
 import uuid
 
 from django.conf import settings
@@ -8,8 +9,10 @@ from django.test.utils import override_settings
 from django.urls import reverse
 from netaddr import IPNetwork
 
+from nautobot.core.authentication import _object_permissions_cache, object_permission_changes_pending
 from nautobot.core.settings_funcs import sso_auth_enabled
 from nautobot.core.testing import NautobotTestClient, TestCase
+from nautobot.core.utils.permissions import has_perms_for_objects
 from nautobot.dcim.models import Location, LocationType
 from nautobot.extras.models import Status
 from nautobot.ipam.models import Prefix, Namespace
@@ -454,3 +457,113 @@ class ObjectPermissionAPIViewTestCase(TestCase):
         url = reverse("ipam-api:prefix-detail", kwargs={"pk": self.prefixes[0].pk})
         response = self.client.delete(url, format="json", **self.header)
         self.assertEqual(response.status_code, 204)
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+class ObjectPermissionBackendTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="testuser")
+        self.group = Group.objects.create(name="Test Group")
+        self.location_type = LocationType.objects.get(name="Campus")
+        self.locations = list(Location.objects.all()[:10])
+        self.permitted_pks = {
+            location.pk for location in self.locations if location.location_type == self.location_type
+        }
+
+    def add_permission(self, constraints=None, **kwargs):
+        obj_perm = ObjectPermission.objects.create(name="Test permission", constraints=constraints, actions=["change"])
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Location))
+        if "users" in kwargs:
+            obj_perm.users.add(*kwargs["users"])
+        if "groups" in kwargs:
+            obj_perm.groups.add(*kwargs["groups"])
+        return obj_perm
+
+    def get_user(self):
+        """Retrieve the user afresh, without any permissions cached on the instance."""
+        return User.objects.get(pk=self.user.pk)
+
+    def test_has_perms_for_objects(self):
+        self.add_permission(constraints={"location_type__name": "Campus"}, users=[self.user])
+        user = self.get_user()
+        self.assertTrue(user.has_perm("dcim.change_location"))
+
+        with self.assertNumQueries(1):
+            permitted = has_perms_for_objects(user, "dcim.change_location", self.locations)
+        self.assertEqual(permitted, {location.pk: location.pk in self.permitted_pks for location in self.locations})
+        for location in self.locations:
+            self.assertEqual(user.has_perm("dcim.change_location", location), permitted[location.pk])
+
+        self.assertEqual(
+            has_perms_for_objects(user, "dcim.delete_location", self.locations),
+            dict.fromkeys(permitted, False),
+        )
+        with self.assertRaises(ValueError):
+            has_perms_for_objects(user, "dcim.change_device", self.locations)
+
+    def test_has_perms_for_objects_unconstrained(self):
+        self.add_permission(users=[self.user])
+        user = self.get_user()
+        self.assertTrue(user.has_perm("dcim.change_location"))
+
+        with self.assertNumQueries(0):
+            permitted = has_perms_for_objects(user, "dcim.change_location", self.locations)
+            self.assertTrue(user.has_perm("dcim.change_location", self.locations[0]))
+        self.assertEqual(permitted, dict.fromkeys(permitted, True))
+
+    @override_settings(OBJECT_PERMISSION_CACHE_TIMEOUT=60)
+    def test_object_permission_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj_perm = self.add_permission(constraints={"location_type__name": "Campus"}, groups=[self.group])
+            self.user.groups.add(self.group)
+        self.assertTrue(self.get_user().has_perm("dcim.change_location"))
+
+        # Permissions are now cached across user instances
+        user = self.get_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("dcim.change_location"))
+            self.assertFalse(user.has_perm("dcim.delete_location"))
+            self.assertEqual(
+                Location.objects.restrict(user, "change").query.where,
+                Location.objects.filter(location_type__name="Campus").query.where,
+            )
+
+        # Changes to ObjectPermissions invalidate the cache
+        with self.captureOnCommitCallbacks(execute=True):
+            obj_perm.actions = ["change", "delete"]
+            obj_perm.save()
+        self.assertTrue(self.get_user().has_perm("dcim.delete_location"))
+
+        # Changes to group membership invalidate the cache
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.remove(self.group)
+        self.assertFalse(self.get_user().has_perm("dcim.change_location"))
+
+    @override_settings(OBJECT_PERMISSION_CACHE_TIMEOUT=60)
+    def test_object_permission_cache_bypassed_for_uncommitted_changes(self):
+        self.assertFalse(self.get_user().has_perm("dcim.change_location"))
+
+        # Uncommitted changes are visible within the transaction but never cached
+        self.add_permission(users=[self.user])
+        self.assertTrue(self.get_user().has_perm("dcim.change_location"))
+        self.assertTrue(object_permission_changes_pending())
+
+    @override_settings(OBJECT_PERMISSION_CACHE_TIMEOUT=60)
+    def test_object_permission_cache_bounded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_permission(users=[self.user])
+        with mock.patch("nautobot.core.authentication.OBJECT_PERMISSION_CACHE_MAX_USERS", 1):
+            self.assertTrue(self.get_user().has_perm("dcim.change_location"))
+            self.assertFalse(User.objects.create(username="otheruser").has_perm("dcim.change_location"))
+        self.assertEqual(len(_object_permissions_cache["users"]), 1)
+
+    def test_restrict_compiles_missing_constraints(self):
+        self.add_permission(constraints={"location_type__name": "Campus"}, users=[self.user])
+        user = self.get_user()
+        self.assertTrue(user.has_perm("dcim.change_location"))
+        del user._object_perm_q_cache
+        self.assertEqual(
+            Location.objects.restrict(user, "change").query.where,
+            Location.objects.filter(location_type__name="Campus").query.where,
+        )
+        self.assertIn("dcim.change_location", user._object_perm_q_cache)
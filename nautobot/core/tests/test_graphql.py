@@ -1,17 +1,23 @@
+from io import StringIO
+import math
 import random
 import types
-from unittest import skip
+from unittest import mock, skip
 import uuid
 
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
 from django.db.models import Q
 from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from graphql import GraphQLError
+import graphene
 import graphene.types
 from graphene_django.settings import graphene_settings
 from graphene_django.registry import get_global_registry
@@ -21,18 +27,21 @@ from rest_framework import status
 
 from nautobot.circuits.models import Provider, CircuitTermination
 from nautobot.core.graphql import execute_query, execute_saved_query
+from nautobot.core.graphql.backends import get_query_hash, NautobotGraphQLBackend, QueryMetrics
 from nautobot.core.graphql.generators import (
     generate_list_search_parameters,
     generate_schema_type,
 )
 from nautobot.core.graphql.schema import (
     extend_schema_type,
+    extend_schema_type_computed_field,
     extend_schema_type_custom_field,
     extend_schema_type_tags,
     extend_schema_type_config_context,
     extend_schema_type_relationships,
     extend_schema_type_null_field_choice,
 )
+from nautobot.core.graphql.schema_init import get_schema
 from nautobot.core.graphql.types import OptimizedNautobotObjectType
 from nautobot.core.graphql.utils import str_to_var_name
 from nautobot.core.testing import NautobotTestClient, create_test_user
@@ -59,6 +68,7 @@ from nautobot.dcim.models import (
 from nautobot.extras.choices import CustomFieldTypeChoices
 from nautobot.extras.models import (
     ChangeLoggedModel,
+    ComputedField,
     CustomField,
     ConfigContext,
     GraphQLQuery,
@@ -163,6 +173,111 @@ class GraphQLTestCase(TestCase):
                     )
 
 
+class GraphQLBackendTestCase(TestCase):
+    def setUp(self):
+        self.user = create_test_user("graphql_testuser")
+        self.backend = NautobotGraphQLBackend()
+        self.schema = graphene_settings.SCHEMA
+
+    def test_document_cache(self):
+        """Documents are parsed and validated once per query, and the least recently used ones are evicted."""
+        query = "{ locations { name } }"
+        document = self.backend.document_from_string(self.schema, query)
+        self.assertIs(self.backend.document_from_string(self.schema, query), document)
+        self.assertEqual(document.query_hash, get_query_hash(query))
+        self.assertEqual(document.validation_errors, [])
+
+        backend = NautobotGraphQLBackend(cache_size=2)
+        documents = [
+            backend.document_from_string(self.schema, f"{{ locations(limit: {i}) {{ name }} }}") for i in range(3)
+        ]
+        self.assertIsNot(backend.document_from_string(self.schema, "{ locations(limit: 0) { name } }"), documents[0])
+        self.assertIs(backend.document_from_string(self.schema, "{ locations(limit: 2) { name } }"), documents[2])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_document_validation_errors(self):
+        document = self.backend.document_from_string(self.schema, "{ locations { not_a_field } }")
+        self.assertEqual(len(document.validation_errors), 1)
+        result = document.execute(context_value=RequestFactory().post("/graphql/"))
+        self.assertTrue(result.invalid)
+        self.assertEqual(result.errors, document.validation_errors)
+
+    def test_query_analysis(self):
+        """The cost and depth of queries are estimated from the number of rows of each model and the query nesting."""
+        location_count = Location.objects.count()
+        device_count = Device.objects.count()
+        document = self.backend.document_from_string(self.schema, "{ locations { name } }")
+        self.assertEqual(document.cost, location_count)
+        self.assertEqual(document.depth, 1)
+
+        document = self.backend.document_from_string(
+            self.schema,
+            """
+            query { locations(limit: 2) { name ...LocationDevices } }
+            fragment LocationDevices on LocationType { devices { name location { name } } }
+            """,
+        )
+        self.assertEqual(document.validation_errors, [])
+        devices_per_location = max(math.ceil(device_count / location_count), 1)
+        self.assertEqual(document.cost, 2 + 2 * devices_per_location * 2)
+        self.assertEqual(document.depth, 3)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"], GRAPHQL_MAX_QUERY_DEPTH=1, GRAPHQL_MAX_QUERY_COST=5)
+    def test_query_limits(self):
+        """Queries exceeding the maximum depth or cost are rejected without being executed."""
+        resp = execute_query("{ locations(limit: 5) { name } }", user=self.user).to_dict()
+        self.assertNotIn("errors", resp)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = execute_query("{ locations(limit: 2) { name parent { name } } }", user=self.user).to_dict()
+        self.assertEqual(resp["errors"][0]["message"], "Query depth of 2 exceeds the maximum allowed depth of 1.")
+        # Only the row count estimates of the query analysis were queried
+        self.assertFalse(any('"dcim_location"."name"' in query["sql"] for query in queries.captured_queries))
+
+        resp = execute_query("{ locations(limit: 6) { name } }", user=self.user).to_dict()
+        self.assertEqual(resp["errors"][0]["message"], "Query cost of 6 exceeds the maximum allowed cost of 5.")
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_query_metrics(self):
+        with QueryMetrics() as metrics:
+            resp = execute_query("{ locations { name } }", user=self.user).to_dict()
+        self.assertGreater(metrics.duration, 0)
+        self.assertGreater(metrics.sql_queries, 0)
+        self.assertGreaterEqual(metrics.rows, len(resp["data"]["locations"]))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_audit_graphql_queries_metrics(self):
+        GraphQLQuery.objects.create(name="Locations", query="{ locations { name } }")
+        out = StringIO()
+        call_command("audit_graphql_queries", metrics=True, stdout=out, stderr=StringIO())
+        self.assertIn("All GraphQLQuery query data are validated successfully!", out.getvalue())
+        self.assertIn(f"GraphQLQuery `Locations`: cost {Location.objects.count()}, depth 1, execute", out.getvalue())
+
+
+class GraphQLSchemaTestCase(TestCase):
+    def test_get_schema(self):
+        """The schema is built once, and rebuilt when custom fields, computed fields or relationships change."""
+        schema = get_schema()
+        self.assertIs(get_schema(), schema)
+        self.assertIs(graphene_settings.SCHEMA, schema)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field = CustomField.objects.create(
+                label="Schema Field", key="schema_field", type=CustomFieldTypeChoices.TYPE_TEXT
+            )
+            custom_field.content_types.add(ContentType.objects.get_for_model(Location))
+        new_schema = get_schema()
+        self.assertIsNot(new_schema, schema)
+        self.assertIs(graphene_settings.SCHEMA, new_schema)
+        self.assertIn("cf_schema_field", new_schema.get_type("LocationType").fields)
+        self.assertNotIn("cf_schema_field", schema.get_type("LocationType").fields)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field.delete()
+        self.assertNotIn("cf_schema_field", get_schema().get_type("LocationType").fields)
+        self.assertIn("cf_schema_field", new_schema.get_type("LocationType").fields)
+
+
 class GraphQLUtilsTestCase(TestCase):
     def test_str_to_var_name(self):
         self.assertEqual(str_to_var_name("IP Addresses"), "ip_addresses")
@@ -1273,6 +1388,85 @@ query {
         self.assertIn(str(self.device2.id), set(item["id"] for item in result.data["device"]["rel_device_group"]))
         self.assertIn(str(self.device3.id), set(item["id"] for item in result.data["device"]["rel_device_group"]))
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_query_batched_resolvers(self):
+        """Test that relationships, computed fields and config context of a list of objects are loaded in batches."""
+        ComputedField.objects.create(
+            content_type=ContentType.objects.get_for_model(Device),
+            key="name_upper",
+            label="Name Upper",
+            template="{{ obj.name | upper }}",
+        )
+
+        # The schema is built before the relationships and computed field of this test exist, so extend the Device
+        # type with them for the duration of the test, and build a dedicated schema around it
+        # Other tests may have registered their own schema types, so make sure to use the Nautobot schema types
+        for patcher in [
+            mock.patch.dict(DeviceTypeGraphQL._meta.fields),
+            mock.patch.dict(
+                get_global_registry()._registry,
+                {schema_type._meta.model: schema_type for schema_type in registry["graphql_types"].values()},
+            ),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        resolver_names = set(dir(DeviceTypeGraphQL))
+        extend_schema_type_computed_field(DeviceTypeGraphQL, Device)
+        extend_schema_type_relationships(DeviceTypeGraphQL, Device)
+        for resolver_name in set(dir(DeviceTypeGraphQL)) - resolver_names:
+            self.addCleanup(delattr, DeviceTypeGraphQL, resolver_name)
+
+        class Query(graphene.ObjectType):
+            devices = graphene.List(DeviceTypeGraphQL, name=graphene.List(graphene.String))
+
+            def resolve_devices(self, info, name):
+                # Not annotated with the config context data, unlike the `devices` resolver of the Nautobot schema
+                return Device.objects.filter(name__in=name)
+
+        schema = graphene.Schema(query=Query, auto_camelcase=False)
+        query = """
+            query ($name: [String]) {
+                devices(name: $name) {
+                    name
+                    cpf_name_upper
+                    config_context
+                    rel_device_to_vm { id }
+                    rel_device_group { id }
+                }
+            }
+        """
+
+        devices = [self.device1, self.device2, self.device3]
+        variables = {"name": [device.name for device in devices]}
+        # Populate the ContentType cache and the like, before counting queries
+        schema.execute(query, context_value=self.request, variables=variables)
+
+        with CaptureQueriesContext(connection) as single_device_queries:
+            result = schema.execute(query, context_value=self.request, variables={"name": [self.device1.name]})
+        self.assertIsNone(result.errors)
+        self.assertEqual(len(result.data["devices"]), 1)
+
+        with CaptureQueriesContext(connection) as all_devices_queries:
+            result = schema.execute(query, context_value=self.request, variables=variables)
+        self.assertIsNone(result.errors)
+        self.assertEqual(len(all_devices_queries), len(single_device_queries))
+
+        results = {item["name"]: item for item in result.data["devices"]}
+        self.assertEqual(len(results), len(devices))
+        for device in devices:
+            self.assertEqual(results[device.name]["cpf_name_upper"], device.name.upper())
+            self.assertEqual(results[device.name]["config_context"], device.get_config_context())
+        self.assertEqual(results[self.device1.name]["rel_device_to_vm"], {"id": str(self.virtualmachine.id)})
+        self.assertIsNone(results[self.device2.name]["rel_device_to_vm"])
+        self.assertEqual(
+            {item["id"] for item in results[self.device1.name]["rel_device_group"]},
+            {str(self.device2.id), str(self.device3.id)},
+        )
+        self.assertEqual(
+            {item["id"] for item in results[self.device2.name]["rel_device_group"]},
+            {str(self.device1.id), str(self.device3.id)},
+        )
+
     @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
     def test_query_device_role_filter(self):
         query = (
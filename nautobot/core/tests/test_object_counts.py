@@ -0,0 +1,108 @@
+import time
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from nautobot.circuits.models import Provider
+from nautobot.core.object_counts import get_object_count, OBJECT_COUNTS_CACHE_PREFIX
+from nautobot.core.testing import TestCase
+from nautobot.users.models import ObjectPermission
+
+
+class GetObjectCountTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.delete_pattern(f"{OBJECT_COUNTS_CACHE_PREFIX}.*")
+        self.providers = list(Provider.objects.order_by("name")[:2])
+        self.assertEqual(len(self.providers), 2)
+
+    def add_constrained_permission(self, provider):
+        obj_perm = ObjectPermission.objects.create(name=f"View {provider.name}", actions=["view"])
+        obj_perm.constraints = {"name": provider.name}
+        obj_perm.save()
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Provider))
+        obj_perm.users.add(self.user)
+
+    def test_count(self):
+        self.assertEqual(get_object_count(Provider), (Provider.objects.count(), False))
+        # No permission
+        self.assertEqual(get_object_count(Provider, self.user), (0, False))
+
+        self.add_constrained_permission(self.providers[0])
+        user = self.user.__class__.objects.get(pk=self.user.pk)
+        self.assertEqual(get_object_count(Provider, user), (1, False))
+
+    @override_settings(OBJECT_COUNT_CACHE_TIMEOUT=60)
+    def test_count_cached(self):
+        count = Provider.objects.count()
+        self.assertEqual(get_object_count(Provider), (count, False))
+
+        Provider.objects.create(name="New Provider")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_object_count(Provider), (count, False))
+
+        # An exact count bypasses and refreshes the cache
+        self.assertEqual(get_object_count(Provider, exact=True), (count + 1, False))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_object_count(Provider), (count + 1, False))
+
+    @override_settings(OBJECT_COUNT_CACHE_TIMEOUT=60)
+    def test_count_cached_per_permission_constraints(self):
+        self.add_constrained_permission(self.providers[0])
+        self.assertEqual(get_object_count(Provider, self.user), (1, False))
+        self.assertEqual(get_object_count(Provider), (Provider.objects.count(), False))
+
+        # Another user with the same constraints shares the cached count
+        other_user = self.user.__class__.objects.create(username="other_user")
+        ObjectPermission.objects.get(name=f"View {self.providers[0].name}").users.add(other_user)
+        other_user = self.user.__class__.objects.get(pk=other_user.pk)
+        other_user.get_all_permissions()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_object_count(Provider, other_user), (1, False))
+
+    def test_count_approximate(self):
+        with mock.patch("nautobot.core.object_counts.get_approximate_count", return_value=123456) as mock_approximate:
+            self.assertEqual(get_object_count(Provider), (123456, True))
+            self.assertEqual(get_object_count(Provider, exact=True), (Provider.objects.count(), False))
+            mock_approximate.assert_called_once()
+
+            # Users restricted by constraints always get exact counts
+            self.add_constrained_permission(self.providers[0])
+            self.assertEqual(get_object_count(Provider, self.user), (1, False))
+            mock_approximate.assert_called_once()
+
+    @override_settings(OBJECT_COUNT_CACHE_TIMEOUT=60)
+    def test_count_refreshed_in_background(self):
+        count = Provider.objects.count()
+        self.assertEqual(get_object_count(Provider), (count, False))
+        Provider.objects.create(name="New Provider")
+
+        # A fresh cached count is not refreshed
+        with mock.patch("nautobot.core.object_counts.refresh_object_counts") as mock_refresh:
+            self.assertEqual(get_object_count(Provider), (count, False))
+        mock_refresh.delay.assert_not_called()
+
+        # A cached count close to expiry is refreshed in the background, only once
+        with mock.patch("nautobot.core.object_counts.time.time", return_value=time.time() + 45):
+            self.assertEqual(get_object_count(Provider), (count, False))
+            self.assertEqual(get_object_count(Provider), (count + 1, False))
+            self.assertEqual(get_object_count(Provider), (count + 1, False))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_views_exact_counts(self):
+        self.user.is_superuser = True
+        self.user.save()
+        with mock.patch("nautobot.core.object_counts.get_approximate_count", return_value=123456):
+            response = self.client.get(reverse("home"))
+            self.assertContains(response, "~123456")
+            response = self.client.get(reverse("home") + "?exact_counts=true")
+            self.assertNotContains(response, "~123456")
+
+            response = self.client.get(reverse("ui-api:get-object-counts"))
+            self.assertEqual(response.json()["Networks"][0]["count"], 123456)
+            self.assertTrue(response.json()["Networks"][0]["count_is_approximate"])
+            response = self.client.get(reverse("ui-api:get-object-counts") + "?exact_counts=true")
+            self.assertFalse(response.json()["Networks"][0]["count_is_approximate"])
@@ -1,6 +1,15 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.context_processors import PermWrapper
+from django.contrib.contenttypes.models import ContentType
+from django.template import Context
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
 
+from nautobot.dcim.models import Manufacturer
 from nautobot.dcim.tables import ManufacturerTable, DeviceTypeTable, LocationTable, LocationTypeTable, RackGroupTable
+from nautobot.users.models import ObjectPermission
+
+User = get_user_model()
 
 
 class TableTestCase(TestCase):
@@ -16,3 +25,34 @@ class TableTestCase(TestCase):
         for table in non_tree_node_model_tables:
             queryset = table.Meta.model.objects.all()
             self.assertTrue(table(queryset).orderable)
+
+    def test_buttons_column_object_permissions(self):
+        """Assert that edit buttons are only rendered for the records which the user has permission to change."""
+        manufacturers = list(Manufacturer.objects.all()[:4])
+        user = User.objects.create(username="testuser")
+        obj_perm = ObjectPermission.objects.create(
+            name="Test permission",
+            constraints={"name__in": [manufacturers[0].name, manufacturers[1].name]},
+            actions=["view", "change"],
+        )
+        obj_perm.users.add(user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Manufacturer))
+
+        request = RequestFactory().get("/")
+        request.user = user
+        table = ManufacturerTable(manufacturers)
+        table.context = Context({"request": request, "perms": PermWrapper(user)})
+        self.assertTrue(user.has_perm("dcim.change_manufacturer"))
+        # The constraints are checked against all records at once
+        with self.assertNumQueries(1):
+            cells = {row.record.pk: row.get_cell("actions") for row in table.rows}
+
+        for manufacturer in manufacturers:
+            edit_url = reverse("dcim:manufacturer_edit", kwargs={"pk": manufacturer.pk})
+            if manufacturer in manufacturers[:2]:
+                self.assertIn(edit_url, cells[manufacturer.pk])
+            else:
+                self.assertNotIn(edit_url, cells[manufacturer.pk])
+            self.assertNotIn(
+                reverse("dcim:manufacturer_delete", kwargs={"pk": manufacturer.pk}), cells[manufacturer.pk]
+            )
@@ -1,3 +1,4 @@
+from unittest import mock
 import uuid
 
 from django import forms as django_forms
@@ -6,7 +7,9 @@ from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
 from django.http import QueryDict
-from django.test import TestCase
+from django.template import engines
+from django.test import override_settings, TestCase
+from jinja2 import TemplateSyntaxError
 
 from example_plugin.models import ExampleModel
 
@@ -147,6 +150,47 @@ class DeepMergeTest(TestCase):
         self.assertEqual(data_utils.deepmerge(dict1, dict2), merged)
 
 
+class RenderJinja2Test(TestCase):
+    """
+    Validate the caching of compiled templates by render_jinja2() and render_jinja2_batch().
+    """
+
+    def setUp(self):
+        data_utils.clear_jinja2_template_cache()
+        self.addCleanup(data_utils.clear_jinja2_template_cache)
+
+    def test_render_jinja2_compiles_template_once(self):
+        rendering_engine = engines["jinja"]
+        with mock.patch.object(rendering_engine, "from_string", wraps=rendering_engine.from_string) as from_string:
+            self.assertEqual(data_utils.render_jinja2("{{ a }}-{{ b }}", {"a": 1, "b": 2}), "1-2")
+            self.assertEqual(data_utils.render_jinja2("{{ a }}-{{ b }}", {"a": 3, "b": 4}), "3-4")
+            self.assertEqual(from_string.call_count, 1)
+
+            self.assertEqual(
+                data_utils.render_jinja2_batch("{{ a }}-{{ b }}", [{"a": 5, "b": 6}, {"a": 7, "b": 8}]), ["5-6", "7-8"]
+            )
+            self.assertEqual(data_utils.render_jinja2_batch("{{ a }}", []), [])
+            self.assertEqual(from_string.call_count, 2)
+
+    @override_settings(JINJA2_TEMPLATE_CACHE_SIZE=2)
+    def test_template_cache_size(self):
+        rendering_engine = engines["jinja"]
+        with mock.patch.object(rendering_engine, "from_string", wraps=rendering_engine.from_string) as from_string:
+            for template_code in ("{{ 1 }}", "{{ 2 }}", "{{ 1 }}", "{{ 3 }}"):
+                data_utils.render_jinja2(template_code, {})
+            self.assertEqual(from_string.call_count, 3)
+            # "{{ 2 }}" was the least recently used template, so it was discarded from the cache
+            data_utils.render_jinja2("{{ 1 }}", {})
+            self.assertEqual(from_string.call_count, 3)
+            data_utils.render_jinja2("{{ 2 }}", {})
+            self.assertEqual(from_string.call_count, 4)
+
+    def test_syntax_errors_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(TemplateSyntaxError):
+                data_utils.render_jinja2("{{ a ", {})
+
+
 class FlattenIterableTest(TestCase):
     """Tests for the `flatten_iterable()` function."""
 
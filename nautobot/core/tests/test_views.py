@@ -8,6 +8,7 @@ from django.test.utils import override_script_prefix
 from django.urls import get_script_prefix, reverse
 from prometheus_client.parser import text_string_to_metric_families
 
+from nautobot.circuits.models import Provider
 from nautobot.core.testing import TestCase
 from nautobot.dcim.models.locations import Location
 from nautobot.extras.choices import CustomFieldTypeChoices
@@ -31,6 +32,33 @@ class HomeViewTestCase(TestCase):
         response = self.client.get(f"{url}?{urllib.parse.urlencode(params)}")
         self.assertHttpStatus(response, 200)
 
+    def test_search_results(self):
+        self.add_permissions("dcim.view_location")
+        location = Location.objects.first()
+        location.description = "Searchable description"
+        location.save()
+
+        response = self.client.get(f"{reverse('search')}?q=searchable+DESCRIPTION")
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, location.get_absolute_url())
+        self.assertContains(response, '<span class="badge">1</span>', html=True)
+
+        # Results are limited to the type of object being searched for
+        response = self.client.get(f"{reverse('search')}?q=searchable+description&obj_type=rack")
+        self.assertNotContains(response, location.get_absolute_url())
+
+    def test_search_results_ranked(self):
+        self.add_permissions("circuits.view_provider")
+        providers = [
+            Provider.objects.create(name="A Ranked Provider"),
+            Provider.objects.create(name="Ranked Provider"),
+        ]
+
+        # The best match is listed first, regardless of the default ordering of the model
+        response = self.client.get(f"{reverse('search')}?q=ranked+provider")
+        content = response.content.decode(response.charset)
+        self.assertLess(content.index(providers[1].get_absolute_url()), content.index(providers[0].get_absolute_url()))
+
     def make_request(self):
         url = reverse("home")
         response = self.client.get(url)
@@ -1,9 +1,13 @@
 from collections import OrderedDict, namedtuple
 from decimal import Decimal
+import hashlib
+import threading
 import uuid
 
+from django.conf import settings
 from django.core import validators
 from django.template import engines
+from prometheus_client import Counter
 
 from nautobot.dcim import choices  # TODO move dcim.choices.CableLengthUnitChoices into core
 
@@ -11,6 +15,14 @@ from nautobot.dcim import choices  # TODO move dcim.choices.CableLengthUnitChoic
 # Setup UtilizationData named tuple for use by multiple methods
 UtilizationData = namedtuple("UtilizationData", ["numerator", "denominator"])
 
+JINJA2_TEMPLATE_CACHE_METRIC = Counter(
+    "nautobot_jinja2_template_cache_lookups", "Lookups of compiled Jinja2 templates.", ["result"]
+)
+
+# Least recently used compiled Jinja2 templates, keyed by (rendering engine, hash of the template code)
+_jinja2_templates = OrderedDict()
+_jinja2_templates_lock = threading.Lock()
+
 
 def deepmerge(original, new):
     """
@@ -94,13 +106,55 @@ def merge_dicts_without_collision(d1, d2):
     return {**d1, **d2}
 
 
-def render_jinja2(template_code, context):
+def get_jinja2_template(template_code):
     """
-    Render a Jinja2 template with the provided context. Return the rendered content.
+    Return the compiled Jinja2 template for the provided template code.
+
+    Compiled templates are kept in memory in a least recently used cache keyed by the hash of their code, so that a
+    template rendered repeatedly (e.g. a computed field in each row of a table) is only compiled once per process. The
+    number of cached templates is limited by the `JINJA2_TEMPLATE_CACHE_SIZE` setting.
     """
     rendering_engine = engines["jinja"]
+    key = (rendering_engine, hashlib.sha256(template_code.encode("utf-8")).hexdigest())
+    with _jinja2_templates_lock:
+        template = _jinja2_templates.get(key)
+        if template is not None:
+            _jinja2_templates.move_to_end(key)
+    if template is not None:
+        JINJA2_TEMPLATE_CACHE_METRIC.labels(result="hit").inc()
+        return template
+
+    JINJA2_TEMPLATE_CACHE_METRIC.labels(result="miss").inc()
+    # Syntax errors are raised here rather than cached
     template = rendering_engine.from_string(template_code)
-    return template.render(context=context)
+    with _jinja2_templates_lock:
+        _jinja2_templates[key] = template
+        while len(_jinja2_templates) > settings.JINJA2_TEMPLATE_CACHE_SIZE:
+            _jinja2_templates.popitem(last=False)
+    return template
+
+
+def clear_jinja2_template_cache():
+    """
+    Discard all the compiled Jinja2 templates cached by `get_jinja2_template()`.
+    """
+    with _jinja2_templates_lock:
+        _jinja2_templates.clear()
+
+
+def render_jinja2(template_code, context):
+    """
+    Render a Jinja2 template with the provided context. Return the rendered content.
+    """
+    return get_jinja2_template(template_code).render(context=context)
+
+
+def render_jinja2_batch(template_code, contexts):
+    """
+    Render a Jinja2 template with each of the provided contexts, compiling it only once. Return the rendered contents.
+    """
+    template = get_jinja2_template(template_code)
+    return [template.render(context=context) for context in contexts]
 
 
 def shallow_compare_dict(source_dict, destination_dict, exclude=None):
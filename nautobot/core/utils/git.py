@@ -4,7 +4,7 @@ from collections import namedtuple
 import logging
 import os
 
-from git import Repo
+from git import GitCommandError, Repo
 
 logger = logging.getLogger(__name__)
 
@@ -156,3 +156,35 @@ class GitRepo:
             return convert_git_diff_log_to_list(diff)
         logger.debug("No Difference")
         return []
+
+    def get_changed_files(self, from_commit_hexsha, to_commit_hexsha):
+        """
+        Get the paths of the files that were added, modified or deleted between two commits.
+
+        A renamed file is reported as the deletion of its old path and the addition of its new path.
+
+        Returns:
+            (set[str]): paths relative to the repository root, or None if `from_commit_hexsha` isn't an ancestor of
+                `to_commit_hexsha` (such as when it isn't available locally, or the branch history has been rewritten)
+        """
+        try:
+            # Exits non-zero if it isn't an ancestor, as well as if either commit is unknown
+            self.repo.git.merge_base("--is-ancestor", from_commit_hexsha, to_commit_hexsha)
+        except GitCommandError:
+            logger.debug(f"Commit `{from_commit_hexsha}` is not an ancestor of commit `{to_commit_hexsha}`")
+            return None
+
+        diff = self.repo.git.diff("--name-only", "--no-renames", "-z", from_commit_hexsha, to_commit_hexsha)
+        return {path for path in diff.split("\0") if path}
+
+    def get_file_contents(self, commit_hexsha, path):
+        """
+        Get the contents of the file at the given path, relative to the repository root, as of the given commit.
+
+        Returns:
+            (str): file contents, or None if the file doesn't exist in that commit
+        """
+        try:
+            return self.repo.git.show(f"{commit_hexsha}:{path}")
+        except GitCommandError:
+            return None
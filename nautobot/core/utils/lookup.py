@@ -2,6 +2,7 @@
 
 import inspect
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
@@ -140,6 +141,17 @@ def get_related_class_for_model(model, module_name, object_suffix):
     return None
 
 
+def get_searchable_models():
+    """
+    Return the models included in the global search, as listed in the `searchable_models` of each app, in order.
+    """
+    searchable_models = []
+    for app_config in apps.get_app_configs():
+        for model_name in getattr(app_config, "searchable_models", []):
+            searchable_models.append(app_config.get_model(model_name))
+    return searchable_models
+
+
 def get_filterset_for_model(model):
     """Return the `FilterSet` class associated with a given `model`.
 
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 
 
 def get_permission_for_model(model, action):
@@ -68,3 +69,57 @@ def permission_is_exempt(name):
             return True
 
     return False
+
+
+def compile_constraints(constraint_sets):
+    """
+    Compile the constraints of one or more ObjectPermissions into a single Q object.
+
+    An empty Q object is returned if any of the constraint sets is null, granting access to all instances of the model.
+
+    :param constraint_sets: List of constraints, as returned by `ObjectPermission.list_constraints()`
+    """
+    constraints = Q()
+    for constraint_set in constraint_sets:
+        if isinstance(constraint_set, list):
+            for attrs in constraint_set:
+                constraints |= Q(**attrs)
+        elif constraint_set:
+            constraints |= Q(**constraint_set)
+        else:
+            # Any permission with null constraints grants access to _all_ instances
+            return Q()
+    return constraints
+
+
+def has_perms_for_objects(user, perm, objs):
+    """
+    Check whether a user has been granted a permission on each of the given objects, using at most one query.
+
+    This is equivalent to calling `user.has_perm(perm, obj)` for each object, which runs one query per object.
+
+    :param user: User instance
+    :param perm: Permission name in the format <app_label>.<action>_<model>
+    :param objs: Iterable of instances of the model to which the permission applies
+    :return: Dictionary mapping the primary key of each object to whether the permission is granted for it
+    """
+    objs = list(objs)
+    if not objs:
+        return {}
+
+    app_label, action, model_name = resolve_permission(perm)
+    model = objs[0]._meta.model
+    if model._meta.label_lower != f"{app_label}.{model_name}":
+        raise ValueError(f"Invalid permission {perm} for model {model}")
+
+    pks = [obj.pk for obj in objs]
+    if not user.has_perm(perm):
+        return dict.fromkeys(pks, False)
+
+    # Superusers, exempt permissions and ObjectPermissions with null constraints allow model-level access
+    constraints = getattr(user, "_object_perm_q_cache", {}).get(perm)
+    if user.is_superuser or permission_is_exempt(perm) or (constraints is not None and not constraints):
+        return dict.fromkeys(pks, True)
+
+    permitted_pks = set(model.objects.restrict(user, action).filter(pk__in=pks).values_list("pk", flat=True))
+    return {pk: pk in permitted_pks for pk in pks}
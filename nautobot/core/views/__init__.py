@@ -3,10 +3,11 @@ import platform
 import sys
 import time
 
-from django.apps import apps
 import prometheus_client
 from django.conf import settings
 from django.contrib.auth.mixins import AccessMixin
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Case, Count, IntegerField, Value, When
 from django.http import HttpResponseServerError, JsonResponse, HttpResponseForbidden, HttpResponse
 from django.shortcuts import redirect, render
 from django.template import loader, RequestContext, Template
@@ -24,10 +25,13 @@ from prometheus_client.registry import Collector
 
 from nautobot.core.constants import SEARCH_MAX_RESULTS
 from nautobot.core.forms import SearchForm
+from nautobot.core.object_counts import get_object_count
 from nautobot.core.releases import get_latest_release
+from nautobot.core.settings_funcs import is_truthy
+from nautobot.core.graphql.backends import get_graphql_backend
 from nautobot.core.utils.config import get_settings_or_config
-from nautobot.core.utils.lookup import get_route_for_model
-from nautobot.extras.models import GraphQLQuery
+from nautobot.core.utils.lookup import get_route_for_model, get_searchable_models
+from nautobot.extras.models import GraphQLQuery, SearchIndexEntry
 from nautobot.extras.registry import registry
 from nautobot.extras.forms import GraphQLQueryForm
 
@@ -81,6 +85,9 @@ class HomeView(AccessMixin, TemplateView):
             }
         )
 
+        # Object counts may be cached or approximate, unless exact counts are explicitly requested
+        exact_counts = is_truthy(request.GET.get("exact_counts", False))
+
         # Loop over homepage layout to collect all additional data and create custom panels.
         for panel_details in registry["homepage_layout"]["panels"].values():
             if panel_details.get("custom_template"):
@@ -93,7 +100,9 @@ class HomeView(AccessMixin, TemplateView):
 
                     elif item_details.get("model"):
                         # If there is a model attached collect object count.
-                        item_details["count"] = item_details["model"].objects.restrict(request.user, "view").count()
+                        item_details["count"], item_details["count_is_approximate"] = get_object_count(
+                            item_details["model"], request.user, exact=exact_counts
+                        )
 
                     elif item_details.get("items"):
                         # Collect count for grouped objects.
@@ -103,9 +112,10 @@ class HomeView(AccessMixin, TemplateView):
                                     request, context, group_item_details
                                 )
                             elif group_item_details.get("model"):
-                                group_item_details["count"] = (
-                                    group_item_details["model"].objects.restrict(request.user, "view").count()
-                                )
+                                (
+                                    group_item_details["count"],
+                                    group_item_details["count_is_approximate"],
+                                ) = get_object_count(group_item_details["model"], request.user, exact=exact_counts)
 
         return self.render_to_response(context)
 
@@ -131,49 +141,54 @@ class SearchView(AccessMixin, View):
         results = []
 
         if form.is_valid():
-            # Build the list of (app_label, modelname) tuples, representing all models included in the global search,
-            # based on the `app_config.searchable_models` list (if any) defined by each app
-            searchable_models = []
-            for app_config in apps.get_app_configs():
-                if hasattr(app_config, "searchable_models"):
-                    searchable_models += [(app_config.label, modelname) for modelname in app_config.searchable_models]
-
+            # All models included in the global search, based on the `app_config.searchable_models` list (if any)
+            # defined by each app, or only the one type of object being searched for
+            searchable_models = get_searchable_models()
             if form.cleaned_data["obj_type"]:
-                # Searching for a single type of object
-                obj_types = [form.cleaned_data["obj_type"]]
-            else:
-                # Searching all object types
-                obj_types = [model_info[1] for model_info in searchable_models]
+                searchable_models = [
+                    model for model in searchable_models if model._meta.model_name == form.cleaned_data["obj_type"]
+                ]
 
-            for label, modelname in searchable_models:
-                if modelname not in obj_types:
+            # Find the matching objects of all types in the search index, in a single ranked query
+            entries = SearchIndexEntry.objects.search(
+                form.cleaned_data["q"], user=request.user, models=searchable_models
+            )
+            counts = dict(
+                entries.order_by().values("object_type").annotate(count=Count("pk")).values_list("object_type", "count")
+            )
+
+            for model in searchable_models:
+                content_type = ContentType.objects.get_for_model(model)
+                if not counts.get(content_type.pk):
                     continue
-                # Based on the label and modelname, reverse-lookup the list URL, then the view or UIViewSet
-                # corresponding to that URL, and finally the queryset, filterset, and table classes needed
-                # to find and display the model search results.
-                url = get_route_for_model(f"{label}.{modelname}", "list")
+                # Based on the model, reverse-lookup the list URL, then the view or UIViewSet corresponding to that URL,
+                # and finally the queryset and table classes needed to display the model search results.
+                url = get_route_for_model(model, "list")
                 view_func = resolve(reverse(url)).func
                 # For a UIViewSet, view_func.cls gets what we need; for an ObjectListView, view_func.view_class is it.
                 view_or_viewset = getattr(view_func, "cls", getattr(view_func, "view_class", None))
-                queryset = view_or_viewset.queryset.restrict(request.user, "view")
-                # For a UIViewSet, .filterset_class, for an ObjectListView, .filterset.
-                filterset = getattr(view_or_viewset, "filterset_class", getattr(view_or_viewset, "filterset", None))
                 # For a UIViewSet, .table_class, for an ObjectListView, .table.
                 table = getattr(view_or_viewset, "table_class", getattr(view_or_viewset, "table", None))
 
-                # Construct the results table for this object type
-                filtered_queryset = filterset({"q": form.cleaned_data["q"]}, queryset=queryset).qs
-                table = table(filtered_queryset, orderable=False)
+                # Construct the results table for this object type from its best-ranked matches
+                pks = list(
+                    entries.filter(object_type=content_type).values_list("object_id", flat=True)[:SEARCH_MAX_RESULTS]
+                )
+                # Keep the objects in the order of their rank
+                queryset = view_or_viewset.queryset.filter(pk__in=pks).order_by(
+                    Case(*[When(pk=pk, then=Value(rank)) for rank, pk in enumerate(pks)], output_field=IntegerField())
+                )
+                table = table(queryset, orderable=False)
                 table.paginate(per_page=SEARCH_MAX_RESULTS)
 
-                if table.page:
-                    results.append(
-                        {
-                            "name": queryset.model._meta.verbose_name_plural,
-                            "table": table,
-                            "url": f"{reverse(url)}?q={form.cleaned_data.get('q')}",
-                        }
-                    )
+                results.append(
+                    {
+                        "name": model._meta.verbose_name_plural,
+                        "table": table,
+                        "count": counts[content_type.pk],
+                        "url": f"{reverse(url)}?q={form.cleaned_data.get('q')}",
+                    }
+                )
 
         return render(
             request,
@@ -241,6 +256,14 @@ def csrf_failure(request, reason="", template_name="403_csrf_failure.html"):
 
 
 class CustomGraphQLView(GraphQLView):
+    def __init__(self, *args, schema=None, **kwargs):
+        from nautobot.core.graphql.schema_init import get_schema  # circular import workaround
+
+        super().__init__(*args, schema=schema or get_schema(), **kwargs)
+
+    def get_backend(self, request):
+        return get_graphql_backend()
+
     def render_graphiql(self, request, **data):
         if not request.user.is_authenticated and get_settings_or_config("HIDE_RESTRICTED_UI"):
             graphql_url = reverse("graphql")
@@ -40,7 +40,7 @@ from nautobot.core.forms import (
 from nautobot.core.forms.forms import DynamicFilterFormSet
 from nautobot.core.templatetags.helpers import bettertitle, validated_viewname
 from nautobot.core.utils.config import get_settings_or_config
-from nautobot.core.utils.permissions import get_permission_for_model
+from nautobot.core.utils.permissions import get_permission_for_model, has_perms_for_objects
 from nautobot.core.utils.requests import (
     convert_querydict_to_factory_formset_acceptable_querydict,
     get_filterable_params_from_filter_params,
@@ -1025,9 +1025,8 @@ class BulkEditView(GetReturnURLMixin, ObjectPermissionRequiredMixin, View):
                                 form.save_note(instance=obj, user=request.user)
 
                         # Enforce object-level permissions
-                        if self.queryset.filter(pk__in=[obj.pk for obj in updated_objects]).count() != len(
-                            updated_objects
-                        ):
+                        permitted = has_perms_for_objects(request.user, self.get_required_permission(), updated_objects)
+                        if not all(permitted.values()):
                             raise ObjectDoesNotExist
 
                     if updated_objects:
@@ -1031,7 +1031,8 @@ class ObjectBulkUpdateViewMixin(NautobotViewSetMixin, BulkUpdateModelMixin):
                     form.save_note(instance=obj, user=request.user)
 
             # Enforce object-level permissions
-            if queryset.filter(pk__in=[obj.pk for obj in updated_objects]).count() != len(updated_objects):
+            perm = permissions.get_permission_for_model(model, "change")
+            if not all(permissions.has_perms_for_objects(request.user, perm, updated_objects).values()):
                 raise ObjectDoesNotExist
         if updated_objects:
             msg = f"Updated {len(updated_objects)} {model._meta.verbose_name_plural}"
@@ -102,9 +102,9 @@ def get_csv_form_fields_from_serializer_class(serializer_class):
             continue
         if field_name == "custom_fields":
             from nautobot.extras.choices import CustomFieldTypeChoices
-            from nautobot.extras.models import CustomField
+            from nautobot.extras.metadata import get_content_type_metadata
 
-            cfs = CustomField.objects.get_for_model(serializer_class.Meta.model)
+            cfs = get_content_type_metadata(serializer_class.Meta.model).custom_fields
             for cf in cfs:
                 cf_form_field = cf.to_form_field(set_initial=False)
                 field_info = {
@@ -27,11 +27,8 @@ class RackElevationSVG:
         else:
             self.base_url = ""
 
-        # Determine the subset of devices within this rack that are viewable by the user, if any
-        permitted_devices = self.rack.devices
-        if user is not None:
-            permitted_devices = permitted_devices.restrict(user, "view")
-        self.permitted_device_ids = permitted_devices.values_list("pk", flat=True)
+        # Retrieve the devices and reservations of this rack, and which devices are viewable by the user, at once
+        self.occupancy = self.rack.get_occupancy(user=user)
 
     @staticmethod
     def _get_device_description(device):
@@ -199,12 +196,12 @@ class RackElevationSVG:
         link.add(drawing.text("add device", insert=text, class_="add-device"))
 
     def merge_elevations(self, face):
-        elevation = self.rack.get_rack_units(face=face, expand_devices=False)
+        elevation = self.rack.get_rack_units(face=face, expand_devices=False, occupancy=self.occupancy)
         if face == DeviceFaceChoices.FACE_REAR:
             other_face = DeviceFaceChoices.FACE_FRONT
         else:
             other_face = DeviceFaceChoices.FACE_REAR
-        other = self.rack.get_rack_units(face=other_face)
+        other = self.rack.get_rack_units(face=other_face, occupancy=self.occupancy)
 
         unit_cursor = 0
         for u in elevation:
@@ -224,7 +221,7 @@ class RackElevationSVG:
             unit_width + legend_width + RACK_ELEVATION_BORDER_WIDTH * 2,
             unit_height * self.rack.u_height + RACK_ELEVATION_BORDER_WIDTH * 2,
         )
-        reserved_units = self.rack.get_reserved_units()
+        reserved_units = self.rack.get_reserved_units(occupancy=self.occupancy)
 
         unit_cursor = 0
         for ru in range(0, self.rack.u_height):
@@ -250,7 +247,7 @@ class RackElevationSVG:
             text_coordinates = (x_offset + (unit_width / 2), y_offset + end_y / 2)
 
             # Draw the device
-            if device and device.pk in self.permitted_device_ids:
+            if device and self.occupancy.is_permitted(device):
                 if device.face == face:
                     self._draw_device_front(drawing, device, start_coordinates, end_coordinates, text_coordinates)
                 elif device.device_type.is_full_depth:
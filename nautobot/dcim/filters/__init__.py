@@ -421,6 +421,7 @@ class RackFilterSet(
             "devices",
             "rack_reservations",
             "tags",
+            "utilization",
         ]
 
 
@@ -1,6 +1,12 @@
+from collections import defaultdict
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import multiprocessing
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
-from django.core.management.color import no_style
-from django.db import connection
+from django.db import connections
+from django.db.models import Q
 
 from nautobot.circuits.models import CircuitTermination
 from nautobot.dcim.models import (
@@ -12,17 +18,47 @@ from nautobot.dcim.models import (
     PowerOutlet,
     PowerPort,
 )
-from nautobot.dcim.signals import create_cablepath
+from nautobot.dcim.tracing import update_cable_paths
 
-ENDPOINT_MODELS = (
-    CircuitTermination,
-    ConsolePort,
-    ConsoleServerPort,
-    Interface,
-    PowerFeed,
-    PowerOutlet,
-    PowerPort,
-)
+# Path endpoint models, and the lookup of the Location of each, used to split the work into chunks
+ENDPOINT_MODELS = {
+    CircuitTermination: "location",
+    ConsolePort: "device__location",
+    ConsoleServerPort: "device__location",
+    Interface: "device__location",
+    PowerFeed: "power_panel__location",
+    PowerOutlet: "device__location",
+    PowerPort: "device__location",
+}
+
+
+def trace_chunk(content_type_id, pks, batch_size):
+    """
+    Trace the paths from the given origins, all of the same content type, and update their CablePaths.
+
+    If any path can't be traced, such as because it contains a loop, the origins are retraced one at a time so that
+    only the paths which can't be traced are skipped. Module-level so that it can be run in a worker process.
+
+    Returns:
+        tuple: The number of CablePaths `(created, updated, deleted)`, and a list of `(pk, error)` for the origins
+            whose path couldn't be traced.
+    """
+    origins = [(content_type_id, pk) for pk in pks]
+    try:
+        return update_cable_paths(origins, batch_size=batch_size), []
+    except ValidationError:
+        pass
+
+    totals = (0, 0, 0)
+    errors = []
+    for origin in origins:
+        try:
+            counts = update_cable_paths([origin], batch_size=batch_size)
+        except ValidationError as exc:
+            errors.append((origin[1], exc))
+            continue
+        totals = tuple(total + count for total, count in zip(totals, counts))
+    return totals, errors
 
 
 class Command(BaseCommand):
@@ -41,6 +77,18 @@ class Command(BaseCommand):
             dest="no_input",
             help="Do not prompt user for any input/confirmation",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes tracing paths in parallel, one Location at a time (default: 1)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of objects to load or write per database query (default: 1000)",
+        )
 
     def draw_progress_bar(self, percentage):
         """
@@ -50,50 +98,76 @@ class Command(BaseCommand):
         self.stdout.write(f"\r  [{'#' * bar_size}{' ' * (20-bar_size)}] {int(percentage)}%", ending="")
 
     def handle(self, *model_names, **options):
-        # If --force was passed, first delete all existing CablePaths
         if options["force"]:
-            cable_paths = CablePath.objects.all()
-            paths_count = cable_paths.count()
+            paths_count = CablePath.objects.count()
 
             # Prompt the user to confirm recalculation of all paths
             if paths_count and not options["no_input"]:
                 self.stdout.write(self.style.ERROR("WARNING: Forcing recalculation of all cable paths."))
-                self.stdout.write(
-                    f"This will delete and recalculate all {paths_count} existing cable paths. Are you sure?"
-                )
+                self.stdout.write(f"This will recalculate all {paths_count} existing cable paths. Are you sure?")
                 confirmation = input("Type yes to confirm: ")
                 if confirmation != "yes":
                     self.stdout.write(self.style.SUCCESS("Aborting"))
                     return
 
-            # Delete all existing CablePath instances
-            self.stdout.write(f"Deleting {paths_count} existing cable paths...")
-            deleted_count, _ = CablePath.objects.all().delete()
-            self.stdout.write((self.style.SUCCESS(f"  Deleted {deleted_count} paths")))
-
-            # Reinitialize the model's PK sequence
-            self.stdout.write("Resetting database sequence for CablePath model")
-            sequence_sql = connection.ops.sequence_reset_sql(no_style(), [CablePath])
-            with connection.cursor() as cursor:
-                for sql in sequence_sql:
-                    cursor.execute(sql)
-
-        # Retrace paths
-        for model in ENDPOINT_MODELS:
-            origins = model.objects.filter(cable__isnull=False)
-            if not options["force"]:
-                origins = origins.filter(_path__isnull=True)
-            origins_count = origins.count()
-            if not origins_count:
-                self.stdout.write(f"Found no missing {model._meta.verbose_name} paths; skipping")
-                continue
-            self.stdout.write(f"Retracing {origins_count} cabled {model._meta.verbose_name_plural}...")
-            i = 0
-            for i, obj in enumerate(origins, start=1):
-                create_cablepath(obj)
-                if not i % 100:
-                    self.draw_progress_bar(i * 100 / origins_count)
-            self.draw_progress_bar(100)
-            self.stdout.write(self.style.SUCCESS(f"\n  Retraced {i} {model._meta.verbose_name_plural}"))
+        executor = None
+        if options["workers"] > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=options["workers"], mp_context=multiprocessing.get_context("fork")
+            )
+
+        try:
+            for model, location_field in ENDPOINT_MODELS.items():
+                self.trace_model(model, location_field, executor, options)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         self.stdout.write(self.style.SUCCESS("Finished."))
+
+    def trace_model(self, model, location_field, executor, options):
+        """Retrace the paths from all cabled instances of the given model, one chunk per Location."""
+        if options["force"]:
+            # Also include origins which have lost their cable, so that their stale CablePath gets deleted
+            origins = model.objects.filter(Q(cable__isnull=False) | Q(_path__isnull=False))
+        else:
+            origins = model.objects.filter(cable__isnull=False, _path__isnull=True)
+
+        chunks = defaultdict(list)
+        for pk, location_id in origins.values_list("pk", location_field).iterator():
+            chunks[location_id].append(pk)
+        origins_count = sum(len(pks) for pks in chunks.values())
+        if not origins_count:
+            self.stdout.write(f"Found no missing {model._meta.verbose_name} paths; skipping")
+            return
+
+        self.stdout.write(
+            f"Retracing {origins_count} cabled {model._meta.verbose_name_plural} in {len(chunks)} location(s)..."
+        )
+        content_type_id = ContentType.objects.get_for_model(model).pk
+        args = [(content_type_id, pks, options["batch_size"]) for pks in chunks.values()]
+        if executor is not None:
+            # Worker processes are forked as chunks are submitted, and must not share the database connections that
+            # this process has (re)opened since, so close them first; this process doesn't query until all are submitted
+            connections.close_all()
+            futures = {executor.submit(trace_chunk, *arg): len(arg[1]) for arg in args}
+            results = ((future.result(), futures[future]) for future in as_completed(futures))
+        else:
+            results = ((trace_chunk(*arg), len(arg[1])) for arg in args)
+
+        totals = [0, 0, 0]
+        traced = 0
+        for ((created, updated, deleted), errors), count in results:
+            for pk, error in errors:
+                self.stdout.write(
+                    self.style.ERROR(f"\n  Error tracing the path from {model._meta.verbose_name} {pk}: {error}")
+                )
+            totals = [totals[0] + created, totals[1] + updated, totals[2] + deleted]
+            traced += count
+            self.draw_progress_bar(traced * 100 / origins_count)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n  Retraced {traced} {model._meta.verbose_name_plural}: created {totals[0]}, updated {totals[1]} "
+                f"and deleted {totals[2]} paths"
+            )
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.23 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dcim", "0052_fix_interface_redundancy_group_created"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rack",
+            name="utilization",
+            field=models.FloatField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="rack",
+            name="utilization_denominator",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="rack",
+            name="utilization_numerator",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def populate_location_ancestry(apps, schema):
+    Location = apps.get_model("dcim", "Location")
+    LocationAncestry = apps.get_model("dcim", "LocationAncestry")
+
+    parents = dict(Location.objects.values_list("pk", "parent_id"))
+    chains = {}
+
+    def get_chain(pk):
+        if pk not in chains:
+            parent_pk = parents[pk]
+            chains[pk] = [pk] + (get_chain(parent_pk) if parent_pk is not None else [])
+        return chains[pk]
+
+    LocationAncestry.objects.bulk_create(
+        [
+            LocationAncestry(location_id=pk, ancestor_id=ancestor_pk, depth=depth)
+            for pk in parents
+            for depth, ancestor_pk in enumerate(get_chain(pk))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dcim", "0053_rack_utilization"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationAncestry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("depth", models.PositiveSmallIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_entries",
+                        to="dcim.location",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="ancestor_entries", to="dcim.location"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "location ancestries",
+                "ordering": ["location", "depth"],
+                "unique_together": {("location", "ancestor")},
+            },
+        ),
+        migrations.RunPython(populate_location_ancestry, migrations.RunPython.noop),
+    ]
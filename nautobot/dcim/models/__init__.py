@@ -26,7 +26,7 @@ from .device_components import (
     RearPort,
 )
 from .devices import Device, DeviceRedundancyGroup, DeviceType, Manufacturer, Platform, VirtualChassis
-from .locations import Location, LocationType
+from .locations import Location, LocationAncestry, LocationType
 from .power import PowerFeed, PowerPanel
 from .racks import Rack, RackGroup, RackReservation
 
@@ -52,6 +52,7 @@ __all__ = (
     "InterfaceTemplate",
     "InventoryItem",
     "Location",
+    "LocationAncestry",
     "LocationType",
     "Manufacturer",
     "PathEndpoint",
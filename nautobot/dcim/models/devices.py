@@ -235,13 +235,17 @@ class DeviceType(PrimaryModel):
         super().clean()
 
         # If editing an existing DeviceType to have a larger u_height, first validate that *all* instances of it have
-        # room to expand within their racks. This validation will impose a very high performance penalty when there are
-        # many instances to check, but increasing the u_height of a DeviceType should be a very rare occurrence.
+        # room to expand within their racks. The occupancy of all the racks involved is retrieved in bulk, as there may be
+        # many instances to check.
         if self.present_in_database and self.u_height > self._original_u_height:
-            for d in Device.objects.filter(device_type=self, position__isnull=False):
+            from .racks import RackOccupancy  # circular import workaround
+
+            racked_instances = Device.objects.select_related("rack").filter(device_type=self, position__isnull=False)
+            occupancies = RackOccupancy.for_racks({d.rack for d in racked_instances})
+            for d in racked_instances:
                 face_required = None if self.is_full_depth else d.face
-                u_available = d.rack.get_available_units(
-                    u_height=self.u_height, rack_face=face_required, exclude=[d.pk]
+                u_available = occupancies[d.rack_id].get_available_units(
+                    u_height=self.u_height, face=face_required, exclude=[d.pk]
                 )
                 if d.position not in u_available:
                     raise ValidationError(
@@ -1,13 +1,13 @@
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils.functional import classproperty
 
 from timezone_field import TimeZoneField
 
 from nautobot.core.models.fields import NaturalOrderingField
-from nautobot.core.models.generics import OrganizationalModel, PrimaryModel
+from nautobot.core.models.generics import BaseModel, OrganizationalModel, PrimaryModel
 from nautobot.core.models.tree_queries import TreeManager, TreeModel, TreeQuerySet
 from nautobot.core.utils.config import get_settings_or_config
 from nautobot.dcim.fields import ASNField
@@ -322,3 +322,54 @@ class Location(TreeModel, PrimaryModel):
             decimal_places = self._meta.get_field("latitude").decimal_places
             self.latitude = f"{self.latitude:.{decimal_places}f}"
         super().clean_fields(exclude)
+
+    def update_ancestry(self):
+        """
+        Rebuild the `LocationAncestry` entries of this Location and of all of its descendants.
+
+        This must be called whenever a Location is created or its parent changes.
+        """
+        ancestors = dict(self.ancestors().values_list("pk", "parent_id"))
+        chain = [self.pk]
+        parent_pk = self.parent_id
+        while parent_pk is not None:
+            chain.append(parent_pk)
+            parent_pk = ancestors[parent_pk]
+
+        # Descendants are returned in tree order, so the chain of each parent is always known before its children
+        chains = {self.pk: chain}
+        for pk, parent_pk in self.descendants().values_list("pk", "parent_id"):
+            chains[pk] = [pk, *chains[parent_pk]]
+
+        with transaction.atomic():
+            LocationAncestry.objects.filter(location_id__in=chains.keys()).delete()
+            LocationAncestry.objects.bulk_create(
+                [
+                    LocationAncestry(location_id=pk, ancestor_id=ancestor_pk, depth=depth)
+                    for pk, chain in chains.items()
+                    for depth, ancestor_pk in enumerate(chain)
+                ],
+                batch_size=1000,
+            )
+
+
+class LocationAncestry(BaseModel):
+    """
+    Closure table of the Location tree, relating each Location to itself and to each of its ancestors.
+
+    This allows "is this Location at or below that one" to be answered by a plain join, for example when annotating
+    Devices and VirtualMachines with their config context data. It is maintained by `Location.update_ancestry()`
+    whenever a Location is created or moved within the tree (see `nautobot.dcim.signals`).
+    """
+
+    location = models.ForeignKey(to="dcim.Location", on_delete=models.CASCADE, related_name="ancestor_entries")
+    ancestor = models.ForeignKey(to="dcim.Location", on_delete=models.CASCADE, related_name="descendant_entries")
+    depth = models.PositiveSmallIntegerField(help_text="Number of levels between the location and this ancestor")
+
+    class Meta:
+        unique_together = ["location", "ancestor"]
+        ordering = ["location", "depth"]
+        verbose_name_plural = "location ancestries"
+
+    def __str__(self):
+        return f"{self.ancestor} is an ancestor of {self.location}"
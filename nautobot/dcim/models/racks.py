@@ -6,10 +6,12 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Count, Sum, Q
+from django.db.models import Count, Sum
 
+from nautobot.core.models import BaseManager
 from nautobot.core.models.fields import NaturalOrderingField, JSONArrayField
 from nautobot.core.models.generics import OrganizationalModel, PrimaryModel
+from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.core.models.tree_queries import TreeModel
 from nautobot.core.models.utils import array_to_string
 from nautobot.core.utils.config import get_settings_or_config
@@ -88,6 +90,186 @@ class RackGroup(TreeModel, OrganizationalModel):
             )
 
 
+class RackOccupancy:
+    """
+    The rack units of a Rack occupied by its devices and reserved by its reservations.
+
+    The units occupied on each face of the rack are kept as bitmaps, i.e. integers where bit `u - 1` is set if unit `u`
+    is occupied, so that the available positions, the reserved units and the utilization of the rack, as well as its
+    elevation, can all be computed from the same two queries (devices and reservations) without any further query.
+
+    :param rack: The Rack instance
+    :param devices: The racked devices (with a position) within the rack, with their `device_type` selected
+    :param reservations: The reservations of units within the rack
+    :param permitted_device_ids: Set of the PKs of the devices viewable by the user, or None if all devices are viewable
+    """
+
+    def __init__(self, rack, devices, reservations, permitted_device_ids=None):
+        self.rack = rack
+        self.devices = list(devices)
+        self.reservations = list(reservations)
+        self.permitted_device_ids = permitted_device_ids
+        # Bitmap of all the units of the rack, used to ignore devices and reservations extending beyond its height
+        self.rack_units_bitmap = (1 << rack.u_height) - 1
+        self._occupied_units_bitmaps = {}
+
+    @classmethod
+    def for_racks(cls, racks, user=None):
+        """
+        Return a dictionary mapping the PK of each of the given racks to its RackOccupancy, computed with one query for
+        the devices, one query for the reservations and (if a user is given) one query for the device permissions of all
+        the racks.
+
+        :param racks: Iterable of Rack instances
+        :param user: User instance to be used for evaluating device view permissions. If None, all devices are viewable.
+        """
+        racks = [rack for rack in racks if rack.present_in_database]
+        devices_by_rack = {rack.pk: [] for rack in racks}
+        reservations_by_rack = {rack.pk: [] for rack in racks}
+        permitted_device_ids = {rack.pk: None if user is None else set() for rack in racks}
+        if racks:
+            devices = (
+                Device.objects.select_related("device_type", "device_type__manufacturer", "role")
+                .annotate(device_bay_count=Count("device_bays"))
+                .filter(rack__in=racks, position__gte=1)
+            )
+            for device in devices:
+                devices_by_rack[device.rack_id].append(device)
+
+            # Determine which devices the user has permission to view
+            if user is not None:
+                permitted_devices = Device.objects.restrict(user, "view").filter(rack__in=racks, position__gte=1)
+                for device_pk, rack_pk in permitted_devices.values_list("pk", "rack_id"):
+                    permitted_device_ids[rack_pk].add(device_pk)
+
+            for reservation in RackReservation.objects.select_related("user").filter(rack__in=racks):
+                reservations_by_rack[reservation.rack_id].append(reservation)
+
+        return {
+            rack.pk: cls(rack, devices_by_rack[rack.pk], reservations_by_rack[rack.pk], permitted_device_ids[rack.pk])
+            for rack in racks
+        }
+
+    @staticmethod
+    def get_device_units_bitmap(device):
+        """Return the bitmap of the units occupied by the given racked device."""
+        return ((1 << device.device_type.u_height) - 1) << (device.position - 1)
+
+    @staticmethod
+    def get_units_from_bitmap(bitmap):
+        """Return the list of units set in the given bitmap, in descending order."""
+        return [u for u in range(bitmap.bit_length(), 0, -1) if bitmap >> (u - 1) & 1]
+
+    def is_permitted(self, device):
+        """Return whether the given device is viewable by the user this occupancy was computed for."""
+        return self.permitted_device_ids is None or device.pk in self.permitted_device_ids
+
+    def get_devices(self, face=None, exclude=None):
+        """
+        Return the racked devices occupying the given face of the rack (including full-depth devices mounted on the
+        other face), or occupying any face if `face` is None.
+
+        :param face: Rack face (front or rear), or None for any face
+        :param exclude: List of device PKs to exclude (optional)
+        """
+        return [
+            device
+            for device in self.devices
+            if (not exclude or device.pk not in exclude)
+            and (face is None or device.face == face or device.device_type.is_full_depth)
+        ]
+
+    def get_occupied_units_bitmap(self, face=None, exclude=None):
+        """
+        Return the bitmap of the units occupied on the given face of the rack, or on any face if `face` is None.
+
+        :param face: Rack face (front or rear), or None for any face
+        :param exclude: List of device PKs to exclude (optional)
+        """
+        exclude = frozenset(exclude or ())
+        key = (face, exclude)
+        if key not in self._occupied_units_bitmaps:
+            bitmap = 0
+            for device in self.get_devices(face=face, exclude=exclude):
+                bitmap |= self.get_device_units_bitmap(device)
+            self._occupied_units_bitmaps[key] = bitmap & self.rack_units_bitmap
+        return self._occupied_units_bitmaps[key]
+
+    def get_reserved_units_bitmap(self):
+        """Return the bitmap of the reserved units of the rack."""
+        bitmap = 0
+        for reservation in self.reservations:
+            for u in reservation.units:
+                if u >= 1:
+                    bitmap |= 1 << (u - 1)
+        return bitmap & self.rack_units_bitmap
+
+    def get_available_units(self, u_height=1, face=None, exclude=None):
+        """
+        Return the list of units, in descending order, from which a device of the given height fits in the free units
+        of the given face of the rack (or of both faces if `face` is None).
+
+        :param u_height: Minimum number of contiguous free units required
+        :param face: The face of the rack (front or rear) required; None if the device is full depth
+        :param exclude: List of device PKs to exclude (useful when moving a device within a rack)
+        """
+        free_units_bitmap = self.rack_units_bitmap & ~self.get_occupied_units_bitmap(face=face, exclude=exclude)
+        # A unit is available if it and the `u_height - 1` units above it are all free
+        available_units_bitmap = free_units_bitmap
+        for offset in range(1, u_height):
+            available_units_bitmap &= free_units_bitmap >> offset
+        return self.get_units_from_bitmap(available_units_bitmap)
+
+    def get_reserved_units(self):
+        """Return a dictionary mapping all reserved units within the rack to their reservation."""
+        reserved_units = {}
+        for reservation in self.reservations:
+            for u in reservation.units:
+                reserved_units[u] = reservation
+        return reserved_units
+
+    def get_utilization(self):
+        """
+        Return the utilization of the rack.
+
+        Returns:
+            UtilizationData: (numerator=Occupied or reserved unit count, denominator=U Height of the rack)
+        """
+        bitmap = self.get_occupied_units_bitmap() | self.get_reserved_units_bitmap()
+        return UtilizationData(numerator=bin(bitmap).count("1"), denominator=self.rack.u_height)
+
+
+class RackQuerySet(RestrictedQuerySet):
+    """Queryset for `Rack` objects."""
+
+    def get_occupancies(self, user=None):
+        """
+        Return a dictionary mapping the PK of each Rack in this queryset to its `RackOccupancy`, computed in bulk.
+
+        :param user: User instance to be used for evaluating device view permissions. If None, all devices are viewable.
+        """
+        return RackOccupancy.for_racks(self, user=user)
+
+    def update_utilization(self, batch_size=1000):
+        """
+        Recalculate and store the utilization of every Rack in this queryset, in batches of racks.
+
+        The occupancy of each batch of racks is retrieved in bulk, and the fields are written with `bulk_update()`,
+        bypassing `save()` and its signals.
+
+        Returns:
+            int: The number of racks updated.
+        """
+        racks = list(self)
+        for i in range(0, len(racks), batch_size):
+            batch = racks[i : i + batch_size]
+            occupancies = RackOccupancy.for_racks(batch)
+            for rack in batch:
+                rack.set_utilization(occupancies[rack.pk].get_utilization())
+            self.model.objects.bulk_update(batch, ["utilization", "utilization_numerator", "utilization_denominator"])
+        return len(racks)
+
+
 @extras_features(
     "custom_links",
     "custom_validators",
@@ -171,6 +353,18 @@ class Rack(PrimaryModel):
     )
     comments = models.TextField(blank=True)
     images = GenericRelation(to="extras.ImageAttachment")
+    # Denormalized copy of `get_utilization()`, maintained by `update_utilization()`, for sorting and filtering.
+    # A denominator of 0 indicates that the utilization has not yet been calculated.
+    utilization = models.FloatField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Percentage of rack units that are occupied or reserved",
+    )
+    utilization_numerator = models.PositiveSmallIntegerField(default=0, editable=False)
+    utilization_denominator = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = BaseManager.from_queryset(RackQuerySet)()
 
     clone_fields = [
         "location",
@@ -253,12 +447,24 @@ class Rack(PrimaryModel):
             return f"{self.name} ({self.facility_id})"
         return self.name
 
+    def get_occupancy(self, user=None):
+        """
+        Return the `RackOccupancy` of this rack, to compute its elevation, available units and utilization at once.
+
+        :param user: User instance to be used for evaluating device view permissions. If None, all devices
+            will be included.
+        """
+        if not self.present_in_database:
+            return RackOccupancy(self, [], [])
+        return RackOccupancy.for_racks([self], user=user)[self.pk]
+
     def get_rack_units(
         self,
         user=None,
         face=DeviceFaceChoices.FACE_FRONT,
         exclude=None,
         expand_devices=True,
+        occupancy=None,
     ):
         """
         Return a list of rack units as dictionaries. Example: {'device': None, 'face': 0, 'id': 48, 'name': 'U48'}
@@ -271,6 +477,8 @@ class Rack(PrimaryModel):
         :param expand_devices: When True, all units that a device occupies will be listed with each containing a
             reference to the device. When False, only the bottom most unit for a device is included and that unit
             contains a height attribute for the device
+        :param occupancy: `RackOccupancy` of this rack, if already computed (optional); it must have been computed for
+            the given user, if any
         """
 
         elevation = OrderedDict()
@@ -284,41 +492,31 @@ class Rack(PrimaryModel):
             }
 
         # Add devices to rack units list
-        if self.present_in_database:
-            # Retrieve all devices installed within the rack
-            queryset = (
-                Device.objects.select_related("device_type", "device_type__manufacturer", "role")
-                .annotate(device_bay_count=Count("device_bays"))
-                .exclude(pk=exclude)
-                .filter(rack=self, position__gt=0, device_type__u_height__gt=0)
-                .filter(Q(face=face) | Q(device_type__is_full_depth=True))
-            )
-
-            # Determine which devices the user has permission to view
-            permitted_device_ids = []
-            if user is not None:
-                permitted_device_ids = self.devices.restrict(user, "view").values_list("pk", flat=True)
-
-            for device in queryset:
-                if expand_devices:
-                    for u in range(device.position, device.position + device.device_type.u_height):
-                        if user is None or device.pk in permitted_device_ids:
-                            elevation[u]["device"] = device
-                        elevation[u]["occupied"] = True
-                else:
-                    if user is None or device.pk in permitted_device_ids:
-                        elevation[device.position]["device"] = device
-                    elevation[device.position]["occupied"] = True
-                    elevation[device.position]["height"] = device.device_type.u_height
-                    for u in range(
-                        device.position + 1,
-                        device.position + device.device_type.u_height,
-                    ):
-                        elevation.pop(u, None)
+        if occupancy is None:
+            occupancy = self.get_occupancy(user=user)
+        for device in occupancy.get_devices(face=face, exclude=[exclude] if exclude else None):
+            if not device.device_type.u_height:
+                continue
+            permitted = user is None or occupancy.is_permitted(device)
+            if expand_devices:
+                for u in range(device.position, device.position + device.device_type.u_height):
+                    if permitted:
+                        elevation[u]["device"] = device
+                    elevation[u]["occupied"] = True
+            else:
+                if permitted:
+                    elevation[device.position]["device"] = device
+                elevation[device.position]["occupied"] = True
+                elevation[device.position]["height"] = device.device_type.u_height
+                for u in range(
+                    device.position + 1,
+                    device.position + device.device_type.u_height,
+                ):
+                    elevation.pop(u, None)
 
         return list(elevation.values())
 
-    def get_available_units(self, u_height=1, rack_face=None, exclude=None):
+    def get_available_units(self, u_height=1, rack_face=None, exclude=None, occupancy=None):
         """
         Return a list of units within the rack available to accommodate a device of a given U height (default 1).
         Optionally exclude one or more devices when calculating empty units (needed when moving a device from one
@@ -327,42 +525,21 @@ class Rack(PrimaryModel):
         :param u_height: Minimum number of contiguous free units required
         :param rack_face: The face of the rack (front or rear) required; 'None' if device is full depth
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
+        :param occupancy: `RackOccupancy` of this rack, if already computed (optional)
         """
-        # Gather all devices which consume U space within the rack
-        devices = self.devices.select_related("device_type").filter(position__gte=1)
-        if exclude is not None:
-            devices = devices.exclude(pk__in=exclude)
-
-        # Initialize the rack unit skeleton
-        units = list(range(1, self.u_height + 1))
-
-        # Remove units consumed by installed devices
-        for d in devices:
-            if rack_face is None or d.face == rack_face or d.device_type.is_full_depth:
-                for u in range(d.position, d.position + d.device_type.u_height):
-                    try:
-                        units.remove(u)
-                    except ValueError:
-                        # Found overlapping devices in the rack!
-                        pass
-
-        # Remove units without enough space above them to accommodate a device of the specified height
-        available_units = []
-        for u in units:
-            if set(range(u, u + u_height)).issubset(units):
-                available_units.append(u)
-
-        return list(reversed(available_units))
+        if occupancy is None:
+            occupancy = self.get_occupancy()
+        return occupancy.get_available_units(u_height=u_height, face=rack_face, exclude=exclude)
 
-    def get_reserved_units(self):
+    def get_reserved_units(self, occupancy=None):
         """
         Return a dictionary mapping all reserved units within the rack to their reservation.
+
+        :param occupancy: `RackOccupancy` of this rack, if already computed (optional)
         """
-        reserved_units = {}
-        for r in self.rack_reservations.all():
-            for u in r.units:
-                reserved_units[u] = r
-        return reserved_units
+        if occupancy is None:
+            occupancy = RackOccupancy(self, [], self.rack_reservations.all())
+        return occupancy.get_reserved_units()
 
     def get_elevation_svg(
         self,
@@ -404,22 +581,39 @@ class Rack(PrimaryModel):
     def get_0u_devices(self):
         return self.devices.filter(position=0)
 
-    def get_utilization(self):
+    def get_utilization(self, occupancy=None):
         """Gets utilization numerator and denominator for racks.
 
+        Args:
+            occupancy (RackOccupancy): Occupancy of this rack, if already computed (optional)
+
         Returns:
             UtilizationData: (numerator=Occupied Unit Count, denominator=U Height of the rack)
         """
-        # Determine unoccupied units
-        available_units = self.get_available_units()
+        if occupancy is None:
+            occupancy = self.get_occupancy()
+        # Return the numerator and denominator as percentage is to be calculated later where needed
+        return occupancy.get_utilization()
 
-        # Remove reserved units
-        for u in self.get_reserved_units():
-            if u in available_units:
-                available_units.remove(u)
+    def set_utilization(self, utilization_data):
+        """Set the `utilization*` fields of this rack from the given UtilizationData, without saving them."""
+        numerator, denominator = utilization_data
+        self.utilization_numerator = numerator
+        self.utilization_denominator = denominator
+        self.utilization = 100 * numerator / denominator if denominator else 0
 
-        # Return the numerator and denominator as percentage is to be calculated later where needed
-        return UtilizationData(numerator=self.u_height - len(available_units), denominator=self.u_height)
+    def update_utilization(self):
+        """
+        Recalculate the space utilization of this rack and store it in the `utilization*` fields.
+
+        The fields are written with an `update()` query, bypassing `save()` and its signals.
+        """
+        self.set_utilization(self.get_utilization())
+        Rack.objects.filter(pk=self.pk).update(
+            utilization=self.utilization,
+            utilization_numerator=self.utilization_numerator,
+            utilization_denominator=self.utilization_denominator,
+        )
 
     def get_power_utilization(self):
         """Determine the utilization numerator and denominator for power utilization on the rack.
@@ -2,7 +2,7 @@ import logging
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.db import transaction
 from django.dispatch import receiver
 
@@ -12,13 +12,18 @@ from .models import (
     CablePath,
     Device,
     DeviceRedundancyGroup,
+    DeviceType,
     PathEndpoint,
     PowerPanel,
     Rack,
     RackGroup,
+    RackReservation,
     VirtualChassis,
     Interface,
+    Location,
+    LocationAncestry,
 )
+from .tracing import update_cable_paths, update_cable_paths_containing
 from .utils import validate_interface_tagged_vlans
 
 
@@ -28,13 +33,7 @@ def create_cablepath(node, rebuild=True):
 
     rebuild (bool) - Used to refresh paths where this node is not an endpoint.
     """
-    cp = CablePath.from_origin(node)
-    if cp:
-        try:
-            cp.save()
-        except Exception as e:
-            print(node, node.pk)
-            raise e
+    update_cable_paths([(ContentType.objects.get_for_model(node).pk, node.pk)])
     if rebuild:
         rebuild_paths(node)
 
@@ -43,13 +42,33 @@ def rebuild_paths(obj):
     """
     Rebuild all CablePaths which traverse the specified node
     """
-    cable_paths = CablePath.objects.filter(path__contains=obj)
+    update_cable_paths_containing(obj)
 
-    with transaction.atomic():
-        for cp in cable_paths:
-            cp.delete()
-            # Prevent looping back to rebuild_paths during the atomic transaction.
-            create_cablepath(cp.origin, rebuild=False)
+
+#
+# Location ancestry
+#
+
+
+@receiver(post_save, sender=Location)
+def update_location_ancestry(instance, created, raw=False, **kwargs):
+    """
+    Maintain the `LocationAncestry` entries of a Location and its descendants when it is created or moved.
+    """
+    if raw:
+        return
+
+    if not created:
+        recorded = dict(
+            LocationAncestry.objects.filter(location=instance, depth__lte=1).values_list("depth", "ancestor_id")
+        )
+        expected = {0: instance.pk}
+        if instance.parent_id is not None:
+            expected[1] = instance.parent_id
+        if recorded == expected:
+            return
+
+    instance.update_ancestry()
 
 
 #
@@ -147,6 +166,79 @@ def handle_rack_location_change(instance, created, raw=False, **kwargs):
                 device.save()
 
 
+#
+# Stored rack utilization
+#
+
+
+@receiver(post_save, sender=Rack)
+def update_rack_utilization(instance, raw=False, **kwargs):
+    """
+    Update the stored utilization of a Rack when it is saved (e.g. its height has changed).
+    """
+    if raw:
+        return
+    instance.update_utilization()
+
+
+@receiver(pre_save, sender=Device)
+def record_device_previous_rack(instance, raw=False, **kwargs):
+    """
+    Record the Rack a Device was previously in, so that its stored utilization can be updated if the Device moves.
+    """
+    if raw or instance._state.adding:
+        return
+    instance._previous_rack_id = Device.objects.filter(pk=instance.pk).values_list("rack_id", flat=True).first()
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_delete, sender=Device)
+def update_device_rack_utilization(instance, raw=False, **kwargs):
+    """
+    Update the stored utilization of the Rack(s) a Device was added to, moved within, or removed from.
+    """
+    if raw:
+        return
+    rack_ids = {instance.rack_id, getattr(instance, "_previous_rack_id", None)} - {None}
+    for rack in Rack.objects.filter(pk__in=rack_ids):
+        rack.update_utilization()
+
+
+@receiver(post_save, sender=DeviceType)
+def update_device_type_rack_utilization(instance, created, raw=False, **kwargs):
+    """
+    Update the stored utilization of every Rack containing a Device of this DeviceType, as its height may have changed.
+    """
+    if raw or created:
+        return
+    Rack.objects.filter(devices__device_type=instance).distinct().update_utilization()
+
+
+@receiver(pre_save, sender=RackReservation)
+def record_rack_reservation_previous_rack(instance, raw=False, **kwargs):
+    """
+    Record the Rack a RackReservation was previously for, so that its stored utilization can be updated if it changes.
+    """
+    if raw or instance._state.adding:
+        return
+    instance._previous_rack_id = (
+        RackReservation.objects.filter(pk=instance.pk).values_list("rack_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=RackReservation)
+@receiver(post_delete, sender=RackReservation)
+def update_rack_reservation_utilization(instance, raw=False, **kwargs):
+    """
+    Update the stored utilization of the Rack(s) of a reservation when it is created, changed, moved, or deleted.
+    """
+    if raw:
+        return
+    rack_ids = {instance.rack_id, getattr(instance, "_previous_rack_id", None)} - {None}
+    for rack in Rack.objects.filter(pk__in=rack_ids):
+        rack.update_utilization()
+
+
 #
 # Device redundancy group
 #
@@ -258,19 +350,8 @@ def nullify_connected_endpoints(instance, **kwargs):
         instance.termination_b._cable_peer = None
         instance.termination_b.save()
 
-    # Delete and retrace any dependent cable paths
-    for cablepath in CablePath.objects.filter(path__contains=instance):
-        cp = CablePath.from_origin(cablepath.origin)
-        if cp:
-            CablePath.objects.filter(pk=cablepath.pk).update(
-                path=cp.path,
-                destination_type=ContentType.objects.get_for_model(cp.destination) if cp.destination else None,
-                destination_id=cp.destination.pk if cp.destination else None,
-                is_active=cp.is_active,
-                is_split=cp.is_split,
-            )
-        else:
-            cablepath.delete()
+    # Retrace any dependent cable paths, deleting those which no longer have a cable at their origin
+    update_cable_paths_containing(instance)
 
 
 #
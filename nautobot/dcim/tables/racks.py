@@ -11,7 +11,7 @@ from nautobot.core.tables import (
 from nautobot.dcim.models import Rack, RackGroup, RackReservation
 from nautobot.extras.tables import RoleTableMixin, StatusTableMixin
 from nautobot.tenancy.tables import TenantColumn
-from .template_code import TREE_LINK, RACKGROUP_ELEVATIONS, UTILIZATION_GRAPH
+from .template_code import TREE_LINK, RACKGROUP_ELEVATIONS, STORED_UTILIZATION_GRAPH, UTILIZATION_GRAPH
 
 __all__ = (
     "RackTable",
@@ -88,7 +88,9 @@ class RackDetailTable(RackTable):
         url_params={"rack": "pk"},
         verbose_name="Devices",
     )
-    get_utilization = tables.TemplateColumn(template_code=UTILIZATION_GRAPH, orderable=False, verbose_name="Space")
+    get_utilization = tables.TemplateColumn(
+        template_code=STORED_UTILIZATION_GRAPH, order_by=("utilization",), verbose_name="Space"
+    )
     get_power_utilization = tables.TemplateColumn(
         template_code=UTILIZATION_GRAPH, orderable=False, verbose_name="Power"
     )
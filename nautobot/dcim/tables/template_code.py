@@ -150,6 +150,14 @@ UTILIZATION_GRAPH = """
 {% utilization_graph value %}
 """
 
+# Uses the stored utilization of the record, falling back to calculating it if it has not yet been stored.
+STORED_UTILIZATION_GRAPH = """
+{% load helpers %}
+{% if record.utilization_denominator %}\
+{% utilization_graph_raw_data record.utilization_numerator record.utilization_denominator %}\
+{% else %}{% utilization_graph record.get_utilization %}{% endif %}
+"""
+
 #
 # Device component buttons
 #
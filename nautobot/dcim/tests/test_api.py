@@ -614,6 +614,9 @@ class RackTest(APIViewTestCases.APIViewTestCase):
                                 "tenant",
                                 "type",
                                 "u_height",
+                                "utilization",
+                                "utilization_denominator",
+                                "utilization_numerator",
                                 "width",
                             ]
                         },
@@ -1,5 +1,9 @@
+from io import StringIO
+from unittest import mock
+
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase
 
 from nautobot.circuits.models import Circuit, CircuitTermination, CircuitType, Provider
@@ -22,6 +26,8 @@ from nautobot.dcim.models import (
     RearPort,
 )
 
+from nautobot.dcim.management.commands.trace_paths import trace_chunk
+from nautobot.dcim.tracing import update_cable_paths
 from nautobot.dcim.utils import object_to_path_node
 from nautobot.extras.models import Role, Status
 
@@ -1495,3 +1501,70 @@ class CablePathTestCase(TestCase):
                 rearport1: 2,
             }
         )
+
+    def test_401_trace_paths(self):
+        """
+        [IF1] --C1-- [FP1] [RP1] --C2-- [IF2]
+        [IF3] --C3-- [IF4]
+        """
+        interface1 = Interface.objects.create(device=self.device, name="Interface 1", status=self.interface_status)
+        interface2 = Interface.objects.create(device=self.device, name="Interface 2", status=self.interface_status)
+        interface3 = Interface.objects.create(device=self.device, name="Interface 3", status=self.interface_status)
+        interface4 = Interface.objects.create(device=self.device, name="Interface 4", status=self.interface_status)
+        rearport1 = RearPort.objects.create(device=self.device, name="Rear Port 1", positions=1)
+        frontport1 = FrontPort.objects.create(
+            device=self.device,
+            name="Front Port 1",
+            rear_port=rearport1,
+            rear_port_position=1,
+        )
+        cable1 = Cable(termination_a=interface1, termination_b=frontport1, status=self.status)
+        cable1.save()
+        cable2 = Cable(termination_a=rearport1, termination_b=interface2, status=self.status)
+        cable2.save()
+        cable3 = Cable(termination_a=interface3, termination_b=interface4, status=self.status)
+        cable3.save()
+
+        # Missing paths are traced
+        CablePath.objects.all().delete()
+        call_command("trace_paths", no_input=True, stdout=StringIO())
+        path1 = self.assertPathExists(
+            origin=interface1,
+            destination=interface2,
+            path=(cable1, frontport1, rearport1, cable2),
+            is_active=True,
+        )
+        path3 = self.assertPathExists(origin=interface3, destination=interface4, path=(cable3,), is_active=True)
+        self.assertEqual(CablePath.objects.count(), 4)
+        interface1.refresh_from_db()
+        self.assertPathIsSet(interface1, path1)
+
+        # Only paths which changed are rewritten
+        CablePath.objects.filter(pk=path1.pk).update(is_active=False)
+        interface_type_id = ContentType.objects.get_for_model(Interface).pk
+        origins = [(interface_type_id, interface.pk) for interface in (interface1, interface2, interface3, interface4)]
+        self.assertEqual(update_cable_paths(origins), (0, 1, 0))
+        self.assertPathExists(origin=interface1, destination=interface2, is_active=True)
+
+        # Stale paths are deleted when forcing recalculation
+        Interface.objects.filter(pk__in=[interface3.pk, interface4.pk]).update(cable=None)
+        call_command("trace_paths", force=True, no_input=True, stdout=StringIO())
+        self.assertFalse(CablePath.objects.filter(pk=path3.pk).exists())
+        self.assertEqual(CablePath.objects.count(), 2)
+        self.assertTrue(CablePath.objects.filter(pk=path1.pk).exists())
+
+    def test_402_trace_paths_invalid_path(self):
+        """A path that can't be traced doesn't prevent updating the other paths traced with it."""
+        interface_type_id = ContentType.objects.get_for_model(Interface).pk
+        error = ValidationError("a loop is detected in the path")
+
+        def fake_update_cable_paths(origins, batch_size):
+            if any(pk == "bad" for _, pk in origins):
+                raise error
+            return (len(origins), 0, 0)
+
+        with mock.patch("nautobot.dcim.management.commands.trace_paths.update_cable_paths", fake_update_cable_paths):
+            self.assertEqual(trace_chunk(interface_type_id, ["good1", "good2"], 100), ((2, 0, 0), []))
+            self.assertEqual(
+                trace_chunk(interface_type_id, ["good1", "bad", "good2"], 100), ((2, 0, 0), [("bad", error)])
+            )
@@ -34,6 +34,7 @@ from nautobot.dcim.models import (
     InterfaceRedundancyGroup,
     InterfaceTemplate,
     Location,
+    LocationAncestry,
     LocationType,
     Manufacturer,
     Platform,
@@ -44,6 +45,7 @@ from nautobot.dcim.models import (
     PowerPanel,
     Rack,
     RackGroup,
+    RackReservation,
     RearPort,
     RearPortTemplate,
 )
@@ -611,6 +613,117 @@ class RackTestCase(ModelTestCases.BaseModelTestCase):
             rack.validated_save()
         self.assertIn('Racks may not associate to locations of type "Location Type B"', str(cm.exception))
 
+    def test_stored_utilization(self):
+        """The stored utilization of a Rack is kept up to date as Devices and RackReservations change."""
+
+        def assert_utilization(rack, numerator, denominator):
+            rack.refresh_from_db()
+            self.assertEqual((rack.utilization_numerator, rack.utilization_denominator), (numerator, denominator))
+            self.assertEqual((numerator, denominator), rack.get_utilization())
+            self.assertAlmostEqual(rack.utilization, 100 * numerator / denominator)
+
+        rack2 = Rack.objects.create(name="TestRack2", location=self.location1, status=self.status, u_height=10)
+        assert_utilization(rack2, 0, 10)
+
+        device = Device.objects.create(
+            name="TestSwitch1",
+            device_type=self.device_type["ff2048"],
+            role=self.device_roles[0],
+            status=self.device_status,
+            location=self.location1,
+            rack=self.rack,
+            position=1,
+            face=DeviceFaceChoices.FACE_FRONT,
+        )
+        assert_utilization(self.rack, 1, 42)
+
+        # Moving the device updates both racks
+        device.rack = rack2
+        device.save()
+        assert_utilization(self.rack, 0, 42)
+        assert_utilization(rack2, 1, 10)
+
+        # Changing the height of the device type updates the racks containing it
+        self.device_type["ff2048"].u_height = 2
+        self.device_type["ff2048"].save()
+        assert_utilization(rack2, 2, 10)
+
+        reservation = RackReservation.objects.create(
+            rack=rack2, units=[5, 6, 7], user=User.objects.create(username="reserver"), description="Reserved"
+        )
+        assert_utilization(rack2, 5, 10)
+
+        # Changing the height of the rack
+        rack2.u_height = 20
+        rack2.save()
+        assert_utilization(rack2, 5, 20)
+
+        # Moving the reservation updates both racks
+        reservation.rack = self.rack
+        reservation.save()
+        assert_utilization(rack2, 2, 20)
+        assert_utilization(self.rack, 3, 42)
+
+        reservation.delete()
+        assert_utilization(self.rack, 0, 42)
+        device.delete()
+        assert_utilization(rack2, 0, 20)
+
+    def test_occupancy(self):
+        """The occupancy of a Rack accounts for both faces, full-depth devices and reservations."""
+        rack2 = Rack.objects.create(name="TestRack2", location=self.location1, status=self.status, u_height=10)
+        half_depth_2u = DeviceType.objects.create(
+            manufacturer=self.manufacturer, model="Half Depth 2U", u_height=2, is_full_depth=False
+        )
+        half_depth_1u = DeviceType.objects.create(
+            manufacturer=self.manufacturer, model="Half Depth 1U", u_height=1, is_full_depth=False
+        )
+        for name, device_type, position, face in (
+            ("Front", half_depth_2u, 1, DeviceFaceChoices.FACE_FRONT),
+            ("Rear", half_depth_1u, 5, DeviceFaceChoices.FACE_REAR),
+            ("Full", self.device_type["ff2048"], 8, DeviceFaceChoices.FACE_FRONT),
+        ):
+            Device.objects.create(
+                name=name,
+                device_type=device_type,
+                role=self.device_roles[0],
+                status=self.device_status,
+                location=self.location1,
+                rack=rack2,
+                position=position,
+                face=face,
+            )
+        full_depth_device = Device.objects.get(name="Full")
+        reservation = RackReservation.objects.create(
+            rack=rack2, units=[10], user=User.objects.create(username="reserver"), description="Reserved"
+        )
+
+        # One query each for the racks, their devices and their reservations
+        with self.assertNumQueries(3):
+            occupancies = Rack.objects.filter(pk__in=[self.rack.pk, rack2.pk]).get_occupancies()
+        self.assertEqual(occupancies[self.rack.pk].get_available_units(), list(range(42, 0, -1)))
+        occupancy = occupancies[rack2.pk]
+        with self.assertNumQueries(0):
+            self.assertEqual(occupancy.get_available_units(face=DeviceFaceChoices.FACE_FRONT), [10, 9, 7, 6, 5, 4, 3])
+            self.assertEqual(occupancy.get_available_units(face=DeviceFaceChoices.FACE_REAR), [10, 9, 7, 6, 4, 3, 2, 1])
+            self.assertEqual(occupancy.get_available_units(u_height=2), [9, 6, 3])
+            self.assertEqual(occupancy.get_available_units(u_height=2, exclude=[full_depth_device.pk]), [9, 8, 7, 6, 3])
+            self.assertEqual(occupancy.get_reserved_units(), {10: reservation})
+            self.assertEqual(occupancy.get_utilization(), (5, 10))
+            rear_units = rack2.get_rack_units(face=DeviceFaceChoices.FACE_REAR, occupancy=occupancy)
+            self.assertEqual(
+                {unit["id"]: unit["device"].name for unit in rear_units if unit["device"]}, {5: "Rear", 8: "Full"}
+            )
+
+        # The occupancy of a single rack gives the same results as the Rack methods computing it on their own
+        self.assertEqual(rack2.get_available_units(u_height=2), [9, 6, 3])
+        self.assertEqual(rack2.get_utilization(), (5, 10))
+
+        Rack.objects.filter(pk=rack2.pk).update(utilization=0, utilization_numerator=0, utilization_denominator=0)
+        self.assertEqual(Rack.objects.filter(pk__in=[self.rack.pk, rack2.pk]).update_utilization(), 2)
+        rack2.refresh_from_db()
+        self.assertEqual((rack2.utilization_numerator, rack2.utilization_denominator, rack2.utilization), (5, 10, 50))
+
 
 class LocationTypeTestCase(TestCase):
     def test_reserved_names(self):
@@ -740,6 +853,42 @@ class LocationTestCase(ModelTestCases.BaseModelTestCase):
         self.assertEqual(location.longitude, Decimal("55.123457"))
         self.assertEqual(location.latitude, Decimal("55.123457"))
 
+    def test_location_ancestry(self):
+        """Test that the LocationAncestry closure table follows the creation and moving of Locations."""
+
+        def assert_ancestry_matches_tree():
+            for location in Location.objects.all():
+                self.assertEqual(
+                    list(location.ancestor_entries.values_list("ancestor", flat=True)),
+                    [location.pk] + list(location.ancestors().values_list("pk", flat=True))[::-1],
+                    location,
+                )
+
+        assert_ancestry_matches_tree()
+
+        root_1 = Location.objects.create(name="Root 1", location_type=self.root_nestable_type, status=self.status)
+        root_2 = Location.objects.create(name="Root 2", location_type=self.root_nestable_type, status=self.status)
+        branch = Location.objects.create(
+            name="Branch", location_type=self.root_nestable_type, parent=root_1, status=self.status
+        )
+        leaf = Location.objects.create(
+            name="Leaf", location_type=self.leaf_nestable_type, parent=branch, status=self.status
+        )
+        self.assertEqual(
+            list(leaf.ancestor_entries.values_list("depth", "ancestor")), [(0, leaf.pk), (1, branch.pk), (2, root_1.pk)]
+        )
+
+        # Moving a Location updates the ancestry of its whole subtree
+        branch.parent = root_2
+        branch.validated_save()
+        self.assertEqual(
+            list(leaf.ancestor_entries.values_list("depth", "ancestor")), [(0, leaf.pk), (1, branch.pk), (2, root_2.pk)]
+        )
+        assert_ancestry_matches_tree()
+
+        branch.delete()
+        self.assertFalse(LocationAncestry.objects.filter(location__in=[branch, leaf]).exists())
+
     def test_validate_unique(self):
         """Confirm that the uniqueness constraint on (parent, name) works when parent is None."""
         location_1 = Location(name="Campus 1", location_type=self.root_type, status=self.status)
@@ -0,0 +1,354 @@
+"""
+Bulk tracing of CablePaths.
+
+`CablePath.from_origin()` follows a path one hop at a time, querying the database for the cable, the far-end
+termination and any front port or circuit termination peer at every hop. `CablePathTracer` instead traces many paths
+side by side: at each step, the topology data needed by every unfinished trace is loaded at once, with one query per
+model, and kept in memory for the remainder of the trace. `update_cable_paths()` then writes the results back, only
+creating, updating or deleting the CablePaths that actually changed.
+"""
+
+from collections import defaultdict, namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from nautobot.dcim.utils import compile_path_node
+
+
+# The result of tracing the path from a single origin; `path` is a list of path nodes as stored in `CablePath.path`,
+# and `destination` is a `(content_type_id, pk)` tuple or None.
+TracedPath = namedtuple("TracedPath", ["path", "destination", "is_active", "is_split"])
+
+# Kinds of topology data loaded by `CablePathTracer`
+TERMINATION = "termination"  # (content_type_id, pk) -> termination data, or None
+CABLE = "cable"  # cable pk -> whether the cable is connected
+FRONT_PORT = "front_port"  # (rear_port_id, rear_port_position) -> (content_type_id, pk) of the FrontPort, or None
+CIRCUIT_PEER = "circuit_peer"  # (circuit_id, term_side) -> (content_type_id, pk) of the CircuitTermination, or None
+
+
+def _batched(batch_size, values):
+    values = list(values)
+    for i in range(0, len(values), batch_size):
+        yield values[i : i + batch_size]
+
+
+class CablePathTracer:
+    """
+    Trace the CablePaths originating from many path endpoints at once.
+
+    The loaded topology data is kept for the lifetime of the tracer, so a tracer should only be reused for as long as
+    the cables and terminations involved are not modified.
+    """
+
+    def __init__(self, batch_size=1000):
+        from nautobot.circuits.models import CircuitTermination
+        from nautobot.dcim.models import Cable, FrontPort, PathEndpoint, RearPort
+
+        self.batch_size = batch_size
+        self._data = {TERMINATION: {}, CABLE: {}, FRONT_PORT: {}, CIRCUIT_PEER: {}}
+
+        self.cable_type_id = ContentType.objects.get_for_model(Cable).pk
+        self.front_port_type_id = ContentType.objects.get_for_model(FrontPort).pk
+        self.rear_port_type_id = ContentType.objects.get_for_model(RearPort).pk
+        self.circuit_termination_type_id = ContentType.objects.get_for_model(CircuitTermination).pk
+        self.connected_status_id = getattr(Cable.STATUS_CONNECTED, "pk", None)
+        self._path_endpoint_class = PathEndpoint
+
+    def trace(self, origins):
+        """
+        Trace the paths from the given origins.
+
+        Args:
+            origins (iterable): `(content_type_id, pk)` tuples of the path endpoints to trace from.
+
+        Returns:
+            dict: `{origin: TracedPath}`, with a value of None for origins that have no cable.
+
+        Raises:
+            ValidationError: if a loop is detected in any of the paths.
+        """
+        traces = {origin: self._trace(origin) for origin in origins}
+        results = {}
+        while traces:
+            # Advance every trace until it either completes or needs topology data that hasn't been loaded yet
+            requests = defaultdict(set)
+            for origin, trace in list(traces.items()):
+                try:
+                    kind, key = next(trace)
+                except StopIteration as exc:
+                    results[origin] = exc.value
+                    del traces[origin]
+                else:
+                    requests[kind].add(key)
+
+            for kind, keys in requests.items():
+                getattr(self, f"_load_{kind}s")(keys)
+
+        return results
+
+    def _get(self, kind, key):
+        """Generator returning the topology data of the given kind and key, requesting it to be loaded if needed."""
+        if key not in self._data[kind]:
+            yield kind, key
+        return self._data[kind][key]
+
+    def _trace(self, origin):
+        """Generator tracing the path from a single origin. This mirrors `CablePath.from_origin()`."""
+        node = origin
+        termination = yield from self._get(TERMINATION, node)
+        if termination is None or termination["cable_id"] is None:
+            return None
+
+        destination = None
+        path = []
+        position_stack = []
+        is_active = True
+        is_split = False
+
+        visited_nodes = set()
+        while termination["cable_id"] is not None:
+            if node[1] in visited_nodes:
+                raise ValidationError("a loop is detected in the path")
+            visited_nodes.add(node[1])
+            if not self._data[CABLE][termination["cable_id"]]:
+                is_active = False
+
+            # Follow the cable to its far-end termination
+            path.append(compile_path_node(self.cable_type_id, termination["cable_id"]))
+            peer = termination["peer"]
+            peer_termination = None
+            if peer is not None:
+                peer_termination = yield from self._get(TERMINATION, peer)
+            if peer_termination is None:
+                break
+
+            # Follow a FrontPort to its corresponding RearPort
+            if peer[0] == self.front_port_type_id:
+                path.append(compile_path_node(*peer))
+                node = (self.rear_port_type_id, peer_termination["rear_port_id"])
+                termination = yield from self._get(TERMINATION, node)
+                if termination["positions"] > 1:
+                    position_stack.append(peer_termination["rear_port_position"])
+                path.append(compile_path_node(*node))
+
+            # Follow a RearPort to its corresponding FrontPort (if any)
+            elif peer[0] == self.rear_port_type_id:
+                path.append(compile_path_node(*peer))
+
+                # Determine the peer FrontPort's position
+                if peer_termination["positions"] == 1:
+                    position = 1
+                elif position_stack:
+                    position = position_stack.pop()
+                else:
+                    # No position indicated: path has split, so we stop at the RearPort
+                    is_split = True
+                    break
+
+                node = yield from self._get(FRONT_PORT, (peer[1], position))
+                if node is None:
+                    # No corresponding FrontPort found for the RearPort
+                    break
+                termination = self._data[TERMINATION][node]
+                path.append(compile_path_node(*node))
+
+            # Follow a Circuit Termination if there is a corresponding Circuit Termination
+            elif peer[0] == self.circuit_termination_type_id:
+                peer_side = "Z" if peer_termination["term_side"] == "A" else "A"
+                node = yield from self._get(CIRCUIT_PEER, (peer_termination["circuit_id"], peer_side))
+                # A Circuit Termination does not require a peer.
+                if node is None:
+                    destination = peer
+                    break
+                termination = self._data[TERMINATION][node]
+                path.append(compile_path_node(*peer))
+                path.append(compile_path_node(*node))
+
+            # Anything else marks the end of the path
+            else:
+                destination = peer
+                break
+
+        if destination is None:
+            is_active = False
+
+        return TracedPath(path=path, destination=destination, is_active=is_active, is_split=is_split)
+
+    def _get_termination_fields(self, model):
+        fields = ["pk", "cable_id", "_cable_peer_type_id", "_cable_peer_id"]
+        if issubclass(model, self._path_endpoint_class):
+            fields.append("_path_id")
+        if model._meta.model_name == "frontport":
+            fields += ["rear_port_id", "rear_port_position"]
+        elif model._meta.model_name == "rearport":
+            fields.append("positions")
+        elif model._meta.model_name == "circuittermination":
+            fields += ["circuit_id", "term_side"]
+        return fields
+
+    def _add_terminations(self, content_type_id, rows):
+        """Record the given termination `values()` rows, and load the cables that they are connected to."""
+        cable_ids = set()
+        for row in rows:
+            termination = dict(row)
+            termination["peer"] = None
+            peer_type_id = termination.pop("_cable_peer_type_id")
+            peer_id = termination.pop("_cable_peer_id")
+            if peer_type_id is not None and peer_id is not None:
+                termination["peer"] = (peer_type_id, peer_id)
+            self._data[TERMINATION][(content_type_id, termination["pk"])] = termination
+            if termination["cable_id"] is not None and termination["cable_id"] not in self._data[CABLE]:
+                cable_ids.add(termination["cable_id"])
+        if cable_ids:
+            self._load_cables(cable_ids)
+
+    def _load_terminations(self, keys):
+        pks_by_type = defaultdict(set)
+        for content_type_id, pk in keys:
+            pks_by_type[content_type_id].add(pk)
+
+        for content_type_id, pks in pks_by_type.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            fields = self._get_termination_fields(model)
+            for batch in _batched(self.batch_size, pks):
+                self._add_terminations(content_type_id, model.objects.filter(pk__in=batch).values(*fields))
+
+        for key in keys:
+            self._data[TERMINATION].setdefault(key, None)
+
+    def _load_cables(self, keys):
+        from nautobot.dcim.models import Cable
+
+        for batch in _batched(self.batch_size, keys):
+            for pk, status_id in Cable.objects.filter(pk__in=batch).values_list("pk", "status_id"):
+                self._data[CABLE][pk] = self.connected_status_id is not None and status_id == self.connected_status_id
+
+    def _load_front_ports(self, keys):
+        from nautobot.dcim.models import FrontPort
+
+        fields = self._get_termination_fields(FrontPort)
+        for batch in _batched(self.batch_size, {rear_port_id for rear_port_id, _ in keys}):
+            rows = list(FrontPort.objects.filter(rear_port_id__in=batch).values(*fields))
+            self._add_terminations(self.front_port_type_id, rows)
+            for row in rows:
+                self._data[FRONT_PORT][(row["rear_port_id"], row["rear_port_position"])] = (
+                    self.front_port_type_id,
+                    row["pk"],
+                )
+
+        for key in keys:
+            self._data[FRONT_PORT].setdefault(key, None)
+
+    def _load_circuit_peers(self, keys):
+        from nautobot.circuits.models import CircuitTermination
+
+        fields = self._get_termination_fields(CircuitTermination)
+        for batch in _batched(self.batch_size, {circuit_id for circuit_id, _ in keys}):
+            rows = list(CircuitTermination.objects.filter(circuit_id__in=batch).values(*fields))
+            self._add_terminations(self.circuit_termination_type_id, rows)
+            for row in rows:
+                self._data[CIRCUIT_PEER][(row["circuit_id"], row["term_side"])] = (
+                    self.circuit_termination_type_id,
+                    row["pk"],
+                )
+
+        for key in keys:
+            self._data[CIRCUIT_PEER].setdefault(key, None)
+
+    def get_path_id(self, origin):
+        """Return the `_path_id` recorded on a traced origin."""
+        termination = self._data[TERMINATION].get(origin)
+        return termination.get("_path_id") if termination else None
+
+
+def update_cable_paths(origins, batch_size=1000):
+    """
+    Trace the paths from the given origins, and create, update or delete their CablePaths to match.
+
+    CablePaths whose path, destination and status are unchanged are left untouched. Like `CablePath.save()`, this also
+    records a reference to each CablePath on its origin.
+
+    Args:
+        origins (iterable): `(content_type_id, pk)` tuples of the path endpoints to trace from.
+        batch_size (int): Number of objects to load or write per query.
+
+    Returns:
+        tuple: The number of CablePaths `(created, updated, deleted)`.
+    """
+    from nautobot.dcim.models import CablePath
+
+    origins = list(dict.fromkeys(origins))
+    tracer = CablePathTracer(batch_size=batch_size)
+    results = tracer.trace(origins)
+
+    pks_by_type = defaultdict(list)
+    for content_type_id, pk in origins:
+        pks_by_type[content_type_id].append(pk)
+    existing = {}
+    for content_type_id, pks in pks_by_type.items():
+        for batch in _batched(batch_size, pks):
+            for cable_path in CablePath.objects.filter(origin_type_id=content_type_id, origin_id__in=batch):
+                existing[(content_type_id, cable_path.origin_id)] = cable_path
+
+    fields = ["path", "destination_type_id", "destination_id", "is_active", "is_split"]
+    to_create = []
+    to_update = []
+    to_delete = []
+    cable_paths = {}
+    for origin in origins:
+        traced = results[origin]
+        cable_path = existing.get(origin)
+        if traced is None:
+            if cable_path is not None:
+                to_delete.append(cable_path.pk)
+            continue
+
+        destination_type_id, destination_id = traced.destination or (None, None)
+        values = {
+            "path": traced.path,
+            "destination_type_id": destination_type_id,
+            "destination_id": destination_id,
+            "is_active": traced.is_active,
+            "is_split": traced.is_split,
+        }
+        if cable_path is None:
+            cable_path = CablePath(origin_type_id=origin[0], origin_id=origin[1], **values)
+            to_create.append(cable_path)
+        elif any(getattr(cable_path, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(cable_path, field, value)
+            to_update.append(cable_path)
+        cable_paths[origin] = cable_path
+
+    with transaction.atomic():
+        CablePath.objects.filter(pk__in=to_delete).delete()
+        CablePath.objects.bulk_create(to_create, batch_size=batch_size)
+        CablePath.objects.bulk_update(to_update, fields, batch_size=batch_size)
+
+        # Record a direct reference to each CablePath on its originating object
+        origins_by_type = defaultdict(list)
+        for origin, cable_path in cable_paths.items():
+            if tracer.get_path_id(origin) != cable_path.pk:
+                origins_by_type[origin[0]].append((origin[1], cable_path.pk))
+        for content_type_id, paths in origins_by_type.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            model.objects.bulk_update(
+                [model(pk=pk, _path_id=path_id) for pk, path_id in paths], ["_path"], batch_size=batch_size
+            )
+
+    return len(to_create), len(to_update), len(to_delete)
+
+
+def update_cable_paths_containing(obj, batch_size=1000):
+    """
+    Retrace all CablePaths which traverse the specified node, updating only those which changed.
+
+    Returns:
+        tuple: The number of CablePaths `(created, updated, deleted)`.
+    """
+    from nautobot.dcim.models import CablePath
+
+    origins = CablePath.objects.filter(path__contains=obj).values_list("origin_type_id", "origin_id")
+    return update_cable_paths(origins, batch_size=batch_size)
@@ -1,10 +1,8 @@
-from django.contrib.contenttypes.models import ContentType
-
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 from rest_framework.fields import Field
 
-from nautobot.extras.models import CustomField
+from nautobot.extras.metadata import get_content_type_metadata
 
 
 #
@@ -23,8 +21,7 @@ class CustomFieldDefaultValues:
         self.model = serializer_field.parent.Meta.model
 
         # Retrieve the CustomFields for the parent model
-        content_type = ContentType.objects.get_for_model(self.model)
-        fields = CustomField.objects.filter(content_types=content_type)
+        fields = get_content_type_metadata(self.model).custom_fields
 
         # Populate the default value for each CustomField
         value = {}
@@ -46,10 +43,7 @@ class CustomFieldsDataField(Field):
         Cache CustomField keys assigned to this model to avoid redundant database queries
         """
         if not hasattr(self, "_custom_field_keys"):
-            content_type = ContentType.objects.get_for_model(self.parent.Meta.model)
-            self._custom_field_keys = CustomField.objects.filter(content_types=content_type).values_list(
-                "key", flat=True
-            )
+            self._custom_field_keys = [cf.key for cf in get_content_type_metadata(self.parent.Meta.model).custom_fields]
         return self._custom_field_keys
 
     def to_representation(self, obj):
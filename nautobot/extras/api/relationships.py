@@ -16,6 +16,7 @@ from nautobot.core.api.utils import (
 )
 from nautobot.extras.choices import RelationshipSideChoices
 from nautobot.extras.models import Relationship
+from nautobot.extras.models.relationships import prefetch_relationship_peers
 
 logger = logging.getLogger(__name__)
 
@@ -106,7 +107,20 @@ class RelationshipsDataField(WritableSerializerMixin, JSONField):
                 }`
         """
         data = {}
-        relationships_data = value.get_relationships(include_hidden=True)
+        relationships_data = {
+            side: {relationship: list(associations) for relationship, associations in relationships.items()}
+            for side, relationships in value.get_relationships(include_hidden=True).items()
+        }
+        # Load the peers of all the associations at once
+        prefetch_relationship_peers(
+            [
+                association
+                for relationships in relationships_data.values()
+                for associations in relationships.values()
+                for association in associations
+            ],
+            [value],
+        )
         for this_side, relationships in relationships_data.items():
             for relationship, associations in relationships.items():
                 depth = int(self.context.get("depth", 0))
@@ -255,6 +255,13 @@ class DynamicGroupSerializer(NautobotModelSerializer):
             "filter": {"read_only": False},
         }
 
+    def get_field_names(self, declared_fields, info):
+        """Ensure that the internal "query_version" stamp is not exposed."""
+        fields = list(super().get_field_names(declared_fields, info))
+        if "query_version" in fields:
+            fields.remove("query_version")
+        return fields
+
 
 #
 # Export templates
@@ -949,6 +949,8 @@ class ObjectChangeViewSet(ReadOnlyModelViewSet):
     queryset = ObjectChange.objects.select_related("user")
     serializer_class = serializers.ObjectChangeSerializer
     filterset_class = filters.ObjectChangeFilterSet
+    # Newest changes first, as for the default ordering, when using keyset (cursor) pagination
+    cursor_ordering = ("-time", "pk")
 
 
 #
@@ -44,10 +44,20 @@ JOB_LOG_MAX_GROUPING_LENGTH = 100
 JOB_LOG_MAX_LOG_OBJECT_LENGTH = 200
 JOB_LOG_MAX_ABSOLUTE_URL_LENGTH = 255
 
+# Number of JobLogEntries, and maximum number of seconds, that job logging buffers before writing them to the database
+JOB_LOG_BUFFER_SIZE = 100
+JOB_LOG_FLUSH_INTERVAL = 1
+
 # ChangeLog Truncation Length
 CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL = 400
 CHANGELOG_MAX_OBJECT_REPR = 200
 
+# Number of ObjectChanges buffered by a change context before they are written to the database
+CHANGELOG_MAX_BUFFERED_CHANGES = 1000
+
+# Number of objects whose custom field data is rewritten by a single query when a custom field or choice changes
+CUSTOM_FIELD_DATA_BATCH_SIZE = 1000
+
 # JobResult custom Celery kwargs
 JOB_RESULT_CUSTOM_CELERY_KWARGS = (
     "nautobot_job_profile",
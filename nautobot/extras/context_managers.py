@@ -1,11 +1,168 @@
-import uuid
 from contextlib import contextmanager
+import logging
+import uuid
+import weakref
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.test.client import RequestFactory
+from django.utils import timezone
 
-from nautobot.extras.choices import ObjectChangeEventContextChoices
+from nautobot.extras.choices import ObjectChangeActionChoices, ObjectChangeEventContextChoices
+from nautobot.extras.constants import CHANGELOG_MAX_BUFFERED_CHANGES
+from nautobot.extras.models import ObjectChange
 from nautobot.extras.signals import change_context_state
+from nautobot.extras.webhooks import enqueue_webhooks
+
+logger = logging.getLogger(__name__)
+
+
+class _TransactionState:
+    """
+    Fate of the changes recorded in a single transaction or savepoint, as reported by its `_TransactionMarker`.
+
+    The marker is only referenced by the connection's list of `on_commit()` callbacks, so once Django discards it
+    (because the transaction or savepoint was rolled back) it is garbage-collected and the state is no longer pending.
+    """
+
+    def __init__(self):
+        self.committed = False
+        marker = _TransactionMarker(self)
+        self._marker = weakref.ref(marker)
+        transaction.on_commit(marker)
+
+    @property
+    def pending(self):
+        """Whether the transaction has neither been committed nor rolled back yet."""
+        return not self.committed and self._marker() is not None
+
+    @property
+    def rolled_back(self):
+        """Whether the transaction was rolled back, the on_commit() callback having been discarded uncalled."""
+        return not self.committed and self._marker() is None
+
+
+class _TransactionMarker:
+    """Callback registered with `transaction.on_commit()` to record the commit of a transaction."""
+
+    def __init__(self, state):
+        self.state = state
+
+    def __call__(self):
+        self.state.committed = True
+
+
+class ObjectChangeBuffer:
+    """
+    In-memory buffer of the ObjectChange records of a single ChangeContext.
+
+    Repeated changes to the same object are coalesced into a single record, and the buffer is written to the database
+    with a single `bulk_create()` when flushed, at which point the webhooks and job hooks for the written records are
+    dispatched. Changes which were rolled back in the meantime are discarded rather than written.
+    """
+
+    def __init__(self):
+        self.object_changes = []
+        # {(changed_object_type_id, changed_object_id): index in self.object_changes} of the records that may be updated
+        self._index = {}
+        # {object_change.pk: _TransactionState} of the records made inside a transaction
+        self._transactions = {}
+        # {tuple(connection.savepoint_ids): _TransactionState} of the transactions seen so far
+        self._transaction_states = {}
+
+    def __len__(self):
+        return len(self.object_changes)
+
+    def _get_transaction_state(self):
+        """Return the state of the current transaction and savepoint, or None when in autocommit mode."""
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            return None
+        # atomic(savepoint=False) blocks record a None savepoint id, their fate being that of the enclosing savepoint
+        state = tuple(sid for sid in connection.savepoint_ids if sid is not None)
+        transaction_state = self._transaction_states.get(state)
+        # A previous transaction with the same savepoint ids has already ended, so this one needs a new marker
+        if transaction_state is None or not transaction_state.pending:
+            transaction_state = _TransactionState()
+            self._transaction_states[state] = transaction_state
+        return transaction_state
+
+    def add(self, object_change):
+        """
+        Add the given ObjectChange to the buffer.
+
+        An update to an object already recorded in this buffer, within the same transaction, is merged into the
+        existing record, which keeps its action but takes on the latest data of the object.
+        """
+        # bulk_create() happens at flush time, so record when the change was actually made
+        object_change.time = timezone.now()
+        key = (object_change.changed_object_type_id, object_change.changed_object_id)
+        transaction_state = self._get_transaction_state()
+        index = self._index.get(key)
+        if object_change.action == ObjectChangeActionChoices.ACTION_UPDATE and index is not None:
+            existing = self.object_changes[index]
+            existing_state = self._transactions.get(existing.pk)
+            if existing_state is transaction_state or (transaction_state is None and existing_state.committed):
+                existing.time = object_change.time
+                existing.object_repr = object_change.object_repr
+                existing.object_data = object_change.object_data
+                existing.object_data_v2 = object_change.object_data_v2
+                return existing
+
+        if not object_change.user_name:
+            object_change.user_name = object_change.user.username if object_change.user else "Undefined"
+        if object_change.action == ObjectChangeActionChoices.ACTION_DELETE:
+            self._index.pop(key, None)
+        else:
+            self._index[key] = len(self.object_changes)
+        if transaction_state is not None:
+            self._transactions[object_change.pk] = transaction_state
+        self.object_changes.append(object_change)
+
+        if len(self.object_changes) >= CHANGELOG_MAX_BUFFERED_CHANGES:
+            self.flush()
+        return object_change
+
+    def discard(self):
+        """Discard the buffered ObjectChanges without writing them."""
+        self.object_changes = []
+        self._index = {}
+        self._transactions = {}
+        self._transaction_states = {}
+
+    def flush(self):
+        """
+        Write the buffered ObjectChanges that were not rolled back to the database, then enqueue their webhooks and
+        job hooks.
+
+        Returns:
+            (list[ObjectChange]): The ObjectChanges that were written.
+        """
+        from nautobot.extras.jobs import enqueue_job_hooks, get_job_hooks_for_object_change  # avoid circular import
+
+        object_changes = [
+            object_change
+            for object_change in self.object_changes
+            if object_change.pk not in self._transactions or not self._transactions[object_change.pk].rolled_back
+        ]
+        self.discard()
+        if not object_changes:
+            return []
+
+        ObjectChange.objects.bulk_create(object_changes, batch_size=CHANGELOG_MAX_BUFFERED_CHANGES)
+
+        enqueue_webhooks(object_changes)
+
+        # Look up the applicable job hooks only once per object type and action
+        job_hooks = {}
+        for object_change in object_changes:
+            key = (object_change.changed_object_type_id, object_change.action)
+            if key not in job_hooks:
+                job_hooks[key] = list(get_job_hooks_for_object_change(object_change))
+            if job_hooks[key]:
+                enqueue_job_hooks(object_change, jobhook_queryset=job_hooks[key])
+
+        return object_changes
 
 
 class ChangeContext:
@@ -43,6 +200,8 @@ class ChangeContext:
         if self.change_id is None:
             self.change_id = uuid.uuid4()
 
+        self.object_changes = ObjectChangeBuffer()
+
     def get_user(self):
         """Return self.user if set, otherwise return self.request.user"""
         if self.user is not None:
@@ -80,6 +239,10 @@ def change_logging(change_context):
     Enable change logging by connecting the appropriate signals to their receivers before code is run, and
     disconnecting them afterward.
 
+    The ObjectChanges recorded while the context is active are buffered in memory and written to the database,
+    together with the dispatch of their webhooks and job hooks, when the context exits. If it exits with an exception
+    inside a transaction, which is then expected to be rolled back, the buffered ObjectChanges are discarded instead.
+
     :param change_context: ChangeContext instance
     """
 
@@ -88,10 +251,22 @@ def change_logging(change_context):
 
     try:
         yield
-    finally:
+    except BaseException:
         # Reset change logging state. This is necessary to avoid recording any errant
         # changes during test cleanup.
         change_context_state.reset(prev_state)
+        if transaction.get_connection().in_atomic_block:
+            change_context.object_changes.discard()
+        else:
+            # The changes made so far were committed, but the original exception must not be masked
+            try:
+                change_context.object_changes.flush()
+            except Exception:
+                logger.exception("Failed to write the change log of change context %s", change_context.change_id)
+        raise
+    else:
+        change_context_state.reset(prev_state)
+        change_context.object_changes.flush()
 
 
 @contextmanager
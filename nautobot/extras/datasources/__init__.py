@@ -2,6 +2,7 @@ from .git import (
     enqueue_git_repository_diff_origin_and_local,
     enqueue_pull_git_repository_and_refresh_data,
     ensure_git_repository,
+    get_git_repository_sync_state,
     git_repository_dry_run,
 )
 from .registry import (
@@ -16,6 +17,7 @@ __all__ = (
     "ensure_git_repository",
     "get_datasource_content_choices",
     "get_datasource_contents",
+    "get_git_repository_sync_state",
     "git_repository_dry_run",
     "refresh_datasource_content",
 )
@@ -18,6 +18,7 @@ from nautobot.core.celery import app as celery_app
 from nautobot.core.utils.git import GitRepo
 from nautobot.dcim.models import Device, DeviceType, Location, Platform
 from nautobot.extras.choices import (
+    JobResultStatusChoices,
     LogLevelChoices,
     SecretsGroupAccessTypeChoices,
     SecretsGroupSecretTypeChoices,
@@ -48,6 +49,24 @@ GitJobResult = namedtuple("GitJobResult", ["job_result", "repository_record"])
 # namedtuple takes from_url(remote git repository url), to_path(local path of git repo), from_branch(git branch)
 GitRepoInfo = namedtuple("GitRepoInfo", ["from_url", "to_path", "from_branch"])
 
+# namedtuple takes previous_head(commit hash of the last successful sync), repo_helper(GitRepo instance),
+# changed_files(paths of the files added, modified or deleted since the last successful sync)
+GitRepoChanges = namedtuple("GitRepoChanges", ["previous_head", "repo_helper", "changed_files"])
+
+# Subdirectories of config_contexts/ whose files each define a config context with the filter implied by the file name
+CONFIG_CONTEXT_FILTER_TYPES = (
+    "locations",
+    "device_types",
+    "roles",
+    "platforms",
+    "cluster_groups",
+    "clusters",
+    "tenant_groups",
+    "tenants",
+    "tags",
+    "dynamic_groups",
+)
+
 
 def enqueue_git_repository_helper(repository, user, job_class, **kwargs):
     """
@@ -189,6 +208,162 @@ def git_repository_dry_run(repository_record, logger):  # pylint: disable=redefi
     logger.info("Repository dry run successful")
 
 
+def record_failed_file(repository_record, file_path):
+    """Record that a file of a Git repository failed to load during the ongoing sync, so that the next sync retries it."""
+    if not hasattr(repository_record, "_git_failed_files"):
+        repository_record._git_failed_files = set()
+    repository_record._git_failed_files.add(os.path.relpath(file_path, repository_record.filesystem_path))
+
+
+def record_refreshed_content(repository_record, content_identifier):
+    """Record that the given content was completely refreshed by the ongoing sync of a Git repository."""
+    if not hasattr(repository_record, "_git_refreshed_contents"):
+        repository_record._git_refreshed_contents = set()
+    repository_record._git_refreshed_contents.add(content_identifier)
+
+
+def get_git_repository_sync_state(repository_record, failed=False):
+    """Get the state of the ongoing sync of a Git repository, to be recorded in the result of its JobResult.
+
+    Args:
+        repository_record (GitRepository): Repository being synced.
+        failed (bool): Whether the sync failed, in which case only the content that was completely refreshed is
+            recorded as provided.
+
+    Returns:
+        (dict): The current head, the provided contents, and the paths of the files that failed to load.
+    """
+    provided_contents = repository_record.provided_contents
+    if failed:
+        refreshed_contents = getattr(repository_record, "_git_refreshed_contents", set())
+        provided_contents = [content for content in provided_contents if content in refreshed_contents]
+    return {
+        "head": repository_record.current_head,
+        "provided_contents": provided_contents,
+        "failed_files": sorted(getattr(repository_record, "_git_failed_files", ())),
+    }
+
+
+def get_repo_changes_since_last_sync(
+    repository_record, job_result, content_identifier, log_grouping, owned_records=(), get_drifted_files=None
+):
+    """Get the files of a Git repository that need to be loaded again since the given content was last synced from it.
+
+    Content is only refreshed incrementally if the latest previous sync of the repository recorded its state, the
+    repository already provided this content then, and the commit synced then is an ancestor of the current head.
+    The files to load are then those changed since that commit, those that failed to load in that sync, and those
+    providing records whose data was modified since. Otherwise, such as after the branch history has been rewritten,
+    all of the content is refreshed.
+
+    Args:
+        repository_record (GitRepository): Repository being synced, with its current head already checked out.
+        job_result (JobResult): JobResult of the ongoing sync.
+        content_identifier (str): Identifier of the content being refreshed, such as "extras.configcontext".
+        log_grouping (str): Grouping of the log entries of the JobResult.
+        owned_records (list): Querysets of the records wholly provided by the repository for this content; any
+            modification of these since the last sync causes all of the content to be refreshed.
+        get_drifted_files (callable): Function taking the completion time of the last sync and returning the paths of
+            the files providing data which was modified since, such as local config context data of devices.
+
+    Returns:
+        (GitRepoChanges): The changes since the last sync, or None if all of the content needs to be refreshed.
+    """
+    from nautobot.core.jobs import GitRepositorySync
+
+    previous_sync = (
+        JobResult.objects.filter(
+            job_model__module_name=GitRepositorySync.__module__,
+            job_model__job_class_name=GitRepositorySync.__name__,
+            task_kwargs__repository=str(repository_record.pk),
+        )
+        .exclude(pk=job_result.pk)
+        .order_by("-date_created")
+        .first()
+    )
+    if previous_sync is None or previous_sync.status not in JobResultStatusChoices.READY_STATES:
+        return None
+    # See GitRepositorySync.run() and GitRepositorySync.after_return()
+    if not isinstance(previous_sync.result, dict) or not previous_sync.result.get("head"):
+        return None
+    if content_identifier not in previous_sync.result.get("provided_contents", ()):
+        return None
+    if previous_sync.date_done is None or any(
+        records.filter(last_updated__gt=previous_sync.date_done).exists() for records in owned_records
+    ):
+        msg = "Records provided by this repository were modified since the last sync, refreshing all files"
+        logger.info(msg)
+        job_result.log(msg, grouping=log_grouping)
+        return None
+
+    previous_head = previous_sync.result["head"]
+    # The diff is shared by the callbacks of all of the content types refreshed during the same sync
+    cached_changes = getattr(repository_record, "_git_repo_changes", None)
+    if cached_changes is not None and cached_changes[0] == (previous_head, repository_record.current_head):
+        repo_helper, changed_files = cached_changes[1]
+    else:
+        from_url, to_path, _ = get_repo_from_url_to_path_and_from_branch(repository_record)
+        repo_helper = GitRepo(to_path, from_url, clone_initially=False)
+        changed_files = repo_helper.get_changed_files(previous_head, repository_record.current_head)
+        repository_record._git_repo_changes = (
+            (previous_head, repository_record.current_head),
+            (repo_helper, changed_files),
+        )
+    if changed_files is None:
+        msg = f"Commit `{previous_head}` of the last sync is no longer in the branch history, refreshing all files"
+        logger.info(msg)
+        job_result.log(msg, grouping=log_grouping)
+        return None
+
+    msg = f"Refreshing only the {len(changed_files)} file(s) changed since commit `{previous_head}` of the last sync"
+    logger.info(msg)
+    job_result.log(msg, grouping=log_grouping)
+
+    failed_files = set(previous_sync.result.get("failed_files", ())) - set(changed_files)
+    if failed_files:
+        msg = f"Retrying the {len(failed_files)} file(s) which failed to load in the last sync"
+        logger.info(msg)
+        job_result.log(msg, grouping=log_grouping)
+    drifted_files = set()
+    if get_drifted_files is not None:
+        drifted_files = set(get_drifted_files(previous_sync.date_done)) - set(changed_files) - failed_files
+    if drifted_files:
+        msg = f"Reverting the data provided by {len(drifted_files)} file(s) which was modified since the last sync"
+        logger.info(msg)
+        job_result.log(msg, grouping=log_grouping)
+
+    return GitRepoChanges(
+        previous_head=previous_head,
+        repo_helper=repo_helper,
+        changed_files=set(changed_files) | failed_files | drifted_files,
+    )
+
+
+def is_file_changed(repository_record, changes, file_path):
+    """Check whether the given file of a Git repository needs to be loaded, given its changes since the last sync."""
+    return changes is None or os.path.relpath(file_path, repository_record.filesystem_path) in changes.changed_files
+
+
+def get_previous_record_names(changes, paths):
+    """Get the names of the records defined by the given data files as of the last sync of a Git repository.
+
+    Each data file defines one record, as a dict with a `_metadata` key, or a list thereof. Files that didn't exist
+    or weren't valid as of the last sync are ignored.
+    """
+    names = set()
+    for path in paths:
+        contents = changes.repo_helper.get_file_contents(changes.previous_head, path)
+        if contents is None:
+            continue
+        try:
+            data = yaml.safe_load(contents)
+        except yaml.YAMLError:
+            continue
+        for entry in data if isinstance(data, list) else [data]:
+            if isinstance(entry, dict) and isinstance(entry.get("_metadata"), dict) and "name" in entry["_metadata"]:
+                names.add(entry["_metadata"]["name"])
+    return names
+
+
 #
 # Config context handling
 #
@@ -208,6 +383,19 @@ def update_git_config_contexts(repository_record, job_result):
     if not os.path.isdir(config_context_path):
         return
 
+    git_repository_content_type = ContentType.objects.get_for_model(GitRepository)
+    changes = get_repo_changes_since_last_sync(
+        repository_record,
+        job_result,
+        "extras.configcontext",
+        "config contexts",
+        owned_records=[
+            ConfigContext.objects.filter(
+                owner_content_type=git_repository_content_type, owner_object_id=repository_record.pk
+            ),
+        ],
+        get_drifted_files=lambda since: get_drifted_local_config_context_files(repository_record, since),
+    )
     managed_config_contexts = set()
     managed_local_config_contexts = defaultdict(set)
 
@@ -216,6 +404,8 @@ def update_git_config_contexts(repository_record, job_result):
     for file_name in os.listdir(config_context_path):
         if not os.path.isfile(os.path.join(config_context_path, file_name)):
             continue
+        if not is_file_changed(repository_record, changes, os.path.join(config_context_path, file_name)):
+            continue
         msg = f"Loading config context from `{file_name}`"
         logger.info(msg)
         job_result.log(msg, grouping="config contexts")
@@ -225,12 +415,15 @@ def update_git_config_contexts(repository_record, job_result):
                 context_data = yaml.safe_load(fd)
 
             # A file can contain one config context dict or a list thereof
+            file_path = os.path.join(config_context_path, file_name)
             if isinstance(context_data, dict):
-                context_name = import_config_context(context_data, repository_record, job_result)
+                context_name = import_config_context(context_data, repository_record, job_result, file_path=file_path)
                 managed_config_contexts.add(context_name)
             elif isinstance(context_data, list):
                 for context_data_entry in context_data:
-                    context_name = import_config_context(context_data_entry, repository_record, job_result)
+                    context_name = import_config_context(
+                        context_data_entry, repository_record, job_result, file_path=file_path
+                    )
                     managed_config_contexts.add(context_name)
             else:
                 raise RuntimeError("data must be a dict or list of dicts")
@@ -239,20 +432,10 @@ def update_git_config_contexts(repository_record, job_result):
             msg = f"Error in loading config context data from `{file_name}`: {exc}"
             logger.error(msg)
             job_result.log(msg, level_choice=LogLevelChoices.LOG_ERROR, grouping="config contexts")
+            record_failed_file(repository_record, os.path.join(config_context_path, file_name))
 
     # Next, handle the "filter/name" directory structure case - files in <filter_type>/<name>.(json|yaml)
-    for filter_type in (
-        "locations",
-        "device_types",
-        "roles",
-        "platforms",
-        "cluster_groups",
-        "clusters",
-        "tenant_groups",
-        "tenants",
-        "tags",
-        "dynamic_groups",
-    ):
+    for filter_type in CONFIG_CONTEXT_FILTER_TYPES:
         if os.path.isdir(os.path.join(repository_record.filesystem_path, filter_type)):
             msg = (
                 f'Found "{filter_type}" directory in the repository root. If this is meant to contain config contexts, '
@@ -266,6 +449,8 @@ def update_git_config_contexts(repository_record, job_result):
             continue
 
         for file_name in os.listdir(dir_path):
+            if not is_file_changed(repository_record, changes, os.path.join(dir_path, file_name)):
+                continue
             name = os.path.splitext(file_name)[0]
             msg = f'Loading config context, filter `{filter_type} = [name: "{name}"]`, from `{filter_type}/{file_name}`'
             logger.info(msg)
@@ -283,12 +468,15 @@ def update_git_config_contexts(repository_record, job_result):
                 else:
                     context_data.setdefault("_metadata", {}).setdefault(filter_type, []).append({"name": name})
 
-                context_name = import_config_context(context_data, repository_record, job_result)
+                context_name = import_config_context(
+                    context_data, repository_record, job_result, file_path=os.path.join(dir_path, file_name)
+                )
                 managed_config_contexts.add(context_name)
             except Exception as exc:
                 msg = f"Error in loading config context data from `{file_name}`: {exc}"
                 logger.error(msg)
                 job_result.log(msg, level_choice=LogLevelChoices.LOG_ERROR, grouping="config contexts")
+                record_failed_file(repository_record, os.path.join(dir_path, file_name))
 
     # Finally, handle device- and virtual-machine-specific "local" context in (devices|virtual_machines)/<name>.(json|yaml)
     for local_type in ("devices", "virtual_machines"):
@@ -306,6 +494,9 @@ def update_git_config_contexts(repository_record, job_result):
 
         for file_name in os.listdir(dir_path):
             device_name = os.path.splitext(file_name)[0]
+            if not is_file_changed(repository_record, changes, os.path.join(dir_path, file_name)):
+                managed_local_config_contexts[local_type].add(device_name)
+                continue
             msg = f"Loading local config context for `{device_name}` from `{local_type}/{file_name}`"
             logger.info(msg)
             job_result.log(msg, grouping="local config contexts")
@@ -318,12 +509,33 @@ def update_git_config_contexts(repository_record, job_result):
                     device_name,
                     context_data,
                     repository_record,
+                    file_path=os.path.join(dir_path, file_name),
                 )
                 managed_local_config_contexts[local_type].add(device_name)
             except Exception as exc:
                 msg = f"Error in loading local config context from `{local_type}/{file_name}`: {exc}"
                 logger.error(msg)
                 job_result.log(msg, level_choice=LogLevelChoices.LOG_ERROR, grouping="local config contexts")
+                record_failed_file(repository_record, os.path.join(dir_path, file_name))
+
+    if changes is not None:
+        # Only the config contexts defined by the changed files as of the last sync may need to be deleted
+        changed_context_files = set()
+        for path in changes.changed_files:
+            parts = path.split("/")
+            if parts[0] == "config_contexts" and (
+                len(parts) == 2 or (len(parts) == 3 and parts[1] in CONFIG_CONTEXT_FILTER_TYPES)
+            ):
+                changed_context_files.add(path)
+        deleted_config_contexts = get_previous_record_names(changes, changed_context_files) - managed_config_contexts
+        managed_config_contexts = (
+            set(
+                ConfigContext.objects.filter(
+                    owner_content_type=git_repository_content_type, owner_object_id=repository_record.pk
+                ).values_list("name", flat=True)
+            )
+            - deleted_config_contexts
+        )
 
     # Delete any prior contexts that are owned by this repository but were not created/updated above
     delete_git_config_contexts(
@@ -332,12 +544,49 @@ def update_git_config_contexts(repository_record, job_result):
         preserve=managed_config_contexts,
         preserve_local=managed_local_config_contexts,
     )
+    record_refreshed_content(repository_record, "extras.configcontext")
+
+
+def get_drifted_local_config_context_files(repository_record, since):
+    """Get the paths of the files providing local config context data to devices and virtual machines, whose data
+    was modified since the given time.
+
+    Only the devices and virtual machines updated since then are checked, and only their local config context data is
+    compared with the file providing it, so that other changes to these records are ignored.
+    """
+    git_repository_content_type = ContentType.objects.get_for_model(GitRepository)
+    drifted_files = set()
+    for local_type, model in (("devices", Device), ("virtual_machines", VirtualMachine)):
+        dir_path = os.path.join(repository_record.filesystem_path, "config_contexts", local_type)
+        if not os.path.isdir(dir_path):
+            continue
+        file_names = {os.path.splitext(file_name)[0]: file_name for file_name in os.listdir(dir_path)}
+        records = model.objects.filter(
+            local_config_context_data_owner_content_type=git_repository_content_type,
+            local_config_context_data_owner_object_id=repository_record.pk,
+            last_updated__gt=since,
+        ).values_list("name", "local_config_context_data")
+        for name, local_config_context_data in records.iterator():
+            if name not in file_names:
+                continue
+            file_path = os.path.join(dir_path, file_names[name])
+            try:
+                with open(file_path, "r") as fd:
+                    context_data = yaml.safe_load(fd)
+            except (OSError, yaml.YAMLError):
+                context_data = None
+            if local_config_context_data != context_data:
+                drifted_files.add(os.path.relpath(file_path, repository_record.filesystem_path))
+    return drifted_files
 
 
-def import_config_context(context_data, repository_record, job_result):
+def import_config_context(context_data, repository_record, job_result, file_path=None):
     """
     Parse a given dictionary of data to create/update a ConfigContext record.
 
+    If given, `file_path` is the data file the dictionary was loaded from, recorded as failed if the record can only
+    be partially loaded.
+
     The dictionary is expected to have a key "_metadata" which defines properties on the ConfigContext record itself
     (name, weight, description, etc.), while all other keys in the dictionary will go into the record's "data" field.
 
@@ -444,6 +693,8 @@ def import_config_context(context_data, repository_record, job_result):
                     job_result.log(
                         msg, obj=context_record, level_choice=LogLevelChoices.LOG_ERROR, grouping="config contexts"
                     )
+                    if file_path is not None:
+                        record_failed_file(repository_record, file_path)
         else:
             if context_record.config_context_schema is not None:
                 context_record.config_context_schema = None
@@ -486,9 +737,11 @@ def import_config_context(context_data, repository_record, job_result):
     return context_record.name if context_record else None
 
 
-def import_local_config_context(local_type, device_name, context_data, repository_record):
+def import_local_config_context(local_type, device_name, context_data, repository_record, file_path=None):
     """
     Create/update the local config context data associated with a Device or VirtualMachine.
+
+    If given, `file_path` is the data file the data was loaded from, recorded as failed if it cannot be applied.
     """
     try:
         if local_type == "devices":
@@ -511,6 +764,8 @@ def import_local_config_context(local_type, device_name, context_data, repositor
             record.local_config_context_data_owner,
             extra={"object": record, "grouping": "local config contexts"},
         )
+        if file_path is not None:
+            record_failed_file(repository_record, file_path)
         return
 
     if record.local_config_context_data == context_data and record.local_config_context_data_owner == repository_record:
@@ -581,11 +836,25 @@ def update_git_config_context_schemas(repository_record, job_result):
     if not os.path.isdir(config_context_schema_path):
         return
 
+    git_repository_content_type = ContentType.objects.get_for_model(GitRepository)
+    changes = get_repo_changes_since_last_sync(
+        repository_record,
+        job_result,
+        "extras.configcontextschema",
+        "config context schemas",
+        owned_records=[
+            ConfigContextSchema.objects.filter(
+                owner_content_type=git_repository_content_type, owner_object_id=repository_record.pk
+            )
+        ],
+    )
     managed_config_context_schemas = set()
 
     for file_name in os.listdir(config_context_schema_path):
         if not os.path.isfile(os.path.join(config_context_schema_path, file_name)):
             continue
+        if not is_file_changed(repository_record, changes, os.path.join(config_context_schema_path, file_name)):
+            continue
         msg = (f"Loading config context schema from `{file_name}`",)
         logger.info(msg)
         job_result.log(msg, grouping="config context schemas")
@@ -611,6 +880,24 @@ def update_git_config_context_schemas(repository_record, job_result):
             msg = f"Error in loading config context schema data from `{file_name}`: {exc}"
             logger.error(msg)
             job_result.log(msg, level_choice=LogLevelChoices.LOG_ERROR, grouping="config context schemas")
+            record_failed_file(repository_record, os.path.join(config_context_schema_path, file_name))
+
+    if changes is not None:
+        # Only the config context schemas defined by the changed files as of the last sync may need to be deleted
+        changed_schema_files = {
+            path for path in changes.changed_files if path.split("/")[:-1] == ["config_context_schemas"]
+        }
+        deleted_config_context_schemas = (
+            get_previous_record_names(changes, changed_schema_files) - managed_config_context_schemas
+        )
+        managed_config_context_schemas = (
+            set(
+                ConfigContextSchema.objects.filter(
+                    owner_content_type=git_repository_content_type, owner_object_id=repository_record.pk
+                ).values_list("name", flat=True)
+            )
+            - deleted_config_context_schemas
+        )
 
     # Delete any prior contexts that are owned by this repository but were not created/updated above
     delete_git_config_context_schemas(
@@ -618,6 +905,7 @@ def update_git_config_context_schemas(repository_record, job_result):
         job_result,
         preserve=managed_config_context_schemas,
     )
+    record_refreshed_content(repository_record, "extras.configcontextschema")
 
 
 def import_config_context_schema(context_schema_data, repository_record, job_result):
@@ -829,6 +1117,17 @@ def update_git_export_templates(repository_record, job_result):
         return
 
     git_repository_content_type = ContentType.objects.get_for_model(GitRepository)
+    changes = get_repo_changes_since_last_sync(
+        repository_record,
+        job_result,
+        "extras.exporttemplate",
+        "export templates",
+        owned_records=[
+            ExportTemplate.objects.filter(
+                owner_content_type=git_repository_content_type, owner_object_id=repository_record.pk
+            )
+        ],
+    )
 
     managed_export_templates = {}
     for model_content_type, file_path in files_from_contenttype_directories(
@@ -837,10 +1136,12 @@ def update_git_export_templates(repository_record, job_result):
         file_name = os.path.basename(file_path)
         app_label = model_content_type.app_label
         modelname = model_content_type.model
+        managed_export_templates.setdefault(f"{app_label}.{modelname}", set()).add(file_name)
+        if not is_file_changed(repository_record, changes, file_path):
+            continue
         msg = f"Loading `{app_label}.{modelname}` export template from `{file_name}`"
         logger.info(msg)
         job_result.log(msg, grouping="export templates")
-        managed_export_templates.setdefault(f"{app_label}.{modelname}", set()).add(file_name)
         template_record = None
         try:
             with open(file_path, "r") as fd:
@@ -913,9 +1214,11 @@ def update_git_export_templates(repository_record, job_result):
             job_result.log(
                 str(exc), obj=template_record, level_choice=LogLevelChoices.LOG_ERROR, grouping="export templates"
             )
+            record_failed_file(repository_record, file_path)
 
     # Delete any prior templates that are owned by this repository but were not discovered above
     delete_git_export_templates(repository_record, job_result, preserve=managed_export_templates)
+    record_refreshed_content(repository_record, "extras.exporttemplate")
 
 
 def delete_git_export_templates(repository_record, job_result, preserve=None):
@@ -29,10 +29,9 @@ from nautobot.extras.filters.customfields import (
     CustomFieldMultiValueNumberFilter,
     CustomFieldNumberFilter,
 )
+from nautobot.extras.metadata import get_content_type_metadata
 from nautobot.extras.models import (
     ConfigContextSchema,
-    CustomField,
-    Relationship,
     RelationshipAssociation,
     Role,
     Status,
@@ -70,10 +69,10 @@ class CustomFieldModelFilterSetMixin(django_filters.FilterSet):
             CustomFieldTypeChoices.TYPE_SELECT: CustomFieldMultiSelectFilter,
         }
 
-        custom_fields = CustomField.objects.filter(
-            content_types=ContentType.objects.get_for_model(self._meta.model)
-        ).exclude(filter_logic=CustomFieldFilterLogicChoices.FILTER_DISABLED)
+        custom_fields = get_content_type_metadata(self._meta.model).custom_fields
         for cf in custom_fields:
+            if cf.filter_logic == CustomFieldFilterLogicChoices.FILTER_DISABLED:
+                continue
             # Determine filter class for this CustomField type, default to CustomFieldCharFilter
             new_filter_name = cf.add_prefix_to_cf_key()
             filter_class = custom_field_filter_classes.get(cf.type, CustomFieldCharFilter)
@@ -235,12 +234,7 @@ class RelationshipModelFilterSetMixin(django_filters.FilterSet):
         """
         Append form fields for all Relationships assigned to this model.
         """
-        query = Q(source_type=self.obj_type, source_hidden=False) | Q(
-            destination_type=self.obj_type, destination_hidden=False
-        )
-        relationships = Relationship.objects.select_related("source_type", "destination_type").filter(query)
-
-        for rel in relationships.iterator():
+        for rel in get_content_type_metadata(self.obj_type).relationships:
             if rel.source_type == self.obj_type and not rel.source_hidden:
                 self._append_relationships_side([rel], RelationshipSideChoices.SIDE_SOURCE, model)
             if rel.destination_type == self.obj_type and not rel.destination_hidden:
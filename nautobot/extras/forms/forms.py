@@ -1408,6 +1408,12 @@ class TagBulkEditForm(NautobotBulkEditForm):
 
 class WebhookForm(BootstrapMixin, forms.ModelForm):
     content_types = MultipleContentTypeField(feature="webhooks", required=False, label="Content Type(s)")
+    batch_size = forms.IntegerField(
+        required=False,
+        min_value=1,
+        initial=1,
+        help_text=Webhook._meta.get_field("batch_size").help_text,
+    )
 
     class Meta:
         model = Webhook
@@ -1423,11 +1429,15 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
             "http_content_type",
             "additional_headers",
             "body_template",
+            "batch_size",
             "secret",
             "ssl_verification",
             "ca_file_path",
         )
 
+    def clean_batch_size(self):
+        return self.cleaned_data["batch_size"] or 1
+
     def clean(self):
         data = super().clean()
 
@@ -17,8 +17,8 @@ from nautobot.extras.choices import (
     RelationshipSideChoices,
     RelationshipTypeChoices,
 )
+from nautobot.extras.metadata import get_content_type_metadata
 from nautobot.extras.models import (
-    CustomField,
     Note,
     Relationship,
     RelationshipAssociation,
@@ -67,11 +67,11 @@ class CustomFieldModelFilterFormMixin(forms.Form):
 
         super().__init__(*args, **kwargs)
 
-        custom_fields = CustomField.objects.filter(content_types=self.obj_type).exclude(
-            filter_logic=CustomFieldFilterLogicChoices.FILTER_DISABLED
-        )
+        custom_fields = get_content_type_metadata(self.obj_type).custom_fields
         self.custom_fields = []
         for cf in custom_fields:
+            if cf.filter_logic == CustomFieldFilterLogicChoices.FILTER_DISABLED:
+                continue
             field_name = cf.add_prefix_to_cf_key()
             if cf.type == "json":
                 self.fields[field_name] = cf.to_form_field(
@@ -102,7 +102,7 @@ class CustomFieldModelFormMixin(forms.ModelForm):
         Append form fields for all CustomFields assigned to this model.
         """
         # Append form fields; assign initial values if modifying and existing object
-        for cf in CustomField.objects.filter(content_types=self.obj_type):
+        for cf in get_content_type_metadata(self.obj_type).custom_fields:
             field_name = cf.add_prefix_to_cf_key()
             if self.instance.present_in_database:
                 self.fields[field_name] = cf.to_form_field(set_initial=False)
@@ -130,7 +130,7 @@ class CustomFieldModelBulkEditFormMixin(BulkEditForm):
         self.obj_type = ContentType.objects.get_for_model(self.model)
 
         # Add all applicable CustomFields to the form
-        custom_fields = CustomField.objects.filter(content_types=self.obj_type)
+        custom_fields = get_content_type_metadata(self.obj_type).custom_fields
         for cf in custom_fields:
             field_name = cf.add_prefix_to_cf_key()
             # Annotate non-required custom fields as nullable
@@ -188,10 +188,11 @@ class RelationshipModelBulkEditFormMixin(BulkEditForm):
         """
         Append form fields for all Relationships assigned to this model.
         """
-        source_relationships = Relationship.objects.filter(source_type=self.obj_type, source_hidden=False)
+        metadata = get_content_type_metadata(self.obj_type)
+        source_relationships = [r for r in metadata.source_relationships if not r.source_hidden]
         self._append_relationships_side(source_relationships, RelationshipSideChoices.SIDE_SOURCE)
 
-        dest_relationships = Relationship.objects.filter(destination_type=self.obj_type, destination_hidden=False)
+        dest_relationships = [r for r in metadata.destination_relationships if not r.destination_hidden]
         self._append_relationships_side(dest_relationships, RelationshipSideChoices.SIDE_DESTINATION)
 
     def _append_relationships_side(self, relationships, initial_side):
@@ -653,12 +654,7 @@ class RelationshipModelFilterFormMixin(forms.Form):
         """
         Append form fields for all Relationships assigned to this model.
         """
-        query = Q(source_type=self.obj_type, source_hidden=False) | Q(
-            destination_type=self.obj_type, destination_hidden=False
-        )
-        relationships = Relationship.objects.select_related("source_type", "destination_type").filter(query)
-
-        for rel in relationships.iterator():
+        for rel in get_content_type_metadata(self.obj_type).relationships:
             if rel.source_type == self.obj_type and not rel.source_hidden:
                 self._append_relationships_side([rel], RelationshipSideChoices.SIDE_SOURCE)
             if rel.destination_type == self.obj_type and not rel.destination_hidden:
@@ -21,7 +21,6 @@ from db_file_storage.form_widgets import DBClearableFileInput
 from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.validators import RegexValidator
 from django.db.models import Model
@@ -34,6 +33,7 @@ import netaddr
 import yaml
 
 from nautobot.core.celery import app as celery_app
+from nautobot.core.celery.log import flush_job_log_buffer
 from nautobot.core.celery.task import Task
 from nautobot.core.forms import (
     DynamicModelChoiceField,
@@ -113,39 +113,43 @@ class BaseJob(Task):
         self.logger = get_task_logger(self.__module__)
 
     def __call__(self, *args, **kwargs):
-        # Attempt to resolve serialized data back into original form by creating querysets or model instances
-        # If we fail to find any objects, we consider this a job execution error, and fail.
-        # This might happen when a job sits on the queue for a while (i.e. scheduled) and data has changed
-        # or it might be bad input from an API request, or manual execution.
         try:
-            deserialized_kwargs = self.deserialize_data(kwargs)
-        except Exception as err:
-            raise RunJobTaskFailed("Error initializing job") from err
-        context_class = JobHookChangeContext if isinstance(self, JobHookReceiver) else JobChangeContext
-        change_context = context_class(user=self.user, context_detail=self.class_path)
-
-        with change_logging(change_context):
-            if self.celery_kwargs.get("nautobot_job_profile", False) is True:
-                import cProfile
-
-                # TODO: This should probably be available as a file download rather than dumped to the hard drive.
-                # Pending this: https://github.com/nautobot/nautobot/issues/3352
-                profiling_path = f"{tempfile.gettempdir()}/nautobot-jobresult-{self.job_result.id}.pstats"
-                self.logger.info(
-                    "Writing profiling information to %s.", profiling_path, extra={"grouping": "initialization"}
-                )
+            # Attempt to resolve serialized data back into original form by creating querysets or model instances
+            # If we fail to find any objects, we consider this a job execution error, and fail.
+            # This might happen when a job sits on the queue for a while (i.e. scheduled) and data has changed
+            # or it might be bad input from an API request, or manual execution.
+            try:
+                deserialized_kwargs = self.deserialize_data(kwargs)
+            except Exception as err:
+                raise RunJobTaskFailed("Error initializing job") from err
+            context_class = JobHookChangeContext if isinstance(self, JobHookReceiver) else JobChangeContext
+            change_context = context_class(user=self.user, context_detail=self.class_path)
+
+            with change_logging(change_context):
+                if self.celery_kwargs.get("nautobot_job_profile", False) is True:
+                    import cProfile
+
+                    # TODO: This should probably be available as a file download rather than dumped to the hard drive.
+                    # Pending this: https://github.com/nautobot/nautobot/issues/3352
+                    profiling_path = f"{tempfile.gettempdir()}/nautobot-jobresult-{self.job_result.id}.pstats"
+                    self.logger.info(
+                        "Writing profiling information to %s.", profiling_path, extra={"grouping": "initialization"}
+                    )
 
-                with cProfile.Profile() as pr:
-                    try:
-                        output = self.run(*args, **deserialized_kwargs)
-                    except Exception as err:
-                        pr.dump_stats(profiling_path)
-                        raise err
-                    else:
-                        pr.dump_stats(profiling_path)
-                        return output
-            else:
-                return self.run(*args, **deserialized_kwargs)
+                    with cProfile.Profile() as pr:
+                        try:
+                            output = self.run(*args, **deserialized_kwargs)
+                        except Exception as err:
+                            pr.dump_stats(profiling_path)
+                            raise err
+                        else:
+                            pr.dump_stats(profiling_path)
+                            return output
+                else:
+                    return self.run(*args, **deserialized_kwargs)
+        finally:
+            # Write out the buffered log entries of the job before its result is stored and it is seen to be done
+            flush_job_log_buffer(self.request.id)
 
     def __str__(self):
         return str(self.name)
@@ -308,6 +312,7 @@ class BaseJob(Task):
             self.delete_files(*file_ids)
 
         self.logger.info("Job completed", extra={"grouping": "post_run"})
+        flush_job_log_buffer(task_id)
 
         # TODO(gary): document this in job author docs
         # Super.after_return must be called for chords to function properly
@@ -1167,31 +1172,40 @@ def get_job(class_path):
         return None
 
 
-def enqueue_job_hooks(object_change):
+def get_job_hooks_for_object_change(object_change):
     """
-    Find job hook(s) assigned to this changed object type + action and enqueue them
-    to be processed
+    Return a queryset of the enabled JobHook(s) assigned to the type of the changed object and the action of the given
+    ObjectChange.
     """
-
     # Job hooks cannot trigger other job hooks
     if object_change.change_context == ObjectChangeEventContextChoices.CONTEXT_JOB_HOOK:
-        return
+        return JobHook.objects.none()
 
     # Determine whether this type of object supports job hooks
-    model_type = object_change.changed_object._meta.model
+    model_type = object_change.changed_object_type.model_class()
     if model_type not in ChangeLoggedModelsQuery().list_subclasses():
-        return
+        return JobHook.objects.none()
 
     # Retrieve any applicable job hooks
-    content_type = ContentType.objects.get_for_model(object_change.changed_object)
     action_flag = {
         ObjectChangeActionChoices.ACTION_CREATE: "type_create",
         ObjectChangeActionChoices.ACTION_UPDATE: "type_update",
         ObjectChangeActionChoices.ACTION_DELETE: "type_delete",
     }[object_change.action]
-    job_hooks = JobHook.objects.filter(content_types=content_type, enabled=True, **{action_flag: True})
+    return JobHook.objects.filter(content_types=object_change.changed_object_type, enabled=True, **{action_flag: True})
+
+
+def enqueue_job_hooks(object_change, jobhook_queryset=None):
+    """
+    Find job hook(s) assigned to this changed object type + action and enqueue them
+    to be processed
+
+    `jobhook_queryset` may be given to reuse the JobHooks already looked up for other changes of the same kind.
+    """
+    if jobhook_queryset is None:
+        jobhook_queryset = get_job_hooks_for_object_change(object_change)
 
     # Enqueue the jobs related to the job_hooks
-    for job_hook in job_hooks:
+    for job_hook in jobhook_queryset:
         job_model = job_hook.job
         JobResult.enqueue_job(job_model, object_change.user, object_change=object_change.pk)
@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from nautobot.core.utils.lookup import get_searchable_models
+from nautobot.extras.models import SearchIndexEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the global search index for all (or the given) searchable models."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "args",
+            metavar="app_label.ModelName",
+            nargs="*",
+            help="One or more specific models (e.g. dcim.device) to reindex",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of objects to load or write per database query (default: 1000)",
+        )
+
+    def handle(self, *model_names, **options):
+        searchable_models = get_searchable_models()
+        if model_names:
+            models = []
+            for model_name in model_names:
+                try:
+                    model = apps.get_model(model_name)
+                except (LookupError, ValueError):
+                    raise CommandError(f"Unknown model: {model_name}")
+                if model not in searchable_models:
+                    raise CommandError(f"{model_name} is not included in the global search")
+                models.append(model)
+        else:
+            models = searchable_models
+
+        for model in models:
+            self.stdout.write(f"Indexing {model._meta.verbose_name_plural}...", ending="")
+            counts = SearchIndexEntry.objects.rebuild(models=[model], batch_size=options["batch_size"])
+            self.stdout.write(f" {counts[model]} indexed")
+
+        self.stdout.write(self.style.SUCCESS("Finished."))
@@ -9,10 +9,14 @@ from nautobot.core.utils.config import get_settings_or_config
 
 
 class Command(BaseCommand):
-    help = "Update the member caches for all DynamicGroups."
+    help = "Update the member caches and the member index for all DynamicGroups."
 
     def handle(self, *args, **kwargs):
-        """Run through all Dynamic Groups and ensure their member caches are up to date."""
+        """Run through all Dynamic Groups and ensure their member caches and member index are up to date."""
+
+        self.stdout.write(self.style.NOTICE("Refreshing DynamicGroup member index..."))
+        for dynamic_group in DynamicGroup.objects.iterator():
+            dynamic_group.update_member_index()
 
         if get_settings_or_config("DYNAMIC_GROUPS_MEMBER_CACHE_TIMEOUT") == 0:
             self.stdout.write(
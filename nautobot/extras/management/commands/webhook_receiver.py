@@ -1,5 +1,5 @@
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from django.core.management.base import BaseCommand
 
@@ -8,6 +8,8 @@ request_counter = 1
 
 
 class WebhookHandler(BaseHTTPRequestHandler):
+    # Keep the connections alive between requests, as Nautobot reuses its connections to webhook receivers
+    protocol_version = "HTTP/1.1"
     show_headers = True
 
     def __getattr__(self, item):
@@ -25,10 +27,16 @@ class WebhookHandler(BaseHTTPRequestHandler):
     def do_ANY(self):
         global request_counter
 
+        # Read the request body (if any) before responding, so that the connection can be reused
+        content_length = self.headers.get("Content-Length")
+        body = self.rfile.read(int(content_length)) if content_length is not None else None
+
         # Send a 200 response regardless of the request content
+        response = b"Webhook received!\n"
         self.send_response(200)
+        self.send_header("Content-Length", str(len(response)))
         self.end_headers()
-        self.wfile.write(b"Webhook received!\n")
+        self.wfile.write(response)
 
         request_counter += 1
 
@@ -39,9 +47,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
             print()
 
         # Print the request body (if any)
-        content_length = self.headers.get("Content-Length")
-        if content_length is not None:
-            body = self.rfile.read(int(content_length))
+        if body is not None:
             print(body.decode("utf-8"))
         else:
             print("(No body)")
@@ -75,7 +81,7 @@ class Command(BaseCommand):
         WebhookHandler.show_headers = not options["no_headers"]
 
         self.stdout.write(f"Listening on port http://localhost:{port}. Stop with {quit_command}.")
-        httpd = HTTPServer(("localhost", port), WebhookHandler)
+        httpd = ThreadingHTTPServer(("localhost", port), WebhookHandler)
 
         try:
             httpd.serve_forever()
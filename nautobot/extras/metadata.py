@@ -0,0 +1,167 @@
+"""Process-local registry of the custom fields, computed fields and relationships defined for each content type."""
+
+from collections import namedtuple
+import threading
+import time
+import uuid
+import weakref
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from prometheus_client import Counter
+
+CONTENT_TYPE_METADATA_CACHE_METRIC = Counter(
+    "nautobot_content_type_metadata_cache_lookups",
+    "Lookups of the custom fields, computed fields and relationships of a content type.",
+    ["result"],
+)
+
+CONTENT_TYPE_METADATA_VERSION_KEY = "nautobot.extras.metadata.version"
+
+# How long a process keeps using the version it last read from the cache, before checking it again
+CONTENT_TYPE_METADATA_VERSION_TTL = 1.0
+
+ContentTypeMetadata = namedtuple(
+    "ContentTypeMetadata",
+    ["custom_fields", "computed_fields", "relationships", "source_relationships", "destination_relationships"],
+)
+ContentTypeMetadata.__doc__ = """
+The custom fields, computed fields and relationships defined for a content type, as tuples of model instances.
+
+`relationships` holds every Relationship having the content type on either side, including symmetric relationships;
+`source_relationships` and `destination_relationships` hold those having it on the source and destination side.
+These instances are shared between requests and must not be modified.
+"""
+
+# In-process registry, only valid for the version it was populated under
+_content_type_metadata = {"version": None, "content_types": {}}
+_content_type_metadata_lock = threading.Lock()
+# Version last read from the cache, and the time.monotonic() until which it is used without reading it again
+_content_type_metadata_version = {"version": None, "expires": 0.0}
+# Weak reference to the _ContentTypeMetadataChanged registered by the transaction of the current thread, if any
+_pending_changes = threading.local()
+
+
+class _ContentTypeMetadataChanged:
+    """
+    Callable registered with `transaction.on_commit()` to invalidate the registry once metadata changes commit.
+
+    It is only referenced by the connection's list of `on_commit()` callbacks, so it is garbage-collected when Django
+    discards it because the transaction was rolled back.
+    """
+
+    committed = False
+
+    def __call__(self):
+        self.committed = True
+        _bump_content_type_metadata_version()
+
+
+def content_type_metadata_changes_pending():
+    """
+    Return True if the current database transaction holds uncommitted changes to custom fields, computed fields or
+    relationships.
+
+    The registry is bypassed while this is the case, so that it never holds definitions which might be rolled back.
+    """
+    marker_ref = getattr(_pending_changes, "marker", None)
+    marker = marker_ref() if marker_ref is not None else None
+    return marker is not None and not marker.committed
+
+
+def get_content_type_metadata_version():
+    """
+    Return the current version of the content type metadata, shared by all processes, initializing it if needed.
+
+    The version is read from the cache at most once every `CONTENT_TYPE_METADATA_VERSION_TTL` seconds per process, so
+    changes made in other processes may take that long to be seen.
+    """
+    now = time.monotonic()
+    with _content_type_metadata_lock:
+        if _content_type_metadata_version["expires"] > now:
+            return _content_type_metadata_version["version"]
+
+    version = cache.get(CONTENT_TYPE_METADATA_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_TYPE_METADATA_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CONTENT_TYPE_METADATA_VERSION_KEY)
+    with _content_type_metadata_lock:
+        _content_type_metadata_version["version"] = version
+        _content_type_metadata_version["expires"] = now + CONTENT_TYPE_METADATA_VERSION_TTL
+    return version
+
+
+def _bump_content_type_metadata_version():
+    version = uuid.uuid4().hex
+    cache.set(CONTENT_TYPE_METADATA_VERSION_KEY, version, None)
+    with _content_type_metadata_lock:
+        _content_type_metadata_version["version"] = version
+        _content_type_metadata_version["expires"] = time.monotonic() + CONTENT_TYPE_METADATA_VERSION_TTL
+        _content_type_metadata["version"] = None
+        _content_type_metadata["content_types"] = {}
+
+
+def invalidate_content_type_metadata():
+    """
+    Invalidate the content type metadata registry, in all processes.
+
+    Called when a CustomField, ComputedField or Relationship changes. If called inside a transaction, the registry is
+    invalidated again once the transaction commits.
+    """
+    _bump_content_type_metadata_version()
+    if connection.in_atomic_block and not content_type_metadata_changes_pending():
+        marker = _ContentTypeMetadataChanged()
+        _pending_changes.marker = weakref.ref(marker)
+        transaction.on_commit(marker)
+
+
+def _load_content_type_metadata(content_type):
+    from nautobot.extras.models import ComputedField, CustomField, Relationship  # circular import workaround
+
+    relationships = tuple(
+        Relationship.objects.select_related("source_type", "destination_type").filter(
+            Q(source_type=content_type) | Q(destination_type=content_type)
+        )
+    )
+    return ContentTypeMetadata(
+        custom_fields=tuple(CustomField.objects.filter(content_types=content_type)),
+        computed_fields=tuple(ComputedField.objects.filter(content_type=content_type)),
+        relationships=relationships,
+        source_relationships=tuple(r for r in relationships if r.source_type_id == content_type.pk),
+        destination_relationships=tuple(r for r in relationships if r.destination_type_id == content_type.pk),
+    )
+
+
+def get_content_type_metadata(model):
+    """
+    Return the `ContentTypeMetadata` of the given model, model instance or ContentType.
+
+    The metadata of each content type is loaded from the database once per process, and kept until any CustomField,
+    ComputedField or Relationship changes in any process.
+    """
+    if isinstance(model, ContentType):
+        content_type = model
+    else:
+        content_type = ContentType.objects.get_for_model(model._meta.concrete_model)
+
+    if content_type_metadata_changes_pending():
+        return _load_content_type_metadata(content_type)
+
+    version = get_content_type_metadata_version()
+    with _content_type_metadata_lock:
+        if _content_type_metadata["version"] != version:
+            _content_type_metadata["version"] = version
+            _content_type_metadata["content_types"] = {}
+        metadata = _content_type_metadata["content_types"].get(content_type.pk)
+    if metadata is not None:
+        CONTENT_TYPE_METADATA_CACHE_METRIC.labels(result="hit").inc()
+        return metadata
+
+    CONTENT_TYPE_METADATA_CACHE_METRIC.labels(result="miss").inc()
+    metadata = _load_content_type_metadata(content_type)
+    with _content_type_metadata_lock:
+        if _content_type_metadata["version"] == version:
+            _content_type_metadata["content_types"][content_type.pk] = metadata
+    return metadata
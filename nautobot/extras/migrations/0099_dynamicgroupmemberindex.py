@@ -0,0 +1,54 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("extras", "0098_rename_data_jobresult_result"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DynamicGroupMemberIndex",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("associated_object_id", models.UUIDField()),
+                (
+                    "associated_object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+                (
+                    "dynamic_group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="member_index_entries",
+                        to="extras.dynamicgroup",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["dynamic_group", "associated_object_type", "associated_object_id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="dynamicgroupmemberindex",
+            index=models.Index(
+                fields=["associated_object_type", "associated_object_id"], name="extras_dyna_associa_67d7c9_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="dynamicgroupmemberindex",
+            unique_together={("dynamic_group", "associated_object_id")},
+        ),
+    ]
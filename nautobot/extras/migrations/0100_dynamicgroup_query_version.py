@@ -0,0 +1,18 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:00
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("extras", "0099_dynamicgroupmemberindex"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicgroup",
+            name="query_version",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.23 on 2026-10-18 23:30
+
+from django.db import DatabaseError, migrations, models, transaction
+import django.db.models.deletion
+import uuid
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    On PostgreSQL, index the search text with trigrams so that substring matches (`LIKE '%...%'`) can use an index.
+
+    Creating the `pg_trgm` extension may require privileges that the database user lacks, in which case searches
+    fall back to scanning the table.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        print("\n    Unable to create the pg_trgm extension; the search index will not be trigram-indexed", end="")
+        return
+    schema_editor.execute(
+        "CREATE INDEX extras_searchindexentry_text_trgm ON extras_searchindexentry USING gin (text gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS extras_searchindexentry_text_trgm")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("extras", "0101_webhook_batch_size"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("name", models.CharField(max_length=255)),
+                ("text", models.TextField()),
+                (
+                    "object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "search index entries",
+                "ordering": ["object_type", "name"],
+                "unique_together": {("object_type", "object_id")},
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.23 on 2026-10-19 03:46
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("extras", "0102_searchindexentry"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="objectchange",
+            name="time",
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
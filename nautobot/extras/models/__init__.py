@@ -3,7 +3,7 @@ from .roles import Role, RoleField
 from .statuses import Status, StatusField, StatusModel
 from .customfields import ComputedField, CustomField, CustomFieldChoice, CustomFieldModel
 from .datasources import GitRepository
-from .groups import DynamicGroup, DynamicGroupMembership
+from .groups import DynamicGroup, DynamicGroupMemberIndex, DynamicGroupMembership
 from .jobs import (
     Job,
     JobButton,
@@ -28,6 +28,7 @@ from .models import (
     Webhook,
 )
 from .relationships import Relationship, RelationshipAssociation, RelationshipModel
+from .search import SearchIndexEntry
 from .secrets import Secret, SecretsGroup, SecretsGroupAssociation
 from .tags import Tag, TaggedItem
 
@@ -43,6 +44,7 @@ __all__ = (
     "CustomFieldModel",
     "CustomLink",
     "DynamicGroup",
+    "DynamicGroupMemberIndex",
     "DynamicGroupMembership",
     "ExportTemplate",
     "FileAttachment",
@@ -65,6 +67,7 @@ __all__ = (
     "RoleField",
     "ScheduledJob",
     "ScheduledJobs",
+    "SearchIndexEntry",
     "Secret",
     "SecretsGroup",
     "SecretsGroupAssociation",
@@ -4,6 +4,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
 
 from nautobot.core.celery import NautobotKombuJSONEncoder
 from nautobot.core.models import BaseModel
@@ -73,7 +74,7 @@ class ObjectChange(BaseModel):
     parent device. This will ensure changes made to component models appear in the parent model's changelog.
     """
 
-    time = models.DateTimeField(auto_now_add=True, editable=False, db_index=True)
+    time = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     user = models.ForeignKey(
         to=settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
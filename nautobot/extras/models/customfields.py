@@ -32,7 +32,8 @@ from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.core.models.validators import validate_regex
 from nautobot.core.settings_funcs import is_truthy
 from nautobot.core.templatetags.helpers import render_markdown
-from nautobot.core.utils.data import render_jinja2
+from nautobot.core.utils.data import get_jinja2_template
+from nautobot.extras.metadata import get_content_type_metadata
 from nautobot.extras.choices import CustomFieldFilterLogicChoices, CustomFieldTypeChoices
 from nautobot.extras.models import ChangeLoggedModel
 from nautobot.extras.models.mixins import NotesMixin
@@ -99,18 +100,35 @@ class ComputedField(BaseModel, ChangeLoggedModel, NotesMixin):
         return self.label
 
     def render(self, context):
+        return self.render_many([context])[0]
+
+    def render_many(self, contexts):
+        """
+        Render this computed field with each of the provided contexts, compiling its template only once.
+
+        The `fallback_value` is returned for each context that the template fails to render with.
+        """
         try:
-            rendered = render_jinja2(self.template, context)
-            # If there is an undefined variable within a template, it returns nothing
-            # Doesn't raise an exception either most likely due to using Undefined rather
-            # than StrictUndefined, but return fallback_value if None is returned
-            if rendered is None:
-                logger.warning("Failed to render computed field %s", self.key)
-                return self.fallback_value
-            return rendered
+            template = get_jinja2_template(self.template)
         except Exception as exc:
             logger.warning("Failed to render computed field %s: %s", self.key, exc)
-            return self.fallback_value
+            return [self.fallback_value for _ in contexts]
+
+        results = []
+        for context in contexts:
+            try:
+                rendered = template.render(context=context)
+                # If there is an undefined variable within a template, it returns nothing
+                # Doesn't raise an exception either most likely due to using Undefined rather
+                # than StrictUndefined, but return fallback_value if None is returned
+                if rendered is None:
+                    logger.warning("Failed to render computed field %s", self.key)
+                    rendered = self.fallback_value
+            except Exception as exc:
+                logger.warning("Failed to render computed field %s: %s", self.key, exc)
+                rendered = self.fallback_value
+            results.append(rendered)
+        return results
 
     def clean(self):
         super().clean()
@@ -164,9 +182,9 @@ class CustomFieldModel(models.Model):
         """
         Return a dictionary of custom fields for a single object in the form {<field>: value}.
         """
-        fields = CustomField.objects.get_for_model(self)
+        fields = get_content_type_metadata(self).custom_fields
         if advanced_ui is not None:
-            fields = fields.filter(advanced_ui=advanced_ui)
+            fields = [field for field in fields if field.advanced_ui == advanced_ui]
         return OrderedDict([(field, self.cf.get(field.key)) for field in fields])
 
     def get_custom_field_groupings_basic(self):
@@ -208,9 +226,9 @@ class CustomFieldModel(models.Model):
         }
         """
         record = {}
-        fields = CustomField.objects.get_for_model(self)
+        fields = get_content_type_metadata(self).custom_fields
         if advanced_ui is not None:
-            fields = fields.filter(advanced_ui=advanced_ui)
+            fields = [field for field in fields if field.advanced_ui == advanced_ui]
 
         for field in fields:
             data = (field, self.cf.get(field.key))
@@ -221,7 +239,7 @@ class CustomFieldModel(models.Model):
     def clean(self):
         super().clean()
 
-        custom_fields = {cf.key: cf for cf in CustomField.objects.get_for_model(self)}
+        custom_fields = {cf.key: cf for cf in get_content_type_metadata(self).custom_fields}
 
         # Validate all field values
         for field_key, value in self._custom_field_data.items():
@@ -248,10 +266,10 @@ class CustomFieldModel(models.Model):
         Return a boolean indicating whether or not this content type has computed fields associated with it.
         This can also check whether the advanced_ui attribute is True or False for UI display purposes.
         """
-        computed_fields = ComputedField.objects.get_for_model(self)
+        computed_fields = get_content_type_metadata(self).computed_fields
         if advanced_ui is not None:
-            computed_fields = computed_fields.filter(advanced_ui=advanced_ui)
-        return computed_fields.exists()
+            computed_fields = [cf for cf in computed_fields if cf.advanced_ui == advanced_ui]
+        return bool(computed_fields)
 
     def has_computed_fields_basic(self):
         return self.has_computed_fields(advanced_ui=False)
@@ -264,9 +282,8 @@ class CustomFieldModel(models.Model):
         Get a computed field for this model, lookup via key.
         Returns the template of this field if render is False, otherwise returns the rendered value.
         """
-        try:
-            computed_field = ComputedField.objects.get_for_model(self).get(key=key)
-        except ComputedField.DoesNotExist:
+        computed_field = next((cf for cf in get_content_type_metadata(self).computed_fields if cf.key == key), None)
+        if computed_field is None:
             logger.warning("Computed Field with key %s does not exist for model %s", key, self._meta.verbose_name)
             return None
         if render:
@@ -279,9 +296,9 @@ class CustomFieldModel(models.Model):
         Keys are the `key` value of each field. If label_as_key is True, `label` values of each field are used as keys.
         """
         computed_fields_dict = {}
-        computed_fields = ComputedField.objects.get_for_model(self)
+        computed_fields = get_content_type_metadata(self).computed_fields
         if advanced_ui is not None:
-            computed_fields = computed_fields.filter(advanced_ui=advanced_ui)
+            computed_fields = [cf for cf in computed_fields if cf.advanced_ui == advanced_ui]
         if not computed_fields:
             return {}
         for cf in computed_fields:
@@ -645,10 +662,11 @@ class CustomField(BaseModel, ChangeLoggedModel, NotesMixin):
         Handle the cleanup of old custom field data when a CustomField is deleted.
         """
         content_types = set(self.content_types.values_list("pk", flat=True))
+        pk = self.pk
 
         super().delete(*args, **kwargs)
 
-        delete_custom_field_data.delay(self.key, content_types)
+        delete_custom_field_data.delay(self.key, content_types, pk)
 
     def add_prefix_to_cf_key(self):
         return "cf_" + str(self.key)
@@ -1,7 +1,10 @@
 """Dynamic Groups Models."""
 
+from collections import OrderedDict
 import logging
 import pickle
+import threading
+import uuid
 
 import django_filters
 from django import forms
@@ -26,6 +29,12 @@ from nautobot.extras.utils import extras_features
 
 logger = logging.getLogger(__name__)
 
+# Query plans of nested DynamicGroups, least recently used first, as `{(group_pk, query_version): plan}`.
+# See `DynamicGroup.get_compiled_query()`.
+_query_plans = OrderedDict()
+QUERY_PLAN_CACHE_SIZE = 1024
+_query_plans_lock = threading.Lock()
+
 
 @extras_features(
     "custom_links",
@@ -59,6 +68,11 @@ class DynamicGroup(OrganizationalModel):
         through_fields=("parent_group", "group"),
         related_name="parents",
     )
+    query_version = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        help_text="Version stamp of the compiled member query of this group, changed whenever the query is invalidated",
+    )
 
     objects = BaseManager.from_queryset(DynamicGroupQuerySet)()
 
@@ -318,9 +332,26 @@ class DynamicGroup(OrganizationalModel):
     def members(self):
         """Return the member objects for this group, never cached."""
         # If there are child groups, return the generated group queryset, otherwise use this group's
-        # `filter` directly.
-        if self.children.exists():
-            return self.get_group_queryset()
+        # `filter` directly. The current query version is read along, to avoid a separate query for it.
+        state = (
+            DynamicGroup.objects.filter(pk=self.pk)
+            .annotate(
+                has_children=models.Exists(DynamicGroupMembership.objects.filter(parent_group=models.OuterRef("pk")))
+            )
+            .values_list("query_version", "has_children")
+            .first()
+        )
+        if state is None:
+            return self.get_queryset()
+        return self.get_members(*state)
+
+    def get_members(self, query_version, has_children):
+        """
+        Return the member objects for this group, as `members` does, given the current `query_version` of this group
+        and whether it has child groups, such as when these have already been read along with many groups at once.
+        """
+        if has_children:
+            return self.get_group_queryset(query_version=query_version)
         return self.get_queryset()
 
     @property
@@ -358,6 +389,121 @@ class DynamicGroup(OrganizationalModel):
 
         return self.members_cached
 
+    def update_member_index(self):
+        """
+        Synchronize the reverse-membership index (`DynamicGroupMemberIndex`) with the current members of this group.
+
+        Only index entries that have been added or removed are written.
+
+        Returns:
+            tuple: The number of `(added, removed)` index entries.
+        """
+        if self.model is None:
+            return 0, 0
+
+        members = set(self.members.values_list("pk", flat=True))
+        indexed = set(self.member_index_entries.values_list("associated_object_id", flat=True))
+
+        removed = indexed - members
+        if removed:
+            self.member_index_entries.filter(associated_object_id__in=removed).delete()
+
+        added = members - indexed
+        DynamicGroupMemberIndex.objects.bulk_create(
+            [
+                DynamicGroupMemberIndex(
+                    dynamic_group=self, associated_object_type_id=self.content_type_id, associated_object_id=pk
+                )
+                for pk in added
+            ],
+            batch_size=1000,
+        )
+
+        return len(added), len(removed)
+
+    def bump_query_version(self):
+        """
+        Invalidate the compiled member query of this group and of every group that it is (recursively) a child of.
+
+        This must be called whenever the filter or the child groups of this group change, since the compiled query of
+        every ancestor embeds the query of this group.
+        """
+        self.query_version = uuid.uuid4()
+        DynamicGroup.objects.filter(pk=self.pk).update(query_version=self.query_version)
+        DynamicGroup.objects.filter(pk__in=[ancestor.pk for ancestor in self.get_ancestors()]).update(
+            query_version=uuid.uuid4()
+        )
+
+    def get_query_plan(self):
+        """
+        Return the structure of the query generated by `generate_query()`, without generating any query.
+
+        The plan is either a `(group, filters)` tuple of a DynamicGroup and the `get_query_filters()` of its filter, or
+        a list of `(operator, plan)` tuples to combine in order. Unlike the generated query, it doesn't depend on any
+        data other than the DynamicGroups themselves, such as the descendants of a Location that a tree filter expands
+        to, so only the queries of the filters need to be generated from it on each evaluation.
+        """
+
+        def get_members_plan(group):
+            if group.filter:
+                return (group, self.get_query_filters(group))
+            return [
+                (membership.operator, (membership.group, self.get_query_filters(membership.group)))
+                for membership in group.dynamic_group_memberships.all()
+            ]
+
+        memberships = self.dynamic_group_memberships.all()
+        if not memberships.exists():
+            return get_members_plan(self)
+        return [(membership.operator, get_members_plan(membership.group)) for membership in memberships]
+
+    def generate_query_from_plan(self, plan):
+        """Return the `Q` object generated from the given `get_query_plan()` plan, equal to `generate_query()`."""
+        if isinstance(plan, tuple):
+            group, filters = plan
+            return self.generate_query_for_group(group, filters=filters)
+
+        query = models.Q()
+        for operator, next_plan in plan:
+            query = self.perform_membership_set_operation(operator, query, self.generate_query_from_plan(next_plan))
+        return query
+
+    def get_compiled_query(self, query_version=None):
+        """
+        Return the `Q` object generated by `generate_query()`, reusing a previously computed query plan if current.
+
+        Query plans, including the filtersets of the groups, are kept in memory for each process, for a limited number
+        of groups, and are invalidated by `bump_query_version()`. The current `query_version` is read from the database
+        unless given, so that every process sees it change. The query itself is generated afresh from the filters of
+        the plan each time, as it may depend on other data.
+        """
+        if query_version is None:
+            query_version = DynamicGroup.objects.filter(pk=self.pk).values_list("query_version", flat=True).first()
+        key = (self.pk, query_version)
+        with _query_plans_lock:
+            plan = _query_plans.get(key)
+            if plan is not None:
+                _query_plans.move_to_end(key)
+        if plan is None:
+            plan = self.get_query_plan()
+            with _query_plans_lock:
+                _query_plans[key] = plan
+                while len(_query_plans) > QUERY_PLAN_CACHE_SIZE:
+                    _query_plans.popitem(last=False)
+
+        return self.generate_query_from_plan(plan)
+
+    def update_member_index_and_ancestors(self):
+        """
+        Update the member index of this group and, recursively, of every group that it is a child of.
+
+        A change to a group (or to its child groups) can affect the members of its ancestors, but never those of its
+        descendants.
+        """
+        self.update_member_index()
+        for ancestor in list(self.parents.all()):
+            ancestor.update_member_index_and_ancestors()
+
     def has_member(self, obj, use_cache=False):
         """
         Return True if the given object is a member of this group.
@@ -527,6 +673,9 @@ class DynamicGroup(OrganizationalModel):
                 msg="Cannot delete DynamicGroup while child of other DynamicGroups.",
                 protected_objects=set(self.parents.all()),
             )
+        with _query_plans_lock:
+            for key in [key for key in _query_plans if key[0] == self.pk]:
+                del _query_plans[key]
         return super().delete(*args, **kwargs)
 
     def clean_fields(self, exclude=None):
@@ -611,20 +760,36 @@ class DynamicGroup(OrganizationalModel):
 
         return query
 
-    def generate_query_for_group(self, group):
+    def get_query_filters(self, group):
+        """
+        Return the `(filter_field, value)` pairs of the filter of a `group`, from which its query is generated.
+
+        Only the filters used by the `group` are kept on its filterset, which is otherwise expensive to instantiate and
+        to keep in memory.
+
+        :param group:
+            DynamicGroup instance
+        """
+        fs = group.filterset_class(group.filter, group.model.objects.all())
+        fs.filters = {field_name: fs.filters[field_name] for field_name in fs.data if field_name in fs.filters}
+        return [(fs.filters.get(field_name), value) for field_name, value in fs.data.items()]
+
+    def generate_query_for_group(self, group, filters=None):
         """
         Return a `Q` object generated from all filters for a `group`.
 
         :param group:
             DynamicGroup instance
+        :param filters:
+            The `get_query_filters()` of the `group`, if already known
         """
-        fs = group.filterset_class(group.filter, group.get_queryset())
+        if filters is None:
+            filters = self.get_query_filters(group)
         query = models.Q()
 
         # In this case we want all filters for a group's filter dict in a set intersection (boolean
         # AND) because ALL filter conditions must match for the filter parameters to be valid.
-        for field_name, value in fs.data.items():
-            filter_field = fs.filters.get(field_name)
+        for filter_field, value in filters:
             query &= self.generate_query_for_filter(filter_field, value)
 
         return query
@@ -691,9 +856,9 @@ class DynamicGroup(OrganizationalModel):
 
         return query
 
-    def get_group_queryset(self):
+    def get_group_queryset(self, query_version=None):
         """Return a filtered queryset of all descendant groups."""
-        query = self.generate_query()
+        query = self.get_compiled_query(query_version=query_version)
         qs = self.get_queryset()
         return qs.filter(query)
 
@@ -998,6 +1163,15 @@ class DynamicGroupMembership(BaseModel):
         """Return the group members URL."""
         return self.group.get_group_members_url()
 
+    def delete(self, *args, **kwargs):
+        """Remove this membership and update the member index of the parent group and its ancestors."""
+        result = super().delete(*args, **kwargs)
+        # This is done here rather than in a `post_delete` signal, as memberships are also deleted by cascade when
+        # their parent group is deleted, in which case the parent group must not be re-indexed.
+        self.parent_group.bump_query_version()
+        self.parent_group.update_member_index_and_ancestors()
+        return result
+
     def get_siblings(self, include_self=False):
         """Return group memberships that share the same parent group."""
         siblings = DynamicGroupMembership.objects.filter(parent_group=self.parent_group)
@@ -1030,3 +1204,29 @@ class DynamicGroupMembership(BaseModel):
 
         if self.group in self.parent_group.get_ancestors():
             raise ValidationError({"group": "Cannot add ancestor as a child"})
+
+
+class DynamicGroupMemberIndex(BaseModel):
+    """
+    Reverse-membership index of the objects that are members of each `DynamicGroup`.
+
+    Evaluating which groups an object belongs to would otherwise require running the filter of every group of its
+    content type. This table is maintained incrementally as member objects, groups and group memberships are saved (see
+    `nautobot.extras.signals`), and can be rebuilt in full with `nautobot-server refresh_dynamic_group_member_caches`.
+    """
+
+    dynamic_group = models.ForeignKey(
+        "extras.DynamicGroup", on_delete=models.CASCADE, related_name="member_index_entries"
+    )
+    associated_object_type = models.ForeignKey(to=ContentType, on_delete=models.CASCADE, related_name="+")
+    associated_object_id = models.UUIDField()
+
+    class Meta:
+        unique_together = ["dynamic_group", "associated_object_id"]
+        ordering = ["dynamic_group", "associated_object_type", "associated_object_id"]
+        indexes = [
+            models.Index(fields=["associated_object_type", "associated_object_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.associated_object_type.model} {self.associated_object_id} in {self.dynamic_group}"
@@ -693,41 +693,53 @@ class JobResult(BaseModel, CustomFieldModel):
         level_choice (LogLevelChoices): Message severity level
         grouping (str): Grouping to store the log message under
         """
+        log = self.make_log_entry(message, obj=obj, level_choice=level_choice, grouping=grouping)
+        self.save_log_entries([log])
+
+    def make_log_entry(
+        self,
+        message,
+        obj=None,
+        level_choice=LogLevelChoices.LOG_INFO,
+        grouping="main",
+    ):
+        """
+        Return an unsaved JobLogEntry of this JobResult for the given message, see `log()` for the arguments.
+        """
         if level_choice not in LogLevelChoices.as_dict():
             raise ValueError(f"Unknown logging level: {level_choice}")
 
         message = sanitize(str(message))
 
         try:
-            log = JobLogEntry(
-                job_result=self,
-                log_level=level_choice,
-                grouping=grouping[:JOB_LOG_MAX_GROUPING_LENGTH],
-                message=message,
-                created=timezone.now().isoformat(),
-                log_object=str(obj)[:JOB_LOG_MAX_LOG_OBJECT_LENGTH] if obj else "",
-                absolute_url=obj.get_absolute_url()[:JOB_LOG_MAX_ABSOLUTE_URL_LENGTH]
-                if hasattr(obj, "get_absolute_url")
-                else "",
+            absolute_url = (
+                obj.get_absolute_url()[:JOB_LOG_MAX_ABSOLUTE_URL_LENGTH] if hasattr(obj, "get_absolute_url") else ""
             )
         except NotImplementedError:
-            log = JobLogEntry(
-                job_result=self,
-                log_level=level_choice,
-                grouping=grouping[:JOB_LOG_MAX_GROUPING_LENGTH],
-                message=message,
-                created=timezone.now().isoformat(),
-                log_object=str(obj)[:JOB_LOG_MAX_LOG_OBJECT_LENGTH] if obj else "",
-                absolute_url="",
-            )
+            absolute_url = ""
+
+        return JobLogEntry(
+            job_result=self,
+            log_level=level_choice,
+            grouping=grouping[:JOB_LOG_MAX_GROUPING_LENGTH],
+            message=message,
+            created=timezone.now().isoformat(),
+            log_object=str(obj)[:JOB_LOG_MAX_LOG_OBJECT_LENGTH] if obj else "",
+            absolute_url=absolute_url,
+        )
+
+    def save_log_entries(self, log_entries):
+        """
+        Write the given JobLogEntries of this JobResult to the database with a single query.
+        """
         # If the override is provided, we want to use the default database(pass no using argument)
         # Otherwise we want to use a separate database here so that the logs are created immediately
         # instead of within transaction.atomic(). This allows us to be able to report logs when the jobs
         # are running, and allow us to rollback the database without losing the log entries.
         if not self.use_job_logs_db or not JOB_LOGS:
-            log.save()
+            JobLogEntry.objects.bulk_create(log_entries)
         else:
-            log.save(using=JOB_LOGS)
+            JobLogEntry.objects.using(JOB_LOGS).bulk_create(log_entries)
 
 
 #
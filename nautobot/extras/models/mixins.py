@@ -10,10 +10,12 @@ class DynamicGroupMixin:
     """
     Adds properties to a model to facilitate reversing DynamicGroup membership:
 
-    - `dynamic_groups` - A QuerySet of `DynamicGroup` objects this instance is a member of, performs the most database queries.
-    - `dynamic_groups_cached` - A QuerySet of `DynamicGroup` objects this instance is a member of, uses cached member list if available. Ideal for most use cases.
-    - `dynamic_groups_list` - A list of `DynamicGroup` objects this instance is a member of, performs one less database query than `dynamic_groups`.
-    - `dynamic_groups_list_cached` - A list of `DynamicGroup` objects this instance is a member of, uses cached member list if available. Performs no database queries in optimal conditions.
+    - `dynamic_groups` - A QuerySet of `DynamicGroup` objects this instance is a member of.
+    - `dynamic_groups_cached` - A QuerySet of `DynamicGroup` objects this instance is a member of, using the content type cached on the model class if available.
+    - `dynamic_groups_list` - A list of `DynamicGroup` objects this instance is a member of.
+    - `dynamic_groups_list_cached` - A list of `DynamicGroup` objects this instance is a member of, using the content type cached on the model class if available.
+
+    Membership is read from the reverse-membership index (`DynamicGroupMemberIndex`) in a single database query.
 
     All properties are cached on the instance after the first call. To clear the instance cache without re-instantiating the object, call `delattr(instance, "_[the_property_name]")`.
         EX: `delattr(instance, "_dynamic_groups")`
@@ -23,10 +25,6 @@ class DynamicGroupMixin:
     def dynamic_groups(self):
         """
         Return a queryset of `DynamicGroup` objects this instance is a member of.
-
-        This will NOT use the cached member lists of the dynamic groups and will always query the database for each DynamicGroup.
-
-        Additionally, this performs a final database query to turn the internal list into a queryset.
         """
         from nautobot.extras.models.groups import DynamicGroup
 
@@ -41,11 +39,7 @@ class DynamicGroupMixin:
         """
         Return a queryset of `DynamicGroup` objects this instance is a member of.
 
-        This will use the cached member lists of the dynamic groups if available.
-
-        In optimal conditions this will incur a single database query to convert internal list into a queryset which is reasonably performant.
-
-        This is the ideal property to use for most use cases.
+        This uses the content type cached on the model class, if available, to save a query.
         """
         from nautobot.extras.models.groups import DynamicGroup
 
@@ -59,10 +53,6 @@ class DynamicGroupMixin:
     def dynamic_groups_list(self):
         """
         Return a list of `DynamicGroup` objects this instance is a member of.
-
-        This will NOT use the cached member lists of the dynamic groups and will always query the database for each DynamicGroup.
-
-        This saves a final query to turn the list into a queryset.
         """
         from nautobot.extras.models.groups import DynamicGroup
 
@@ -77,9 +67,7 @@ class DynamicGroupMixin:
         """
         Return a list of `DynamicGroup` objects this instance is a member of.
 
-        This will use the cached member lists of the dynamic groups if available.
-
-        In optimal conditions this will incur no database queries.
+        This uses the content type cached on the model class, if available, to save a query.
         """
 
         from nautobot.extras.models.groups import DynamicGroup
@@ -1,27 +1,30 @@
-import json
 from collections import OrderedDict
+import hashlib
+import json
 
 from db_file_storage.model_utils import delete_file, delete_file_if_needed
 from db_file_storage.storage import DatabaseFileStorage
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.http import HttpResponse
-from graphene_django.settings import graphene_settings
-from graphql import get_default_backend
 from graphql.error import GraphQLSyntaxError
 from graphql.language.ast import OperationDefinition
 from jsonschema.exceptions import SchemaError, ValidationError as JSONSchemaValidationError
 from jsonschema.validators import Draft7Validator
+from prometheus_client import Counter
 from rest_framework.utils.encoders import JSONEncoder
 
 from nautobot.core.models import BaseManager, BaseModel
 from nautobot.core.models.fields import ForeignKeyWithAutoRelatedName
 from nautobot.core.models.generics import OrganizationalModel
-from nautobot.core.utils.data import deepmerge, render_jinja2
+from nautobot.core.utils.config import get_settings_or_config
+from nautobot.core.utils.data import deepmerge, render_jinja2, render_jinja2_batch
 from nautobot.extras.choices import (
     ButtonClassChoices,
     WebhookHttpMethodChoices,
@@ -40,6 +43,10 @@ from .jobs import JOB_LOGS, Job, JobLogEntry, JobResult, ScheduledJob, Scheduled
 # Config contexts
 #
 
+CONFIG_CONTEXT_CACHE_METRIC = Counter(
+    "nautobot_config_context_cache_lookups", "Lookups of rendered config context data in the cache.", ["result"]
+)
+
 
 class ConfigContextSchemaValidationMixin:
     """
@@ -189,47 +196,69 @@ class ConfigContextModel(models.Model, ConfigContextSchemaValidationMixin):
     def get_config_context(self):
         """
         Return the rendered configuration context for a device or VM.
+
+        If `CONFIG_CONTEXT_CACHE_TIMEOUT` is set, the rendered data is cached under `get_config_context_cache_key()`.
         """
 
         if not hasattr(self, "config_context_data"):
             # Annotation not available, so fall back to manually querying for the config context
-            config_context_data = ConfigContext.objects.get_for_object(self).values_list("data", flat=True)
-        else:
-            config_context_data = self.config_context_data or []
-            # Device and VirtualMachine's Location has its own ConfigContext and its parent Locations' ConfigContext, if any, should
-            # also be applied. However, since moving from mptt to django-tree-queries https://github.com/nautobot/nautobot/issues/510,
-            # we lost the ability to query the ancestors for a particular tree node for subquery https://github.com/matthiask/django-tree-queries/issues/54.
-            # So instead of constructing the location related query in ConfigContextModelQueryset._get_config_context_filters(), which is complicated across databases
-            # We append the missing parent location query here as a patch.
-            location_config_context_queryset = ConfigContext.objects.none()
-            if self._meta.model_name == "device":
-                location_config_context_queryset = ConfigContext.objects.filter(
-                    locations__in=self.location.ancestors(include_self=True)
-                ).distinct()
-            else:
-                if self.cluster and self.cluster.location:
-                    location_config_context_queryset = ConfigContext.objects.filter(
-                        locations__in=self.cluster.location.ancestors(include_self=True)
-                    ).distinct()
-
-            # Annotation has keys "weight" and "name" (used for ordering) and "data" (the actual config context data)
-            for cc in location_config_context_queryset:
-                config_context_data.append({"data": cc.data, "name": cc.name, "weight": cc.weight})
-            config_context_data = [
-                c["data"] for c in sorted(config_context_data, key=lambda k: (k["weight"], k["name"]))
+            config_contexts = [
+                {"id": str(pk), "last_updated": last_updated.isoformat(), "data": data}
+                for pk, last_updated, data in ConfigContext.objects.get_for_object(self).values_list(
+                    "id", "last_updated", "data"
+                )
             ]
+        else:
+            # Annotation has keys "weight" and "name" (used for ordering), "id" and "last_updated" (used for caching)
+            # and "data" (the actual config context data)
+            config_contexts = sorted(self.config_context_data or [], key=lambda k: (k["weight"], k["name"]))
+
+        cache_timeout = get_settings_or_config("CONFIG_CONTEXT_CACHE_TIMEOUT")
+        if cache_timeout:
+            cache_key = self.get_config_context_cache_key(config_contexts)
+            data = cache.get(cache_key)
+            if data is not None:
+                CONFIG_CONTEXT_CACHE_METRIC.labels(result="hit").inc()
+                return data
+            CONFIG_CONTEXT_CACHE_METRIC.labels(result="miss").inc()
 
         # Compile all config data, overwriting lower-weight values with higher-weight values where a collision occurs
         data = OrderedDict()
-        for context in config_context_data:
-            data = deepmerge(data, context)
+        for context in config_contexts:
+            data = deepmerge(data, context["data"])
 
         # If the object has local config context data defined, merge it last
         if self.local_config_context_data:
             data = deepmerge(data, self.local_config_context_data)
 
+        if cache_timeout:
+            cache.set(cache_key, data, cache_timeout)
+
         return data
 
+    def get_config_context_cache_key(self, config_contexts):
+        """
+        Return the cache key of the rendered configuration context for a device or VM.
+
+        The key is a fingerprint of the given applicable config contexts (their IDs and last-updated times, in order)
+        and of the local config context data and schema of this object. Any change to a config context, to its
+        assignments or to the attributes of this object that determine which config contexts apply to it therefore
+        results in a new key, rather than requiring the cache to be invalidated.
+
+        Args:
+            config_contexts (list): Dicts with keys "id" and "last_updated" for each applicable ConfigContext.
+        """
+        fingerprint = json.dumps(
+            [
+                [[str(context["id"]), str(context["last_updated"])] for context in config_contexts],
+                self.local_config_context_data,
+                str(self.local_config_context_schema_id),
+            ],
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        )
+        return f"nautobot.extras.configcontext.rendered.{hashlib.sha256(fingerprint.encode()).hexdigest()}"
+
     def clean(self):
         super().clean()
 
@@ -536,10 +565,13 @@ class GraphQLQuery(BaseModel, ChangeLoggedModel, NotesMixin):
         verbose_name_plural = "GraphQL queries"
 
     def save(self, *args, **kwargs):
+        from nautobot.core.graphql.backends import get_graphql_backend
+        from nautobot.core.graphql.schema_init import get_schema
+
         variables = {}
-        schema = graphene_settings.SCHEMA
-        backend = get_default_backend()
-        # Load query into GraphQL backend
+        schema = get_schema()
+        backend = get_graphql_backend()
+        # Load query into GraphQL backend, which also caches the parsed and validated document for its executions
         document = backend.document_from_string(schema, self.query)
 
         # Inspect the parsed document tree (document.document_ast) to retrieve the query (operation) definition(s)
@@ -559,9 +591,12 @@ class GraphQLQuery(BaseModel, ChangeLoggedModel, NotesMixin):
         return super().save(*args, **kwargs)
 
     def clean(self):
+        from nautobot.core.graphql.backends import get_graphql_backend
+        from nautobot.core.graphql.schema_init import get_schema
+
         super().clean()
-        schema = graphene_settings.SCHEMA
-        backend = get_default_backend()
+        schema = get_schema()
+        backend = get_graphql_backend()
         try:
             backend.document_from_string(schema, self.query)
         except GraphQLSyntaxError as error:
@@ -758,6 +793,12 @@ class Webhook(BaseModel, ChangeLoggedModel, NotesMixin):
         "Leave blank to use the system defaults.",
         default="",
     )
+    batch_size = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text="Maximum number of events to send in a single request. When greater than 1, the request body is a "
+        "JSON list of the rendered bodies of the individual events.",
+    )
 
     class Meta:
         ordering = ("name",)
@@ -778,6 +819,12 @@ class Webhook(BaseModel, ChangeLoggedModel, NotesMixin):
                 {"ca_file_path": "Do not specify a CA certificate file if SSL verification is disabled."}
             )
 
+        # Batched payloads are sent as a JSON list
+        if self.batch_size > 1 and self.http_content_type != HTTP_CONTENT_TYPE_JSON:
+            raise ValidationError(
+                {"batch_size": f"Batched payloads require the HTTP content type {HTTP_CONTENT_TYPE_JSON}."}
+            )
+
     def render_headers(self, context):
         """
         Render additional_headers and return a dict of Header: Value pairs.
@@ -800,6 +847,16 @@ class Webhook(BaseModel, ChangeLoggedModel, NotesMixin):
         else:
             return json.dumps(context, cls=JSONEncoder, ensure_ascii=False)
 
+    def render_batch_body(self, contexts):
+        """
+        Render the body of a request conveying several events, as a JSON list of the bodies of the individual events.
+        """
+        if self.body_template:
+            bodies = render_jinja2_batch(self.body_template, contexts)
+        else:
+            bodies = [self.render_body(context) for context in contexts]
+        return f"[{', '.join(bodies)}]"
+
     @classmethod
     def check_for_conflicts(
         cls, instance=None, content_types=None, payload_url=None, type_create=None, type_update=None, type_delete=None
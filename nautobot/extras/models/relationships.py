@@ -1,3 +1,4 @@
+from collections import defaultdict
 import logging
 
 from django import forms
@@ -21,6 +22,7 @@ from nautobot.core.models.fields import AutoSlugField, slugify_dashes_to_undersc
 from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.core.utils.lookup import get_filterset_for_model, get_route_for_model
 from nautobot.extras.choices import RelationshipTypeChoices, RelationshipRequiredSideChoices, RelationshipSideChoices
+from nautobot.extras.metadata import get_content_type_metadata
 from nautobot.extras.utils import FeatureQuery, check_if_key_is_graphql_safe, extras_features
 from nautobot.extras.models import ChangeLoggedModel
 from nautobot.extras.models.mixins import NotesMixin
@@ -80,10 +82,11 @@ class RelationshipModel(models.Model):
                     },
                 }`
         """
-        src_relationships, dst_relationships = Relationship.objects.get_for_model(self)
+        metadata = get_content_type_metadata(self)
+        src_relationships, dst_relationships = metadata.source_relationships, metadata.destination_relationships
         if advanced_ui is not None:
-            src_relationships = src_relationships.filter(advanced_ui=advanced_ui)
-            dst_relationships = dst_relationships.filter(advanced_ui=advanced_ui)
+            src_relationships = [r for r in src_relationships if r.advanced_ui == advanced_ui]
+            dst_relationships = [r for r in dst_relationships if r.advanced_ui == advanced_ui]
         content_type = ContentType.objects.get_for_model(self)
 
         sides = {
@@ -172,6 +175,7 @@ class RelationshipModel(models.Model):
             RelationshipSideChoices.SIDE_DESTINATION: {},
             RelationshipSideChoices.SIDE_PEER: {},
         }
+        single_associations = []
         for side, relationships in relationships_by_side.items():
             for relationship, queryset in relationships.items():
                 peer_side = RelationshipSideChoices.OPPOSITE[side]
@@ -193,16 +197,19 @@ class RelationshipModel(models.Model):
                 else:
                     resp[side][relationship]["url"] = None
                     association = queryset.first()
-                    if not association:
-                        continue
+                    if association:
+                        single_associations.append((side, relationship, association))
 
-                    peer = association.get_peer(self)
+        # Load the peers of all the single-valued relationships at once
+        prefetch_relationship_peers([association for _, _, association in single_associations], [self])
+        for side, relationship, association in single_associations:
+            peer = association.get_peer(self)
 
-                    resp[side][relationship]["value"] = peer
-                    if hasattr(peer, "get_absolute_url"):
-                        resp[side][relationship]["url"] = peer.get_absolute_url()
-                    else:
-                        logger.warning("Peer object %s has no get_absolute_url() method", peer)
+            resp[side][relationship]["value"] = peer
+            if hasattr(peer, "get_absolute_url"):
+                resp[side][relationship]["url"] = peer.get_absolute_url()
+            else:
+                logger.warning("Peer object %s has no get_absolute_url() method", peer)
 
         return resp
 
@@ -896,3 +903,76 @@ class RelationshipAssociation(BaseModel):
                 raise ValidationError(
                     {side_name: (f"{side} violates {self.relationship} {side_name}_filter restriction")}
                 )
+
+
+def prefetch_relationship_peers(associations, objects=()):
+    """
+    Load the source and destination objects of the given RelationshipAssociations in bulk, with one query per type.
+
+    Args:
+        associations (list[RelationshipAssociation]): associations whose source and destination objects to load
+        objects (list[BaseModel]): objects already at hand, used as is rather than loaded again
+
+    Returns:
+        (list[RelationshipAssociation]): the given associations, whose `get_source()`, `get_destination()` and
+            `get_peer()` methods no longer query the database
+    """
+    loaded = {(ContentType.objects.get_for_model(obj).pk, obj.pk): obj for obj in objects}
+
+    # Compile a list of IDs to load for each type of object
+    to_load = defaultdict(set)
+    for association in associations:
+        for side in ("source", "destination"):
+            ct_id, object_id = getattr(association, f"{side}_type_id"), getattr(association, f"{side}_id")
+            if (ct_id, object_id) not in loaded:
+                to_load[ct_id].add(object_id)
+
+    # Load the objects using one query per type. Objects of a model which is not installed can't be loaded.
+    for ct_id, object_ids in to_load.items():
+        model_class = ContentType.objects.get_for_id(ct_id).model_class()
+        if model_class is None:
+            continue
+        for obj in model_class.objects.filter(pk__in=object_ids):
+            loaded[(ct_id, obj.pk)] = obj
+
+    # Populate the cache of the source and destination generic foreign keys of each association
+    for association in associations:
+        for side in ("source", "destination"):
+            obj = loaded.get((getattr(association, f"{side}_type_id"), getattr(association, f"{side}_id")))
+            if obj is not None:
+                association._meta.get_field(side).set_cached_value(association, obj)
+
+    return associations
+
+
+def get_relationship_associations(relationship, side, objects):
+    """
+    Get the RelationshipAssociations of many objects on the given side of a relationship, with their peers loaded.
+
+    Args:
+        relationship (Relationship): relationship of the associations
+        side (str): side of the relationship the objects are on, "peer" for a symmetric relationship
+        objects (list[BaseModel]): objects to get the associations of
+
+    Returns:
+        (dict): the list of RelationshipAssociations of each object, keyed by object primary key
+    """
+    objects = list(objects)
+    pks = [obj.pk for obj in objects]
+    associations = RelationshipAssociation.objects.filter(relationship=relationship).select_related("relationship")
+    if relationship.symmetric:
+        associations = associations.filter(Q(source_id__in=pks) | Q(destination_id__in=pks))
+    else:
+        associations = associations.filter(**{f"{side}_id__in": pks})
+    associations = prefetch_relationship_peers(list(associations), objects)
+
+    associations_by_pk = {pk: [] for pk in pks}
+    for association in associations:
+        if relationship.symmetric:
+            association_pks = {association.source_id, association.destination_id}
+        else:
+            association_pks = {getattr(association, f"{side}_id")}
+        for pk in association_pks:
+            if pk in associations_by_pk:
+                associations_by_pk[pk].append(association)
+    return associations_by_pk
@@ -0,0 +1,33 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from nautobot.core.models import BaseManager, BaseModel
+from nautobot.extras.querysets import SearchIndexEntryQuerySet
+
+
+class SearchIndexEntry(BaseModel):
+    """
+    Entry in the index of the objects included in the global search.
+
+    Each object of the models listed in the `searchable_models` of each app is indexed by its string representation
+    and by the values of the fields matched by the `q` filter of its FilterSet. Searching this single table (with a
+    trigram index on PostgreSQL) replaces a separate query for each searchable model. The index is maintained as
+    objects are saved and deleted (see `nautobot.extras.signals`), and can be rebuilt in full with
+    `nautobot-server rebuild_search_index`.
+    """
+
+    object_type = models.ForeignKey(to=ContentType, on_delete=models.CASCADE, related_name="+")
+    object_id = models.UUIDField()
+    name = models.CharField(max_length=255)
+    # Lowercased text to search, see `SearchIndexEntryQuerySet.get_search_text()`
+    text = models.TextField()
+
+    objects = BaseManager.from_queryset(SearchIndexEntryQuerySet)()
+
+    class Meta:
+        unique_together = ["object_type", "object_id"]
+        ordering = ["object_type", "name"]
+        verbose_name_plural = "search index entries"
+
+    def __str__(self):
+        return f"{self.object_type.model} {self.name}"
@@ -1,13 +1,32 @@
+import re
+
 from django.core.cache import cache
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Model, OuterRef, Subquery, Q, F
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import (
+    Case,
+    CharField,
+    Exists,
+    F,
+    IntegerField,
+    Manager,
+    Model,
+    OuterRef,
+    Q,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
 from django.db.models.functions import JSONObject
 from django_celery_beat.managers import ExtendedQuerySet
 
 from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.core.models.query_functions import EmptyGroupByJSONBAgg
 from nautobot.core.utils.config import get_settings_or_config
+from nautobot.core.utils.data import is_uuid
+from nautobot.core.utils.lookup import get_filterset_for_model, get_searchable_models
 from nautobot.extras.models.tags import TaggedItem
 
 
@@ -83,9 +102,11 @@ class ConfigContextModelQuerySet(RestrictedQuerySet):
 
         Order By clause in Subquery is not guaranteed to be respected within the aggregated JSON array, which is why
         we include "weight" and "name" into the result so that we can sort it within Python to ensure correctness.
+        "id" and "last_updated" are included so that the rendered data can be cached, see
+        `ConfigContextModel.get_config_context_cache_key()`.
 
-        TODO This method does not accurately reflect location inheritance because of the reasons stated in _get_config_context_filters()
-        Do not use this method by itself, use get_config_context() method directly on ConfigContextModel instead.
+        The annotation includes config contexts assigned to the object's location or to any of its ancestors, using the
+        `LocationAncestry` closure table, so no further queries are needed per object.
         """
         from nautobot.extras.models import ConfigContext
 
@@ -96,6 +117,8 @@ class ConfigContextModelQuerySet(RestrictedQuerySet):
                 .annotate(
                     _data=EmptyGroupByJSONBAgg(
                         JSONObject(
+                            id=F("id"),
+                            last_updated=F("last_updated"),
                             data=F("data"),
                             name=F("name"),
                             weight=F("weight"),
@@ -109,10 +132,9 @@ class ConfigContextModelQuerySet(RestrictedQuerySet):
     def _get_config_context_filters(self):
         """
         This method is constructing the set of Q objects for the specific object types.
-        Note that locations filters are not included in the method because the filter needs the
-        ability to query the ancestors for a particular tree node for subquery and we lost it since
-        moving from mptt to django-tree-queries https://github.com/matthiask/django-tree-queries/issues/54.
         """
+        from nautobot.extras.models import ConfigContext
+
         tag_query_filters = {
             "object_id": OuterRef(OuterRef("pk")),
             "content_type__app_label": self.model._meta.app_label,
@@ -129,19 +151,33 @@ class ConfigContextModelQuerySet(RestrictedQuerySet):
             is_active=True,
         )
         base_query.add((Q(roles=OuterRef("role")) | Q(roles=None)), Q.AND)
+        if settings.CONFIG_CONTEXT_DYNAMIC_GROUPS_ENABLED:
+            # Use EXISTS rather than joins so that a context assigned to several groups is not aggregated repeatedly.
+            assigned_groups = ConfigContext.dynamic_groups.through.objects.filter(configcontext=OuterRef("pk"))
+            member_groups = assigned_groups.filter(
+                dynamicgroup__member_index_entries__associated_object_id=OuterRef(OuterRef("pk"))
+            )
+            base_query.add((~Q(Exists(assigned_groups)) | Q(Exists(member_groups))), Q.AND)
         if self.model._meta.model_name == "device":
             base_query.add((Q(device_types=OuterRef("device_type")) | Q(device_types=None)), Q.AND)
             base_query.add(
                 (Q(device_redundancy_groups=OuterRef("device_redundancy_group")) | Q(device_redundancy_groups=None)),
                 Q.AND,
             )
-            # This is necessary to prevent location related config context to be applied now.
-            # The location hierarchy cannot be processed by the database and must be added by `ConfigContextModel.get_config_context`
-            base_query.add((Q(locations=None)), Q.AND)
+            location_field = "location"
         elif self.model._meta.model_name == "virtualmachine":
-            # This is necessary to prevent location related config context to be applied now.
-            # The location hierarchy cannot be processed by the database and must be added by `ConfigContextModel.get_config_context`
-            base_query.add((Q(locations=None)), Q.AND)
+            location_field = "cluster__location"
+        else:
+            location_field = None
+
+        if location_field is not None:
+            # A context assigned to a Location applies to that Location and all of its descendants. As for dynamic
+            # groups, EXISTS is used so that a context assigned to several ancestors is not aggregated repeatedly.
+            assigned_locations = ConfigContext.locations.through.objects.filter(configcontext=OuterRef("pk"))
+            ancestor_locations = assigned_locations.filter(
+                location__descendant_entries__location=OuterRef(OuterRef(location_field))
+            )
+            base_query.add((~Q(Exists(assigned_locations)) | Q(Exists(ancestor_locations))), Q.AND)
 
         return base_query
 
@@ -157,32 +193,110 @@ class DynamicGroupQuerySet(RestrictedQuerySet):
 
         Args:
             obj: The object to seek dynamic groups membership by.
-            use_cache: If True, use the cache and query the database directly.
+            use_cache: If True, use the content type cached on the object's class to save a query.
+        """
+        return list(self.get_for_object(obj, use_cache=use_cache))
+
+    def get_for_object(self, obj, use_cache=False):
+        """
+        Return a queryset of `DynamicGroup` objects that are assigned to the given object.
+
+        Membership is read from the reverse-membership index (`DynamicGroupMemberIndex`) in a single query, rather
+        than by evaluating the filter of every group.
+
+        Args:
+            obj: The object to seek dynamic groups membership by.
+            use_cache: If True, use the content type cached on the object's class to save a query.
         """
         if not isinstance(obj, Model):
             raise TypeError(f"{obj} is not an instance of Django Model class")
 
-        # Get dynamic groups for this content_type using the discrete content_type fields to
-        # optimize the query.
-        eligible_groups = self._get_eligible_dynamic_groups(obj, use_cache=use_cache)
+        # Save a DB query if we can by using the _content_type field on the model which is a cached instance of the ContentType
+        if use_cache and hasattr(type(obj), "_content_type"):
+            queryset = self.filter(content_type_id=type(obj)._content_type.id)
+        else:
+            queryset = self.filter(
+                content_type__app_label=obj._meta.app_label, content_type__model=obj._meta.model_name
+            )
+        return queryset.filter(member_index_entries__associated_object_id=obj.pk)
 
-        # Filter down to matching groups.
-        my_groups = []
-        for dynamic_group in list(eligible_groups):
-            if dynamic_group.has_member(obj, use_cache=use_cache):
-                my_groups.append(dynamic_group)
+    def get_membership_for_objects(self, model, pks):
+        """
+        Evaluate the membership of many objects of the same model in the groups of this queryset at once.
 
-        return my_groups
+        Rather than running the filter of each group in turn, a single query per batch of objects annotates each
+        object with one `EXISTS` clause per group of the model's content type. The state of every group needed to build
+        its members query is read along with the groups, rather than with a separate query for each group.
 
-    def get_for_object(self, obj, use_cache=False):
+        Args:
+            model: The model class of the objects.
+            pks (iterable): The primary keys of the objects.
+
+        Returns:
+            dict: `{pk: [dynamic_group, ...]}` for every given primary key.
         """
-        Return a queryset of `DynamicGroup` objects that are assigned to the given object.
+        pks = list(pks)
+        membership = {pk: [] for pk in pks}
 
-        Args:
-            obj: The object to seek dynamic groups membership by.
-            use_cache: If True, use the cache and query the database directly.
+        content_type = ContentType.objects.get_for_model(model)
+        annotations = {}
+        dynamic_groups = self.filter(content_type=content_type).annotate(
+            has_children=Exists(self.model.children.through.objects.filter(parent_group=OuterRef("pk")))
+        )
+        for i, dynamic_group in enumerate(dynamic_groups):
+            members = dynamic_group.get_members(dynamic_group.query_version, dynamic_group.has_children)
+            # An invalid filter yields `none()`, which would make the whole query empty.
+            if not members.query.is_empty():
+                annotations[f"_dynamic_group_{i}"] = (dynamic_group, Exists(members.filter(pk=OuterRef("pk"))))
+
+        if not annotations:
+            return membership
+
+        for start in range(0, len(pks), 1000):
+            rows = (
+                model.objects.filter(pk__in=pks[start : start + 1000])
+                .annotate(**{name: exists for name, (_, exists) in annotations.items()})
+                .values_list("pk", *annotations)
+            )
+            for pk, *is_member in rows:
+                membership[pk] = [group for (group, _), flag in zip(annotations.values(), is_member) if flag]
+
+        return membership
+
+    def update_member_index_for_objects(self, model, pks):
+        """
+        Synchronize the reverse-membership index for the given objects with the groups of this queryset.
+
+        Returns:
+            tuple: The number of `(added, removed)` index entries.
         """
-        return self.filter(pk__in=[dg.pk for dg in self.get_list_for_object(obj, use_cache=use_cache)])
+        from nautobot.extras.models import DynamicGroupMemberIndex
+
+        membership = self.get_membership_for_objects(model, pks)
+        content_type = ContentType.objects.get_for_model(model)
+
+        wanted = {(group.pk, pk) for pk, groups in membership.items() for group in groups}
+        current = {
+            (group_id, pk): entry_pk
+            for entry_pk, group_id, pk in DynamicGroupMemberIndex.objects.filter(
+                dynamic_group__in=self.filter(content_type=content_type),
+                associated_object_id__in=list(membership),
+            ).values_list("pk", "dynamic_group_id", "associated_object_id")
+        }
+
+        removed = [entry_pk for key, entry_pk in current.items() if key not in wanted]
+        if removed:
+            DynamicGroupMemberIndex.objects.filter(pk__in=removed).delete()
+
+        added = [
+            DynamicGroupMemberIndex(
+                dynamic_group_id=group_id, associated_object_type=content_type, associated_object_id=pk
+            )
+            for group_id, pk in wanted - set(current)
+        ]
+        DynamicGroupMemberIndex.objects.bulk_create(added, batch_size=1000)
+
+        return len(added), len(removed)
 
     def get_by_natural_key(self, slug):
         return self.get(slug=slug)
@@ -279,3 +393,289 @@ class ScheduledJobExtendedQuerySet(RestrictedQuerySet, ExtendedQuerySet):
         Return only ScheduledJob instances that require approval and are not approved
         """
         return self.filter(approval_required=True, approved_at__isnull=True).order_by("start_time")
+
+
+class SearchIndexEntryQuerySet(RestrictedQuerySet):
+    # Cache of {model: (field paths, select_related paths, prefetch_related paths)}, see get_search_fields()
+    _search_fields = {}
+    # Cache of {related model: [(searchable model, relation path, many-valued)]}, see get_search_dependencies()
+    _search_dependencies = None
+
+    # Search values that may be (part of) an IP address or network, see search()
+    RE_NETWORK = re.compile(r"^[0-9a-f.:]+(/[0-9]{1,3})?$")
+
+    def get_search_fields(self, model):
+        """
+        Get the fields of the given model whose values are indexed for search.
+
+        These are the fields matched by the `q` filter of the model's FilterSet, including those of related objects such
+        as `"rack__name"` or (through a reverse foreign key) `"inventory_items__serial"`, but excluding any that traverse
+        a many-to-many or generic relation. If that filter is implemented by a method rather than as a `SearchFilter`,
+        all of the model's own text fields are indexed instead.
+
+        Returns:
+            tuple: The list of field paths, the list of their single-valued relations to `select_related`, and the list
+                of their relations traversing a reverse foreign key to `prefetch_related`
+        """
+        if model not in self._search_fields:
+            filterset = get_filterset_for_model(model)
+            search_filter = filterset.base_filters.get("q") if filterset is not None else None
+            filter_predicates = getattr(search_filter, "filter_predicates", None)
+            if filter_predicates is None:
+                filter_predicates = [
+                    field.name
+                    for field in model._meta.concrete_fields
+                    if isinstance(field, (CharField, TextField)) and not field.name.startswith("_")
+                ]
+            fields, related, prefetch = [], set(), set()
+            for field_path in filter_predicates:
+                names = field_path.split("__")
+                relations = []
+                many_valued = False
+                current_model = model
+                for name in names:
+                    try:
+                        field = current_model._meta.get_field(name)
+                    except FieldDoesNotExist:
+                        break
+                    if field.is_relation:
+                        if field.many_to_many or field.related_model is None:
+                            break
+                        # The path is also used to access the related objects, so it must be their accessor name
+                        if field.one_to_many and field.get_accessor_name() != name:
+                            break
+                        many_valued = many_valued or field.one_to_many
+                        relations.append(name)
+                        current_model = field.related_model
+                    elif name != names[-1]:
+                        break
+                else:
+                    if field_path not in ("id", "pk"):
+                        fields.append(field_path)
+                        if many_valued:
+                            prefetch.add("__".join(relations))
+                        else:
+                            related.update("__".join(relations[: i + 1]) for i in range(len(relations)))
+            self._search_fields[model] = (fields, sorted(related), sorted(prefetch))
+        return self._search_fields[model]
+
+    def get_search_dependencies(self):
+        """
+        Get the related models whose fields are indexed for search as part of the objects of another model.
+
+        For example, the name of a device's manufacturer is indexed with the device, so when a manufacturer is renamed,
+        the index entries of its devices must be updated too. Likewise the serial of an inventory item is indexed with
+        its device, so when an inventory item is created, changed, moved or deleted, its device(s) must be reindexed.
+
+        Returns:
+            dict: `{related_model: [(searchable_model, relation_path, many_valued)]}`, such as
+                `{Manufacturer: [(Device, "device_type__manufacturer", False), ...]}`, where `many_valued` is whether
+                the relation path traverses a reverse foreign key
+        """
+        if self._search_dependencies is None:
+            dependencies = {}
+            for model in get_searchable_models():
+                _, related, prefetch = self.get_search_fields(model)
+                relation_paths = set(related)
+                for path in prefetch:
+                    names = path.split("__")
+                    relation_paths.update("__".join(names[: i + 1]) for i in range(len(names)))
+                for relation_path in sorted(relation_paths):
+                    related_model = model
+                    many_valued = False
+                    for name in relation_path.split("__"):
+                        field = related_model._meta.get_field(name)
+                        many_valued = many_valued or field.one_to_many
+                        related_model = field.related_model
+                    dependencies.setdefault(related_model, []).append((model, relation_path, many_valued))
+            self.__class__._search_dependencies = dependencies
+        return self._search_dependencies
+
+    @classmethod
+    def get_search_values(cls, obj, names):
+        """Get the values of the field at the given path (as a list of names) of the given object or related objects."""
+        if isinstance(obj, Manager):
+            return [value for related_obj in obj.all() for value in cls.get_search_values(related_obj, names)]
+        if obj is None:
+            return []
+        if not names:
+            return [obj]
+        return cls.get_search_values(getattr(obj, names[0], None), names[1:])
+
+    @classmethod
+    def get_search_text(cls, obj, fields):
+        """Get the lowercased text to index for the given object, from its string representation and given fields."""
+        values = [str(obj)]
+        for field_path in fields:
+            values.extend(
+                str(value) for value in cls.get_search_values(obj, field_path.split("__")) if value not in (None, "")
+            )
+        return "\n".join(values).lower()
+
+    def index_objects(self, model, objects, batch_size=1000):
+        """
+        Create or replace the search index entries of the given objects, all instances of the given model.
+
+        Returns:
+            int: The number of objects indexed
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        fields, _, _ = self.get_search_fields(model)
+        entries = [
+            self.model(
+                object_type=content_type,
+                object_id=obj.pk,
+                name=str(obj)[: self.model._meta.get_field("name").max_length],
+                text=self.get_search_text(obj, fields),
+            )
+            for obj in objects
+        ]
+        self.filter(object_type=content_type, object_id__in=[entry.object_id for entry in entries]).delete()
+        self.bulk_create(entries, batch_size=batch_size)
+        return len(entries)
+
+    def update_for_objects(self, model, pks):
+        """Refresh the search index entries of the objects of the given model with the given primary keys."""
+        _, related, prefetch = self.get_search_fields(model)
+        return self.index_objects(
+            model, model.objects.filter(pk__in=pks).select_related(*related).prefetch_related(*prefetch)
+        )
+
+    def get_dependent_objects(self, instance, many_valued_only=False):
+        """
+        Get the objects whose indexed fields include fields of the given object.
+
+        Args:
+            instance (Model): The related object
+            many_valued_only (bool): Only include the objects related through a reverse foreign key, such as the device
+                of an inventory item
+
+        Returns:
+            dict: `{searchable_model: set(primary keys)}`
+        """
+        dependents = {}
+        for model, relation_path, many_valued in self.get_search_dependencies().get(type(instance), []):
+            if many_valued_only and not many_valued:
+                continue
+            pks = model.objects.filter(**{relation_path: instance.pk}).values_list("pk", flat=True)
+            dependents.setdefault(model, set()).update(pks)
+        return dependents
+
+    def update_for_dependent_objects(self, dependents, batch_size=1000):
+        """
+        Refresh the search index entries of the given objects, as returned by `get_dependent_objects()`.
+
+        Returns:
+            int: The number of objects reindexed
+        """
+        count = 0
+        for model, pks in dependents.items():
+            pks = sorted(pks)
+            for start in range(0, len(pks), batch_size):
+                count += self.update_for_objects(model, pks[start : start + batch_size])
+        return count
+
+    def update_for_related_object(self, instance, many_valued_only=False, batch_size=1000):
+        """
+        Refresh the search index entries of the objects whose indexed fields include fields of the given object.
+
+        Returns:
+            int: The number of objects reindexed
+        """
+        return self.update_for_dependent_objects(
+            self.get_dependent_objects(instance, many_valued_only=many_valued_only), batch_size=batch_size
+        )
+
+    def rebuild(self, models=None, batch_size=1000):
+        """
+        Rebuild the search index entries of all objects of the given models (by default, all searchable models).
+
+        Returns:
+            dict: The number of objects indexed for each model
+        """
+        if models is None:
+            models = get_searchable_models()
+        counts = {}
+        for model in models:
+            _, related, prefetch = self.get_search_fields(model)
+            self.filter(object_type=ContentType.objects.get_for_model(model)).delete()
+            counts[model] = 0
+            chunk = []
+            queryset = model.objects.select_related(*related)
+            if prefetch:
+                # iterator() doesn't support prefetch_related() in Django 3.2, so prefetch for each chunk of pks instead
+                pks = list(queryset.values_list("pk", flat=True))
+                for start in range(0, len(pks), batch_size):
+                    counts[model] += self.update_for_objects(model, pks[start : start + batch_size])
+                continue
+            for obj in queryset.iterator(chunk_size=batch_size):
+                chunk.append(obj)
+                if len(chunk) >= batch_size:
+                    counts[model] += self.index_objects(model, chunk, batch_size=batch_size)
+                    chunk = []
+            counts[model] += self.index_objects(model, chunk, batch_size=batch_size)
+        return counts
+
+    def search(self, value, user=None, models=None):
+        """
+        Search the index for objects matching the given value, ranked by relevance.
+
+        An object matches if its indexed text contains every word of the value (or if the value is its primary key).
+        Objects whose name is the value, or starts with it, are ranked first, followed by those matching the value as a
+        whole phrase. If the value may be (part of) an IP address or network, objects of models whose queryset provides
+        a `string_search()` (such as prefixes and IP addresses) also match as per that method, such as by containment.
+
+        Args:
+            value (str): The search terms
+            user (User): If specified, only include the objects that this user is permitted to view
+            models (list): The models to search (by default, all searchable models)
+        """
+        value = value.strip()
+        if not value:
+            return self.none()
+        if models is None:
+            models = get_searchable_models()
+
+        permitted = Q()
+        for model in models:
+            content_type = ContentType.objects.get_for_model(model)
+            if user is None:
+                permitted |= Q(object_type=content_type)
+                continue
+            queryset = model.objects.restrict(user, "view")
+            if queryset.query.is_empty():
+                continue
+            if not queryset.query.where:
+                permitted |= Q(object_type=content_type)
+            else:
+                permitted |= Q(object_type=content_type, object_id__in=queryset.values("pk"))
+        if not permitted:
+            return self.none()
+
+        matches = Q()
+        for word in value.lower().split():
+            matches &= Q(text__contains=word)
+        if is_uuid(value):
+            matches |= Q(object_id=value)
+        elif self.RE_NETWORK.match(value.lower()):
+            for model in models:
+                if hasattr(model.objects, "string_search"):
+                    matches |= Q(
+                        object_type=ContentType.objects.get_for_model(model),
+                        object_id__in=model.objects.string_search(value).values("pk"),
+                    )
+
+        return (
+            self.filter(permitted)
+            .filter(matches)
+            .annotate(
+                rank=Case(
+                    When(name__iexact=value, then=Value(0)),
+                    When(name__istartswith=value, then=Value(1)),
+                    When(text__contains=value.lower(), then=Value(2)),
+                    default=Value(3),
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by("rank", "name")
+        )
@@ -5,7 +5,7 @@ import shutil
 import logging
 from datetime import timedelta
 
-from django.contrib.contenttypes.models import ContentType
+from django.apps import apps as global_apps
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -20,8 +20,21 @@ from nautobot.extras.tasks import delete_custom_field_data, provision_field
 from nautobot.extras.utils import refresh_job_model_from_job_class
 from nautobot.extras.constants import CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
 from .choices import JobResultStatusChoices, ObjectChangeActionChoices
-from .models import CustomField, DynamicGroup, DynamicGroupMembership, GitRepository, JobResult, ObjectChange
-from .webhooks import enqueue_webhooks
+from .metadata import invalidate_content_type_metadata
+from .models import (
+    ComputedField,
+    CustomField,
+    DynamicGroup,
+    DynamicGroupMemberIndex,
+    DynamicGroupMembership,
+    GitRepository,
+    JobResult,
+    ObjectChange,
+    Relationship,
+    SearchIndexEntry,
+    Webhook,
+)
+from .registry import registry
 
 
 # thread safe change context state variable
@@ -48,22 +61,35 @@ def _get_user_if_authenticated(user, objectchange):
         return None
 
 
+def _record_object_change(change_context, instance, action):
+    """Add an ObjectChange for the given change of the given instance to the buffer of the given change context."""
+    # save a copy of this instance's field cache so it can be restored after serialization
+    # to prevent unexpected behavior when chaining multiple signal handlers
+    original_cache = instance._state.fields_cache.copy()
+    objectchange = instance.to_objectchange(action)
+    objectchange.user = _get_user_if_authenticated(change_context.get_user(), objectchange)
+    objectchange.request_id = change_context.change_id
+    objectchange.change_context = change_context.context
+    objectchange.change_context_detail = change_context.context_detail[:CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL]
+    change_context.object_changes.add(objectchange)
+
+    # restore field cache
+    instance._state.fields_cache = original_cache
+
+
 @receiver(post_save)
 @receiver(m2m_changed)
 def _handle_changed_object(sender, instance, raw=False, **kwargs):
     """
     Fires when an object is created or updated.
     """
-    from .jobs import enqueue_job_hooks  # avoid circular import
-
     if raw:
         return
 
-    if change_context_state.get() is None:
+    change_context = change_context_state.get()
+    if change_context is None:
         return
 
-    object_m2m_changed = False
-
     # Determine the type of change being made
     if kwargs.get("created"):
         action = ObjectChangeActionChoices.ACTION_CREATE
@@ -71,53 +97,14 @@ def _handle_changed_object(sender, instance, raw=False, **kwargs):
         action = ObjectChangeActionChoices.ACTION_UPDATE
     elif kwargs.get("action") in ["post_add", "post_remove"] and kwargs["pk_set"]:
         # m2m_changed with objects added or removed
-        object_m2m_changed = True
         action = ObjectChangeActionChoices.ACTION_UPDATE
     else:
         return
 
-    # Record an ObjectChange if applicable
+    # Record an ObjectChange if applicable; webhooks and job hooks are enqueued once it has been written to the database,
+    # and an m2m change recorded after the save of the same object is merged into the record of the save.
     if hasattr(instance, "to_objectchange"):
-        # save a copy of this instance's field cache so it can be restored after serialization
-        # to prevent unexpected behavior when chaining multiple signal handlers
-        original_cache = instance._state.fields_cache.copy()
-        if object_m2m_changed:
-            related_changes = ObjectChange.objects.filter(
-                changed_object_type=ContentType.objects.get_for_model(instance),
-                changed_object_id=instance.pk,
-                request_id=change_context_state.get().change_id,
-            )
-            m2m_changes = instance.to_objectchange(action)
-            if related_changes.exists():
-                related_changes.update(object_data=m2m_changes.object_data, object_data_v2=m2m_changes.object_data_v2)
-                objectchange = related_changes.first()
-            else:
-                objectchange = m2m_changes
-                objectchange.user = _get_user_if_authenticated(change_context_state.get().get_user(), objectchange)
-                objectchange.request_id = change_context_state.get().change_id
-                objectchange.change_context = change_context_state.get().context
-                objectchange.change_context_detail = change_context_state.get().context_detail[
-                    :CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
-                ]
-                objectchange.save()
-        else:
-            objectchange = instance.to_objectchange(action)
-            objectchange.user = _get_user_if_authenticated(change_context_state.get().get_user(), objectchange)
-            objectchange.request_id = change_context_state.get().change_id
-            objectchange.change_context = change_context_state.get().context
-            objectchange.change_context_detail = change_context_state.get().context_detail[
-                :CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
-            ]
-            objectchange.save()
-
-        # restore field cache
-        instance._state.fields_cache = original_cache
-
-        # Enqueue job hooks
-        enqueue_job_hooks(objectchange)
-
-    # Enqueue webhooks
-    enqueue_webhooks(instance, change_context_state.get().get_user(), change_context_state.get().change_id, action)
+        _record_object_change(change_context, instance, action)
 
     # Increment metric counters
     if action == ObjectChangeActionChoices.ACTION_CREATE:
@@ -137,38 +124,13 @@ def _handle_deleted_object(sender, instance, **kwargs):
     """
     Fires when an object is deleted.
     """
-    from .jobs import enqueue_job_hooks  # avoid circular import
-
-    if change_context_state.get() is None:
+    change_context = change_context_state.get()
+    if change_context is None:
         return
 
     # Record an ObjectChange if applicable
     if hasattr(instance, "to_objectchange"):
-        # save a copy of this instance's field cache so it can be restored after serialization
-        # to prevent unexpected behavior when chaining multiple signal handlers
-        original_cache = instance._state.fields_cache.copy()
-        objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
-        objectchange.user = _get_user_if_authenticated(change_context_state.get().get_user(), objectchange)
-        objectchange.request_id = change_context_state.get().change_id
-        objectchange.change_context = change_context_state.get().context
-        objectchange.change_context_detail = change_context_state.get().context_detail[
-            :CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
-        ]
-        objectchange.save()
-
-        # restore field cache
-        instance._state.fields_cache = original_cache
-
-        # Enqueue job hooks
-        enqueue_job_hooks(objectchange)
-
-    # Enqueue webhooks
-    enqueue_webhooks(
-        instance,
-        change_context_state.get().get_user(),
-        change_context_state.get().change_id,
-        ObjectChangeActionChoices.ACTION_DELETE,
-    )
+        _record_object_change(change_context, instance, ObjectChangeActionChoices.ACTION_DELETE)
 
     # Increment metric counters
     model_deletes.labels(instance._meta.model_name).inc()
@@ -185,7 +147,7 @@ def handle_cf_removed_obj_types(instance, action, pk_set, **kwargs):
     """
     if action == "post_remove":
         # Existing content types have been removed from the custom field, delete their data
-        transaction.on_commit(lambda: delete_custom_field_data.delay(instance.key, pk_set))
+        transaction.on_commit(lambda: delete_custom_field_data.delay(instance.key, pk_set, instance.pk))
 
     elif action == "post_add":
         # New content types have been added to the custom field, provision them
@@ -195,6 +157,44 @@ def handle_cf_removed_obj_types(instance, action, pk_set, **kwargs):
 m2m_changed.connect(handle_cf_removed_obj_types, sender=CustomField.content_types.through)
 
 
+@receiver(post_save, sender=CustomField)
+@receiver(post_delete, sender=CustomField)
+@receiver(m2m_changed, sender=CustomField.content_types.through)
+@receiver(post_save, sender=ComputedField)
+@receiver(post_delete, sender=ComputedField)
+@receiver(post_save, sender=Relationship)
+@receiver(post_delete, sender=Relationship)
+def content_type_metadata_changed(sender, **kwargs):
+    """
+    Invalidate the registry of custom fields, computed fields and relationships when any of them changes.
+    """
+    if kwargs.get("action", "post_").startswith("post_"):
+        invalidate_content_type_metadata()
+
+
+#
+# Webhooks
+#
+
+
+def webhook_content_types_changed(instance, action, pk_set, reverse, **kwargs):
+    """
+    Touch the Webhook(s) whose content types were changed, which invalidates the cached Webhook configuration.
+    """
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        webhooks = Webhook.objects.filter(pk=instance.pk)
+    elif pk_set:
+        webhooks = Webhook.objects.filter(pk__in=pk_set)
+    else:
+        webhooks = Webhook.objects.all()
+    webhooks.update(last_updated=timezone.now())
+
+
+m2m_changed.connect(webhook_content_types_changed, sender=Webhook.content_types.through)
+
+
 #
 # Datasources
 #
@@ -330,6 +330,153 @@ post_save.connect(dynamic_group_update_cached_members, sender=DynamicGroup)
 post_save.connect(dynamic_group_update_cached_members, sender=DynamicGroupMembership)
 
 
+def dynamic_group_update_member_index(sender, instance, raw=False, **kwargs):
+    """
+    When a DynamicGroup or DynamicGroupMembership is saved, invalidate the compiled member queries and update the
+    member index of the affected groups.
+
+    Deletion of a DynamicGroupMembership is handled by `DynamicGroupMembership.delete()`.
+    """
+    if raw:
+        return
+
+    if isinstance(instance, DynamicGroupMembership):
+        group = instance.parent_group
+    else:
+        group = instance
+
+    group.bump_query_version()
+    group.update_member_index_and_ancestors()
+
+
+post_save.connect(dynamic_group_update_member_index, sender=DynamicGroup)
+post_save.connect(dynamic_group_update_member_index, sender=DynamicGroupMembership)
+
+
+def _get_eligible_dynamic_groups_for_index(obj):
+    """
+    Return the DynamicGroups that could contain the given object or model, if its model supports Dynamic Groups.
+    """
+    app_label, model_name = obj._meta.app_label, obj._meta.model_name
+    if model_name not in registry["model_features"]["dynamic_groups"].get(app_label, []):
+        return DynamicGroup.objects.none()
+    return DynamicGroup.objects.all()._get_eligible_dynamic_groups(obj, use_cache=True)
+
+
+@receiver(post_save)
+def dynamic_group_update_member_index_for_object(sender, instance, raw=False, **kwargs):
+    """
+    When an object that supports Dynamic Groups is saved, update its entries in the member index.
+    """
+    if raw:
+        return
+
+    dynamic_groups = _get_eligible_dynamic_groups_for_index(instance)
+    if dynamic_groups:
+        dynamic_groups.update_member_index_for_objects(type(instance), [instance.pk])
+
+
+@receiver(m2m_changed)
+def dynamic_group_update_member_index_for_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    When a many-to-many relation (such as `tags`) of objects that support Dynamic Groups changes, update their entries
+    in the member index.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        model, pk_set = type(instance), {instance.pk}
+    elif not pk_set:
+        # The affected objects of a reverse `clear()` are not known
+        return
+
+    dynamic_groups = _get_eligible_dynamic_groups_for_index(model)
+    if dynamic_groups:
+        dynamic_groups.update_member_index_for_objects(model, pk_set)
+
+
+@receiver(post_delete)
+def dynamic_group_remove_member_index_for_object(sender, instance, **kwargs):
+    """
+    When an object that supports Dynamic Groups is deleted, remove its entries from the member index.
+    """
+    dynamic_groups = _get_eligible_dynamic_groups_for_index(instance)
+    if dynamic_groups:
+        DynamicGroupMemberIndex.objects.filter(
+            dynamic_group__in=dynamic_groups, associated_object_id=instance.pk
+        ).delete()
+
+
+#
+# Search index
+#
+
+
+def _is_searchable(model):
+    """Return whether the given model is included in the global search, per the `searchable_models` of its app."""
+    if model._meta.apps is not global_apps:
+        # Historical model, as used in data migrations
+        return False
+    app_config = global_apps.get_app_config(model._meta.app_label)
+    return model._meta.model_name in getattr(app_config, "searchable_models", ())
+
+
+@receiver(pre_save)
+@receiver(pre_delete)
+def search_index_capture_dependent_objects(sender, instance, raw=False, **kwargs):
+    """
+    Before an existing object whose fields are indexed as part of the objects it's related to by a reverse foreign key
+    (such as the device of an inventory item) is saved or deleted, record those objects, which it may be leaving.
+    """
+    if raw or sender._meta.apps is not global_apps or instance._state.adding:
+        return
+    if sender in SearchIndexEntry.objects.get_search_dependencies():
+        instance._search_index_dependents = SearchIndexEntry.objects.get_dependent_objects(
+            instance, many_valued_only=True
+        )
+
+
+@receiver(post_save)
+def search_index_update_for_object(sender, instance, created=False, raw=False, **kwargs):
+    """
+    When an object of a searchable model is saved, update its entry in the search index.
+
+    When an object whose fields are indexed as part of other objects (such as the manufacturer of devices, or the
+    inventory items of a device) is saved, update the entries of those objects too, as well as of those that it was
+    related to before.
+    """
+    if raw or sender._meta.apps is not global_apps:
+        return
+
+    if _is_searchable(sender):
+        SearchIndexEntry.objects.index_objects(sender, [instance])
+    if sender in SearchIndexEntry.objects.get_search_dependencies():
+        # A new object can only be indexed as part of the objects it's related to by a reverse foreign key
+        dependents = SearchIndexEntry.objects.get_dependent_objects(instance, many_valued_only=created)
+        for model, pks in instance.__dict__.pop("_search_index_dependents", {}).items():
+            dependents.setdefault(model, set()).update(pks)
+        SearchIndexEntry.objects.update_for_dependent_objects(dependents)
+
+
+@receiver(post_delete)
+def search_index_remove_for_object(sender, instance, **kwargs):
+    """
+    When an object of a searchable model is deleted, remove its entry from the search index.
+
+    When an object whose fields are indexed as part of the objects it's related to by a reverse foreign key (such as an
+    inventory item) is deleted, update the entries of those objects too.
+    """
+    if sender._meta.apps is not global_apps:
+        return
+
+    if _is_searchable(sender):
+        SearchIndexEntry.objects.filter(object_id=instance.pk).delete()
+    dependents = instance.__dict__.pop("_search_index_dependents", None)
+    if dependents:
+        SearchIndexEntry.objects.update_for_dependent_objects(dependents)
+
+
 #
 # Jobs
 #
@@ -1009,6 +1009,7 @@ class WebhookTable(BaseTable):
             "type_create",
             "type_update",
             "type_delete",
+            "batch_size",
             "ssl_verification",
             "ca_file_path",
         )
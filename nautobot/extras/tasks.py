@@ -1,21 +1,116 @@
+from http.cookiejar import DefaultCookiePolicy
 from logging import getLogger
+import threading
+import time
+import uuid
 
+from celery.utils.time import get_exponential_backoff_interval
+from prometheus_client import Counter, Histogram
 import requests
+from django.apps import apps
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from jinja2.exceptions import TemplateError
 
 from nautobot.core.celery import nautobot_task
-from nautobot.extras.choices import CustomFieldTypeChoices, ObjectChangeActionChoices
+from nautobot.core.models.query_functions import JSONArrayReplace, JSONRemove, JSONSet
+from nautobot.extras.choices import (
+    CustomFieldTypeChoices,
+    JobResultStatusChoices,
+    ObjectChangeActionChoices,
+    ObjectChangeEventContextChoices,
+)
+from nautobot.extras.constants import (
+    CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL,
+    CHANGELOG_MAX_OBJECT_REPR,
+    CUSTOM_FIELD_DATA_BATCH_SIZE,
+)
 from nautobot.extras.utils import generate_signature
 
 
 logger = getLogger("nautobot.extras.tasks")
 
+WEBHOOK_DELIVERY_METRIC = Histogram(
+    "nautobot_webhook_delivery_duration_seconds", "Duration of webhook requests.", ["webhook", "status"]
+)
+WEBHOOK_EVENTS_METRIC = Counter("nautobot_webhook_events", "Events sent by webhook requests.", ["webhook", "status"])
 
-@nautobot_task
-def update_custom_field_choice_data(field_id, old_value, new_value):
+# Upper bound, in seconds, of the delay before retrying failed webhook events
+WEBHOOK_RETRY_BACKOFF_MAX = 600
+
+# Pooled HTTP sessions for webhook requests, per thread (or greenlet, when monkey-patched), see get_webhook_session()
+_webhook_sessions = threading.local()
+
+
+def _update_custom_field_data(task, field_id, field_key, updates, description):
+    """
+    Rewrite the `_custom_field_data` of objects with set-based UPDATE queries rather than saving each object.
+
+    Each of the given `(queryset, expression)` updates is applied to the objects of the queryset in batches of
+    `CUSTOM_FIELD_DATA_BATCH_SIZE`, each batch being written in its own transaction together with a single
+    ObjectChange summarizing it. The progress is reported as the state of the task's JobResult.
+
+    Args:
+        task (Task): The bound task being run
+        field_id (uuid4): The PK of the custom field, against which the change records are made (if not None)
+        field_key (str): The key of the custom field
+        updates (list): List of `(queryset, expression)` tuples, `expression` being the new `_custom_field_data`
+        description (str or dict): Summary of the change made to each object, recorded in the change records
+
+    Returns:
+        int: The number of objects updated
+    """
+    from nautobot.extras.models import CustomField, DynamicGroup, ObjectChange  # avoiding circular import
+
+    total = sum(queryset.count() for queryset, _ in updates)
+    request_id = task.request.id or uuid.uuid4()
+    field_content_type = ContentType.objects.get_for_model(CustomField)
+    done = 0
+    for queryset, expression in updates:
+        model = queryset.model
+        content_type = ContentType.objects.get_for_model(model)
+        dynamic_groups = DynamicGroup.objects.filter(content_type=content_type)
+        if hasattr(queryset, "without_tree_fields"):
+            queryset = queryset.without_tree_fields()
+        queryset = queryset.order_by("pk")
+        while True:
+            pks = list(queryset.values_list("pk", flat=True)[:CUSTOM_FIELD_DATA_BATCH_SIZE])
+            if not pks:
+                break
+            with transaction.atomic():
+                model.objects.filter(pk__in=pks).update(_custom_field_data=expression)
+                if field_id is not None:
+                    ObjectChange.objects.create(
+                        request_id=request_id,
+                        action=ObjectChangeActionChoices.ACTION_UPDATE,
+                        changed_object_type=field_content_type,
+                        changed_object_id=field_id,
+                        change_context=ObjectChangeEventContextChoices.CONTEXT_JOB,
+                        change_context_detail=task.name[:CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL],
+                        object_repr=field_key[:CHANGELOG_MAX_OBJECT_REPR],
+                        object_data={
+                            "custom_field": field_key,
+                            "content_type": model._meta.label_lower,
+                            "change": description,
+                            "count": len(pks),
+                            "objects": pks,
+                        },
+                    )
+            if dynamic_groups.exists():
+                dynamic_groups.update_member_index_for_objects(model, pks)
+
+            done += len(pks)
+            queryset = queryset.filter(pk__gt=pks[-1])
+            logger.info("Updated custom field %s data of %d/%d objects", field_key, done, total)
+            if task.request.id and not task.request.is_eager:
+                task.update_state(state=JobResultStatusChoices.STATUS_STARTED, meta={"done": done, "total": total})
+
+    return done
+
+
+@nautobot_task(bind=True)
+def update_custom_field_choice_data(self, field_id, old_value, new_value):
     """
     Update the values for a custom field choice used in objects' _custom_field_data for the given field.
 
@@ -33,49 +128,61 @@ def update_custom_field_choice_data(field_id, old_value, new_value):
         return False
 
     if field.type == CustomFieldTypeChoices.TYPE_SELECT:
-        # Loop through all field content types and search for values to update
-        for ct in field.content_types.all():
-            model = ct.model_class()
-            for obj in model.objects.filter(**{f"_custom_field_data__{field.key}": old_value}):
-                obj._custom_field_data[field.key] = new_value
-                obj.save()
+        # Update the objects of all field content types that have the old value
+        updates = [
+            (
+                ct.model_class().objects.filter(**{f"_custom_field_data__{field.key}": old_value}),
+                JSONSet("_custom_field_data", field.key, new_value),
+            )
+            for ct in field.content_types.all()
+        ]
 
     elif field.type == CustomFieldTypeChoices.TYPE_MULTISELECT:
-        # Loop through all field content types and search for values to update
-        for ct in field.content_types.all():
-            model = ct.model_class()
-            for obj in model.objects.filter(**{f"_custom_field_data__{field.key}__contains": old_value}):
-                old_list = obj._custom_field_data[field.key]
-                new_list = [new_value if e == old_value else e for e in old_list]
-                obj._custom_field_data[field.key] = new_list
-                obj.save()
+        # Update the objects of all field content types whose values include the old value
+        updates = [
+            (
+                ct.model_class().objects.filter(**{f"_custom_field_data__{field.key}__contains": old_value}),
+                JSONArrayReplace("_custom_field_data", field.key, old_value, new_value),
+            )
+            for ct in field.content_types.all()
+        ]
 
     else:
         logger.error(f"Unknown field type, failing to act on choice data for this field {field.key}.")
         return False
 
+    _update_custom_field_data(self, field.pk, field.key, updates, {"old": old_value, "new": new_value})
+
     return True
 
 
-@nautobot_task
-def delete_custom_field_data(field_key, content_type_pk_set):
+@nautobot_task(bind=True)
+def delete_custom_field_data(self, field_key, content_type_pk_set, field_id=None):
     """
     Delete the values for a custom field
 
     Args:
         field_key (str): The key of the custom field which is being deleted
         content_type_pk_set (list): List of PKs for content types to act upon
+        field_id (uuid4, optional): The PK of the custom field, against which the change records are made
     """
-    with transaction.atomic():
-        for ct in ContentType.objects.filter(pk__in=content_type_pk_set):
-            model = ct.model_class()
-            for obj in model.objects.filter(**{f"_custom_field_data__{field_key}__isnull": False}):
-                del obj._custom_field_data[field_key]
-                obj.save()
+    from nautobot.extras.models import CustomField
 
+    if field_id is None:
+        field_id = CustomField.objects.filter(key=field_key).values_list("pk", flat=True).first()
 
-@nautobot_task
-def provision_field(field_id, content_type_pk_set):
+    updates = [
+        (
+            ct.model_class().objects.filter(_custom_field_data__has_key=field_key),
+            JSONRemove("_custom_field_data", field_key),
+        )
+        for ct in ContentType.objects.filter(pk__in=content_type_pk_set)
+    ]
+    _update_custom_field_data(self, field_id, field_key, updates, "deleted")
+
+
+@nautobot_task(bind=True)
+def provision_field(self, field_id, content_type_pk_set):
     """
     Provision a new custom field on all relevant content type object instances.
 
@@ -91,48 +198,62 @@ def provision_field(field_id, content_type_pk_set):
         logger.error(f"Custom field with ID {field_id} not found, failing to provision.")
         return False
 
-    with transaction.atomic():
-        for ct in ContentType.objects.filter(pk__in=content_type_pk_set):
-            model = ct.model_class()
-            for obj in model.objects.all():
-                obj._custom_field_data.setdefault(field.key, field.default)
-                obj.save()
+    updates = [
+        (
+            ct.model_class().objects.exclude(_custom_field_data__has_key=field.key),
+            JSONSet("_custom_field_data", field.key, field.default),
+        )
+        for ct in ContentType.objects.filter(pk__in=content_type_pk_set)
+    ]
+    _update_custom_field_data(self, field.pk, field.key, updates, {"default": field.default})
 
     return True
 
 
-@nautobot_task
-def process_webhook(webhook_pk, data, model_name, event, timestamp, username, request_id, snapshots):
+def get_webhook_session(webhook):
     """
-    Make a POST request to the defined Webhook
+    Return the pooled HTTP session to use for the requests of the given Webhook.
+
+    Sessions are kept for the lifetime of the worker thread, one per Webhook, so that the requests to its receiver
+    reuse keep-alive connections rather than opening a new connection per request. As `requests.Session` is not
+    thread-safe, sessions are never shared between threads, and as they are reused across events, they reject any
+    cookies set by the receiver rather than replaying them on later requests.
     """
-    from nautobot.extras.models import Webhook  # avoiding circular import
+    verify = webhook.ca_file_path or webhook.ssl_verification
+    sessions = getattr(_webhook_sessions, "sessions", None)
+    if sessions is None:
+        sessions = _webhook_sessions.sessions = {}
+    session = sessions.get(webhook.pk)
+    if session is None or session.verify != verify:
+        if session is not None:
+            session.close()
+        session = requests.Session()
+        session.verify = verify
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        sessions[webhook.pk] = session
+    return session
 
-    webhook = Webhook.objects.get(pk=webhook_pk)
 
-    context = {
-        "event": dict(ObjectChangeActionChoices)[event].lower(),
-        "timestamp": timestamp,
-        "model": model_name,
-        "username": username,
-        "request_id": request_id,
-        "data": data,
-        "snapshots": snapshots,
-    }
+def send_webhook(webhook, contexts):
+    """
+    Send a single request conveying the given event context(s) to the defined Webhook and return the response.
 
+    A Webhook with a `batch_size` greater than 1 is sent a JSON list of events; its headers are rendered with the
+    context of the first event.
+    """
     # Build the headers for the HTTP request
     headers = {
         "Content-Type": webhook.http_content_type,
     }
     try:
-        headers.update(webhook.render_headers(context))
+        headers.update(webhook.render_headers(contexts[0]))
     except (TemplateError, ValueError) as e:
         logger.error("Error parsing HTTP headers for webhook %s: %s", webhook, e)
         raise
 
     # Render the request body
     try:
-        body = webhook.render_body(context)
+        body = webhook.render_batch_body(contexts) if webhook.batch_size > 1 else webhook.render_body(contexts[0])
     except TemplateError as e:
         logger.error("Error rendering request body for webhook %s: %s", webhook, e)
         raise
@@ -144,7 +265,12 @@ def process_webhook(webhook_pk, data, model_name, event, timestamp, username, re
         "headers": headers,
         "data": body.encode("utf8"),
     }
-    logger.info("Sending %s request to %s (%s %s)", params["method"], params["url"], context["model"], context["event"])
+    logger.info(
+        "Sending %s request to %s (%s)",
+        params["method"],
+        params["url"],
+        ", ".join(f"{context['model']} {context['event']}" for context in contexts),
+    )
     logger.debug("%s", params)
     try:
         prepared_request = requests.Request(**params).prepare()
@@ -157,11 +283,40 @@ def process_webhook(webhook_pk, data, model_name, event, timestamp, username, re
         prepared_request.headers["X-Hook-Signature"] = generate_signature(prepared_request.body, webhook.secret)
 
     # Send the request
-    with requests.Session() as session:
-        session.verify = webhook.ssl_verification
-        if webhook.ca_file_path:
-            session.verify = webhook.ca_file_path
-        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES)
+    start_time = time.monotonic()
+    try:
+        response = get_webhook_session(webhook).send(prepared_request, proxies=settings.HTTP_PROXIES)
+    except requests.exceptions.RequestException:
+        status = "error"
+        raise
+    else:
+        status = "success" if response.ok else "failure"
+    finally:
+        WEBHOOK_DELIVERY_METRIC.labels(webhook.name, status).observe(time.monotonic() - start_time)
+        WEBHOOK_EVENTS_METRIC.labels(webhook.name, status).inc(len(contexts))
+
+    return response
+
+
+@nautobot_task
+def process_webhook(webhook_pk, data, model_name, event, timestamp, username, request_id, snapshots):
+    """
+    Make a POST request to the defined Webhook
+    """
+    from nautobot.extras.models import Webhook  # avoiding circular import
+
+    webhook = Webhook.objects.get(pk=webhook_pk)
+
+    context = {
+        "event": dict(ObjectChangeActionChoices)[event].lower(),
+        "timestamp": timestamp,
+        "model": model_name,
+        "username": username,
+        "request_id": request_id,
+        "data": data,
+        "snapshots": snapshots,
+    }
+    response = send_webhook(webhook, [context])
 
     if response.ok:
         logger.info("Request succeeded; response status %s", response.status_code)
@@ -171,3 +326,87 @@ def process_webhook(webhook_pk, data, model_name, event, timestamp, username, re
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@nautobot_task(bind=True, max_retries=None)
+def process_webhook_events(self, webhook_pk, contexts):
+    """
+    Send the given event contexts to the defined Webhook, in requests of up to `webhook.batch_size` events each.
+
+    The events which could not be delivered are retried with an exponential backoff, up to
+    `settings.WEBHOOK_MAX_RETRIES` times. The events which could not be rendered into a request are logged and dropped,
+    as retrying would not help; the other events of their batch are still sent.
+    """
+    from nautobot.extras.models import Webhook  # avoiding circular import
+
+    try:
+        webhook = Webhook.objects.get(pk=webhook_pk)
+    except Webhook.DoesNotExist:
+        logger.warning("Webhook %s no longer exists; dropping %d event(s)", webhook_pk, len(contexts))
+        return f"Webhook {webhook_pk} no longer exists."
+
+    failed_contexts = []
+    dropped_count = 0
+    batches = [contexts[i : i + webhook.batch_size] for i in range(0, len(contexts), webhook.batch_size)]
+    while batches:
+        batch = batches.pop(0)
+        try:
+            response = send_webhook(webhook, batch)
+        except (TemplateError, ValueError) as e:
+            if len(batch) > 1:
+                # Send the events of the batch one at a time instead, to only drop those which can't be rendered
+                batches[:0] = [[context] for context in batch]
+            else:
+                logger.error(
+                    "Dropping %s %s event which could not be rendered: %s",
+                    batch[0].get("model"),
+                    batch[0].get("event"),
+                    e,
+                )
+                dropped_count += 1
+            continue
+        except requests.exceptions.RequestException as e:
+            logger.warning("Request failed: %s", e)
+            failed_contexts.extend(batch)
+            continue
+        if response.ok:
+            logger.info("Request succeeded; response status %s", response.status_code)
+        else:
+            logger.warning("Request failed; response status %s: %s", response.status_code, response.content)
+            failed_contexts.extend(batch)
+
+    if failed_contexts:
+        if self.request.retries < settings.WEBHOOK_MAX_RETRIES:
+            countdown = get_exponential_backoff_interval(
+                factor=settings.WEBHOOK_RETRY_BACKOFF,
+                retries=self.request.retries,
+                maximum=WEBHOOK_RETRY_BACKOFF_MAX,
+                full_jitter=True,
+            )
+            logger.info("Retrying %d event(s) in %d seconds", len(failed_contexts), countdown)
+            raise self.retry(args=[webhook_pk, failed_contexts], countdown=countdown)
+        raise requests.exceptions.RequestException(
+            f"{len(failed_contexts)} of {len(contexts)} event(s) FAILED to be delivered to webhook {webhook}."
+        )
+
+    if dropped_count:
+        return (
+            f"{len(contexts) - dropped_count} event(s) successfully delivered to webhook {webhook}; "
+            f"{dropped_count} event(s) could not be rendered and were dropped."
+        )
+    return f"{len(contexts)} event(s) successfully delivered to webhook {webhook}."
+
+
+@nautobot_task
+def rebuild_search_index(model_labels=None):
+    """
+    Rebuild the global search index for the given models, e.g. `["dcim.device"]` (by default, all searchable models).
+
+    Returns:
+        dict: The number of objects indexed for each model
+    """
+    from nautobot.extras.models import SearchIndexEntry
+
+    models = [apps.get_model(model_label) for model_label in model_labels] if model_labels else None
+    counts = SearchIndexEntry.objects.rebuild(models=models)
+    return {model._meta.label_lower: count for model, count in counts.items()}
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from django.utils import timezone
 
 from nautobot.core.celery import app
 from nautobot.core.testing import TransactionTestCase
@@ -8,7 +10,7 @@ from nautobot.core.utils.lookup import get_changes_for_model
 from nautobot.dcim.models import Location, LocationType
 from nautobot.extras.choices import ObjectChangeActionChoices, ObjectChangeEventContextChoices
 from nautobot.extras.context_managers import web_request_context
-from nautobot.extras.models import Status, Webhook
+from nautobot.extras.models import Status, Tag, Webhook
 
 
 # Use the proper swappable User model
@@ -70,6 +72,70 @@ class WebRequestContextTestCase(TestCase):
         with self.subTest():
             self.assertEqual(oc_list[0].change_context_detail, "test_change_log_context")
 
+    def test_change_log_buffered(self):
+        """Test that the ObjectChanges are written, coalesced per object, when leaving the change context."""
+        location_type = LocationType.objects.get(name="Campus")
+        location_status = Status.objects.get_for_model(Location).first()
+        tag = Tag.objects.create(name="Test Tag 1")
+        tag.content_types.add(ContentType.objects.get_for_model(Location))
+        with web_request_context(self.user):
+            location_1 = Location.objects.create(
+                name="Test Location 1", location_type=location_type, status=location_status
+            )
+            location_1.description = "Updated"
+            location_1.save()
+            location_1.tags.add(tag)
+            location_2 = Location.objects.create(
+                name="Test Location 2", location_type=location_type, status=location_status
+            )
+            self.assertFalse(get_changes_for_model(Location).exists())
+            flush_time = timezone.now()
+
+        oc_list = get_changes_for_model(Location)
+        self.assertEqual(oc_list.count(), 2)
+        oc = oc_list.get(changed_object_id=location_1.pk)
+        self.assertEqual(oc.action, ObjectChangeActionChoices.ACTION_CREATE)
+        self.assertEqual(oc.user_name, self.user.username)
+        self.assertEqual(oc.object_data_v2["description"], "Updated")
+        self.assertEqual(oc.object_data_v2["tags"][0]["id"], str(tag.pk))
+        self.assertEqual(oc_list.get(changed_object_id=location_2.pk).action, ObjectChangeActionChoices.ACTION_CREATE)
+        # The records keep the time of the change rather than that of the flush
+        self.assertLess(oc_list.get(changed_object_id=location_2.pk).time, flush_time)
+
+        location_1_pk = location_1.pk
+        with web_request_context(self.user):
+            location_1.delete()
+        self.assertEqual(
+            oc_list.filter(changed_object_id=location_1_pk).first().action, ObjectChangeActionChoices.ACTION_DELETE
+        )
+
+    def test_change_log_rolled_back(self):
+        """Test that the ObjectChanges for changes which were rolled back are not written."""
+        location_type = LocationType.objects.get(name="Campus")
+        location_status = Status.objects.get_for_model(Location).first()
+        with web_request_context(self.user):
+            Location.objects.create(name="Test Location 1", location_type=location_type, status=location_status)
+            try:
+                with transaction.atomic():
+                    Location.objects.create(name="Test Location 2", location_type=location_type, status=location_status)
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(
+            list(get_changes_for_model(Location).values_list("object_repr", flat=True)), ["Test Location 1"]
+        )
+
+    def test_change_log_discarded_on_error(self):
+        """Test that an error inside a transaction discards the ObjectChanges rather than masking the error."""
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                with web_request_context(self.user):
+                    Tag.objects.create(name="Test Tag 1")
+                    Tag.objects.create(name="Test Tag 1")
+
+        self.assertFalse(get_changes_for_model(Tag).exists())
+
     def test_change_webhook_enqueued(self):
         """Test that the webhook resides on the queue"""
         # TODO(john): come back to this with a way to actually do it without a running worker
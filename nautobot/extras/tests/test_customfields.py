@@ -1,4 +1,5 @@
 import logging
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -20,7 +21,7 @@ from nautobot.dcim.forms import RackFilterForm
 from nautobot.dcim.models import Device, Location, LocationType, Rack
 from nautobot.dcim.tables import LocationTable
 from nautobot.extras.choices import CustomFieldTypeChoices, CustomFieldFilterLogicChoices
-from nautobot.extras.models import ComputedField, CustomField, CustomFieldChoice, Status
+from nautobot.extras.models import ComputedField, CustomField, CustomFieldChoice, ObjectChange, Status
 from nautobot.users.models import ObjectPermission
 from nautobot.virtualization.models import VirtualMachine
 
@@ -2015,6 +2016,68 @@ class CustomFieldBackgroundTasks(TransactionTestCase):
 
         self.assertEqual(location.cf["cf1"], "Bar")
 
+    def test_update_custom_field_choice_data_task_multiselect(self):
+        obj_type = ContentType.objects.get_for_model(Location)
+        cf = CustomField(label="CF1", type=CustomFieldTypeChoices.TYPE_MULTISELECT)
+        cf.save()
+        cf.content_types.set([obj_type])
+
+        choice = CustomFieldChoice(custom_field=cf, value="Foo")
+        choice.save()
+        CustomFieldChoice.objects.create(custom_field=cf, value="Baz")
+        location_type = LocationType.objects.create(name="Root Type 4")
+        location_status = Status.objects.get_for_model(Location).first()
+        locations = [
+            Location.objects.create(
+                name=f"Location {i}",
+                location_type=location_type,
+                status=location_status,
+                _custom_field_data={"cf1": value},
+            )
+            for i, value in enumerate([["Baz", "Foo"], ["Foo"], ["Baz"]])
+        ]
+
+        choice.value = "Bar"
+        choice.save()
+
+        for location in locations:
+            location.refresh_from_db()
+        self.assertEqual(locations[0].cf["cf1"], ["Baz", "Bar"])
+        self.assertEqual(locations[1].cf["cf1"], ["Bar"])
+        self.assertEqual(locations[2].cf["cf1"], ["Baz"])
+
+    @mock.patch("nautobot.extras.tasks.CUSTOM_FIELD_DATA_BATCH_SIZE", 2)
+    def test_custom_field_data_tasks_change_records(self):
+        """The tasks record a single ObjectChange per batch of objects updated."""
+        location_type = LocationType.objects.create(name="Root Type 5")
+        location_status = Status.objects.get_for_model(Location).first()
+        locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=location_status)
+            for i in range(5)
+        ]
+        cf = CustomField(label="CF1", type=CustomFieldTypeChoices.TYPE_TEXT, default="Foo")
+        cf.save()
+        cf.content_types.set([ContentType.objects.get_for_model(Location)])
+
+        object_changes = ObjectChange.objects.filter(
+            changed_object_type=ContentType.objects.get_for_model(CustomField), changed_object_id=cf.pk
+        ).order_by("time")
+        count = Location.objects.count()
+        self.assertEqual(
+            [object_change.object_data["count"] for object_change in object_changes],
+            [2] * (count // 2) + [1] * (count % 2),
+        )
+        self.assertEqual(object_changes[0].object_data["change"], {"default": "Foo"})
+        self.assertEqual(object_changes[0].object_data["content_type"], "dcim.location")
+        changed_pks = {pk for object_change in object_changes for pk in object_change.object_data["objects"]}
+        self.assertTrue(changed_pks.issuperset(str(location.pk) for location in locations))
+        self.assertEqual(Location.objects.filter(_custom_field_data__cf1="Foo").count(), count)
+
+        cf.delete()
+
+        self.assertEqual(object_changes.filter(object_data__change="deleted").count(), (count + 1) // 2)
+        self.assertFalse(Location.objects.filter(_custom_field_data__has_key="cf1").exists())
+
 
 class CustomFieldTableTest(TestCase):
     """
@@ -33,6 +33,7 @@ from nautobot.extras.models import (
     Job,
     JobLogEntry,
     JobResult,
+    ObjectChange,
     Role,
     Secret,
     SecretsGroup,
@@ -52,6 +53,7 @@ class GitTest(TransactionTestCase):
 
     databases = ("default", "job_logs")
     COMMIT_HEXSHA = "88dd9cd78df89e887ee90a1d209a3e9a04e8c841"
+    NEW_COMMIT_HEXSHA = "6d0a1b8e6f6e4f2e9b1c4d7a3f9e2b5c8d1a4e7f"
 
     def setUp(self):
         super().setUp()
@@ -199,6 +201,22 @@ class GitTest(TransactionTestCase):
         os.remove(os.path.join(path, "jobs", "my_job.py"))
         return mock.DEFAULT
 
+    def read_repo_files(self, path):
+        """Get the contents of all files of the repository at the given path, keyed by their relative path."""
+        repo_files = {}
+        for dir_path, _, file_names in os.walk(path):
+            for file_name in file_names:
+                with open(os.path.join(dir_path, file_name), "r") as fd:
+                    repo_files[os.path.relpath(os.path.join(dir_path, file_name), path)] = fd.read()
+        return repo_files
+
+    def mock_new_commit(self, MockGitRepo, previous_files, changed_files):
+        """Mock checking out a new commit, in which the given files changed since the commit of `previous_files`."""
+        MockGitRepo.side_effect = None
+        MockGitRepo.return_value.checkout.return_value = (self.NEW_COMMIT_HEXSHA, True)
+        MockGitRepo.return_value.get_changed_files.return_value = changed_files
+        MockGitRepo.return_value.get_file_contents.side_effect = lambda commit_hexsha, path: previous_files.get(path)
+
     def assert_repo_slug_valid_python_package_name(self):
         git_repository = GitRepository.objects.create(
             name="1 Very-Bad Git_____Repo Name (2)", remote_url="http://localhost/git.git"
@@ -462,8 +480,11 @@ class GitTest(TransactionTestCase):
                 # Make sure Job was successfully loaded from file and registered as a JobModel
                 self.assert_job_exists()
 
-                # Now "resync" the repository, but now those files no longer exist in the repository
-                MockGitRepo.side_effect = self.empty_repo
+                # Now "resync" the repository from a new commit, in which those files no longer exist
+                repo_path = os.path.join(tempdir, self.repo.slug)
+                previous_files = self.read_repo_files(repo_path)
+                self.empty_repo(repo_path, self.repo.remote_url)
+                self.mock_new_commit(MockGitRepo, previous_files, set(previous_files))
 
                 # For verisimilitude, don't re-use the old request and job_result
                 self.mock_request.id = uuid.uuid4()
@@ -506,6 +527,191 @@ class GitTest(TransactionTestCase):
                 # Verify that Job database record still exists but code is no longer installed/loaded
                 self.assert_job_exists(installed=False)
 
+    def test_pull_git_repository_and_refresh_data_incrementally(self, MockGitRepo):
+        """
+        Resyncing a repository should only refresh the data provided by files that changed since the last sync.
+        """
+        with tempfile.TemporaryDirectory() as tempdir:
+            with self.settings(GIT_ROOT=tempdir):
+                MockGitRepo.side_effect = self.populate_repo
+                MockGitRepo.return_value.checkout.return_value = (self.COMMIT_HEXSHA, True)
+
+                job_model = GitRepositorySync().job_model
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                job_result.refresh_from_db()
+                self.assertEqual(
+                    job_result.status,
+                    JobResultStatusChoices.STATUS_SUCCESS,
+                    (
+                        job_result.result,
+                        list(job_result.job_log_entries.filter(log_level="error").values_list("message", flat=True)),
+                    ),
+                )
+                self.assertEqual(job_result.result["head"], self.COMMIT_HEXSHA)
+                MockGitRepo.return_value.get_changed_files.assert_not_called()
+
+                # Change the NTP servers config context and delete an export template in a new commit
+                repo_path = os.path.join(tempdir, self.repo.slug)
+                previous_files = self.read_repo_files(repo_path)
+                with open(os.path.join(repo_path, "config_contexts", "context.yaml"), "w") as fd:
+                    yaml.dump(
+                        {
+                            "_metadata": {"name": "Frobozz 1000 NTP servers v2"},
+                            "ntp-servers": ["172.16.10.44"],
+                        },
+                        fd,
+                    )
+                os.remove(os.path.join(repo_path, "export_templates", "dcim", "device", "template2.html"))
+                # Also change a file that isn't part of the commit diff, which should therefore be left alone
+                with open(os.path.join(repo_path, "config_context_schemas", "schema-1.yaml"), "w") as fd:
+                    yaml.dump(
+                        {
+                            "_metadata": {"name": "Config Context Schema 2"},
+                            "data_schema": self.config_context_schema["data_schema"],
+                        },
+                        fd,
+                    )
+                self.mock_new_commit(
+                    MockGitRepo,
+                    previous_files,
+                    {"config_contexts/context.yaml", "export_templates/dcim/device/template2.html"},
+                )
+
+                object_changes = list(ObjectChange.objects.values_list("pk", flat=True))
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                job_result.refresh_from_db()
+                self.assertEqual(
+                    job_result.status,
+                    JobResultStatusChoices.STATUS_SUCCESS,
+                    (
+                        job_result.result,
+                        list(job_result.job_log_entries.filter(log_level="error").values_list("message", flat=True)),
+                    ),
+                )
+                self.assertEqual(job_result.result["head"], self.NEW_COMMIT_HEXSHA)
+                MockGitRepo.return_value.get_changed_files.assert_called_once_with(
+                    self.COMMIT_HEXSHA, self.NEW_COMMIT_HEXSHA
+                )
+
+                git_repository_content_type = ContentType.objects.get_for_model(GitRepository)
+                self.assertEqual(
+                    sorted(
+                        ConfigContext.objects.filter(
+                            owner_content_type=git_repository_content_type, owner_object_id=self.repo.pk
+                        ).values_list("name", flat=True)
+                    ),
+                    ["Frobozz 1000 NTP servers v2", "Location context"],
+                )
+                self.assertEqual(
+                    ConfigContext.objects.get(name="Frobozz 1000 NTP servers v2").data,
+                    {"ntp-servers": ["172.16.10.44"]},
+                )
+                self.assert_implicit_config_context_exists("Location context")
+                self.assert_config_context_schema_record_exists("Config Context Schema 1")
+                self.assert_device_exists(self.device.name)
+                self.assert_export_template_device("template.j2")
+                self.assert_export_template_vlan_exists("template.j2")
+                with self.assertRaises(ExportTemplate.DoesNotExist):
+                    self.assert_export_template_html_exist("template2.html")
+
+                # Records provided by unchanged files were not saved again
+                self.assertEqual(
+                    sorted(
+                        ObjectChange.objects.exclude(pk__in=object_changes)
+                        .filter(
+                            changed_object_type__in=ContentType.objects.get_for_models(
+                                ConfigContext, ConfigContextSchema, Device, ExportTemplate
+                            ).values()
+                        )
+                        .values_list("object_repr", "action")
+                    ),
+                    sorted(
+                        [
+                            ("[Test Git Repository] Frobozz 1000 NTP servers", "delete"),
+                            ("[Test Git Repository] Frobozz 1000 NTP servers v2", "create"),
+                            ("[Test Git Repository] dcim | device: template2.html", "delete"),
+                        ]
+                    ),
+                )
+
+                # When the commit of the last sync is no longer in the branch history, all files are refreshed
+                MockGitRepo.return_value.get_changed_files.return_value = None
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                job_result.refresh_from_db()
+                self.assertEqual(
+                    job_result.status,
+                    JobResultStatusChoices.STATUS_SUCCESS,
+                    (
+                        job_result.result,
+                        list(job_result.job_log_entries.filter(log_level="error").values_list("message", flat=True)),
+                    ),
+                )
+                self.assertFalse(ConfigContextSchema.objects.filter(name="Config Context Schema 1").exists())
+                ConfigContextSchema.objects.get(name="Config Context Schema 2", owner_object_id=self.repo.pk)
+
+                # Manual changes to the records provided by the repository are reverted by the next sync
+                MockGitRepo.return_value.get_changed_files.return_value = set()
+                context = ConfigContext.objects.get(name="Location context", owner_object_id=self.repo.pk)
+                context.data = {"manually": "changed"}
+                context.save()
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                self.assertTrue(
+                    job_result.job_log_entries.filter(
+                        message="Records provided by this repository were modified since the last sync, "
+                        "refreshing all files"
+                    ).exists()
+                )
+                self.assert_implicit_config_context_exists("Location context")
+
+                # Routine changes to devices don't cause their local config context data to be reloaded
+                device = Device.objects.get(name=self.device.name)
+                device.serial = "Changed"
+                device.save()
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                self.assertTrue(
+                    job_result.job_log_entries.filter(message__startswith="Refreshing only the 0 file(s)").exists()
+                )
+                self.assertFalse(job_result.job_log_entries.filter(message__startswith="Reverting the data").exists())
+
+                # Whereas manual changes to their local config context data are reverted
+                local_context_data = device.local_config_context_data
+                device.local_config_context_data = {"manually": "changed"}
+                device.save()
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                self.assertTrue(
+                    job_result.job_log_entries.filter(
+                        message="Reverting the data provided by 1 file(s) which was modified since the last sync"
+                    ).exists()
+                )
+                device.refresh_from_db()
+                self.assertEqual(device.local_config_context_data, local_context_data)
+
+                # A file that failed to load is retried by the next syncs, even if it didn't change since
+                with open(os.path.join(repo_path, "config_contexts", "context.yaml"), "w") as fd:
+                    fd.write('{"_metadata": ')
+                MockGitRepo.return_value.get_changed_files.return_value = {"config_contexts/context.yaml"}
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                job_result.refresh_from_db()
+                self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILURE)
+                self.assertEqual(job_result.result["failed_files"], ["config_contexts/context.yaml"])
+                MockGitRepo.return_value.get_changed_files.return_value = set()
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                job_result.refresh_from_db()
+                self.assertTrue(
+                    job_result.job_log_entries.filter(
+                        message="Retrying the 1 file(s) which failed to load in the last sync"
+                    ).exists()
+                )
+                self.assertEqual(job_result.result["failed_files"], ["config_contexts/context.yaml"])
+                with open(os.path.join(repo_path, "config_contexts", "context.yaml"), "w") as fd:
+                    yaml.dump({"_metadata": {"name": "Frobozz 1000 NTP servers v3"}, "ntp-servers": []}, fd)
+                job_result = run_job_for_testing(job=job_model, repository=self.repo.pk)
+                job_result.refresh_from_db()
+                self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+                self.assertTrue(job_result.job_log_entries.filter(message__startswith="Refreshing only the").exists())
+                self.assertEqual(job_result.result["failed_files"], [])
+                ConfigContext.objects.get(name="Frobozz 1000 NTP servers v3", owner_object_id=self.repo.pk)
+
     def test_pull_git_repository_and_refresh_data_with_bad_data(self, MockGitRepo):
         """
         The test_pull_git_repository_and_refresh_data job should gracefully handle bad data in the Git repository
@@ -1,7 +1,7 @@
 import random
 import time
 
-from unittest.mock import patch
+from unittest.mock import call, patch, PropertyMock
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
@@ -35,6 +35,7 @@ from nautobot.extras.filters import DynamicGroupFilterSet, DynamicGroupMembershi
 from nautobot.extras.models import (
     CustomField,
     DynamicGroup,
+    DynamicGroupMemberIndex,
     DynamicGroupMembership,
     Relationship,
     RelationshipAssociation,
@@ -277,6 +278,64 @@ class DynamicGroupModelTest(DynamicGroupTestBase):  # TODO: BaseModelTestCase mi
         self.assertEqual(list(device4_groups), [])
         self.assertQuerySetEqual(device4_groups, device4.dynamic_groups)
 
+    def test_get_membership_for_objects(self):
+        """Test `DynamicGroup.objects.get_membership_for_objects()`."""
+        devices = Device.objects.all()
+        # The state of the groups is read along with them, rather than by `members` for each group
+        with patch.object(DynamicGroup, "members", new_callable=PropertyMock) as members:
+            membership = DynamicGroup.objects.get_membership_for_objects(Device, devices.values_list("pk", flat=True))
+        members.assert_not_called()
+
+        self.assertEqual(set(membership), set(devices.values_list("pk", flat=True)))
+        for device in devices:
+            expected = {group for group in DynamicGroup.objects.all() if group.has_member(device)}
+            self.assertEqual(set(membership[device.pk]), expected)
+
+    def test_member_index(self):
+        """Test that the member index follows changes to member objects, groups and group memberships."""
+
+        def assert_index_matches_members():
+            for group in DynamicGroup.objects.filter(content_type=self.device_ct):
+                self.assertEqual(
+                    set(group.member_index_entries.values_list("associated_object_id", flat=True)),
+                    set(group.members.values_list("pk", flat=True)),
+                    group.name,
+                )
+
+        assert_index_matches_members()
+
+        # Changing an object
+        device = self.devices[-1]  # device-location-4
+        self.assertNotIn(self.first_child, DynamicGroup.objects.get_for_object(device))
+        device.location = self.locations[0]
+        device.save()
+        self.assertIn(self.first_child, DynamicGroup.objects.get_for_object(device))
+        assert_index_matches_members()
+
+        # Changing an object's tags
+        tag = Tag.objects.get_for_model(Device).first()
+        tag_group = DynamicGroup.objects.create(name="Tagged", content_type=self.device_ct, filter={"tags": [tag.name]})
+        device.tags.add(tag)
+        self.assertIn(tag_group, DynamicGroup.objects.get_for_object(device))
+        device.tags.remove(tag)
+        self.assertNotIn(tag_group, DynamicGroup.objects.get_for_object(device))
+
+        # Changing a group's filter
+        self.no_match_filter.filter = {"name": [device.name]}
+        self.no_match_filter.save()
+        self.assertIn(self.no_match_filter, DynamicGroup.objects.get_for_object(device))
+        assert_index_matches_members()
+
+        # Changing the children of a group
+        self.parent.remove_child(self.second_child)
+        assert_index_matches_members()
+        self.parent.add_child(self.second_child, DynamicGroupOperatorChoices.OPERATOR_UNION, 20)
+        assert_index_matches_members()
+
+        # Deleting an object
+        device.delete()
+        self.assertFalse(DynamicGroupMemberIndex.objects.filter(associated_object_id=device.pk).exists())
+
     def test_members(self):
         """Test `DynamicGroup.members`."""
         group = self.first_child
@@ -702,6 +761,54 @@ class DynamicGroupModelTest(DynamicGroupTestBase):  # TODO: BaseModelTestCase mi
 
         self.assertQuerySetEqual(group_qs, process_qs)
 
+    def test_get_compiled_query(self):
+        """Test that the query plan of a group is reused until the group or one of its descendants changes."""
+        get_query_plan = DynamicGroup.get_query_plan
+        get_query_filters = DynamicGroup.get_query_filters
+        with patch.object(
+            DynamicGroup, "get_query_plan", autospec=True, side_effect=get_query_plan
+        ) as mock_plan, patch.object(
+            DynamicGroup, "get_query_filters", autospec=True, side_effect=get_query_filters
+        ) as mock_filters:
+            self.parent.get_compiled_query()
+            mock_plan.reset_mock()
+            mock_filters.reset_mock()
+            self.parent.get_compiled_query()
+            mock_plan.assert_not_called()
+            # The filtersets of the groups are not instantiated again either
+            mock_filters.assert_not_called()
+
+            # Changing a descendant group invalidates the query plan of its ancestors
+            self.nested_child.filter = {"status": [self.status_2.name]}
+            self.nested_child.save()
+            self.assertIn(call(self.parent), mock_plan.call_args_list)
+            mock_plan.reset_mock()
+            self.parent.get_compiled_query()
+            mock_plan.assert_not_called()
+
+        self.assertQuerySetEqual(self.parent.members, self.parent.get_queryset().filter(self.parent.generate_query()))
+
+    def test_get_compiled_query_tree_filter(self):
+        """Test that objects added below a Location filtered on by a child group are members without any group change."""
+        self.parent.get_compiled_query()
+        child_location_type = LocationType.objects.filter(parent=self.lt).first()
+        child_location = Location.objects.create(
+            name="Location 1 Child",
+            location_type=child_location_type,
+            parent=self.locations[0],
+            status=self.locations[0].status,
+        )
+        child_location_type.content_types.add(self.device_ct)
+        device = Device.objects.create(
+            name="device-location-1-child",
+            status=self.status_2,
+            role=self.device_role,
+            device_type=self.device_type,
+            location=child_location,
+        )
+        self.assertIn(device, self.first_child.members)
+        self.assertIn(device, self.parent.members)
+
     def test_get_ancestors(self):
         """Test `DynamicGroup.get_ancestors()`."""
         expected = ["Third Child", "Parent"]
@@ -1,6 +1,7 @@
 from unittest import mock
 
 from django.test import TestCase
+from git import GitCommandError
 
 from nautobot.core.utils.git import GitRepo, convert_git_diff_log_to_list
 
@@ -21,3 +22,19 @@ class GitRepoTest(TestCase):
         RepoMock.create_remote.assert_called_with("origin", url=url)
 
         self.assertEqual(repo.diff_remote("main"), convert_git_diff_log_to_list(RepoMock.git.diff.return_value))
+
+    def test_get_changed_files(self, RepoMock):
+        RepoMock.init.return_value = RepoMock
+        RepoMock.git.diff.return_value = "config_contexts/context.yaml\0export_templates/dcim/device/template.j2\0"
+        repo = GitRepo("path", "http://localhost.git", clone_initially=False)
+
+        self.assertEqual(
+            repo.get_changed_files("abc", "def"),
+            {"config_contexts/context.yaml", "export_templates/dcim/device/template.j2"},
+        )
+        RepoMock.git.merge_base.assert_called_with("--is-ancestor", "abc", "def")
+        RepoMock.git.diff.assert_called_with("--name-only", "--no-renames", "-z", "abc", "def")
+
+        # The previous commit is no longer an ancestor of the current one, e.g. after a force-push
+        RepoMock.git.merge_base.side_effect = GitCommandError("merge-base", 1)
+        self.assertIsNone(repo.get_changed_files("abc", "def"))
@@ -15,6 +15,7 @@ from django.test import override_settings
 from django.test.client import RequestFactory
 from django.utils import timezone
 
+from nautobot.core.celery.log import JobLogBuffer
 from nautobot.core.testing import (
     TestCase,
     TransactionTestCase,
@@ -379,6 +380,38 @@ class JobTransactionTest(TransactionTestCase):
             if log.message != "Job completed":
                 self.assertEqual(log.message, "The secret is (redacted)")
 
+    @mock.patch("nautobot.core.celery.log.JOB_LOG_BUFFER_SIZE", 2)
+    def test_log_buffering(self):
+        """
+        Test that log entries are written to the database in batches, and all of them by the end of the job.
+        """
+        module = "log_redaction"
+        name = "TestLogRedaction"
+        with mock.patch.object(
+            models.JobResult, "save_log_entries", autospec=True, side_effect=models.JobResult.save_log_entries
+        ) as save_log_entries:
+            job_result = create_job_result_and_run_job(module, name)
+
+        logs = models.JobLogEntry.objects.filter(job_result=job_result)
+        self.assertEqual(sum(len(call_args.args[1]) for call_args in save_log_entries.call_args_list), logs.count())
+        self.assertLess(save_log_entries.call_count, logs.count())
+        self.assertTrue(logs.filter(message="Job completed").exists())
+
+    def test_log_buffer_immediate(self):
+        """
+        Test that the first log entry of a job, and any entry written immediately, are not kept in the buffer.
+        """
+        job_result = mock.Mock()
+        job_log_buffer = JobLogBuffer(job_result)
+        job_log_buffer.add("first")
+        job_result.save_log_entries.assert_called_once_with(["first"])
+        job_log_buffer.add("second")
+        job_log_buffer.add("third")
+        self.assertEqual(job_log_buffer.log_entries, ["second", "third"])
+        job_log_buffer.add("warning", immediate=True)
+        job_result.save_log_entries.assert_called_with(["second", "third", "warning"])
+        self.assertEqual(job_log_buffer.log_entries, [])
+
     def test_log_skip_db_logging(self):
         """
         Test that an attempt is made at log redaction.
@@ -857,17 +890,17 @@ class JobHookTransactionTest(TransactionTestCase):  # TODO: BaseModelTestCase mi
         with web_request_context(user=self.user):
             status = models.Status.objects.get_for_model(Location).first()
             Location.objects.create(name="Test Job Hook Location 1", location_type=self.location_type, status=status)
-            job_result = models.JobResult.objects.get(job_model=self.job_model)
-            expected_log_messages = [
-                ("info", "Running job"),
-                ("info", f"change: dcim | location Test Job Hook Location 1 created by {self.user.username}"),
-                ("info", "action: create"),
-                ("info", f"jobresult.user: {self.user.username}"),
-                ("info", "Test Job Hook Location 1"),
-                ("info", "Job completed"),
-            ]
-            log_messages = models.JobLogEntry.objects.filter(job_result=job_result).values_list("log_level", "message")
-            self.assertSequenceEqual(log_messages, expected_log_messages)
+        job_result = models.JobResult.objects.get(job_model=self.job_model)
+        expected_log_messages = [
+            ("info", "Running job"),
+            ("info", f"change: dcim | location Test Job Hook Location 1 created by {self.user.username}"),
+            ("info", "action: create"),
+            ("info", f"jobresult.user: {self.user.username}"),
+            ("info", "Test Job Hook Location 1"),
+            ("info", "Job completed"),
+        ]
+        log_messages = models.JobLogEntry.objects.filter(job_result=job_result).values_list("log_level", "message")
+        self.assertSequenceEqual(log_messages, expected_log_messages)
 
     def test_enqueue_job_hook_m2m(self):
         """
@@ -883,17 +916,17 @@ class JobHookTransactionTest(TransactionTestCase):  # TODO: BaseModelTestCase mi
         tag.content_types.add(ContentType.objects.get_for_model(Location))
         with web_request_context(user=self.user):
             loc.tags.add(tag)
-            job_result = models.JobResult.objects.get(job_model=self.job_model)
-            expected_log_messages = [
-                ("info", "Running job"),
-                ("info", f"change: dcim | location Test Job Hook Location 1 updated by {self.user.username}"),
-                ("info", "action: update"),
-                ("info", f"jobresult.user: {self.user.username}"),
-                ("info", "Test Job Hook Location 1"),
-                ("info", "Job completed"),
-            ]
-            log_messages = models.JobLogEntry.objects.filter(job_result=job_result).values_list("log_level", "message")
-            self.assertSequenceEqual(log_messages, expected_log_messages)
+        job_result = models.JobResult.objects.get(job_model=self.job_model)
+        expected_log_messages = [
+            ("info", "Running job"),
+            ("info", f"change: dcim | location Test Job Hook Location 1 updated by {self.user.username}"),
+            ("info", "action: update"),
+            ("info", f"jobresult.user: {self.user.username}"),
+            ("info", "Test Job Hook Location 1"),
+            ("info", "Job completed"),
+        ]
+        log_messages = models.JobLogEntry.objects.filter(job_result=job_result).values_list("log_level", "message")
+        self.assertSequenceEqual(log_messages, expected_log_messages)
 
 
 class RemoveScheduledJobManagementCommandTestCase(TestCase):
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Device, Location
+from nautobot.dcim.tables import LocationTable
+from nautobot.extras.choices import CustomFieldTypeChoices, RelationshipTypeChoices
+from nautobot.extras.metadata import (
+    content_type_metadata_changes_pending,
+    get_content_type_metadata,
+    get_content_type_metadata_version,
+)
+from nautobot.extras.models import ComputedField, CustomField, Relationship
+
+
+class ContentTypeMetadataTest(TestCase):
+    def setUp(self):
+        self.location_ct = ContentType.objects.get_for_model(Location)
+        self.device_ct = ContentType.objects.get_for_model(Device)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.custom_field = CustomField.objects.create(
+                label="Metadata Field", key="metadata_field", type=CustomFieldTypeChoices.TYPE_TEXT
+            )
+            self.custom_field.content_types.add(self.location_ct)
+            self.computed_field = ComputedField.objects.create(
+                content_type=self.location_ct, label="Metadata Computed", key="metadata_computed", template="{{ obj }}"
+            )
+            self.relationship = Relationship.objects.create(
+                label="Location Devices",
+                key="location_devices",
+                type=RelationshipTypeChoices.TYPE_ONE_TO_MANY,
+                source_type=self.location_ct,
+                destination_type=self.device_ct,
+            )
+
+    def test_get_content_type_metadata(self):
+        metadata = get_content_type_metadata(Location)
+        self.assertIn(self.custom_field, metadata.custom_fields)
+        self.assertEqual(metadata.computed_fields, (self.computed_field,))
+        self.assertEqual(metadata.relationships, (self.relationship,))
+        self.assertEqual(metadata.source_relationships, (self.relationship,))
+        self.assertEqual(metadata.destination_relationships, ())
+
+        device_metadata = get_content_type_metadata(self.device_ct)
+        self.assertEqual(device_metadata.custom_fields, ())
+        self.assertEqual(device_metadata.source_relationships, ())
+        self.assertEqual(device_metadata.destination_relationships, (self.relationship,))
+
+        # The metadata is now served from the registry, for models, instances and content types alike
+        location = Location.objects.first()
+        with self.assertNumQueries(0):
+            self.assertIs(get_content_type_metadata(location), metadata)
+            self.assertIs(get_content_type_metadata(self.location_ct), metadata)
+            table = LocationTable(Location.objects.all())
+        self.assertIn("cf_metadata_field", table.base_columns)
+        self.assertIn("cpf_metadata_computed", table.base_columns)
+        self.assertIn("cr_location_devices_src", table.base_columns)
+
+    def test_registry_invalidation(self):
+        metadata = get_content_type_metadata(Location)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.computed_field.delete()
+            self.custom_field.content_types.remove(self.location_ct)
+        new_metadata = get_content_type_metadata(Location)
+        self.assertIsNot(new_metadata, metadata)
+        self.assertNotIn(self.custom_field, new_metadata.custom_fields)
+        self.assertEqual(new_metadata.computed_fields, ())
+
+        # Uncommitted changes bypass the registry
+        self.relationship.source_type = self.device_ct
+        self.relationship.destination_type = self.location_ct
+        self.relationship.save()
+        self.assertEqual(get_content_type_metadata(Location).source_relationships, ())
+        self.assertEqual(get_content_type_metadata(Location).destination_relationships, (self.relationship,))
+
+        # The change is pending until the transaction ends
+        self.assertTrue(content_type_metadata_changes_pending())
+
+    def test_rolled_back_changes_not_pending(self):
+        try:
+            with transaction.atomic():
+                self.computed_field.delete()
+                self.assertTrue(content_type_metadata_changes_pending())
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(content_type_metadata_changes_pending())
+
+    def test_version_memoized(self):
+        version = get_content_type_metadata_version()
+        with mock.patch("nautobot.extras.metadata.cache") as cache:
+            self.assertEqual(get_content_type_metadata_version(), version)
+            cache.get.assert_not_called()
@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 from unittest import mock, expectedFailure
@@ -19,6 +20,7 @@ from nautobot.core.choices import ColorChoices
 from nautobot.core.testing import TestCase
 from nautobot.core.testing.mixins import NautobotTestCaseMixin
 from nautobot.core.testing.models import ModelTestCases
+from nautobot.core.utils.data import deepmerge
 from nautobot.dcim.models import (
     Device,
     DeviceType,
@@ -120,6 +122,20 @@ class ComputedFieldTest(ModelTestCases.BaseModelTestCase):
         rendered_value = self.bad_computed_field.render(context={"obj": self.location1})
         self.assertEqual(rendered_value, self.bad_computed_field.fallback_value)
 
+    def test_render_many_method(self):
+        computed_field = ComputedField.objects.create(
+            content_type=ContentType.objects.get_for_model(Location),
+            key="division",
+            label="Division",
+            template="{{ 10 // obj }}",
+            fallback_value="Division error",
+        )
+        rendered_values = computed_field.render_many([{"obj": 2}, {"obj": 0}, {"obj": 5}])
+        self.assertEqual(rendered_values, ["5", "Division error", "2"])
+
+        rendered_values = self.bad_computed_field.render_many([{"obj": self.location1}, {"obj": self.location1}])
+        self.assertEqual(rendered_values, [self.bad_computed_field.fallback_value] * 2)
+
     def test_check_if_key_is_graphql_safe(self):
         """
         Check the GraphQL validation method on CustomField Key Attribute.
@@ -314,6 +330,33 @@ class ConfigContextTest(ModelTestCases.BaseModelTestCase):
         device_context = device.get_config_context()
         for key in ["location-1", "location-2", "location-3"]:
             self.assertIn(key, device_context)
+        # Location inheritance is resolved entirely by the annotation
+        annotated_device = Device.objects.filter(pk=device.pk).annotate_config_context_data().get()
+        with self.assertNumQueries(0):
+            self.assertEqual(device_context, annotated_device.get_config_context())
+
+    def test_annotation_same_as_get_for_object_location_and_other_relations(self):
+        """A context assigned to both a location and a role only applies to objects matching both."""
+        other_role = Role.objects.get_for_model(Device).exclude(pk=self.devicerole.pk).first()
+        location_context = ConfigContext.objects.create(name="parent-location", weight=100, data={"location": 1})
+        location_context.locations.add(self.parent_location)
+        location_context.roles.add(other_role)
+        device = Device.objects.create(
+            name="Child Location Device",
+            location=self.location,
+            role=self.devicerole,
+            status=self.device_status,
+            device_type=self.devicetype,
+        )
+        annotated_device = Device.objects.filter(pk=device.pk).annotate_config_context_data().get()
+        self.assertNotIn("location", annotated_device.get_config_context())
+        self.assertEqual(device.get_config_context(), annotated_device.get_config_context())
+
+        device.role = other_role
+        device.save()
+        annotated_device = Device.objects.filter(pk=device.pk).annotate_config_context_data().get()
+        self.assertIn("location", annotated_device.get_config_context())
+        self.assertEqual(device.get_config_context(), annotated_device.get_config_context())
 
     def test_annotation_same_as_get_for_object_virtualmachine_relations(self):
         location_context = ConfigContext.objects.create(name="location", weight=100, data={"location": 1})
@@ -401,6 +444,42 @@ class ConfigContextTest(ModelTestCases.BaseModelTestCase):
             "location-3",
         ]:
             self.assertIn(key, vm_context)
+        annotated_vm = VirtualMachine.objects.filter(pk=virtual_machine.pk).annotate_config_context_data().get()
+        with self.assertNumQueries(0):
+            self.assertEqual(vm_context, annotated_vm.get_config_context())
+
+    @override_settings(CONFIG_CONTEXT_CACHE_TIMEOUT=60)
+    def test_get_config_context_cache(self):
+        """Test that rendered config context data is cached until a config context or the device changes."""
+        config_context = ConfigContext.objects.create(name="cached", weight=100, data={"cached": 1})
+        config_context.roles.add(self.devicerole)
+
+        def get_config_context():
+            return Device.objects.filter(pk=self.device.pk).annotate_config_context_data().get().get_config_context()
+
+        with mock.patch("nautobot.extras.models.models.deepmerge", wraps=deepmerge) as mock_deepmerge:
+            self.assertEqual(get_config_context()["cached"], 1)
+            mock_deepmerge.assert_called()
+            mock_deepmerge.reset_mock()
+            self.assertEqual(get_config_context()["cached"], 1)
+            mock_deepmerge.assert_not_called()
+
+            # Changing a config context results in its data being rendered afresh
+            config_context.data = {"cached": 2}
+            config_context.save()
+            self.assertEqual(get_config_context()["cached"], 2)
+            mock_deepmerge.assert_called()
+
+            # So does changing the device such that a different set of config contexts applies to it
+            self.device.role = Role.objects.get_for_model(Device).exclude(pk=self.devicerole.pk).first()
+            self.device.save()
+            self.assertNotIn("cached", get_config_context())
+
+            # And changing its local config context data
+            self.device.local_config_context_data = {"cached": 3}
+            self.device.save()
+            self.assertEqual(get_config_context()["cached"], 3)
+            self.assertEqual(self.device.get_config_context()["cached"], 3)
 
     def test_multiple_tags_return_distinct_objects(self):
         """
@@ -494,6 +573,11 @@ class ConfigContextTest(ModelTestCases.BaseModelTestCase):
         self.assertIn("dynamic context 2", device2.get_config_context().values())
         self.assertNotIn("dynamic context 1", device2.get_config_context().values())
 
+        # The annotation used for lists of devices must match the same dynamic groups
+        for device in (self.device, device2):
+            annotated_device = Device.objects.filter(pk=device.pk).annotate_config_context_data().get()
+            self.assertEqual(device.get_config_context(), annotated_device.get_config_context())
+
 
 class ConfigContextSchemaTestCase(ModelTestCases.BaseModelTestCase):
     """
@@ -1670,3 +1754,18 @@ class WebhookTest(ModelTestCases.BaseModelTestCase):
             conflicts["type_create"],
             [f"A webhook already exists for create on dcim | device to URL {self.url}"],
         )
+
+    def test_batch_size(self):
+        webhook = self.webhooks[0]
+        webhook.batch_size = 2
+        webhook.validated_save()
+        self.assertEqual(
+            json.loads(webhook.render_batch_body([{"event": "created"}, {"event": "updated"}])),
+            [{"event": "created"}, {"event": "updated"}],
+        )
+
+        # Batched payloads are JSON lists
+        webhook.http_content_type = "application/x-www-form-urlencoded"
+        with self.assertRaises(ValidationError) as cm:
+            webhook.validated_save()
+        self.assertIn("batch_size", cm.exception.message_dict)
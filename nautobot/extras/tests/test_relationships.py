@@ -1053,6 +1053,41 @@ class RelationshipTableTest(RelationshipBaseTest, TestCase):
             for value in col_expected_value:
                 self.assertIn(value, rendered_value)
 
+    def test_relationship_table_render_num_queries(self):
+        """The associations and peers of a relationship column are loaded at once for all the rows of the table."""
+        for location, vlan in zip(self.locations, self.vlans):
+            RelationshipAssociation.objects.create(
+                relationship=self.o2m_1,
+                source_type=self.location_ct,
+                source_id=location.id,
+                destination_type=self.vlan_ct,
+                destination_id=vlan.id,
+            )
+        for location, rack in zip(self.locations, self.racks):
+            RelationshipAssociation.objects.create(
+                relationship=self.o2o_1,
+                source_type=self.rack_ct,
+                source_id=rack.id,
+                destination_type=self.location_ct,
+                destination_id=location.id,
+            )
+
+        location_table = LocationTable(Location.objects.filter(pk__in=[location.pk for location in self.locations]))
+        rows = list(location_table.rows)
+        self.assertEqual(len(rows), len(self.locations))
+        # One query for the associations and one for the peers, per column
+        with self.assertNumQueries(4):
+            cells = {
+                row.record: (row.get_cell("cr_location_vlan_src"), row.get_cell("cr_primary_rack_location_dst"))
+                for row in rows
+            }
+
+        for location, vlan, rack in zip(self.locations, self.vlans, self.racks):
+            self.assertIn("1 VLAN<", cells[location][0])
+            self.assertEqual(cells[location][1], f'<a href="{rack.get_absolute_url()}">{rack}</a>')
+        for location in self.locations[len(self.racks) :]:
+            self.assertEqual(cells[location], ("—", "—"))
+
 
 class RequiredRelationshipTestMixin:
     """Common test mixin for both view and API tests dealing with required relationships."""
@@ -0,0 +1,193 @@
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.urls import reverse
+
+from nautobot.circuits.models import Circuit, Provider
+from nautobot.core.testing import APITestCase, TestCase
+from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, Manufacturer, Rack, RackReservation
+from nautobot.extras.models import Role, SearchIndexEntry, Status
+from nautobot.ipam.models import IPAddress, Namespace, Prefix
+from nautobot.users.models import ObjectPermission
+
+
+class SearchIndexEntryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.providers = [
+            Provider.objects.create(name="Searchable Transit", comments="Peering in AMS-IX"),
+            Provider.objects.create(name="Transit Searchable"),
+            Provider.objects.create(name="Other Searchable Transit Provider", account="ACCT-4242"),
+        ]
+
+    def search(self, value, **kwargs):
+        return list(SearchIndexEntry.objects.search(value, **kwargs).values_list("object_id", flat=True))
+
+    def test_get_search_fields(self):
+        fields, related, prefetch = SearchIndexEntry.objects.get_search_fields(RackReservation)
+        self.assertIn("rack__name", fields)
+        self.assertIn("user__username", fields)
+        self.assertNotIn("id", fields)
+        self.assertEqual(related, ["rack", "user"])
+        self.assertEqual(prefetch, [])
+
+        # Fields of the objects related by a reverse foreign key are prefetched
+        fields, _, prefetch = SearchIndexEntry.objects.get_search_fields(Circuit)
+        self.assertIn("cid", fields)
+        self.assertIn("circuit_terminations__xconnect_id", fields)
+        self.assertEqual(prefetch, ["circuit_terminations"])
+
+    def test_index_updated_on_save_and_delete(self):
+        provider = self.providers[0]
+        entry = SearchIndexEntry.objects.get(object_id=provider.pk)
+        self.assertEqual(entry.object_type, ContentType.objects.get_for_model(Provider))
+        self.assertEqual(entry.name, "Searchable Transit")
+        self.assertIn("peering in ams-ix", entry.text)
+
+        provider.comments = "Peering in DE-CIX"
+        provider.save()
+        self.assertEqual(self.search("de-cix"), [provider.pk])
+        self.assertEqual(self.search("ams-ix"), [])
+
+        provider.delete()
+        self.assertFalse(SearchIndexEntry.objects.filter(object_id=provider.pk).exists())
+
+    def test_search_ranking(self):
+        self.assertEqual(
+            self.search("Searchable Transit"), [self.providers[0].pk, self.providers[2].pk, self.providers[1].pk]
+        )
+        self.assertEqual(self.search("TRANSIT"), [self.providers[1].pk, self.providers[2].pk, self.providers[0].pk])
+        self.assertEqual(self.search("acct-4242"), [self.providers[2].pk])
+        self.assertEqual(self.search(str(self.providers[1].pk)), [self.providers[1].pk])
+        self.assertEqual(self.search("   "), [])
+
+    def test_search_models(self):
+        status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(
+            name="Searchable Location", location_type=Location.objects.first().location_type, status=status
+        )
+        self.assertIn(location.pk, self.search("searchable"))
+        self.assertEqual(self.search("searchable", models=[Location]), [location.pk])
+        self.assertEqual(self.search("searchable", models=[Rack]), [])
+
+    def test_search_network(self):
+        namespace = Namespace.objects.first()
+        status = Status.objects.get_for_model(Prefix).first()
+        prefix = Prefix.objects.create(prefix="198.51.100.0/24", namespace=namespace, status=status)
+        ip_address = IPAddress.objects.create(
+            address="198.51.100.7/24", namespace=namespace, status=Status.objects.get_for_model(IPAddress).first()
+        )
+        # Prefixes and IP addresses within the (partial) network match, as well as those containing it
+        self.assertEqual(self.search("198.51.100.7", models=[Prefix, IPAddress]), [ip_address.pk, prefix.pk])
+        self.assertEqual(self.search("198.51", models=[IPAddress]), [ip_address.pk])
+        self.assertEqual(self.search("198.51.100.128/25", models=[Prefix]), [prefix.pk])
+        self.assertEqual(self.search("203.0.113.1", models=[Prefix, IPAddress]), [])
+
+    def test_index_updated_on_related_save(self):
+        manufacturer = Manufacturer.objects.create(name="Searchable Vendor")
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model="Model 1")
+        self.assertEqual(self.search("searchable vendor", models=[DeviceType]), [device_type.pk])
+
+        manufacturer.name = "Renamed Vendor"
+        manufacturer.save()
+        self.assertEqual(self.search("searchable vendor", models=[DeviceType]), [])
+        self.assertEqual(self.search("renamed vendor", models=[DeviceType]), [device_type.pk])
+
+    def test_index_updated_on_reverse_related_save_and_delete(self):
+        device_type = DeviceType.objects.create(manufacturer=Manufacturer.objects.first(), model="Searchable Model")
+        role = Role.objects.get_for_model(Device).first()
+        status = Status.objects.get_for_model(Device).first()
+        location = Location.objects.get_for_model(Device).first()
+        device, other_device = [
+            Device.objects.create(name=name, device_type=device_type, role=role, status=status, location=location)
+            for name in ("Device 1", "Device 2")
+        ]
+        inventory_item = InventoryItem.objects.create(device=device, name="Searchable Item", serial="SRCH-0001")
+        self.assertEqual(self.search("srch-0001", models=[Device]), [device.pk])
+
+        inventory_item.serial = "SRCH-0002"
+        inventory_item.save()
+        self.assertEqual(self.search("srch-0001", models=[Device]), [])
+        self.assertEqual(self.search("srch-0002", models=[Device]), [device.pk])
+
+        # Moving the item reindexes both the device it left and the one it joined
+        inventory_item.device = other_device
+        inventory_item.save()
+        self.assertEqual(self.search("srch-0002", models=[Device]), [other_device.pk])
+
+        inventory_item.delete()
+        self.assertEqual(self.search("srch-0002", models=[Device]), [])
+
+        SearchIndexEntry.objects.all().delete()
+        InventoryItem.objects.create(device=device, name="Searchable Item", serial="SRCH-0003")
+        SearchIndexEntry.objects.rebuild(models=[Device], batch_size=2)
+        self.assertEqual(self.search("srch-0003", models=[Device]), [device.pk])
+
+    def test_search_restricted(self):
+        self.assertEqual(self.search("searchable", user=self.user), [])
+
+        obj_perm = ObjectPermission.objects.create(name="Test permission", actions=["view"])
+        obj_perm.constraints = {"name__startswith": "Transit"}
+        obj_perm.save()
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Provider))
+        obj_perm.users.add(self.user)
+        user = self.user.__class__.objects.get(pk=self.user.pk)
+        self.assertEqual(self.search("searchable", user=user), [self.providers[1].pk])
+
+    def test_rebuild(self):
+        SearchIndexEntry.objects.all().delete()
+        counts = SearchIndexEntry.objects.rebuild(models=[Provider], batch_size=2)
+        self.assertEqual(counts, {Provider: Provider.objects.count()})
+        self.assertEqual(SearchIndexEntry.objects.count(), Provider.objects.count())
+        self.assertEqual(len(self.search("searchable transit")), 3)
+
+        out = StringIO()
+        call_command("rebuild_search_index", "circuits.provider", stdout=out)
+        self.assertIn(f"Indexing providers... {Provider.objects.count()} indexed", out.getvalue())
+        self.assertEqual(SearchIndexEntry.objects.count(), Provider.objects.count())
+
+
+class SearchAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.providers = [
+            Provider.objects.create(name="Searchable Transit"),
+            Provider.objects.create(name="Transit Searchable"),
+        ]
+
+    def test_search(self):
+        self.add_permissions("circuits.view_provider")
+        response = self.client.get(f"{reverse('api-search')}?q=transit", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [(result["object_type"], result["id"]) for result in response.data["results"]],
+            [("circuits.provider", self.providers[1].pk), ("circuits.provider", self.providers[0].pk)],
+        )
+        self.assertEqual(response.data["results"][0]["display"], "Transit Searchable")
+        self.assertTrue(response.data["results"][0]["url"].endswith(f"/api/circuits/providers/{self.providers[1].pk}/"))
+
+        response = self.client.get(f"{reverse('api-search')}?q=transit&obj_type=dcim.device", **self.header)
+        self.assertEqual(response.data["count"], 0)
+        response = self.client.get(f"{reverse('api-search')}?q=transit&limit=1", **self.header)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(reverse("api-search"), **self.header)
+        self.assertHttpStatus(response, 400)
+
+    def test_rebuild(self):
+        url = reverse("api-search-rebuild")
+        response = self.client.post(url, {"obj_type": ["circuits.provider"]}, format="json", **self.header)
+        self.assertHttpStatus(response, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        SearchIndexEntry.objects.all().delete()
+        response = self.client.post(url, {"obj_type": ["circuits.provider"]}, format="json", **self.header)
+        self.assertHttpStatus(response, 202)
+        self.assertEqual(SearchIndexEntry.objects.count(), Provider.objects.count())
+
+        response = self.client.post(url, {"obj_type": ["users.user"]}, format="json", **self.header)
+        self.assertHttpStatus(response, 400)
@@ -2324,6 +2324,7 @@ class WebhookTestCase(
             "payload_url": "http://test-url.com/test-4",
             "http_method": "POST",
             "http_content_type": "application/json",
+            "batch_size": 10,
         }
 
 
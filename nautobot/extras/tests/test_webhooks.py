@@ -1,24 +1,32 @@
-import json
-import uuid
+from contextlib import redirect_stdout
 from copy import deepcopy
+from http.server import ThreadingHTTPServer
+from io import StringIO
+import json
+import threading
 from unittest.mock import patch
+import uuid
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
 from django.utils import timezone
 from requests import Session
+from requests.exceptions import ConnectionError, RequestException
 
 from nautobot.core.api.exceptions import SerializerNotFound
-from nautobot.core.testing import APITestCase
+from nautobot.core.testing import APITestCase, TestCase
 from nautobot.core.utils.lookup import get_changes_for_model
 from nautobot.dcim.api.serializers import LocationSerializer
 from nautobot.dcim.models import Location, LocationType
 from nautobot.extras.choices import ObjectChangeActionChoices
 from nautobot.extras.context_managers import web_request_context
+from nautobot.extras.management.commands.webhook_receiver import WebhookHandler
 from nautobot.extras.models import Webhook, Tag
 from nautobot.extras.models.statuses import Status
-from nautobot.extras.tasks import process_webhook
+from nautobot.extras.tasks import get_webhook_session, process_webhook, process_webhook_events, WEBHOOK_EVENTS_METRIC
 from nautobot.extras.utils import generate_signature
+from nautobot.extras.webhooks import get_webhooks_by_change_type
 
 
 User = get_user_model()
@@ -100,29 +108,30 @@ class WebhookTest(APITestCase):
         with patch.object(Session, "send", mock_send):
             self.client.force_login(self.user)
 
-            with web_request_context(self.user, change_id=request_id):
+            with web_request_context(self.user):
                 location_type = LocationType.objects.get(name="Campus")
                 location = Location(name="Location 1", status=self.statuses[0], location_type=location_type)
                 location.save()
 
+            with web_request_context(self.user, change_id=request_id):
                 location.name = "Location Update"
                 location.status = self.statuses[1]
                 location.save()
 
-                serializer = LocationSerializer(location, context={"request": None, "depth": 1})
-                oc = get_changes_for_model(location).first()
-                snapshots = oc.get_snapshots()
-
-                process_webhook(
-                    webhook.pk,
-                    serializer.data,
-                    Location._meta.model_name,
-                    ObjectChangeActionChoices.ACTION_CREATE,
-                    timestamp,
-                    self.user.username,
-                    request_id,
-                    snapshots,
-                )
+            serializer = LocationSerializer(location, context={"request": None, "depth": 1})
+            oc = get_changes_for_model(location).first()
+            snapshots = oc.get_snapshots()
+
+            process_webhook(
+                webhook.pk,
+                serializer.data,
+                Location._meta.model_name,
+                ObjectChangeActionChoices.ACTION_CREATE,
+                timestamp,
+                self.user.username,
+                request_id,
+                snapshots,
+            )
 
     def test_webhooks_snapshot_on_create(self):
         request_id = uuid.uuid4()
@@ -151,20 +160,20 @@ class WebhookTest(APITestCase):
                 location = Location(name="Location 1", location_type=location_type, status=self.statuses[0])
                 location.save()
 
-                serializer = LocationSerializer(location, context={"request": None})
-                oc = get_changes_for_model(location).first()
-                snapshots = oc.get_snapshots()
-
-                process_webhook(
-                    webhook.pk,
-                    serializer.data,
-                    Location._meta.model_name,
-                    ObjectChangeActionChoices.ACTION_CREATE,
-                    timestamp,
-                    self.user.username,
-                    request_id,
-                    snapshots,
-                )
+            serializer = LocationSerializer(location, context={"request": None})
+            oc = get_changes_for_model(location).first()
+            snapshots = oc.get_snapshots()
+
+            process_webhook(
+                webhook.pk,
+                serializer.data,
+                Location._meta.model_name,
+                ObjectChangeActionChoices.ACTION_CREATE,
+                timestamp,
+                self.user.username,
+                request_id,
+                snapshots,
+            )
 
     def test_webhooks_snapshot_on_delete(self):
         request_id = uuid.uuid4()
@@ -197,20 +206,20 @@ class WebhookTest(APITestCase):
                 temp_location = deepcopy(location)
                 location.delete()
 
-                serializer = LocationSerializer(temp_location, context={"request": None})
-                oc = get_changes_for_model(temp_location).first()
-                snapshots = oc.get_snapshots()
-
-                process_webhook(
-                    webhook.pk,
-                    serializer.data,
-                    Location._meta.model_name,
-                    ObjectChangeActionChoices.ACTION_CREATE,
-                    timestamp,
-                    self.user.username,
-                    request_id,
-                    snapshots,
-                )
+            serializer = LocationSerializer(temp_location, context={"request": None})
+            oc = get_changes_for_model(temp_location).first()
+            snapshots = oc.get_snapshots()
+
+            process_webhook(
+                webhook.pk,
+                serializer.data,
+                Location._meta.model_name,
+                ObjectChangeActionChoices.ACTION_CREATE,
+                timestamp,
+                self.user.username,
+                request_id,
+                snapshots,
+            )
 
     @patch("nautobot.core.api.utils.get_serializer_for_model")
     def test_webhooks_snapshot_without_model_api_serializer(self, get_serializer_for_model):
@@ -242,34 +251,35 @@ class WebhookTest(APITestCase):
         with patch.object(Session, "send", mock_send):
             self.client.force_login(self.user)
 
-            with web_request_context(self.user, change_id=request_id):
+            with web_request_context(self.user):
                 location_type = LocationType.objects.get(name="Campus")
                 location = Location(name="Location 1", status=self.statuses[0], location_type=location_type)
                 location.save()
 
+            with web_request_context(self.user, change_id=request_id):
                 location.name = "Location Update"
                 location.status = self.statuses[1]
                 location.save()
 
-                serializer = LocationSerializer(location, context={"request": None})
-                oc = get_changes_for_model(location).first()
-                snapshots = oc.get_snapshots()
-
-                process_webhook(
-                    webhook.pk,
-                    serializer.data,
-                    Location._meta.model_name,
-                    ObjectChangeActionChoices.ACTION_CREATE,
-                    timestamp,
-                    self.user.username,
-                    request_id,
-                    snapshots,
-                )
+            serializer = LocationSerializer(location, context={"request": None})
+            oc = get_changes_for_model(location).first()
+            snapshots = oc.get_snapshots()
+
+            process_webhook(
+                webhook.pk,
+                serializer.data,
+                Location._meta.model_name,
+                ObjectChangeActionChoices.ACTION_CREATE,
+                timestamp,
+                self.user.username,
+                request_id,
+                snapshots,
+            )
 
     def test_webhook_render_body_with_utf8(self):
         self.assertEqual(Webhook().render_body({"utf8": "I am UTF-8! 😀"}), '{"utf8": "I am UTF-8! 😀"}')
 
-    @patch("nautobot.extras.tasks.process_webhook.apply_async")
+    @patch("nautobot.extras.tasks.process_webhook_events.apply_async")
     def test_enqueue_webhooks(self, mock_async):
         request_id = uuid.uuid4()
         self.client.force_login(self.user)
@@ -279,20 +289,21 @@ class WebhookTest(APITestCase):
             location = Location(name="Location 1", location_type=location_type, status=self.statuses[0])
             location.save()
 
-            mock_async.assert_called_once()
-            args = mock_async.call_args[1]["args"]
-            self.assertEqual(args[0], Webhook.objects.get(type_create=True).pk)
-            self.assertEqual(args[1]["name"], "Location 1")
-            self.assertEqual(args[2], "location")
-            self.assertEqual(args[3], ObjectChangeActionChoices.ACTION_CREATE)
-            self.assertEqual(args[5], self.user.username)
-            self.assertEqual(args[6], request_id)
-            self.assertEqual(args[7]["prechange"], None)
-            self.assertEqual(args[7]["postchange"]["name"], "Location 1")
-            self.assertEqual(args[7]["differences"]["removed"], None)
-            self.assertEqual(args[7]["differences"]["added"]["name"], "Location 1")
-
-    @patch("nautobot.extras.tasks.process_webhook.apply_async")
+        mock_async.assert_called_once()
+        webhook_pk, contexts = mock_async.call_args[1]["args"]
+        self.assertEqual(webhook_pk, Webhook.objects.get(type_create=True).pk)
+        self.assertEqual(len(contexts), 1)
+        self.assertEqual(contexts[0]["data"]["name"], "Location 1")
+        self.assertEqual(contexts[0]["model"], "location")
+        self.assertEqual(contexts[0]["event"], "created")
+        self.assertEqual(contexts[0]["username"], self.user.username)
+        self.assertEqual(contexts[0]["request_id"], request_id)
+        self.assertEqual(contexts[0]["snapshots"]["prechange"], None)
+        self.assertEqual(contexts[0]["snapshots"]["postchange"]["name"], "Location 1")
+        self.assertEqual(contexts[0]["snapshots"]["differences"]["removed"], None)
+        self.assertEqual(contexts[0]["snapshots"]["differences"]["added"]["name"], "Location 1")
+
+    @patch("nautobot.extras.tasks.process_webhook_events.apply_async")
     def test_enqueue_webhooks_m2m_update(self, mock_async):
         """
         Make sure a webhook is enqueued if there's **only** an m2m change.
@@ -314,12 +325,224 @@ class WebhookTest(APITestCase):
         with web_request_context(self.user, change_id=request_id):
             location.tags.add(tag)
 
-            mock_async.assert_called_once()
-            args = mock_async.call_args[1]["args"]
-            self.assertEqual(args[0], Webhook.objects.get(type_update=True).pk)
-            self.assertEqual(args[1]["name"], "Location 1")
-            self.assertEqual(args[2], "location")
-            self.assertEqual(args[3], ObjectChangeActionChoices.ACTION_UPDATE)
-            self.assertEqual(args[5], self.user.username)
-            self.assertEqual(args[6], request_id)
-            self.assertNotEqual(args[7], {})
+        mock_async.assert_called_once()
+        webhook_pk, contexts = mock_async.call_args[1]["args"]
+        self.assertEqual(webhook_pk, Webhook.objects.get(type_update=True).pk)
+        self.assertEqual(len(contexts), 1)
+        self.assertEqual(contexts[0]["data"]["name"], "Location 1")
+        self.assertEqual(contexts[0]["model"], "location")
+        self.assertEqual(contexts[0]["event"], "updated")
+        self.assertEqual(contexts[0]["username"], self.user.username)
+        self.assertEqual(contexts[0]["request_id"], request_id)
+        self.assertNotEqual(contexts[0]["snapshots"], {})
+
+    def test_get_webhooks_by_change_type(self):
+        location_ct = ContentType.objects.get_for_model(Location)
+        create_webhook = Webhook.objects.get(type_create=True)
+        update_webhook = Webhook.objects.get(type_update=True)
+        self.assertEqual(
+            get_webhooks_by_change_type()[(location_ct.pk, ObjectChangeActionChoices.ACTION_CREATE)], [create_webhook]
+        )
+        self.assertEqual(
+            get_webhooks_by_change_type()[(location_ct.pk, ObjectChangeActionChoices.ACTION_UPDATE)], [update_webhook]
+        )
+        self.assertNotIn((location_ct.pk, ObjectChangeActionChoices.ACTION_DELETE), get_webhooks_by_change_type())
+
+        # The cached webhooks are refreshed when a webhook is updated
+        update_webhook.type_delete = True
+        update_webhook.save()
+        self.assertEqual(
+            get_webhooks_by_change_type()[(location_ct.pk, ObjectChangeActionChoices.ACTION_DELETE)], [update_webhook]
+        )
+
+        # ... or its content types are changed
+        update_webhook.content_types.set([ContentType.objects.get_for_model(Tag)])
+        self.assertNotIn((location_ct.pk, ObjectChangeActionChoices.ACTION_DELETE), get_webhooks_by_change_type())
+
+        # ... or a webhook is deleted
+        create_webhook.delete()
+        self.assertNotIn((location_ct.pk, ObjectChangeActionChoices.ACTION_CREATE), get_webhooks_by_change_type())
+
+    def test_enqueue_webhooks_batched(self):
+        """Test that a single task is enqueued per webhook for all the changes of a change context."""
+        location_type = LocationType.objects.get(name="Campus")
+        with patch("nautobot.extras.tasks.process_webhook_events.apply_async") as mock_async:
+            with web_request_context(self.user):
+                for i in range(3):
+                    Location.objects.create(name=f"Location {i}", location_type=location_type, status=self.statuses[0])
+
+        mock_async.assert_called_once()
+        webhook_pk, contexts = mock_async.call_args[1]["args"]
+        self.assertEqual(webhook_pk, Webhook.objects.get(type_create=True).pk)
+        self.assertEqual(
+            sorted(context["data"]["name"] for context in contexts), ["Location 0", "Location 1", "Location 2"]
+        )
+
+    def test_process_webhook_events(self):
+        """Test the batching of the events into requests and the retry of the events of failed requests."""
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.batch_size = 2
+        webhook.validated_save()
+        contexts = [{"event": "created", "model": "location", "data": {"name": f"Location {i}"}} for i in range(3)]
+        bodies = []
+
+        def mock_send(_, request, **kwargs):
+            bodies.append(json.loads(request.body))
+            self.assertEqual(request.headers["X-Hook-Signature"], generate_signature(request.body, webhook.secret))
+
+            class FakeResponse:
+                # Fail the first request only
+                ok = len(bodies) > 1
+                status_code = 200 if ok else 500
+                content = b""
+
+            return FakeResponse()
+
+        with patch.object(Session, "send", mock_send):
+            with override_settings(WEBHOOK_MAX_RETRIES=1):
+                process_webhook_events.apply(args=[webhook.pk, contexts])
+
+        self.assertEqual(
+            [[event["data"]["name"] for event in body] for body in bodies],
+            [["Location 0", "Location 1"], ["Location 2"], ["Location 0", "Location 1"]],
+        )
+
+    def test_process_webhook_events_retries_exhausted(self):
+        webhook = Webhook.objects.get(type_create=True)
+        contexts = [{"event": "created", "model": "location", "data": {"name": "Location 1"}}]
+
+        with patch.object(Session, "send", side_effect=ConnectionError("Connection refused")) as send:
+            with override_settings(WEBHOOK_MAX_RETRIES=2):
+                result = process_webhook_events.apply(args=[webhook.pk, contexts])
+
+        self.assertEqual(send.call_count, 3)
+        self.assertIsInstance(result.result, RequestException)
+
+    def test_process_webhook_events_errors(self):
+        """Test that events which can't be rendered are dropped, and that any failed request is retried."""
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.batch_size = 2
+        webhook.body_template = '{"name": "{{ data.location.name }}"}'
+        webhook.validated_save()
+        contexts = [
+            {"event": "created", "model": "location", "data": {"location": {"name": "Location 0"}}},
+            {"event": "created", "model": "location", "data": {}},
+            {"event": "created", "model": "location", "data": {"location": {"name": "Location 2"}}},
+        ]
+        bodies = []
+        # Fail the first request only
+        errors = [RequestException("Read timed out")]
+
+        def mock_send(_, request, **kwargs):
+            bodies.append(json.loads(request.body))
+            if errors:
+                raise errors.pop()
+
+            class FakeResponse:
+                ok = True
+                status_code = 200
+                content = b""
+
+            return FakeResponse()
+
+        with patch.object(Session, "send", mock_send):
+            with override_settings(WEBHOOK_MAX_RETRIES=1):
+                result = process_webhook_events.apply(args=[webhook.pk, contexts])
+
+        self.assertEqual(
+            [[event["name"] for event in body] for body in bodies],
+            [["Location 0"], ["Location 2"], ["Location 0"]],
+        )
+        # The result is that of the retry, which only had the event of the failed request to deliver
+        self.assertEqual(result.result, f"1 event(s) successfully delivered to webhook {webhook}.")
+
+        bodies.clear()
+        with patch.object(Session, "send", mock_send):
+            result = process_webhook_events.apply(args=[webhook.pk, contexts[1:]])
+        self.assertEqual(
+            result.result,
+            f"1 event(s) successfully delivered to webhook {webhook}; 1 event(s) could not be rendered and were dropped.",
+        )
+
+
+class WebhookReceiverLoadTest(TestCase):
+    """Deliver webhook events to a local `webhook_receiver` server."""
+
+    def setUp(self):
+        super().setUp()
+        self.connections = set()
+        self.bodies = []
+        self.cookies = []
+        test = self
+
+        class Handler(WebhookHandler):
+            show_headers = False
+
+            def do_ANY(self):
+                test.connections.add(self.client_address)
+                test.cookies.append(self.headers.get("Cookie"))
+                with redirect_stdout(StringIO()):
+                    super().do_ANY()
+
+            def end_headers(self):
+                self.send_header("Set-Cookie", "sessionid=receiver-secret; Path=/")
+                super().end_headers()
+
+            def log_message(self, format_str, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("localhost", 0), Handler)
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+
+        self.webhook = Webhook.objects.create(
+            name="Load Test Webhook",
+            type_create=True,
+            payload_url=f"http://localhost:{self.server.server_port}/",
+            secret="LOOKATMEIMASECRETSTRING",
+        )
+        self.contexts = [
+            {"event": "created", "model": "location", "data": {"name": f"Location {i}"}} for i in range(200)
+        ]
+
+    def test_connections_reused(self):
+        result = process_webhook_events.apply(args=[self.webhook.pk, self.contexts])
+
+        self.assertEqual(result.result, f"200 event(s) successfully delivered to webhook {self.webhook}.")
+        # All 200 requests were sent over a single keep-alive connection
+        self.assertEqual(len(self.connections), 1)
+        # The cookie set by the receiver was never sent back
+        self.assertEqual(set(self.cookies), {None})
+        self.assertEqual(len(get_webhook_session(self.webhook).cookies), 0)
+
+    def test_sessions_not_shared(self):
+        other_webhook = Webhook.objects.create(
+            name="Other Load Test Webhook", type_create=True, payload_url=self.webhook.payload_url
+        )
+        session = get_webhook_session(self.webhook)
+        self.assertIs(get_webhook_session(self.webhook), session)
+        self.assertIsNot(get_webhook_session(other_webhook), session)
+
+        # Each thread has its own sessions
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_webhook_session(self.webhook)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], session)
+
+        # A change of SSL verification setting replaces the session
+        self.webhook.ssl_verification = False
+        self.assertFalse(get_webhook_session(self.webhook).verify)
+
+    def test_batched_payloads(self):
+        self.webhook.batch_size = 50
+        self.webhook.validated_save()
+        sent = WEBHOOK_EVENTS_METRIC.labels(self.webhook.name, "success")._value.get()
+
+        result = process_webhook_events.apply(args=[self.webhook.pk, self.contexts])
+
+        self.assertEqual(result.result, f"200 event(s) successfully delivered to webhook {self.webhook}.")
+        self.assertEqual(WEBHOOK_EVENTS_METRIC.labels(self.webhook.name, "success")._value.get() - sent, 200)
+        self.assertEqual(len(self.connections), 1)
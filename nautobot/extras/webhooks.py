@@ -1,56 +1,97 @@
-from django.contrib.contenttypes.models import ContentType
-from django.utils import timezone
+from collections import defaultdict
 
+from django.db.models import Count, Max
+from django.utils import timezone
 
-from nautobot.core.api.utils import get_serializer_for_model
-from nautobot.core.utils.lookup import get_changes_for_model
 from nautobot.extras.models import Webhook
 from nautobot.extras.registry import registry
-from nautobot.extras.tasks import process_webhook
+from nautobot.extras.tasks import process_webhook_events
 from .choices import ObjectChangeActionChoices
 
 
-def enqueue_webhooks(instance, user, request_id, action):
+WEBHOOK_ACTION_FLAGS = {
+    ObjectChangeActionChoices.ACTION_CREATE: "type_create",
+    ObjectChangeActionChoices.ACTION_UPDATE: "type_update",
+    ObjectChangeActionChoices.ACTION_DELETE: "type_delete",
+}
+
+# In-process cache of the enabled Webhooks, see get_webhooks_by_change_type()
+_webhooks_cache = {"stamp": None, "webhooks": {}}
+
+
+def get_webhooks_by_change_type():
     """
-    Find Webhook(s) assigned to this instance + action and enqueue them
-    to be processed
+    Return the enabled Webhooks as a dictionary of lists keyed by `(content_type_id, action)`.
+
+    The Webhooks are cached in memory for as long as the number of Webhooks and their latest `last_updated` time are
+    unchanged, which only takes a trivial query to check. Creating, updating or deleting a Webhook, or changing its
+    content types, therefore invalidates the cache of every process, and as the check reads the database, it remains
+    accurate when a transaction is rolled back.
+    """
+    stamp = tuple(Webhook.objects.aggregate(count=Count("pk"), last_updated=Max("last_updated")).values())
+    if stamp != _webhooks_cache["stamp"]:
+        webhooks = defaultdict(list)
+        for webhook in Webhook.objects.filter(enabled=True).prefetch_related("content_types"):
+            for content_type in webhook.content_types.all():
+                for action, action_flag in WEBHOOK_ACTION_FLAGS.items():
+                    if getattr(webhook, action_flag):
+                        webhooks[(content_type.pk, action)].append(webhook)
+        _webhooks_cache.update(stamp=stamp, webhooks=dict(webhooks))
+    return _webhooks_cache["webhooks"]
+
+
+def get_webhooks_for_object_change(object_change, webhooks_by_change_type=None):
+    """
+    Return a list of the enabled Webhook(s) assigned to the type of the changed object and the action of the given
+    ObjectChange.
     """
     # Determine whether this type of object supports webhooks
-    app_label = instance._meta.app_label
-    model_name = instance._meta.model_name
-    if model_name not in registry["model_features"]["webhooks"].get(app_label, []):
-        return
-
-    # Retrieve any applicable Webhooks
-    content_type = ContentType.objects.get_for_model(instance)
-    action_flag = {
-        ObjectChangeActionChoices.ACTION_CREATE: "type_create",
-        ObjectChangeActionChoices.ACTION_UPDATE: "type_update",
-        ObjectChangeActionChoices.ACTION_DELETE: "type_delete",
-    }[action]
-    webhooks = Webhook.objects.filter(content_types=content_type, enabled=True, **{action_flag: True})
-
-    if webhooks.exists():
-        # Get the Model's API serializer class and serialize the object
-        serializer_class = get_serializer_for_model(instance.__class__)
-        serializer_context = {
-            "request": None,
-            "depth": 1,
-        }
-        serializer = serializer_class(instance, context=serializer_context)
-        most_recent_change = get_changes_for_model(instance).first()
-        snapshots = most_recent_change.get_snapshots() if most_recent_change else {}
-
-        # Enqueue the webhooks
+    content_type = object_change.changed_object_type
+    if content_type.model not in registry["model_features"]["webhooks"].get(content_type.app_label, []):
+        return []
+
+    if webhooks_by_change_type is None:
+        webhooks_by_change_type = get_webhooks_by_change_type()
+    return webhooks_by_change_type.get((content_type.pk, object_change.action), [])
+
+
+def get_webhook_context(object_change, snapshots=None):
+    """
+    Return the context of the webhook event for the given ObjectChange, as available to the Webhook templates.
+
+    The data of the event is the API representation of the object recorded in `object_change.object_data_v2`.
+    """
+    if snapshots is None:
+        snapshots = object_change.get_snapshots()
+
+    return {
+        "event": dict(ObjectChangeActionChoices)[object_change.action].lower(),
+        "timestamp": str(timezone.now()),
+        "model": object_change.changed_object_type.model,
+        "username": object_change.user_name,
+        "request_id": object_change.request_id,
+        "data": object_change.object_data_v2,
+        "snapshots": snapshots,
+    }
+
+
+def enqueue_webhooks(object_changes):
+    """
+    Find Webhook(s) assigned to the changed object types + actions of the given ObjectChanges and enqueue them
+    to be processed
+
+    A single task is enqueued per Webhook, conveying the events of all the given ObjectChanges for this Webhook.
+    """
+    webhooks_by_change_type = get_webhooks_by_change_type()
+    contexts_by_webhook = defaultdict(list)
+    for object_change in object_changes:
+        webhooks = get_webhooks_for_object_change(object_change, webhooks_by_change_type)
+        if not webhooks:
+            continue
+        context = get_webhook_context(object_change)
         for webhook in webhooks:
-            args = [
-                webhook.pk,
-                serializer.data,
-                instance._meta.model_name,
-                action,
-                str(timezone.now()),
-                user.username,
-                request_id,
-                snapshots,
-            ]
-            process_webhook.apply_async(args=args)
+            contexts_by_webhook[webhook.pk].append(context)
+
+    # Enqueue the webhooks
+    for webhook_pk, contexts in contexts_by_webhook.items():
+        process_webhook_events.apply_async(args=[webhook_pk, contexts])
@@ -1,7 +1,10 @@
+import itertools
+
 from django.conf import settings
 from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
+import netaddr
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -11,6 +14,7 @@ from nautobot.core.models.querysets import count_related
 from nautobot.core.utils.config import get_settings_or_config
 from nautobot.extras.api.views import NautobotModelViewSet
 from nautobot.ipam import filters
+from nautobot.ipam.availability import allocate_block
 from nautobot.ipam.models import (
     IPAddress,
     IPAddressToInterface,
@@ -121,7 +125,7 @@ class PrefixViewSet(NautobotModelViewSet):
         prefix = get_object_or_404(self.queryset, pk=pk)
         if request.method == "POST":
             with cache.lock("available-prefixes", blocking_timeout=5, timeout=settings.REDIS_LOCK_TIMEOUT):
-                available_prefixes = prefix.get_available_prefixes()
+                available_ranges = list(prefix.get_available_prefix_ranges())
 
                 # Validate Requested Prefixes' length
                 serializer = serializers.PrefixLengthSerializer(
@@ -137,21 +141,18 @@ class PrefixViewSet(NautobotModelViewSet):
                 requested_prefixes = serializer.validated_data
                 # Allocate prefixes to the requested objects based on availability within the parent
                 for requested_prefix in requested_prefixes:
-                    # Find the first available prefix equal to or larger than the requested size
-                    for available_prefix in available_prefixes.iter_cidrs():
-                        if requested_prefix["prefix_length"] >= available_prefix.prefixlen:
-                            allocated_prefix = f"{available_prefix.network}/{requested_prefix['prefix_length']}"
-                            requested_prefix["prefix"] = allocated_prefix
-                            requested_prefix["namespace"] = prefix.namespace.pk
-                            break
-                    else:
+                    # Find the first available block of the requested size; this also removes it from the
+                    # available ranges so that subsequent requests are allocated non-overlapping space.
+                    block_size = netaddr.IPNetwork(f"{prefix.network}/{requested_prefix['prefix_length']}").size
+                    network = allocate_block(available_ranges, block_size)
+                    if network is None:
                         return Response(
                             {"detail": "Insufficient space is available to accommodate the requested prefix size(s)"},
                             status=status.HTTP_204_NO_CONTENT,
                         )
-
-                    # Remove the allocated prefix from the list of available prefixes
-                    available_prefixes.remove(allocated_prefix)
+                    network = netaddr.IPAddress(network, version=prefix.ip_version)
+                    requested_prefix["prefix"] = f"{network}/{requested_prefix['prefix_length']}"
+                    requested_prefix["namespace"] = prefix.namespace.pk
 
                 # Initialize the serializer with a list or a single object depending on what was requested
                 context = {"request": request, "depth": 0}
@@ -166,9 +167,8 @@ class PrefixViewSet(NautobotModelViewSet):
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         else:
-            available_prefixes = prefix.get_available_prefixes()
             serializer = serializers.AvailablePrefixSerializer(
-                available_prefixes.iter_cidrs(),
+                list(prefix.iter_available_prefixes()),
                 many=True,
                 context={
                     "request": request,
@@ -208,8 +208,8 @@ class PrefixViewSet(NautobotModelViewSet):
                 requested_ips = request.data if isinstance(request.data, list) else [request.data]
 
                 # Determine if the requested number of IPs is available
-                available_ips = prefix.get_available_ips()
-                if available_ips.size < len(requested_ips):
+                available_ips = list(itertools.islice(prefix.iter_available_ips(), len(requested_ips)))
+                if len(available_ips) < len(requested_ips):
                     return Response(
                         {
                             "detail": (
@@ -221,10 +221,9 @@ class PrefixViewSet(NautobotModelViewSet):
                     )
 
                 # Assign addresses from the list of available IPs and copy Namespace assignment from the parent Prefix
-                available_ips = iter(available_ips)
                 prefix_length = prefix.prefix.prefixlen
-                for requested_ip in requested_ips:
-                    requested_ip["address"] = f"{next(available_ips)}/{prefix_length}"
+                for requested_ip, available_ip in zip(requested_ips, available_ips):
+                    requested_ip["address"] = f"{available_ip}/{prefix_length}"
                     requested_ip["namespace"] = prefix.namespace.pk
 
                 # Initialize the serializer with a list or a single object depending on what was requested
@@ -249,11 +248,7 @@ class PrefixViewSet(NautobotModelViewSet):
                 limit = min(limit, get_settings_or_config("MAX_PAGE_SIZE"))
 
             # Calculate available IPs within the prefix
-            ip_list = []
-            for index, ip in enumerate(prefix.get_available_ips(), start=1):
-                ip_list.append(ip)
-                if index == limit:
-                    break
+            ip_list = list(itertools.islice(prefix.iter_available_ips(), limit))
             serializer = serializers.AvailableIPSerializer(
                 ip_list,
                 many=True,
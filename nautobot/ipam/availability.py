@@ -0,0 +1,87 @@
+"""
+Interval-merge engine for computing the free address space within a Prefix.
+
+All functions in this module operate on inclusive `(first, last)` integer ranges, as produced by `netaddr`
+(`IPNetwork.first` / `IPNetwork.last`, `int(IPAddress)`), so that available space can be computed in a single linear
+pass over child records streamed from the database in address order, without building intermediate `IPSet` objects.
+"""
+
+import netaddr
+
+
+def address_to_int(address):
+    """Convert an IP address string (as returned by `VarbinaryIPField`) or `netaddr.IPAddress` to an integer."""
+    return int(netaddr.IPAddress(address))
+
+
+def iter_free_ranges(first, last, used_ranges):
+    """
+    Yield the inclusive `(start, end)` integer ranges between `first` and `last` that are not covered by `used_ranges`.
+
+    Args:
+        first (int): First usable address of the containing range.
+        last (int): Last usable address of the containing range.
+        used_ranges (iterable): `(start, end)` integer tuples, **sorted by `start`**. Ranges may overlap or nest
+            (for example, a child prefix and its own child prefix) and may extend outside of `first`/`last`.
+
+    Yields:
+        tuple: `(start, end)` integer tuples in ascending order.
+    """
+    cursor = first
+    for start, end in used_ranges:
+        if end < cursor:
+            continue
+        if start > last:
+            break
+        if start > cursor:
+            yield (cursor, start - 1)
+        cursor = end + 1
+        if cursor > last:
+            return
+    if cursor <= last:
+        yield (cursor, last)
+
+
+def iter_free_addresses(free_ranges, version):
+    """Yield each address in `free_ranges` as a `netaddr.IPAddress`."""
+    for start, end in free_ranges:
+        for value in range(start, end + 1):
+            yield netaddr.IPAddress(value, version=version)
+
+
+def iter_free_cidrs(free_ranges, version):
+    """Yield the minimal set of CIDR blocks covering `free_ranges` as `netaddr.IPNetwork` objects."""
+    for start, end in free_ranges:
+        yield from netaddr.iprange_to_cidrs(
+            netaddr.IPAddress(start, version=version), netaddr.IPAddress(end, version=version)
+        )
+
+
+def free_ranges_to_ipset(free_ranges, version):
+    """Build a `netaddr.IPSet` from `free_ranges`, for callers that need set semantics."""
+    return netaddr.IPSet(iter_free_cidrs(free_ranges, version))
+
+
+def allocate_block(free_ranges, size):
+    """
+    Claim the lowest block of `size` addresses, aligned on a multiple of `size`, from `free_ranges`.
+
+    `free_ranges` must be a mutable list of `(start, end)` tuples sorted by `start`; it is updated in place so that
+    repeated calls allocate successive, non-overlapping blocks.
+
+    Returns:
+        int: The first address of the allocated block, or None if no sufficiently large aligned block is free.
+    """
+    for index, (start, end) in enumerate(free_ranges):
+        block_start = -(-start // size) * size  # round up to the next multiple of `size`
+        block_end = block_start + size - 1
+        if block_end > end:
+            continue
+        remainder = []
+        if block_start > start:
+            remainder.append((start, block_start - 1))
+        if block_end < end:
+            remainder.append((block_end + 1, end))
+        free_ranges[index : index + 1] = remainder
+        return block_start
+    return None
@@ -219,7 +219,7 @@ class PrefixFilterSet(
 
     class Meta:
         model = Prefix
-        fields = ["date_allocated", "id", "prefix_length", "tags"]
+        fields = ["date_allocated", "id", "prefix_length", "tags", "utilization"]
 
     def filter_prefix(self, queryset, name, value):
         value = value.strip()
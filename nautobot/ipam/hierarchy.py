@@ -0,0 +1,173 @@
+"""
+Bulk computation of the Prefix/IPAddress parent hierarchy.
+
+`Prefix.save()` resolves its own parent and reparents its subnets and IP addresses one row at a time, which is
+appropriate for interactive edits but prohibitively slow for mass imports. The functions in this module instead
+compute every `parent` within a namespace and IP version in a single sort-and-stack sweep over rows ordered by
+`(network, prefix_length)`, so that the results can be written back with one bulk update.
+"""
+
+from contextlib import contextmanager
+import contextvars
+
+from django.apps import apps
+from django.db import transaction
+
+from nautobot.ipam.availability import address_to_int
+
+
+deferred_parenting_state = contextvars.ContextVar("deferred_parenting_state", default=None)
+
+
+def compute_prefix_parents(prefixes):
+    """
+    Compute the closest parent of each of the given prefixes.
+
+    Args:
+        prefixes (iterable): `(id, network, broadcast)` tuples for every prefix in a single namespace and IP version,
+            **sorted by `(network, prefix_length)`**. `network` and `broadcast` are integers.
+
+    Returns:
+        dict: `{prefix_id: parent_id}`, where `parent_id` is None for root prefixes.
+    """
+    parents = {}
+    stack = []  # (broadcast, id) of the chain of prefixes containing the current position
+    for pk, network, broadcast in prefixes:
+        while stack and stack[-1][0] < network:
+            stack.pop()
+        parents[pk] = stack[-1][1] if stack else None
+        stack.append((broadcast, pk))
+    return parents
+
+
+def compute_ip_address_parents(prefixes, ip_addresses):
+    """
+    Compute the closest parent prefix of each of the given IP addresses.
+
+    Args:
+        prefixes (iterable): `(id, network, broadcast)` tuples, as for `compute_prefix_parents()`.
+        ip_addresses (iterable): `(id, host)` tuples for IP addresses in the same namespace and IP version,
+            **sorted by `host`**. `host` is an integer.
+
+    Returns:
+        dict: `{ip_address_id: parent_id}`. IP addresses with no containing prefix are omitted.
+    """
+    parents = {}
+    prefixes = iter(prefixes)
+    next_prefix = next(prefixes, None)
+    stack = []
+    for pk, host in ip_addresses:
+        while next_prefix is not None and next_prefix[1] <= host:
+            prefix_pk, network, broadcast = next_prefix
+            while stack and stack[-1][0] < network:
+                stack.pop()
+            stack.append((broadcast, prefix_pk))
+            next_prefix = next(prefixes, None)
+        while stack and stack[-1][0] < host:
+            stack.pop()
+        if stack:
+            parents[pk] = stack[-1][1]
+    return parents
+
+
+def rebuild_prefix_hierarchy(namespace_id, ip_version, batch_size=1000):
+    """
+    Recompute the `parent` of every Prefix and IPAddress in the given namespace and IP version.
+
+    Only rows whose parent actually changes are written, using `bulk_update()`. Like `Prefix.reparent_subnets()`,
+    this bypasses `save()` and its signals.
+
+    Returns:
+        tuple: The number of `(prefixes, ip_addresses)` that were reparented.
+    """
+    Prefix = apps.get_model("ipam", "Prefix")
+    IPAddress = apps.get_model("ipam", "IPAddress")
+
+    with transaction.atomic():
+        prefix_rows = [
+            (pk, address_to_int(network), address_to_int(broadcast), parent_id)
+            for pk, network, broadcast, parent_id in Prefix.objects.select_for_update()
+            .filter(namespace_id=namespace_id, ip_version=ip_version)
+            .order_by("network", "prefix_length")
+            .values_list("pk", "network", "broadcast", "parent_id")
+            .iterator()
+        ]
+        prefixes = [row[:3] for row in prefix_rows]
+        current_prefix_parents = {row[0]: row[3] for row in prefix_rows}
+
+        prefix_parents = compute_prefix_parents(prefixes)
+        changed_prefixes = [
+            Prefix(pk=pk, parent_id=parent_id)
+            for pk, parent_id in prefix_parents.items()
+            if current_prefix_parents[pk] != parent_id
+        ]
+        Prefix.objects.bulk_update(changed_prefixes, ["parent"], batch_size=batch_size)
+
+        ip_rows = [
+            (pk, address_to_int(host), parent_id)
+            for pk, host, parent_id in IPAddress.objects.select_for_update()
+            .filter(parent__namespace_id=namespace_id, ip_version=ip_version)
+            .order_by("host")
+            .values_list("pk", "host", "parent_id")
+            .iterator()
+        ]
+        current_ip_parents = {row[0]: row[2] for row in ip_rows}
+
+        ip_parents = compute_ip_address_parents(prefixes, (row[:2] for row in ip_rows))
+        changed_ips = [
+            IPAddress(pk=pk, parent_id=parent_id)
+            for pk, parent_id in ip_parents.items()
+            if current_ip_parents[pk] != parent_id
+        ]
+        IPAddress.objects.bulk_update(changed_ips, ["parent"], batch_size=batch_size)
+
+    return len(changed_prefixes), len(changed_ips)
+
+
+@contextmanager
+def deferred_prefix_parenting():
+    """
+    Defer the per-save parent resolution and reparenting done by `Prefix.save()`.
+
+    Within this context, saving a Prefix neither looks up its closest parent nor reparents its subnets and IP
+    addresses, and saving or deleting a Prefix or IPAddress does not update the stored utilization of the affected
+    prefixes; instead the affected namespaces and IP versions are recorded, and their hierarchy and utilization are
+    rebuilt once per namespace and IP version when the context exits.
+
+    Example usage:
+
+    >>> from nautobot.ipam.hierarchy import deferred_prefix_parenting
+    >>> with deferred_prefix_parenting():
+    ...     for cidr in cidrs:
+    ...         Prefix.objects.create(prefix=cidr, namespace=namespace, status=status)
+    """
+    if deferred_parenting_state.get() is not None:
+        # Already deferred by an enclosing context; let it perform the rebuild.
+        yield
+        return
+
+    token = deferred_parenting_state.set(set())
+    try:
+        yield
+        pending = deferred_parenting_state.get()
+    finally:
+        deferred_parenting_state.reset(token)
+
+    Prefix = apps.get_model("ipam", "Prefix")
+    for namespace_id, ip_version in sorted(pending, key=str):
+        rebuild_prefix_hierarchy(namespace_id, ip_version)
+        Prefix.objects.filter(namespace_id=namespace_id, ip_version=ip_version).update_utilization()
+
+
+def defer_hierarchy_update(namespace_id, ip_version):
+    """
+    Record a namespace and IP version for a deferred rebuild, if a `deferred_prefix_parenting()` context is active.
+
+    Returns:
+        bool: True if the update was deferred, False if the caller should update the hierarchy immediately.
+    """
+    pending = deferred_parenting_state.get()
+    if pending is None:
+        return False
+    pending.add((namespace_id, ip_version))
+    return True
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from nautobot.ipam.hierarchy import rebuild_prefix_hierarchy
+from nautobot.ipam.models import Namespace, Prefix
+
+
+class Command(BaseCommand):
+    help = "Recompute the parent of every Prefix and IPAddress, one namespace and IP version at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--namespace",
+            action="append",
+            dest="namespaces",
+            metavar="NAME",
+            help="Only rebuild the given namespace (may be specified multiple times)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows to write per bulk update query",
+        )
+
+    def handle(self, *args, **options):
+        prefixes = Prefix.objects.all()
+        if options["namespaces"]:
+            namespaces = Namespace.objects.filter(name__in=options["namespaces"])
+            missing = set(options["namespaces"]) - set(namespaces.values_list("name", flat=True))
+            if missing:
+                raise CommandError(f"Namespace(s) not found: {', '.join(sorted(missing))}")
+            prefixes = prefixes.filter(namespace__in=namespaces)
+
+        pairs = prefixes.order_by("namespace__name", "ip_version").values_list(
+            "namespace_id", "namespace__name", "ip_version"
+        )
+        for namespace_id, namespace_name, ip_version in pairs.distinct():
+            self.stdout.write(f"Rebuilding IPv{ip_version} prefix tree for namespace {namespace_name}...")
+            prefix_count, ip_address_count = rebuild_prefix_hierarchy(
+                namespace_id, ip_version, batch_size=options["batch_size"]
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"  Reparented {prefix_count} prefixes and {ip_address_count} IP addresses")
+            )
+
+        self.stdout.write(self.style.SUCCESS("Finished."))
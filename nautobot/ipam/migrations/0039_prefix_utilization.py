@@ -0,0 +1,27 @@
+# Generated by Django 3.2.23 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ipam", "0038_vlan_group_name_unique_remove_slug"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prefix",
+            name="utilization",
+            field=models.FloatField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="prefix",
+            name="utilization_denominator",
+            field=models.DecimalField(decimal_places=0, default=0, editable=False, max_digits=39),
+        ),
+        migrations.AddField(
+            model_name="prefix",
+            name="utilization_numerator",
+            field=models.DecimalField(decimal_places=0, default=0, editable=False, max_digits=39),
+        ),
+    ]
@@ -17,7 +17,7 @@ from nautobot.core.utils.data import UtilizationData
 from nautobot.dcim.models import Interface
 from nautobot.extras.models import RoleField, StatusField
 from nautobot.extras.utils import extras_features
-from nautobot.ipam import choices, constants
+from nautobot.ipam import availability, choices, constants, hierarchy
 from nautobot.virtualization.models import VMInterface
 from .fields import VarbinaryIPField
 from .querysets import IPAddressQuerySet, PrefixQuerySet, RIRQuerySet
@@ -477,6 +477,16 @@ class Prefix(PrimaryModel):
         help_text="Date this prefix was allocated to an RIR, reserved in IPAM, etc.",
     )
     description = models.CharField(max_length=200, blank=True)
+    # Denormalized copy of `get_utilization()`, maintained by `update_utilization()`, for sorting and filtering.
+    # A denominator of 0 indicates that the utilization has not yet been calculated.
+    utilization = models.FloatField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Percentage of this prefix's address space that is utilized",
+    )
+    utilization_numerator = models.DecimalField(max_digits=39, decimal_places=0, default=0, editable=False)
+    utilization_denominator = models.DecimalField(max_digits=39, decimal_places=0, default=0, editable=False)
 
     objects = BaseManager.from_queryset(PrefixQuerySet)()
 
@@ -617,6 +627,20 @@ class Prefix(PrimaryModel):
             # Clear host bits from prefix
             self.prefix = self.prefix.cidr
 
+        # When parenting has been deferred (e.g. for a bulk import), the hierarchy of this prefix's namespace
+        # will be rebuilt in a single pass later, so skip the per-prefix lookups and reparenting entirely.
+        if hierarchy.defer_hierarchy_update(self.namespace_id, self.ip_version):
+            super().save(*args, **kwargs)
+            return
+
+        previous = None
+        if self.present_in_database:
+            previous = (
+                Prefix.objects.filter(pk=self.pk)
+                .values_list("parent_id", "network", "prefix_length", "type", named=True)
+                .first()
+            )
+
         # Determine if a parent exists and set it to the closest ancestor by `prefix_length`.
         supernets = self.supernets()
         if supernets:
@@ -660,6 +684,17 @@ class Prefix(PrimaryModel):
         # Determine the child IPs and reparent them to this prefix.
         self.reparent_ips()
 
+        # Update the stored utilization of this prefix and of any parent whose set of children has changed,
+        # which is only the case if this prefix is new or its range, type or parent has changed.
+        range_changed = previous is None or previous.prefix_length != self.prefix_length
+        range_changed = range_changed or str(previous.network) != str(self.network)
+        if range_changed or previous.type != self.type:
+            self.update_utilization()
+        if range_changed or previous.parent_id != self.parent_id:
+            parent_ids = {self.parent_id, previous.parent_id if previous is not None else None} - {None}
+            for parent in Prefix.objects.filter(pk__in=parent_ids):
+                parent.update_utilization()
+
     @property
     def cidr_str(self):
         if self.network is not None and self.prefix_length is not None:
@@ -831,43 +866,68 @@ class Prefix(PrimaryModel):
 
         return query
 
-    def get_available_prefixes(self):
-        """
-        Return all available Prefixes within this prefix as an IPSet.
+    def get_available_prefix_ranges(self):
         """
-        prefix = netaddr.IPSet(self.prefix)
-        child_prefixes = netaddr.IPSet([child.prefix for child in self.descendants()])
-        available_prefixes = prefix - child_prefixes
+        Lazily yield the unallocated space within this prefix as inclusive `(first, last)` integer ranges.
 
-        return available_prefixes
+        Descendant prefixes are streamed from the database in `network` order and merged in a single pass.
+        """
+        descendants = self.descendants().order_by("network").values_list("network", "broadcast")
+        used_ranges = (
+            (availability.address_to_int(network), availability.address_to_int(broadcast))
+            for network, broadcast in descendants.iterator()
+        )
+        return availability.iter_free_ranges(self.prefix.first, self.prefix.last, used_ranges)
 
-    def get_available_ips(self):
+    def get_available_ip_ranges(self):
         """
-        Return all available IPs within this prefix as an IPSet.
+        Lazily yield the unallocated IP addresses within this prefix as inclusive `(first, last)` integer ranges.
+
+        Child IP addresses are streamed from the database in `host` order and merged in a single pass.
         """
-        prefix = netaddr.IPSet(self.prefix)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.ip_addresses.all()])
-        available_ips = prefix - child_ips
+        first, last = self.prefix.first, self.prefix.last
 
         # IPv6, pool, or IPv4 /31-32 sets are fully usable
-        if any(
+        # For "normal" IPv4 prefixes, omit first and last addresses
+        if not any(
             [
                 self.ip_version == 6,
                 self.type == choices.PrefixTypeChoices.TYPE_POOL,
                 self.ip_version == 4 and self.prefix_length >= 31,
             ]
         ):
-            return available_ips
+            first, last = first + 1, last - 1
 
-        # Omit first and last IP address from the available set
-        # For "normal" IPv4 prefixes, omit first and last addresses
-        available_ips -= netaddr.IPSet(
-            [
-                netaddr.IPAddress(self.prefix.first),
-                netaddr.IPAddress(self.prefix.last),
-            ]
+        hosts = (
+            availability.address_to_int(host)
+            for host in self.ip_addresses.order_by("host").values_list("host", flat=True).iterator()
         )
-        return available_ips
+        used_ranges = ((host, host) for host in hosts)
+        return availability.iter_free_ranges(first, last, used_ranges)
+
+    def iter_available_prefixes(self):
+        """
+        Lazily yield the available child prefixes within this prefix as `netaddr.IPNetwork` objects.
+        """
+        return availability.iter_free_cidrs(self.get_available_prefix_ranges(), self.ip_version)
+
+    def iter_available_ips(self):
+        """
+        Lazily yield the available IPs within this prefix as `netaddr.IPAddress` objects.
+        """
+        return availability.iter_free_addresses(self.get_available_ip_ranges(), self.ip_version)
+
+    def get_available_prefixes(self):
+        """
+        Return all available Prefixes within this prefix as an IPSet.
+        """
+        return availability.free_ranges_to_ipset(self.get_available_prefix_ranges(), self.ip_version)
+
+    def get_available_ips(self):
+        """
+        Return all available IPs within this prefix as an IPSet.
+        """
+        return availability.free_ranges_to_ipset(self.get_available_ip_ranges(), self.ip_version)
 
     def get_child_ips(self):
         """
@@ -890,19 +950,16 @@ class Prefix(PrimaryModel):
         """
         Return the first available child prefix within the prefix (or None).
         """
-        available_prefixes = self.get_available_prefixes()
-        if not available_prefixes:
-            return None
-        return available_prefixes.iter_cidrs()[0]
+        return next(self.iter_available_prefixes(), None)
 
     def get_first_available_ip(self):
         """
         Return the first available IP within the prefix (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
-        return f"{next(available_ips.__iter__())}/{self.prefix_length}"
+        return f"{available_ip}/{self.prefix_length}"
 
     def get_utilization(self):
         """Return the utilization of this prefix as a UtilizationData object.
@@ -947,6 +1004,61 @@ class Prefix(PrimaryModel):
 
         return UtilizationData(numerator=numerator_set.size, denominator=denominator)
 
+    def update_utilization(self):
+        """
+        Recalculate the utilization of this prefix and store it in the `utilization*` fields.
+
+        The fields are written with an `update()` query, bypassing `save()` and its signals.
+        """
+        numerator, denominator = self.get_utilization()
+        self.utilization_numerator = numerator
+        self.utilization_denominator = denominator
+        self.utilization = float(100 * numerator / denominator) if denominator else 0
+        Prefix.objects.filter(pk=self.pk).update(
+            utilization=self.utilization,
+            utilization_numerator=self.utilization_numerator,
+            utilization_denominator=self.utilization_denominator,
+        )
+
+    def update_utilization_for_ip_address(self, host, delta):
+        """
+        Incrementally update the stored utilization for an IPAddress with the given `host`, parented to this prefix,
+        having been created (`delta=1`) or deleted (`delta=-1`).
+
+        The address counts toward this prefix (unless it is a container) and toward any pool containing it; it is
+        already covered by a child prefix in all other containing prefixes. Only a change to the network or broadcast
+        address of an IPv4 network prefix, which may change its denominator, requires a full recalculation.
+        """
+        counting = Prefix.objects.filter(
+            models.Q(pk=self.pk) | models.Q(type=choices.PrefixTypeChoices.TYPE_POOL),
+            namespace_id=self.namespace_id,
+            ip_version=self.ip_version,
+            network__lte=host,
+            broadcast__gte=host,
+        ).exclude(type=choices.PrefixTypeChoices.TYPE_CONTAINER)
+        if all(
+            [
+                self.type == choices.PrefixTypeChoices.TYPE_NETWORK,
+                self.ip_version == 4,
+                self.prefix.size > 2,
+                host in (self.network, self.broadcast),
+            ]
+        ):
+            self.update_utilization()
+            counting = counting.exclude(pk=self.pk)
+
+        # Prefixes whose utilization has never been calculated are left as they are
+        pks = list(counting.filter(utilization_denominator__gt=0).values_list("pk", flat=True))
+        if not pks:
+            return
+        Prefix.objects.filter(pk__in=pks).update(utilization_numerator=models.F("utilization_numerator") + delta)
+        Prefix.objects.filter(pk__in=pks).update(
+            utilization=models.ExpressionWrapper(
+                models.F("utilization_numerator") * 100 / models.F("utilization_denominator"),
+                output_field=models.FloatField(),
+            )
+        )
+
 
 @extras_features(
     "custom_links",
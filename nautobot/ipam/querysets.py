@@ -2,10 +2,12 @@ import re
 
 import netaddr
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models import ProtectedError, Q
 
 from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.core.utils.data import merge_dicts_without_collision
+from nautobot.ipam import hierarchy
 
 
 class RIRQuerySet(RestrictedQuerySet):
@@ -382,6 +384,70 @@ class PrefixQuerySet(BaseNetworkQuerySet):
         except IndexError:
             raise self.model.DoesNotExist(f"Could not determine parent Prefix for {cidr}")
 
+    def rebuild_hierarchy(self, batch_size=1000):
+        """
+        Recompute the `parent` of every Prefix and IPAddress in the namespaces and IP versions present in this queryset.
+
+        Each namespace and IP version is rebuilt in full, so that parents are correct relative to all prefixes in
+        the namespace and not merely those matched by this queryset.
+
+        Returns:
+            tuple: The number of `(prefixes, ip_addresses)` that were reparented.
+        """
+        prefix_count = ip_address_count = 0
+        pairs = self.order_by().values_list("namespace_id", "ip_version").distinct()
+        for namespace_id, ip_version in pairs:
+            prefixes, ip_addresses = hierarchy.rebuild_prefix_hierarchy(namespace_id, ip_version, batch_size=batch_size)
+            prefix_count += prefixes
+            ip_address_count += ip_addresses
+        return prefix_count, ip_address_count
+
+    def update_utilization(self):
+        """
+        Recalculate and store the utilization of every Prefix in this queryset.
+
+        Returns:
+            int: The number of prefixes updated.
+        """
+        count = 0
+        for count, prefix in enumerate(self.iterator(), start=1):
+            prefix.update_utilization()
+        return count
+
+    def bulk_create_with_hierarchy(self, objs, batch_size=None):
+        """
+        Create the given (unsaved) Prefix objects with `bulk_create()`, then compute their parents in bulk.
+
+        Unlike calling `save()` on each prefix, this does not resolve parents or reparent subnets and IP addresses
+        per row; instead the hierarchy of each affected namespace and IP version is rebuilt once at the end.
+        As with any `bulk_create()`, `save()` is not called and no signals are sent (although the new prefixes are
+        added to the global search index).
+        """
+        objs = list(objs)
+        for obj in objs:
+            # Clear host bits from prefix, as `Prefix.save()` would
+            obj.prefix = obj.prefix.cidr
+
+        with transaction.atomic():
+            created = self.bulk_create(objs, batch_size=batch_size)
+            pairs = {(obj.namespace_id, obj.ip_version) for obj in created}
+            for namespace_id, ip_version in sorted(pairs, key=str):
+                hierarchy.rebuild_prefix_hierarchy(namespace_id, ip_version)
+
+            parents = dict(self.model.objects.filter(pk__in=[obj.pk for obj in created]).values_list("pk", "parent_id"))
+            for obj in created:
+                obj.parent_id = parents[obj.pk]
+
+            # Only the new prefixes and their parents (which have gained and/or lost children) change utilization.
+            self.model.objects.filter(pk__in=set(parents) | set(parents.values())).update_utilization()
+
+            # As no signals are sent, the new prefixes must also be added to the global search index here
+            from nautobot.extras.models import SearchIndexEntry  # avoid circular import
+
+            SearchIndexEntry.objects.index_objects(self.model, created)
+
+        return created
+
 
 class IPAddressQuerySet(BaseNetworkQuerySet):
     """Queryset for `IPAddress` objects."""
@@ -1,8 +1,9 @@
 from django.core.exceptions import ValidationError
-from django.db.models.signals import m2m_changed, pre_delete, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
-from nautobot.ipam.models import IPAddressToInterface, VRF, VRFDeviceAssignment, VRFPrefixAssignment
+from nautobot.ipam import hierarchy
+from nautobot.ipam.models import IPAddress, IPAddressToInterface, Prefix, VRF, VRFDeviceAssignment, VRFPrefixAssignment
 
 
 @receiver(pre_save, sender=VRFDeviceAssignment)
@@ -87,3 +88,46 @@ def ip_address_to_interface_assignment_created(sender, instance, raw=False, **kw
         return
 
     instance.full_clean()
+
+
+#
+# Stored utilization
+#
+
+
+@receiver(post_delete, sender=Prefix)
+def prefix_deleted_update_utilization(sender, instance, **kwargs):
+    """
+    Update the stored utilization of the parent of a deleted Prefix.
+    """
+    if instance.parent_id is None or hierarchy.defer_hierarchy_update(instance.namespace_id, instance.ip_version):
+        return
+    for parent in Prefix.objects.filter(pk=instance.parent_id):
+        parent.update_utilization()
+
+
+@receiver(post_save, sender=IPAddress)
+def ip_address_created_update_utilization(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Update the stored utilization of the prefixes counting a newly created IPAddress.
+
+    An IPAddress's `host` cannot be changed once created, so updates to an existing IPAddress are ignored.
+    """
+    if raw or not created:
+        return
+    _update_utilization_for_ip_address(instance, 1)
+
+
+@receiver(post_delete, sender=IPAddress)
+def ip_address_deleted_update_utilization(sender, instance, **kwargs):
+    """
+    Update the stored utilization of the prefixes counting a deleted IPAddress.
+    """
+    _update_utilization_for_ip_address(instance, -1)
+
+
+def _update_utilization_for_ip_address(instance, delta):
+    parent = Prefix.objects.filter(pk=instance.parent_id).first()
+    if parent is None or hierarchy.defer_hierarchy_update(parent.namespace_id, instance.ip_version):
+        return
+    parent.update_utilization_for_ip_address(instance.host, delta)
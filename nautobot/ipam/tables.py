@@ -37,7 +37,10 @@ AVAILABLE_LABEL = mark_safe('<span class="label label-success">Available</span>'
 
 UTILIZATION_GRAPH = """
 {% load helpers %}
-{% if record.present_in_database %}{% utilization_graph record.get_utilization %}{% else %}&mdash;{% endif %}
+{% if not record.present_in_database %}&mdash;\
+{% elif record.utilization_denominator %}\
+{% utilization_graph_raw_data record.utilization_numerator record.utilization_denominator %}\
+{% else %}{% utilization_graph record.get_utilization %}{% endif %}
 """
 
 PREFIX_LINK = """
@@ -409,7 +412,7 @@ class PrefixTable(StatusTableMixin, RoleTableMixin, BaseTable):
 
 
 class PrefixDetailTable(PrefixTable):
-    utilization = tables.TemplateColumn(template_code=UTILIZATION_GRAPH, orderable=False)
+    utilization = tables.TemplateColumn(template_code=UTILIZATION_GRAPH, order_by=("utilization",))
     tenant = TenantColumn()
     tags = TagColumn(url_name="ipam:prefix_list")
 
@@ -246,6 +246,33 @@ class PrefixTest(APIViewTestCases.APIViewTestCase):
         self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
         self.assertIn("prefix_length", response.data[0])
 
+    def test_create_mixed_size_available_prefixes(self):
+        """
+        Test that prefixes of differing sizes are allocated from aligned, non-overlapping available space.
+        """
+        namespace = Namespace.objects.create(name="Mixed Size Allocation")
+        prefix = Prefix.objects.create(
+            prefix="192.0.2.0/24",
+            type=choices.PrefixTypeChoices.TYPE_CONTAINER,
+            namespace=namespace,
+            status=self.status,
+        )
+        Prefix.objects.create(prefix="192.0.2.0/26", namespace=namespace, status=self.status)
+        url = reverse("ipam-api:prefix-available-prefixes", kwargs={"pk": prefix.pk})
+        self.add_permissions("ipam.add_prefix")
+
+        data = [
+            {"prefix_length": 28, "namespace": namespace.pk, "status": self.status.pk},
+            {"prefix_length": 25, "namespace": namespace.pk, "status": self.status.pk},
+            {"prefix_length": 28, "namespace": namespace.pk, "status": self.status.pk},
+        ]
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [p["prefix"] for p in response.data],
+            ["192.0.2.64/28", "192.0.2.128/25", "192.0.2.80/28"],
+        )
+
     def test_create_multiple_available_prefixes(self):
         """
         Test the creation of available prefixes within a parent prefix.
@@ -1,4 +1,4 @@
-from unittest import skipIf
+from unittest import mock, skipIf
 
 import netaddr
 from django.contrib.contenttypes.models import ContentType
@@ -512,6 +512,46 @@ class TestPrefix(ModelTestCases.BaseModelTestCase):
         available_ips = parent_prefix.get_available_ips()
         self.assertEqual(available_ips, missing_ips)
 
+    def test_iter_available_prefixes_nested_descendants(self):
+        parent_prefix = Prefix.objects.create(
+            prefix="10.0.0.0/16", status=self.status, namespace=self.namespace, type=PrefixTypeChoices.TYPE_CONTAINER
+        )
+        Prefix.objects.create(prefix="10.0.0.0/20", status=self.status, namespace=self.namespace)
+        Prefix.objects.create(prefix="10.0.0.0/24", status=self.status, namespace=self.namespace)
+        Prefix.objects.create(prefix="10.0.16.0/24", status=self.status, namespace=self.namespace)
+        Prefix.objects.create(prefix="10.0.128.0/17", status=self.status, namespace=self.namespace)
+
+        self.assertEqual(
+            list(parent_prefix.iter_available_prefixes()),
+            [
+                netaddr.IPNetwork("10.0.17.0/24"),
+                netaddr.IPNetwork("10.0.18.0/23"),
+                netaddr.IPNetwork("10.0.20.0/22"),
+                netaddr.IPNetwork("10.0.24.0/21"),
+                netaddr.IPNetwork("10.0.32.0/19"),
+                netaddr.IPNetwork("10.0.64.0/18"),
+            ],
+        )
+        self.assertEqual(list(parent_prefix.get_available_prefix_ranges())[0], (0x0A001100, 0x0A007FFF))
+
+    def test_iter_available_ips(self):
+        parent_prefix = Prefix.objects.create(prefix="10.0.0.0/16", status=self.status, namespace=self.namespace)
+        IPAddress.objects.create(address="10.0.0.1/16", status=self.status, namespace=self.namespace)
+        IPAddress.objects.create(address="10.0.0.3/16", status=self.status, namespace=self.namespace)
+
+        available_ips = parent_prefix.iter_available_ips()
+        self.assertEqual(
+            [next(available_ips) for _ in range(3)],
+            [netaddr.IPAddress("10.0.0.2"), netaddr.IPAddress("10.0.0.4"), netaddr.IPAddress("10.0.0.5")],
+        )
+        # Network and broadcast addresses are excluded for IPv4 network prefixes
+        self.assertEqual(list(parent_prefix.get_available_ip_ranges())[-1], (0x0A000004, 0x0A00FFFE))
+
+        pool_prefix = Prefix.objects.create(
+            prefix="10.1.0.0/30", status=self.status, namespace=self.namespace, type=PrefixTypeChoices.TYPE_POOL
+        )
+        self.assertEqual(len(list(pool_prefix.iter_available_ips())), 4)
+
     def test_get_first_available_prefix(self):
         prefixes = [
             Prefix(
@@ -645,6 +685,80 @@ class TestPrefix(ModelTestCases.BaseModelTestCase):
         Prefix.objects.create(prefix="ab80::/9", status=self.status, namespace=self.namespace)
         self.assertEqual(large_prefix_v6.get_utilization(), (2**120, 2**120))
 
+    def test_stored_utilization(self):
+        """The stored utilization of a Prefix is kept up to date as child Prefixes and IPAddresses change."""
+
+        def assert_utilization(prefix, numerator, denominator):
+            prefix.refresh_from_db()
+            self.assertEqual((prefix.utilization_numerator, prefix.utilization_denominator), (numerator, denominator))
+            self.assertEqual((numerator, denominator), prefix.get_utilization())
+            self.assertAlmostEqual(prefix.utilization, 100 * numerator / denominator)
+
+        # From setUp: self.parent (/25) contains self.child1 and self.child2 (/26 each)
+        assert_utilization(self.root, 128, 256)
+        assert_utilization(self.parent, 128, 128)
+        assert_utilization(self.child1, 0, 62)
+
+        # IPAddresses are counted incrementally, only by the prefixes counting them
+        with mock.patch.object(Prefix, "get_utilization") as get_utilization:
+            ip = IPAddress.objects.create(address="101.102.0.1/32", status=self.status, namespace=self.namespace)
+            get_utilization.assert_not_called()
+        assert_utilization(self.child1, 1, 62)
+        assert_utilization(self.parent, 128, 128)
+        ip.delete()
+        assert_utilization(self.child1, 0, 62)
+
+        # Assigning the network address of an IPv4 network prefix changes its denominator
+        ip = IPAddress.objects.create(address="101.102.0.0/32", status=self.status, namespace=self.namespace)
+        assert_utilization(self.child1, 1, 64)
+        ip.delete()
+        assert_utilization(self.child1, 0, 62)
+
+        # Addresses within a pool count toward the pool, which already counts fully toward its parent
+        pool = Prefix.objects.create(
+            prefix="101.102.0.16/28", status=self.status, namespace=self.namespace, type=PrefixTypeChoices.TYPE_POOL
+        )
+        assert_utilization(self.child1, 16, 62)
+        ip = IPAddress.objects.create(address="101.102.0.17/32", status=self.status, namespace=self.namespace)
+        assert_utilization(pool, 1, 16)
+        assert_utilization(self.child1, 16, 62)
+        ip.delete()
+        pool.delete()
+        assert_utilization(self.child1, 0, 62)
+
+        # Changes not affecting the range, type or parent of a prefix do not recalculate any utilization
+        with mock.patch.object(Prefix, "update_utilization") as update_utilization:
+            self.child1.description = "Updated"
+            self.child1.save()
+            update_utilization.assert_not_called()
+
+        # Inserting a prefix between the root and its existing child updates both
+        self.parent.delete()
+        assert_utilization(self.root, 128, 256)
+        middle = Prefix.objects.create(
+            prefix="101.102.0.0/25", status=self.status, namespace=self.namespace, type=PrefixTypeChoices.TYPE_CONTAINER
+        )
+        assert_utilization(middle, 128, 128)
+        assert_utilization(self.root, 128, 256)
+
+        self.child2.refresh_from_db()
+        self.child2.delete()
+        assert_utilization(middle, 64, 128)
+
+        # IPv6 sizes exceed the range of a 64-bit integer
+        large_prefix_v6 = Prefix.objects.create(
+            prefix="ab00::/8", type=PrefixTypeChoices.TYPE_CONTAINER, status=self.status, namespace=self.namespace
+        )
+        Prefix.objects.create(prefix="ab00::/9", status=self.status, namespace=self.namespace)
+        assert_utilization(large_prefix_v6, 2**119, 2**120)
+
+        # Filtering by the stored utilization
+        self.assertQuerysetEqual(
+            Prefix.objects.filter(utilization__gte=50),
+            [self.root, middle, large_prefix_v6],
+            ordered=False,
+        )
+
     #
     # Uniqueness enforcement tests
     #
@@ -7,6 +7,7 @@ from django.db import connection
 from nautobot.core.testing import TestCase
 from nautobot.extras.models import Status
 from nautobot.ipam import choices
+from nautobot.ipam.hierarchy import deferred_prefix_parenting
 from nautobot.ipam.models import Prefix, IPAddress, Namespace
 
 
@@ -757,3 +758,62 @@ class PrefixQuerysetTestCase(TestCase):
                     .order_by("-prefix_length")
                     .first(),
                 )
+
+    def test_bulk_create_with_hierarchy(self):
+        namespace = Namespace.objects.create(name="Bulk Hierarchy Namespace")
+        container = Prefix.objects.create(
+            prefix="10.0.0.0/16", type=choices.PrefixTypeChoices.TYPE_CONTAINER, namespace=namespace, status=self.status
+        )
+        ip_address = IPAddress.objects.create(address="10.0.1.10/24", namespace=namespace, status=self.status)
+        self.assertEqual(ip_address.parent, container)
+
+        created = Prefix.objects.bulk_create_with_hierarchy(
+            [
+                Prefix(prefix="10.0.1.0/24", namespace=namespace, status=self.status),
+                Prefix(prefix="10.0.0.0/8", namespace=namespace, status=self.status),
+                Prefix(prefix="10.0.1.0/25", namespace=namespace, status=self.status),
+                Prefix(prefix="10.0.2.0/24", namespace=namespace, status=self.status),
+                Prefix(prefix="2001:db8::/64", namespace=namespace, status=self.status),
+            ]
+        )
+        parents = {str(prefix.prefix): prefix.parent for prefix in created}
+        self.assertEqual(parents["10.0.0.0/8"], None)
+        self.assertEqual(parents["10.0.1.0/24"], container)
+        self.assertEqual(parents["10.0.1.0/25"].cidr_str, "10.0.1.0/24")
+        self.assertEqual(parents["10.0.2.0/24"], container)
+        self.assertEqual(parents["2001:db8::/64"], None)
+
+        container.refresh_from_db()
+        self.assertEqual(container.parent.cidr_str, "10.0.0.0/8")
+        ip_address.refresh_from_db()
+        self.assertEqual(ip_address.parent.cidr_str, "10.0.1.0/25")
+
+    def test_deferred_prefix_parenting(self):
+        namespace = Namespace.objects.create(name="Deferred Hierarchy Namespace")
+        with deferred_prefix_parenting():
+            child = Prefix.objects.create(prefix="10.0.1.0/24", namespace=namespace, status=self.status)
+            parent = Prefix.objects.create(
+                prefix="10.0.0.0/16",
+                type=choices.PrefixTypeChoices.TYPE_CONTAINER,
+                namespace=namespace,
+                status=self.status,
+            )
+            ip_address = IPAddress.objects.create(address="10.0.1.1/24", namespace=namespace, status=self.status)
+            child.refresh_from_db()
+            self.assertIsNone(child.parent)
+
+        child.refresh_from_db()
+        ip_address.refresh_from_db()
+        self.assertEqual(child.parent, parent)
+        self.assertEqual(ip_address.parent, child)
+
+    def test_rebuild_hierarchy(self):
+        namespace = Namespace.objects.create(name="Rebuild Hierarchy Namespace")
+        parent = Prefix.objects.create(prefix="10.0.0.0/16", namespace=namespace, status=self.status)
+        child = Prefix.objects.create(prefix="10.0.1.0/24", namespace=namespace, status=self.status)
+        Prefix.objects.filter(pk=child.pk).update(parent=None)
+
+        self.assertEqual(Prefix.objects.filter(namespace=namespace).rebuild_hierarchy(), (1, 0))
+        child.refresh_from_db()
+        self.assertEqual(child.parent, parent)
+        self.assertEqual(Prefix.objects.filter(namespace=namespace).rebuild_hierarchy(), (0, 0))
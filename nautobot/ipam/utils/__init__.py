@@ -2,6 +2,7 @@ import netaddr
 
 from nautobot.dcim.models import Interface
 from nautobot.extras.models import RelationshipAssociation
+from nautobot.ipam import availability
 from nautobot.ipam.constants import VLAN_VID_MAX, VLAN_VID_MIN
 from nautobot.ipam.models import Prefix, VLAN
 from nautobot.ipam.querysets import IPAddressQuerySet
@@ -14,11 +15,15 @@ def add_available_prefixes(parent, prefix_list):
     """
 
     # Find all unallocated space
-    available_prefixes = netaddr.IPSet(parent) ^ netaddr.IPSet([p.prefix for p in prefix_list])
-    available_prefixes = [Prefix(prefix=p, status=None) for p in available_prefixes.iter_cidrs()]
+    prefix_list = sorted(prefix_list, key=lambda p: p.prefix)
+    used_ranges = ((p.prefix.first, p.prefix.last) for p in prefix_list)
+    free_ranges = availability.iter_free_ranges(parent.first, parent.last, used_ranges)
+    available_prefixes = [
+        Prefix(prefix=p, status=None) for p in availability.iter_free_cidrs(free_ranges, parent.version)
+    ]
 
     # Concatenate and sort complete list of children
-    prefix_list = list(prefix_list) + available_prefixes
+    prefix_list = prefix_list + available_prefixes
     prefix_list.sort(key=lambda p: p.prefix)
 
     return prefix_list
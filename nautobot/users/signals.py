@@ -0,0 +1,20 @@
+"""Signal handlers for the users app."""
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from nautobot.core.authentication import invalidate_object_permissions_cache
+from nautobot.users.models import ObjectPermission, User
+
+
+@receiver(post_save, sender=ObjectPermission)
+@receiver(post_delete, sender=ObjectPermission)
+@receiver(post_delete, sender=Group)
+@receiver(m2m_changed, sender=ObjectPermission.object_types.through)
+@receiver(m2m_changed, sender=ObjectPermission.groups.through)
+@receiver(m2m_changed, sender=ObjectPermission.users.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def object_permissions_changed(sender, **kwargs):
+    """Invalidate the cached object permissions of all users when any ObjectPermission or group membership changes."""
+    if kwargs.get("action", "post_").startswith("post_"):
+        invalidate_object_permissions_cache()